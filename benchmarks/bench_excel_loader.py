@@ -0,0 +1,84 @@
+"""Benchmark Excel loading: legacy two-pass pandas vs single-pass engines.
+
+Usage:
+    python benchmarks/bench_excel_loader.py [path/to/workbook.xlsx] [--repeat N]
+
+The legacy loader read the workbook twice through pandas (once for headers,
+once for data) and then converted the result to Polars. This script times
+that approach against each single-pass engine of ``load_excel_to_polars``,
+with the Parquet cache disabled, and checks all engines return the same
+frame.
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+from functools import partial
+from importlib.util import find_spec
+from pathlib import Path
+
+import pandas as pd
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from optimizer_340b.ingest.cache import ParquetCache, set_default_cache
+from optimizer_340b.ingest.loaders import NDC_COLUMN_NAMES, load_excel_to_polars
+
+DEFAULT_WORKBOOK = (
+    Path(__file__).resolve().parents[1] / "data" / "sample" / "product_catalog.xlsx"
+)
+
+
+def load_legacy_two_pass(path: Path) -> pl.DataFrame:
+    """Reproduce the original header pass + data pass pandas loader."""
+    headers = pd.read_excel(path, engine="openpyxl", nrows=0)
+    dtype = {col: str for col in headers.columns if col in NDC_COLUMN_NAMES}
+    return pl.from_pandas(pd.read_excel(path, engine="openpyxl", dtype=dtype or None))
+
+
+def time_loader(
+    loader: Callable[[], pl.DataFrame], repeat: int
+) -> tuple[float, pl.DataFrame]:
+    """Return the median wall time of ``repeat`` runs and the last result."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = loader()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), df
+
+
+def main() -> None:
+    """Run the benchmark and print a timing table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("workbook", nargs="?", type=Path, default=DEFAULT_WORKBOOK)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    set_default_cache(ParquetCache(Path("."), enabled=False))
+
+    baseline, expected = time_loader(
+        lambda: load_legacy_two_pass(args.workbook), args.repeat
+    )
+    print(f"{args.workbook.name}: {expected.height} rows x {expected.width} columns")
+    print(f"{'loader':<20}{'median (s)':>12}{'speedup':>10}")
+    print(f"{'pandas two-pass':<20}{baseline:>12.2f}{1.0:>9.1f}x")
+
+    engines = ["openpyxl"]
+    if find_spec("fastexcel") is not None:
+        engines.append("calamine")
+    else:
+        print("(calamine skipped: install fastexcel to enable it)")
+
+    for engine in engines:
+        elapsed, df = time_loader(
+            partial(load_excel_to_polars, args.workbook, engine=engine),
+            args.repeat,
+        )
+        assert_frame_equal(expected, df)
+        print(f"{engine:<20}{elapsed:>12.2f}{baseline / elapsed:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
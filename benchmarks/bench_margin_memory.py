@@ -0,0 +1,121 @@
+"""Benchmark memory per analyzed drug: dataclass lists vs MarginTable.
+
+Usage:
+    python benchmarks/bench_margin_memory.py [--data-dir data/sample] [--scale N]
+
+Scores the sample catalog (stacked ``--scale`` times) with
+``rank_opportunities`` and measures what holding every analysis costs:
+
+- dict dataclasses: the previous ``Drug``/``MarginAnalysis`` layout (plain
+  ``@dataclass`` with a per-instance ``__dict__``), rebuilt here from the
+  model fields
+- slotted dataclasses: ``margin_analyses_from_frame`` output
+- MarginTable: the analyzed frame's columns plus one row view
+
+Python allocations are measured with tracemalloc; the table's Arrow buffers
+are not Python objects, so its cost is the frame's ``estimated_size()``.
+"""
+
+import argparse
+import dataclasses
+import gc
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.margin_table import MarginTable
+from optimizer_340b.compute.margins import (
+    margin_analyses_from_frame,
+    rank_opportunities,
+)
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.ingest.sources import resolve_source_paths
+from optimizer_340b.models import Drug, MarginAnalysis
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
+
+
+def _dict_dataclass(cls: type) -> type:
+    """Unslotted copy of a model dataclass (the pre-slots layout)."""
+    return dataclasses.make_dataclass(
+        f"Dict{cls.__name__}",
+        [
+            (f.name, f.type, dataclasses.field(default=f.default))
+            if f.default is not dataclasses.MISSING
+            else (f.name, f.type)
+            for f in dataclasses.fields(cls)
+        ],
+    )
+
+
+DictDrug = _dict_dataclass(Drug)
+DictMarginAnalysis = _dict_dataclass(MarginAnalysis)
+
+
+def _as_dict_dataclasses(margins: pl.DataFrame) -> list[Any]:
+    """Build the analyses with the unslotted layout."""
+    analyses = []
+    for analysis in margin_analyses_from_frame(margins):
+        values = {
+            f.name: getattr(analysis, f.name)
+            for f in dataclasses.fields(MarginAnalysis)
+        }
+        drug = analysis.drug
+        values["drug"] = DictDrug(
+            **{f.name: getattr(drug, f.name) for f in dataclasses.fields(Drug)}
+        )
+        analyses.append(DictMarginAnalysis(**values))
+    return analyses
+
+
+def traced_bytes(build: Callable[[], object]) -> int:
+    """Python bytes still allocated by ``build`` once it returns."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    """Score the catalog and print bytes per analyzed drug per layout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    ingest = ingest_sources(resolve_source_paths(args.data_dir), max_workers=1)
+    index = DrugIndex.from_uploaded_data(ingest.frames)
+    if index is None:
+        raise SystemExit(f"No product catalog found in {args.data_dir}")
+    margins = rank_opportunities(pl.concat([index.frame] * args.scale))
+    n = margins.height
+
+    def build_table() -> tuple[MarginTable, object]:
+        table = MarginTable(margins)
+        return table, table[0]
+
+    results = {
+        "dict dataclasses": traced_bytes(lambda: _as_dict_dataclasses(margins)),
+        "slotted dataclasses": traced_bytes(
+            lambda: margin_analyses_from_frame(margins)
+        ),
+        "MarginTable": traced_bytes(build_table) + margins.estimated_size(),
+    }
+
+    baseline = results["dict dataclasses"]
+    print(f"analyzed drugs: {n:,}")
+    print(f"{'layout':<22}{'bytes/drug':>12}{'vs dict':>10}")
+    for name, total in results.items():
+        print(f"{name:<22}{total / n:>12,.0f}{total / baseline:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the Silver build: eager frames vs one lazy streaming query.
+
+Usage:
+    python benchmarks/bench_silver.py [--data-dir data/sample] [--scale N]
+
+The catalog, crosswalk and ASP files are loaded once and written to Parquet
+(the catalog stacked ``--scale`` times). Each variant then runs in a fresh
+interpreter so its peak RSS is its own:
+
+- eager: ``pl.read_parquet`` + ``build_silver_dataset``
+- lazy: ``pl.scan_parquet`` + ``build_silver_dataset_lazy`` (streaming)
+- lazy-projected: as lazy, carrying only the catalog columns the drug
+  frame reads
+
+All variants must produce the same row counts.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+
+from optimizer_340b.cli import peak_rss_mb
+from optimizer_340b.ingest.normalizers import (
+    build_silver_dataset,
+    build_silver_dataset_lazy,
+)
+from optimizer_340b.ingest.sources import load_source
+
+DEFAULT_DATA_DIR = Path(__file__).resolve().parents[1] / "data" / "sample"
+
+VARIANTS = ("eager", "lazy", "lazy-projected")
+
+# Catalog columns the drug frame reads (absent ones are ignored)
+PROJECTED_COLUMNS = (
+    "NDC",
+    "Drug Name",
+    "Manufacturer",
+    "Contract Name",
+    "Contract Cost",
+    "Unit Price (Current Catalog)",
+    "AWP",
+)
+
+
+def run_variant(variant: str, parquet_dir: Path) -> dict[str, float]:
+    """Build the Silver dataset one way and report time, rows and peak RSS."""
+    names = ("catalog", "crosswalk", "asp_pricing")
+    paths = [parquet_dir / f"{name}.parquet" for name in names]
+
+    start = time.perf_counter()
+    if variant == "eager":
+        silver, orphans = build_silver_dataset(*(pl.read_parquet(p) for p in paths))
+    else:
+        columns = PROJECTED_COLUMNS if variant == "lazy-projected" else None
+        catalog, crosswalk, asp = (pl.scan_parquet(p) for p in paths)
+        silver, orphans = build_silver_dataset_lazy(
+            catalog, crosswalk, asp, catalog_columns=columns
+        )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "seconds": elapsed,
+        "silver_rows": silver.height,
+        "orphan_rows": orphans.height,
+        "peak_rss_mb": peak_rss_mb() or 0.0,
+    }
+
+
+def main() -> None:
+    """Run every variant in a subprocess and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    parser.add_argument("--parquet-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.parquet_dir)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parquet_dir = Path(tmp)
+        catalog = load_source("catalog", args.data_dir / "product_catalog.xlsx")
+        pl.concat([catalog] * args.scale).write_parquet(parquet_dir / "catalog.parquet")
+        # Already normalized; the Silver build's normalization is idempotent
+        for name, filename in (
+            ("crosswalk", "asp_crosswalk.csv"),
+            ("asp_pricing", "asp_pricing.csv"),
+        ):
+            load_source(name, args.data_dir / filename).write_parquet(
+                parquet_dir / f"{name}.parquet"
+            )
+
+        print(f"catalog: {catalog.height * args.scale:,} rows")
+        print(f"{'variant':<16}{'seconds':>10}{'peak RSS (MiB)':>16}{'rows':>10}")
+        results = {}
+        for variant in VARIANTS:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--variant",
+                    variant,
+                    "--parquet-dir",
+                    str(parquet_dir),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results[variant] = json.loads(output.strip().splitlines()[-1])
+            r = results[variant]
+            print(
+                f"{variant:<16}{r['seconds']:>10.3f}{r['peak_rss_mb']:>16.1f}"
+                f"{r['silver_rows']:>10,}"
+            )
+
+        counts = {(r["silver_rows"], r["orphan_rows"]) for r in results.values()}
+        assert len(counts) == 1, f"Variants disagree: {results}"
+
+
+if __name__ == "__main__":
+    main()
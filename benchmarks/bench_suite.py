@@ -0,0 +1,361 @@
+"""Throughput benchmark suite over synthetic CMS-shaped data.
+
+Usage:
+    python -m benchmarks.bench_suite [--sizes 1k,10k,100k,1m] [--data-dir DIR]
+        [--output results.json] [--baseline benchmarks/baseline.json]
+        [--tolerance 0.25] [--update-baseline]
+
+For each size, ``benchmarks.synthetic`` generates a file set (reused from
+``--data-dir`` when already there; 1m takes a few minutes, mostly writing
+the workbook). A fresh interpreter then runs the pipeline stages in order,
+each feeding the next:
+
+- load_excel: ``load_excel_to_polars`` on the product catalog
+- preprocess_cms_csv: the ASP crosswalk and pricing files
+- build_silver: ``build_silver_dataset``
+- drug_index: ``DrugIndex.from_uploaded_data`` (drug frame and NDC index)
+- margin_scoring: ``rank_opportunities`` over the drug frame
+- search_index: ``SearchIndex`` build
+- search: name, NDC and misspelled-name queries
+- ndc_lookup: ``stream_ndc_lookup`` over the generated claim list
+
+The Parquet cache is disabled. Each stage records rows, seconds, rows/s and
+the peak RSS sampled while it ran. Results are printed, optionally written
+to JSON, and compared with the baseline: a stage whose rows/s falls more
+than ``--tolerance`` below the baseline is a regression and the exit status
+is 1. Baselines are machine-specific; refresh with ``--update-baseline``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from benchmarks.synthetic import generate_dataset, parse_size
+from optimizer_340b.cli import peak_rss_mb
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.margins import rank_opportunities
+from optimizer_340b.compute.ndc_lookup import (
+    NdcLookup,
+    read_ndc_list,
+    stream_ndc_lookup,
+)
+from optimizer_340b.compute.search_index import SearchIndex
+from optimizer_340b.ingest.cache import ParquetCache, set_default_cache
+from optimizer_340b.ingest.loaders import load_csv_to_polars, load_excel_to_polars
+from optimizer_340b.ingest.normalizers import (
+    build_silver_dataset,
+    normalize_catalog,
+    normalize_crosswalk,
+    normalize_noc_crosswalk,
+    normalize_noc_pricing,
+    preprocess_cms_csv,
+)
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_SIZES = "1k,10k"
+DEFAULT_TOLERANCE = 0.25
+SEARCH_QUERIES = 300
+RSS_SAMPLE_SECONDS = 0.005
+
+
+@dataclass
+class StageResult:
+    """Timing and memory for one stage at one size."""
+
+    ndcs: int
+    stage: str
+    rows: int
+    seconds: float
+    rows_per_s: float
+    peak_rss_mb: float | None
+
+
+def current_rss_mb() -> float | None:
+    """Current resident set size in MiB, or None without ``/proc``."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+@contextmanager
+def sample_peak_rss() -> Iterator[list[float | None]]:
+    """Sample RSS in a thread while the block runs.
+
+    Yields a one-item list that holds the peak RSS in MiB once the block
+    exits. Without ``/proc`` this falls back to the process high-water mark.
+    """
+    result: list[float | None] = [None]
+    stop = threading.Event()
+    samples: list[float] = []
+
+    def sample() -> None:
+        while True:
+            rss = current_rss_mb()
+            if rss is not None:
+                samples.append(rss)
+            if stop.wait(RSS_SAMPLE_SECONDS):
+                return
+
+    thread = threading.Thread(target=sample, daemon=True)
+    thread.start()
+    try:
+        yield result
+    finally:
+        stop.set()
+        thread.join()
+        result[0] = max(samples) if samples else peak_rss_mb()
+
+
+def search_queries(index: DrugIndex, count: int) -> list[str]:
+    """Mixed search workload: name prefixes, NDCs and misspelled names."""
+    rows = index.frame.select("drug_name", "ndc").gather_every(
+        max(index.frame.height // count, 1)
+    )
+    queries = []
+    for i, (name, ndc) in enumerate(rows.head(count).iter_rows()):
+        if i % 3 == 0:
+            queries.append(name[: max(len(name) // 2, 3)])
+        elif i % 3 == 1:
+            queries.append(f"{ndc[:5]}-{ndc[5:9]}")
+        else:
+            queries.append(name[:-2] + name[-1:] + name[-2] if len(name) > 3 else name)
+    return queries
+
+
+def run_stages(paths: dict[str, Path], ndcs: int) -> list[StageResult]:
+    """Run every stage once over one generated file set."""
+    set_default_cache(ParquetCache(Path("."), enabled=False))
+    results: list[StageResult] = []
+
+    def timed(stage: str, run: Callable[[], Any], rows: Callable[[Any], int]) -> Any:
+        with sample_peak_rss() as peak:
+            start = time.perf_counter()
+            value = run()
+            seconds = time.perf_counter() - start
+        count = rows(value)
+        results.append(
+            StageResult(
+                ndcs=ndcs,
+                stage=stage,
+                rows=count,
+                seconds=seconds,
+                rows_per_s=count / seconds if seconds > 0 else 0.0,
+                peak_rss_mb=peak[0],
+            )
+        )
+        return value
+
+    catalog = timed(
+        "load_excel",
+        lambda: load_excel_to_polars(paths["catalog"]),
+        lambda df: df.height,
+    )
+    crosswalk, asp_pricing = timed(
+        "preprocess_cms_csv",
+        lambda: (
+            preprocess_cms_csv(paths["crosswalk"], skip_rows=8),
+            preprocess_cms_csv(paths["asp_pricing"], skip_rows=8),
+        ),
+        lambda frames: sum(df.height for df in frames),
+    )
+    timed(
+        "build_silver",
+        lambda: build_silver_dataset(catalog, crosswalk, asp_pricing),
+        lambda _: catalog.height,
+    )
+
+    # Remaining inputs load as ingest.sources loads them (untimed)
+    uploaded = {
+        "catalog": normalize_catalog(catalog),
+        "crosswalk": normalize_crosswalk(crosswalk),
+        "asp_pricing": asp_pricing,
+        "nadac": load_csv_to_polars(paths["nadac"]),
+        "noc_crosswalk": normalize_noc_crosswalk(
+            preprocess_cms_csv(paths["noc_crosswalk"], skip_rows=9)
+        ),
+        "noc_pricing": normalize_noc_pricing(
+            preprocess_cms_csv(paths["noc_pricing"], skip_rows=12)
+        ),
+    }
+    index = timed(
+        "drug_index",
+        lambda: DrugIndex.from_uploaded_data(uploaded),
+        lambda index: index.frame.height,
+    )
+    timed(
+        "margin_scoring",
+        lambda: rank_opportunities(index.frame),
+        lambda df: df.height,
+    )
+    search = timed(
+        "search_index",
+        lambda: SearchIndex.from_frame(index.frame, index.catalog),
+        lambda _: index.frame.height,
+    )
+    queries = search_queries(index, SEARCH_QUERIES)
+    timed(
+        "search",
+        lambda: [search.search(query) for query in queries],
+        len,
+    )
+
+    ndc_list = read_ndc_list(paths["ndc_list"].read_bytes())
+    assert ndc_list is not None
+    with tempfile.TemporaryDirectory() as tmp:
+        timed(
+            "ndc_lookup",
+            lambda: stream_ndc_lookup(
+                ndc_list,
+                NdcLookup(index.catalog, uploaded["nadac"]),
+                Path(tmp) / "lookup.parquet",
+            ),
+            lambda summary: summary.total,
+        )
+    return results
+
+
+def dataset_for(data_dir: Path, ndcs: int, seed: int) -> dict[str, Path]:
+    """Generate the file set for a size, or reuse one already generated."""
+    out_dir = data_dir / f"ndcs-{ndcs}-seed-{seed}"
+    marker = out_dir / "paths.json"
+    if marker.exists():
+        return {key: Path(p) for key, p in json.loads(marker.read_text()).items()}
+    paths = generate_dataset(out_dir, ndcs, seed)
+    marker.write_text(json.dumps({key: str(p) for key, p in paths.items()}))
+    return paths
+
+
+def run_size(data_dir: Path, ndcs: int, seed: int) -> list[StageResult]:
+    """Run the stages for one size in a fresh interpreter."""
+    dataset_for(data_dir, ndcs, seed)
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.bench_suite",
+            "--worker",
+            "--sizes",
+            str(ndcs),
+            "--data-dir",
+            str(data_dir),
+            "--seed",
+            str(seed),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=BENCHMARK_DIR.parent,
+    ).stdout
+    return [StageResult(**r) for r in json.loads(output.strip().splitlines()[-1])]
+
+
+def environment() -> dict[str, Any]:
+    """Interpreter, library and machine details stored with the results."""
+    return {
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(
+    results: list[StageResult], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Print rows/s against the baseline and return the regressed stages."""
+    expected = {
+        (r["ndcs"], r["stage"]): r["rows_per_s"] for r in baseline.get("results", [])
+    }
+    regressions = []
+    print(f"\n{'ndcs':>9}  {'stage':<20}{'rows/s':>14}{'baseline':>14}{'ratio':>8}")
+    for r in results:
+        base = expected.get((r.ndcs, r.stage))
+        if not base:
+            continue
+        ratio = r.rows_per_s / base
+        flag = ""
+        if ratio < 1 - tolerance:
+            flag = "  REGRESSION"
+            regressions.append(f"{r.ndcs}/{r.stage}")
+        print(
+            f"{r.ndcs:>9,}  {r.stage:<20}{r.rows_per_s:>14,.0f}{base:>14,.0f}"
+            f"{ratio:>7.2f}x{flag}"
+        )
+    return regressions
+
+
+def main() -> None:
+    """Run the suite, print a table and compare against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", type=Path)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    results: list[StageResult] = []
+
+    if args.worker:
+        paths = dataset_for(args.data_dir, sizes[0], args.seed)
+        results = run_stages(paths, sizes[0])
+        print(json.dumps([asdict(r) for r in results]))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or Path(tmp)
+        print(
+            f"{'ndcs':>9}  {'stage':<20}{'rows':>10}{'seconds':>10}"
+            f"{'rows/s':>14}{'peak RSS (MiB)':>16}"
+        )
+        for ndcs in sizes:
+            for r in run_size(data_dir, ndcs, args.seed):
+                results.append(r)
+                rss = f"{r.peak_rss_mb:>16.1f}" if r.peak_rss_mb else f"{'n/a':>16}"
+                print(
+                    f"{r.ndcs:>9,}  {r.stage:<20}{r.rows:>10,}{r.seconds:>10.3f}"
+                    f"{r.rows_per_s:>14,.0f}{rss}"
+                )
+
+    report = {
+        "environment": environment(),
+        "seed": args.seed,
+        "results": [asdict(r) for r in results],
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressed beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
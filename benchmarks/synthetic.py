@@ -0,0 +1,527 @@
+"""Synthetic CMS-shaped input files at any catalog size.
+
+Usage:
+    python -m benchmarks.synthetic OUT_DIR [--ndcs 10k] [--seed 0]
+
+Writes the files ``ingest.sources`` loads, under their sample-data names,
+for a catalog of ``--ndcs`` NDCs (``1k``, ``10k``, ``100k`` and ``1m`` are
+accepted as well as plain integers):
+
+- product_catalog.xlsx: the wholesaler catalog layout; 12% of NDCs appear
+  twice (a second contract), 15% of rows are off-contract
+- asp_crosswalk.csv / asp_pricing.csv: CMS layouts with their 8 metadata
+  rows; 20% of catalog NDCs map to a HCPCS code (about 8 NDCs per code),
+  plus crosswalk-only NDCs and priced codes no NDC maps to
+- noc_crosswalk.csv / noc_pricing.csv: CMS NOC layouts (9 and 12 metadata
+  rows) for 0.5% of catalog NDCs
+- ndc_nadac_master_statistics.csv: NADAC statistics for 60% of catalog
+  NDCs plus NADAC-only NDCs, with a few penny-priced rows
+- biologics_logic_grid.xlsx: dosing rows for the catalog's biologic names
+- ndc_list.csv: an NDC Lookup input list of every catalog NDC plus 5%
+  unknown NDCs
+
+The overlaps follow the bundled sample data, and files generated with the
+same size and seed are identical.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import openpyxl  # type: ignore[import-untyped]
+import polars as pl
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Key overlap, as fractions of the catalog's NDC count
+DUPLICATE_FRACTION = 0.12  # NDCs listed under a second contract
+OFF_CONTRACT_FRACTION = 0.15
+MEDICAL_FRACTION = 0.20  # catalog NDCs in the ASP crosswalk
+CROSSWALK_ONLY_FRACTION = 0.05  # crosswalk NDCs missing from the catalog
+NDCS_PER_HCPCS = 8
+UNMAPPED_HCPCS_FRACTION = 0.04  # priced HCPCS codes no NDC maps to
+NOC_FRACTION = 0.005
+NADAC_FRACTION = 0.60
+NADAC_ONLY_FRACTION = 0.10
+PENNY_FRACTION = 0.02
+LOOKUP_MISS_FRACTION = 0.05
+
+# Metadata rows above the header, as in the CMS files
+ASP_CROSSWALK_PREAMBLE = (
+    "October 2025 ASP NDC - HCPCS Crosswalk for Medicare Part B Drugs",
+    "     Effective October 1, 2025 through December 31, 2025",
+    "",
+    "Synthetic crosswalk generated for benchmarking.",
+    "",
+    "",
+    "",
+    "",
+)
+ASP_PRICING_PREAMBLE = (
+    "Payment Allowance Limits for Medicare Part B Drugs",
+    "",
+    "Effective October 1, 2025 through December 31, 2025",
+    "",
+    "Note 1: Synthetic payment allowance limits generated for benchmarking.",
+    "Note 2: Not for billing.",
+    "",
+    "",
+)
+NOC_PRICING_PREAMBLE = (
+    "",
+    "Payment Allowance Limits for Medicare Part B Not Otherwise Classified (NOC) Drugs",
+    "",
+    "Effective October 1, 2025 through December 31, 2025",
+    "",
+    "Note 1: Synthetic payment allowance limits generated for benchmarking.",
+    "Note 2: Not for billing.",
+    "",
+    "",
+    "",
+    "",
+    "",
+)
+NOC_CROSSWALK_PREAMBLE = (
+    "October 2025 ASP NOC NDC - HCPCS Crosswalk for Medicare Part B Drugs",
+    "October 1, 2025 through December 31, 2025",
+    "",
+    "Synthetic crosswalk generated for benchmarking.",
+    "",
+    "",
+    "",
+    "",
+    "",
+)
+
+SYLLABLES = (
+    "ba", "ce", "da", "fi", "go", "hu", "li", "ma", "ne", "po",
+    "qui", "ra", "si", "ta", "vo", "xa", "ze", "lor", "mab", "tin",
+)  # fmt: skip
+HCPCS_PREFIXES = "JQCABDEGHKLMPSV"  # Level II code letters
+ORAL_FORMS = ("TABS", "CAPS", "SOLN", "POWD")
+MEDICAL_FORMS = ("PWVL", "SDV", "SYRN", "SDPF")
+CONTRACTS = (
+    "PUBLIC HEALTH SERVICES",
+    "SPD PHS (ORPHAN/BILL TO PD)",
+    "340B PRIME-VENDOR-PROGRAM",
+    "APEXUS GENERICS PORTFOLIO",
+)
+MANUFACTURERS = (
+    "ABBVIE", "AMGEN", "ASTRAZENECA", "GENENTECH", "JANSSEN",
+    "MERCK", "NOVARTIS", "PFIZER", "SANDOZ", "TEVA",
+)  # fmt: skip
+
+
+def parse_size(text: str) -> int:
+    """Parse ``1k``/``10k``/``100k``/``1m`` or an integer NDC count."""
+    return SIZES.get(text.lower()) or int(text.replace("_", ""))
+
+
+def _names(rng: np.random.Generator, count: int) -> list[str]:
+    """Distinct upper-case drug names built from syllables."""
+    names: set[str] = set()
+    while len(names) < count:
+        parts = rng.choice(len(SYLLABLES), size=rng.integers(2, 6))
+        names.add("".join(SYLLABLES[i] for i in parts).upper())
+    return sorted(names)
+
+
+def _ndcs(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Distinct 11-digit NDCs as integers, in random order."""
+    drawn = np.unique(rng.integers(10**9, 10**11, size=int(count * 1.01) + 16))
+    while drawn.size < count:
+        extra = rng.integers(10**9, 10**11, size=count)
+        drawn = np.unique(np.concatenate([drawn, extra]))
+    return rng.permutation(drawn)[:count]
+
+
+def _ndc11(ndcs: np.ndarray) -> pl.Series:
+    """11-digit NDC strings for integer NDCs."""
+    return pl.Series(ndcs).cast(pl.String).str.zfill(11)
+
+
+def _ndc_542(ndc11: pl.Expr) -> pl.Expr:
+    """5-4-2 formatted NDC from an 11-digit NDC expression."""
+    return pl.concat_str(
+        ndc11.str.slice(0, 5),
+        ndc11.str.slice(5, 4),
+        ndc11.str.slice(9, 2),
+        separator="-",
+    )
+
+
+def _write_cms_csv(df: pl.DataFrame, path: Path, preamble: tuple[str, ...]) -> None:
+    """Write ``df`` under CMS-style metadata rows padded to its width."""
+    padding = "," * (df.width - 1)
+    with path.open("wb") as f:
+        for line in preamble:
+            text = f'"{line}"' if "," in line else line
+            f.write(f"{text}{padding}\n".encode("latin-1"))
+        df.write_csv(f)
+
+
+def _write_xlsx(df: pl.DataFrame, path: Path, sheet_name: str = "Sheet1") -> None:
+    """Write ``df`` to a single-sheet workbook (openpyxl write-only mode)."""
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append(df.columns)
+    for row in df.iter_rows():
+        sheet.append(row)
+    workbook.save(path)
+
+
+def build_catalog(rng: np.random.Generator, n: int) -> pl.DataFrame:
+    """Product catalog rows in the wholesaler catalog layout.
+
+    Args:
+        rng: Random generator.
+        n: Number of distinct NDCs.
+
+    Returns:
+        Catalog with a ``_medical`` helper column (dropped before writing).
+    """
+    names = _names(rng, max(n // 6, 10))
+    generics = [name.lower() for name in _names(rng, max(n // 6, 10))]
+    medical = rng.random(n) < MEDICAL_FRACTION
+    name_ids = rng.integers(0, len(names), size=n)
+    awp = np.round(np.exp(rng.normal(4.5, 2.0, size=n)).clip(1, 150_000), 2)
+    cost = np.round(awp * rng.uniform(0.05, 0.9, size=n), 2)
+    pkg_size = rng.choice([1, 10, 30, 90, 100, 500], size=n)
+
+    catalog = pl.DataFrame(
+        {
+            "NDC": _ndc11(_ndcs(rng, n)),
+            "_name": pl.Series([names[i] for i in name_ids]),
+            "Generic Name": pl.Series(
+                [generics[i] for i in name_ids]
+            ).str.to_uppercase(),
+            "Form": np.where(
+                medical,
+                rng.choice(MEDICAL_FORMS, size=n),
+                rng.choice(ORAL_FORMS, size=n),
+            ),
+            "Package Size": pkg_size.astype(float),
+            "Package Qty": rng.choice([1, 1, 1, 10], size=n).astype(float),
+            "Manufacturer": rng.choice(MANUFACTURERS, size=n),
+            "Medispan AWP": awp,
+            "Contract Cost": cost,
+            "_medical": medical,
+        }
+    )
+
+    # A second contract for some NDCs, and off-contract rows
+    duplicates = catalog.sample(
+        fraction=DUPLICATE_FRACTION, seed=int(rng.integers(2**31))
+    )
+    rows = pl.concat([catalog, duplicates]).sample(
+        fraction=1.0, shuffle=True, seed=int(rng.integers(2**31))
+    )
+    m = rows.height
+    off_contract = rng.random(m) < OFF_CONTRACT_FRACTION
+    cost_factor = pl.Series(np.where(off_contract, 1.0, rng.uniform(0.9, 1.1, size=m)))
+
+    return rows.select(
+        "NDC",
+        pl.concat_str(
+            pl.col("_name"),
+            pl.col("Form"),
+            pl.col("Package Size").cast(pl.Int64),
+            separator=" ",
+        ).alias("Product Description"),
+        pl.col("_name").alias("Trade Name"),
+        "Generic Name",
+        "Form",
+        "Package Size",
+        "Package Qty",
+        "Manufacturer",
+        pl.lit("Active").alias("Active Status"),
+        pl.lit("N").alias("Unit Dose"),
+        pl.Series(
+            np.where(off_contract, "Off-Contract", rng.choice(CONTRACTS, size=m))
+        ).alias("Contract Name"),
+        "Medispan AWP",
+        (pl.col("Contract Cost") * cost_factor).round(2).alias("Contract Cost"),
+        (pl.col("Contract Cost") * 0.97)
+        .round(2)
+        .alias("Unit Price (Previous Catalog)"),
+        (pl.col("Contract Cost") * cost_factor)
+        .round(2)
+        .alias("Unit Price (Current Catalog)"),
+        (pl.col("Medispan AWP") * 0.8).round(2).alias("Unit Price (Current Retail)"),
+        (1 - pl.col("Contract Cost") / pl.col("Medispan AWP"))
+        .round(2)
+        .alias("Gross Margin %"),
+        "_medical",
+    )
+
+
+def build_asp_files(
+    rng: np.random.Generator, catalog: pl.DataFrame
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """ASP crosswalk and pricing rows for the catalog's medical NDCs.
+
+    Returns:
+        Tuple of (crosswalk, pricing) in the CMS column layouts.
+    """
+    medical = (
+        catalog.filter("_medical")
+        .unique("NDC", keep="first", maintain_order=True)
+        .select("NDC", "Trade Name", "Manufacturer", "Medispan AWP", "Package Size")
+    )
+    n = catalog.select(pl.col("NDC").n_unique()).item()
+    only = pl.DataFrame(
+        {
+            "NDC": _ndc11(_ndcs(rng, int(n * CROSSWALK_ONLY_FRACTION) + 1)),
+        }
+    ).join(catalog.select("NDC"), on="NDC", how="anti")
+    only = only.with_columns(
+        pl.lit("UNLISTED").alias("Trade Name"),
+        pl.lit("OTHER LABELER").alias("Manufacturer"),
+        pl.lit(500.0).alias("Medispan AWP"),
+        pl.lit(1.0).alias("Package Size"),
+    )
+    mapped = pl.concat([medical, only])
+
+    code_count = max(mapped.height // NDCS_PER_HCPCS, 1)
+    unmapped = int(code_count * UNMAPPED_HCPCS_FRACTION) + 1
+    code_ids = rng.permutation(len(HCPCS_PREFIXES) * 10_000)[: code_count + unmapped]
+    codes = [f"{HCPCS_PREFIXES[i // 10_000]}{i % 10_000:04d}" for i in code_ids]
+    m = mapped.height
+    bill_units = rng.choice([1, 2, 5, 10, 40, 100], size=m)
+
+    crosswalk = mapped.select(
+        pl.Series([codes[i] for i in rng.integers(0, code_count, size=m)]).alias(
+            "_2025_CODE"
+        ),
+        pl.concat_str(pl.col("Trade Name").str.slice(0, 12), pl.lit(" inj")).alias(
+            "Short Description"
+        ),
+        pl.col("Manufacturer").alias("LABELER NAME"),
+        _ndc_542(pl.col("NDC")).alias("NDC2"),
+        pl.col("Trade Name").alias("Drug Name"),
+        pl.lit("10 MG").alias("HCPCS dosage"),
+        "Package Size",
+        pl.lit(1).alias("PKG QTY"),
+        pl.Series(bill_units).alias("BILLUNITS"),
+        pl.Series(bill_units).alias("BILLUNITSPKG"),
+    ).rename({"Package Size": "PKG SIZE"})
+
+    k = len(codes)
+    pricing = pl.DataFrame(
+        {
+            "HCPCS Code": codes,
+            "Short Description": [f"Synthetic drug {code}" for code in codes],
+            "HCPCS Code Dosage": rng.choice(["1 MG", "10 MG", "1 ML"], size=k),
+            "Payment Limit": np.round(np.exp(rng.normal(3.5, 1.5, size=k)), 3),
+            "Co-insurance Percentage": np.full(k, 20.0),
+            "Vaccine AWP%": [None] * k,
+            "Vaccine Limit": [None] * k,
+            "Blood AWP%": [None] * k,
+            "Blood limit": [None] * k,
+            "Clotting Factor": [None] * k,
+            "Notes": [None] * k,
+        }
+    )
+    return crosswalk, pricing
+
+
+def build_noc_files(
+    rng: np.random.Generator, catalog: pl.DataFrame
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """NOC crosswalk and pricing rows for a sample of catalog NDCs.
+
+    Returns:
+        Tuple of (crosswalk, pricing) in the CMS NOC column layouts.
+    """
+    drugs = (
+        catalog.unique("NDC", keep="first", maintain_order=True)
+        .sample(
+            fraction=NOC_FRACTION, seed=int(rng.integers(2**31)), with_replacement=False
+        )
+        .with_columns(
+            pl.concat_str(
+                pl.col("Generic Name").str.to_titlecase(),
+                pl.lit(" ("),
+                pl.col("Manufacturer").str.to_titlecase(),
+                pl.lit(")"),
+            ).alias("Drug Generic Name")
+        )
+    )
+    crosswalk = drugs.select(
+        "Drug Generic Name",
+        pl.col("Manufacturer").alias("LABELER NAME"),
+        _ndc_542(pl.col("NDC")).alias("NDC or ALTERNATE ID"),
+        pl.col("Trade Name").alias("Drug Name"),
+        pl.lit("1 UNIT").alias("Dosage"),
+        pl.col("Package Size").cast(pl.Int64).alias("PKG SIZE"),
+        pl.lit(1).alias("PKG QTY"),
+        pl.lit(10).alias("BILLUNITS"),
+        (pl.col("Package Size").cast(pl.Int64) * 10).alias("BILLUNITSPKG"),
+    )
+    names = crosswalk.get_column("Drug Generic Name").unique(maintain_order=True)
+    pricing = pl.DataFrame(
+        {
+            "Drug Generic Name (Trade Name)": names,
+            "Dosage": ["1 UNIT"] * names.len(),
+            "Payment Limit": [
+                f"${value:,.3f}"
+                for value in np.exp(rng.normal(2.0, 1.5, size=names.len()))
+            ],
+            "Notes": [None] * names.len(),
+        }
+    )
+    return crosswalk, pricing
+
+
+def build_nadac(rng: np.random.Generator, catalog: pl.DataFrame) -> pl.DataFrame:
+    """NADAC master statistics for most catalog NDCs plus NADAC-only NDCs."""
+    priced = (
+        catalog.unique("NDC", keep="first", maintain_order=True)
+        .sample(fraction=NADAC_FRACTION, seed=int(rng.integers(2**31)))
+        .select(
+            "NDC",
+            "Product Description",
+            (pl.col("Contract Cost") / pl.col("Package Size")).alias("_unit_cost"),
+            (pl.col("Medispan AWP") / pl.col("Package Size")).alias("_unit_awp"),
+        )
+    )
+    extra = int(catalog.height * NADAC_ONLY_FRACTION)
+    only = pl.DataFrame(
+        {
+            "NDC": _ndc11(_ndcs(rng, extra + 1)),
+            "Product Description": ["NADAC ONLY"] * (extra + 1),
+            "_unit_cost": rng.uniform(0.01, 5.0, size=extra + 1),
+            "_unit_awp": rng.uniform(0.5, 20.0, size=extra + 1),
+        }
+    ).join(catalog.select("NDC"), on="NDC", how="anti")
+    rows = pl.concat([priced, only])
+    m = rows.height
+    penny = rng.random(m) < PENNY_FRACTION
+    last_price = (
+        pl.col("_unit_awp") * pl.Series(rng.uniform(0.15, 0.6, size=m))
+    ).round(5)
+
+    return rows.select(
+        pl.col("NDC").alias("ndc"),
+        pl.col("Product Description").alias("ndc_description"),
+        last_price.alias("last_price"),
+        (last_price * pl.Series(rng.uniform(0.9, 1.0, size=m)))
+        .round(5)
+        .alias("mean_price"),
+        pl.Series(
+            np.where(penny, rng.uniform(95.0, 99.9, size=m), rng.uniform(5, 90, size=m))
+        )
+        .round(2)
+        .alias("total_discount_340b_pct"),
+        pl.Series(rng.exponential(6.0, size=m)).round(2).alias("inflation_penalty_pct"),
+        pl.Series(np.where(penny, "Yes", "No")).alias("penny_pricing"),
+    )
+
+
+def build_biologics(catalog: pl.DataFrame) -> pl.DataFrame:
+    """Dosing grid rows for up to 64 of the catalog's medical drug names."""
+    names = (
+        catalog.filter("_medical")
+        .select("Trade Name", "Generic Name", "Manufacturer")
+        .unique("Trade Name", keep="first", maintain_order=True)
+        .head(64)
+    )
+    return names.select(
+        pl.col("Trade Name").str.to_titlecase().alias("Drug Name"),
+        pl.col("Generic Name").str.to_lowercase().alias("Generic Name"),
+        pl.col("Manufacturer").str.to_titlecase(),
+        pl.lit("Immunology").alias("Therapeutic Class"),
+        pl.lit("Psoriasis").alias("Indication"),
+        pl.lit("L40.0").alias("ICD-10 Primary"),
+        pl.lit("L40.0-L40.9").alias("ICD-10 Range"),
+        pl.lit("Dermatology").alias("Specialty"),
+        pl.lit("SubQ").alias("Route"),
+        pl.lit("Yes").alias("Loading Dose"),
+        pl.lit(5).alias("Loading Fills"),
+        pl.lit("Monthly").alias("Maintenance Dose"),
+        pl.lit(12).alias("Maint Fills/Yr"),
+        pl.lit(17).alias("Year 1 Fills"),
+        pl.lit(12).alias("Year 2+ Fills"),
+        pl.lit(15).alias("Adj Y1 Fills"),
+        pl.lit(11).alias("Adj Y2+ Fills"),
+        pl.lit("Synthetic dosing row").alias("Notes"),
+    )
+
+
+def build_ndc_list(rng: np.random.Generator, catalog: pl.DataFrame) -> pl.DataFrame:
+    """NDC Lookup input: every catalog NDC plus unknown NDCs, shuffled."""
+    known = catalog.unique("NDC", keep="first", maintain_order=True).select(
+        pl.col("Trade Name").alias("Drug Description"),
+        pl.col("NDC").alias("NDC11"),
+    )
+    misses = int(known.height * LOOKUP_MISS_FRACTION) + 1
+    unknown = pl.DataFrame(
+        {
+            "Drug Description": ["UNKNOWN DRUG"] * misses,
+            "NDC11": _ndc11(_ndcs(rng, misses)),
+        }
+    )
+    rows = pl.concat([known, unknown])
+    return rows.with_columns(
+        pl.Series(rng.choice(["BRAND", "GENERIC"], size=rows.height)).alias("Type")
+    ).sample(fraction=1.0, shuffle=True, seed=int(rng.integers(2**31)))
+
+
+def generate_dataset(out_dir: Path, n_ndcs: int, seed: int = 0) -> dict[str, Path]:
+    """Write a synthetic input file set.
+
+    Args:
+        out_dir: Directory to write into (created if missing).
+        n_ndcs: Number of distinct catalog NDCs.
+        seed: Random seed; the same size and seed give identical files.
+
+    Returns:
+        Mapping of source key (see ``ingest.sources``, plus ``ndc_list``)
+        to written file path.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    catalog = build_catalog(rng, n_ndcs)
+    crosswalk, pricing = build_asp_files(rng, catalog)
+    noc_crosswalk, noc_pricing = build_noc_files(rng, catalog)
+    nadac = build_nadac(rng, catalog)
+    biologics = build_biologics(catalog)
+    ndc_list = build_ndc_list(rng, catalog)
+
+    paths = {
+        "catalog": out_dir / "product_catalog.xlsx",
+        "crosswalk": out_dir / "asp_crosswalk.csv",
+        "asp_pricing": out_dir / "asp_pricing.csv",
+        "noc_crosswalk": out_dir / "noc_crosswalk.csv",
+        "noc_pricing": out_dir / "noc_pricing.csv",
+        "nadac": out_dir / "ndc_nadac_master_statistics.csv",
+        "biologics": out_dir / "biologics_logic_grid.xlsx",
+        "ndc_list": out_dir / "ndc_list.csv",
+    }
+    _write_xlsx(catalog.drop("_medical"), paths["catalog"])
+    _write_cms_csv(crosswalk, paths["crosswalk"], ASP_CROSSWALK_PREAMBLE)
+    _write_cms_csv(pricing, paths["asp_pricing"], ASP_PRICING_PREAMBLE)
+    _write_cms_csv(noc_crosswalk, paths["noc_crosswalk"], NOC_CROSSWALK_PREAMBLE)
+    _write_cms_csv(noc_pricing, paths["noc_pricing"], NOC_PRICING_PREAMBLE)
+    nadac.write_csv(paths["nadac"])
+    _write_xlsx(biologics, paths["biologics"], sheet_name="Biologics Logic Grid")
+    ndc_list.write_csv(paths["ndc_list"])
+    return paths
+
+
+def main() -> None:
+    """Generate one file set."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("--ndcs", type=parse_size, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_dataset(args.out_dir, args.ndcs, args.seed)
+    for key, path in paths.items():
+        print(f"{key:<16}{path}")
+
+
+if __name__ == "__main__":
+    main()
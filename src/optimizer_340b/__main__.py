@@ -0,0 +1,5 @@
+"""Entry point for ``python -m optimizer_340b``."""
+
+from optimizer_340b.cli import main
+
+raise SystemExit(main())
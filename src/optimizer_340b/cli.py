@@ -0,0 +1,312 @@
+"""Headless batch scoring for nightly jobs.
+
+Loads the input files, builds the Silver dataset and drug index through the
+same recompute graph the UI uses, scores the catalog with
+``rank_opportunities`` (the dashboard's opportunity list) and writes the
+ranked frame to Parquet or CSV. Nothing here imports Streamlit.
+
+With ``SNAPSHOT_ENABLED=true`` each run also writes an Arrow IPC snapshot
+(see ``snapshots``); ``--from-snapshot`` scores a snapshot instead of the
+input files.
+
+Usage:
+    python -m optimizer_340b --data-dir data/sample --output ranked.parquet
+    python -m optimizer_340b --from-snapshot --output ranked.parquet
+"""
+
+import argparse
+import logging
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+import polars as pl
+
+from optimizer_340b.compute.analysis_cache import Scenario
+from optimizer_340b.compute.margins import DEFAULT_CAPTURE_RATE, rank_opportunities
+from optimizer_340b.config import Settings
+from optimizer_340b.ingest.normalizers import build_silver_dataset_lazy
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.ingest.sources import SOURCE_FILES, resolve_source_paths
+from optimizer_340b.pipeline import build_pipeline
+from optimizer_340b.snapshots import get_snapshot_store, read_snapshot, write_snapshot
+from optimizer_340b.tracing import span
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ("parquet", "csv")
+
+
+class StageTimer:
+    """Collects wall-clock timings for named stages."""
+
+    def __init__(self) -> None:
+        """Initialize an empty timing log."""
+        self.timings: list[tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and record it under ``name``."""
+        start = time.perf_counter()
+        try:
+            with span(f"cli.{name}"):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timings.append((name, elapsed))
+            logger.info(f"Stage {name}: {elapsed:.3f}s")
+
+    @property
+    def total(self) -> float:
+        """Total seconds across all recorded stages."""
+        return sum(seconds for _, seconds in self.timings)
+
+
+def peak_rss_mb() -> float | None:
+    """Return the peak resident set size of this process in MiB.
+
+    Returns:
+        Peak RSS, or None where ``resource`` is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def write_opportunities(frame: pl.DataFrame, path: Path, fmt: str) -> None:
+    """Write the ranked opportunity frame.
+
+    Args:
+        frame: Ranked frame from ``rank_opportunities``.
+        path: Output file path.
+        fmt: Output format, one of ``OUTPUT_FORMATS``.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        frame.write_csv(path)
+    else:
+        frame.write_parquet(path)
+
+
+def _capture_rate(value: str) -> Decimal:
+    """Parse a ``--capture-rate`` argument: a finite decimal from 0 to 1."""
+    try:
+        rate = Decimal(value)
+    except InvalidOperation:
+        raise argparse.ArgumentTypeError(f"not a number: {value!r}") from None
+    if not rate.is_finite() or not 0 <= rate <= 1:
+        raise argparse.ArgumentTypeError(f"must be between 0 and 1: {value!r}")
+    return rate
+
+
+def _positive_int(value: str) -> int:
+    """Parse an integer argument that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an integer: {value!r}") from None
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value!r}")
+    return number
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m optimizer_340b",
+        description="Score the full catalog and write ranked opportunities.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        type=Path,
+        help="Directory with input files under their default names "
+        f"(e.g. {SOURCE_FILES['catalog']}).",
+    )
+    for key in SOURCE_FILES:
+        parser.add_argument(
+            f"--{key.replace('_', '-')}",
+            dest=key,
+            type=Path,
+            help=f"Path to the {key} file (overrides --data-dir).",
+        )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Output file for ranked opportunities.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="Output format (default: from the output file suffix, else parquet).",
+    )
+    parser.add_argument(
+        "--capture-rate",
+        type=_capture_rate,
+        default=DEFAULT_CAPTURE_RATE,
+        help=f"Retail capture rate, 0-1 (default: {DEFAULT_CAPTURE_RATE}).",
+    )
+    parser.add_argument(
+        "--top",
+        type=_positive_int,
+        help="Only write the N highest-ranked opportunities.",
+    )
+    parser.add_argument(
+        "--from-snapshot",
+        nargs="?",
+        const="latest",
+        metavar="VERSION",
+        help="Score the latest (or the given) snapshot instead of loading input files.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        help="Files to load concurrently (default: CPU count; 1 loads serially).",
+    )
+    parser.add_argument(
+        "--log-level",
+        help="Logging level (default: LOG_LEVEL from the environment).",
+    )
+    return parser
+
+
+def _print_report(timer: StageTimer, rows: int, output: Path) -> None:
+    """Print stage timings and peak memory to stdout."""
+    width = max(len(name) for name, _ in timer.timings)
+    print(f"Wrote {rows:,} opportunities to {output}")
+    print(f"{'stage':<{width}}  seconds")
+    for name, seconds in timer.timings:
+        print(f"{name:<{width}}  {seconds:7.3f}")
+    print(f"{'total':<{width}}  {timer.total:7.3f}")
+
+    peak = peak_rss_mb()
+    if peak is not None:
+        print(f"peak RSS: {peak:.1f} MiB")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run batch scoring.
+
+    Args:
+        argv: Command-line arguments (defaults to ``sys.argv[1:]``).
+
+    Returns:
+        Process exit code (0 on success).
+    """
+    args = _build_parser().parse_args(argv)
+
+    settings = Settings.from_env()
+    logging.basicConfig(
+        level=(args.log_level or settings.log_level).upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    fmt = args.format or ("csv" if args.output.suffix.lower() == ".csv" else "parquet")
+    if args.from_snapshot is not None:
+        with span("cli.main", output=str(args.output)):
+            return _score_snapshot(args, fmt)
+
+    try:
+        paths = resolve_source_paths(
+            args.data_dir, {key: getattr(args, key) for key in SOURCE_FILES}
+        )
+    except FileNotFoundError as e:
+        logger.error(str(e))
+        return 2
+
+    if "catalog" not in paths:
+        logger.error("No product catalog found; pass --catalog or --data-dir")
+        return 2
+
+    with span("cli.main", output=str(args.output)):
+        return _score(args, paths, fmt)
+
+
+def _score(args: argparse.Namespace, paths: dict[str, Path], fmt: str) -> int:
+    """Load, score and write the ranked catalog; return the exit code."""
+    timer = StageTimer()
+
+    with timer.stage("load"):
+        ingest = ingest_sources(paths, max_workers=args.workers)
+    if "catalog" not in ingest.frames:
+        logger.error(f"Product catalog not loaded: {ingest.errors.get('catalog')}")
+        return 1
+
+    pipeline = build_pipeline()
+    pipeline.update_inputs(ingest.frames)
+
+    sources = ingest.frames
+    silver = None
+    if "crosswalk" in sources and "asp_pricing" in sources:
+        # The CLI only reports and snapshots Silver, so skip the pipeline's cached
+        # intermediate frames and run the joins as one streaming query
+        with timer.stage("silver"):
+            enriched, orphans = build_silver_dataset_lazy(
+                sources["catalog"], sources["crosswalk"], sources["asp_pricing"]
+            )
+        logger.info(
+            f"Silver dataset: {enriched.height:,} rows, {orphans.height:,} orphans"
+        )
+        silver = (enriched, orphans)
+    else:
+        logger.warning("Crosswalk or ASP pricing missing - Silver dataset skipped")
+
+    with timer.stage("drug_index"):
+        index = pipeline.get("drug_index")
+
+    with timer.stage("score"):
+        ranked = rank_opportunities(index.frame, args.capture_rate)
+
+    if get_snapshot_store().enabled:
+        with timer.stage("snapshot"):
+            scenario = Scenario(capture_rate=args.capture_rate)
+            write_snapshot(index, ranked, scenario, silver)
+
+    return _write_ranked(args, timer, ranked, fmt)
+
+
+def _score_snapshot(args: argparse.Namespace, fmt: str) -> int:
+    """Score a memory-mapped snapshot and write it; return the exit code."""
+    timer = StageTimer()
+
+    with timer.stage("snapshot_load"):
+        version = None if args.from_snapshot == "latest" else args.from_snapshot
+        snapshot = read_snapshot(version)
+    if snapshot is None:
+        logger.error(
+            f"No snapshot '{args.from_snapshot}' in {get_snapshot_store().root}"
+        )
+        return 1
+
+    with timer.stage("score"):
+        if snapshot.scenario == Scenario(capture_rate=args.capture_rate):
+            ranked = snapshot.gold
+        else:
+            drugs = snapshot.frames["drug_frame"]
+            ranked = rank_opportunities(drugs, args.capture_rate)
+
+    return _write_ranked(args, timer, ranked, fmt)
+
+
+def _write_ranked(
+    args: argparse.Namespace, timer: StageTimer, ranked: pl.DataFrame, fmt: str
+) -> int:
+    """Apply ``--top``, write the ranked frame and print the report."""
+    if args.top is not None:
+        ranked = ranked.head(args.top)
+
+    with timer.stage("write"):
+        write_opportunities(ranked, args.output, fmt)
+
+    _print_report(timer, ranked.height, args.output)
+    return 0
@@ -4,6 +4,12 @@ This module handles:
 - Margin calculations (Retail, Medicare, Commercial)
 - Pathway recommendation logic
 - Loading dose calculations for biologics
+- Catalog-wide (columnar) margin scoring
+- Paged, sortable opportunity lists
+- Array-backed margin analyses with row views
+- Shared NDC index over the joined drug frame
+- Chunked batch NDC lookup with pharmacy channel margins
+- Fixed-point micro-dollar money arithmetic
 """
 
 from optimizer_340b.compute.dosing import (
@@ -14,19 +20,57 @@ from optimizer_340b.compute.dosing import (
     find_high_loading_drugs,
     load_biologics_grid,
 )
+from optimizer_340b.compute.drug_frame import (
+    DRUG_FRAME_SCHEMA,
+    apply_asp_pricing,
+    apply_nadac_pricing,
+    build_drug_base,
+    build_drug_frame,
+    build_hcpcs_lookup,
+    build_noc_lookup,
+    catalog_rows,
+    drug_from_row,
+    drugs_to_frame,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.margin_table import DrugRow, MarginRow, MarginTable
 from optimizer_340b.compute.margins import (
     AWP_DISCOUNT_FACTOR,
     COMMERCIAL_ASP_MULTIPLIER,
     DEFAULT_CAPTURE_RATE,
     MEDICARE_ASP_MULTIPLIER,
+    OPPORTUNITY_SORT_KEYS,
+    analyze_catalog_margins,
     analyze_drug_margin,
     analyze_drug_with_payer,
     calculate_commercial_margin,
+    calculate_crossover_capture_rate,
     calculate_margin_sensitivity,
     calculate_medicare_margin,
     calculate_retail_margin,
     determine_recommendation,
+    margin_analyses_from_frame,
+    opportunity_page,
+    rank_opportunities,
+)
+from optimizer_340b.compute.money import (
+    MICROS_PER_DOLLAR,
+    from_micros,
+    micros_expr,
+    product_micros_expr,
+    round_to_cents,
+    round_to_cents_expr,
+    scale_micros,
+    scale_micros_expr,
+    to_micros,
+)
+from optimizer_340b.compute.ndc_lookup import (
+    NdcLookup,
+    NdcLookupSummary,
+    read_ndc_list,
+    stream_ndc_lookup,
 )
+from optimizer_340b.compute.search_index import SearchHit, SearchIndex
 
 __all__ = [
     # Margin calculation
@@ -37,6 +81,46 @@ __all__ = [
     "analyze_drug_margin",
     "analyze_drug_with_payer",
     "calculate_margin_sensitivity",
+    "calculate_crossover_capture_rate",
+    # Catalog-wide scoring
+    "DRUG_FRAME_SCHEMA",
+    "build_drug_base",
+    "build_drug_frame",
+    "apply_asp_pricing",
+    "apply_nadac_pricing",
+    "build_hcpcs_lookup",
+    "build_noc_lookup",
+    "catalog_rows",
+    "drug_from_row",
+    "drugs_to_frame",
+    "analyze_catalog_margins",
+    "margin_analyses_from_frame",
+    "rank_opportunities",
+    "opportunity_page",
+    "OPPORTUNITY_SORT_KEYS",
+    "MarginTable",
+    "MarginRow",
+    "DrugRow",
+    # NDC index
+    "DrugIndex",
+    # Batch NDC lookup
+    "NdcLookup",
+    "NdcLookupSummary",
+    "read_ndc_list",
+    "stream_ndc_lookup",
+    # Search
+    "SearchIndex",
+    "SearchHit",
+    # Micro-dollar money
+    "MICROS_PER_DOLLAR",
+    "to_micros",
+    "from_micros",
+    "scale_micros",
+    "round_to_cents",
+    "round_to_cents_expr",
+    "micros_expr",
+    "product_micros_expr",
+    "scale_micros_expr",
     # Constants
     "AWP_DISCOUNT_FACTOR",
     "MEDICARE_ASP_MULTIPLIER",
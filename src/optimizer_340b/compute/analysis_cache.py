@@ -0,0 +1,240 @@
+"""In-process LRU cache of scored opportunity frames (Gold Layer).
+
+Every Streamlit rerun (a filter checkbox, a search keystroke) used to
+re-score the whole catalog. Scoring only depends on the drug frame and the
+scenario parameters, so ranked frames are cached under
+``(data version, Scenario)``. The data version is a content fingerprint of
+the drug frame (``DrugIndex.fingerprint``), which lets sessions that loaded
+the same files share entries.
+
+The cache is process-wide and thread-safe (Streamlit runs each session in
+its own thread). Entries are evicted least-recently-used first once their
+total ``estimated_size`` exceeds the memory budget, which comes from
+``Settings.analysis_cache_mb`` and honours ``Settings.cache_enabled``.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+
+import polars as pl
+
+from optimizer_340b.compute.margins import (
+    DEFAULT_CAPTURE_RATE,
+    DEFAULT_DISPENSE_FEE,
+    DEFAULT_MEDICAID_MARKUP,
+    rank_opportunities,
+)
+from optimizer_340b.config import Settings
+
+logger = logging.getLogger(__name__)
+
+BYTES_PER_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Margin scenario parameters that change the scored frame.
+
+    Attributes:
+        capture_rate: Retail capture rate.
+        dispense_fee: Medicaid dispense fee.
+        medicaid_markup_pct: Medicaid pharmacy markup.
+        commercial_asp_pct: Commercial ASP markup.
+    """
+
+    capture_rate: Decimal = DEFAULT_CAPTURE_RATE
+    dispense_fee: Decimal = DEFAULT_DISPENSE_FEE
+    medicaid_markup_pct: Decimal = DEFAULT_MEDICAID_MARKUP
+    commercial_asp_pct: Decimal = Decimal("0.15")
+
+
+class AnalysisCache:
+    """Memory-bounded LRU cache of DataFrames.
+
+    Attributes:
+        max_bytes: Budget for the summed ``estimated_size`` of all entries.
+        hits: Lookups served from the cache.
+        misses: Lookups that had to compute.
+        evictions: Entries dropped to stay within budget.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Memory budget in bytes; 0 disables caching.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[pl.DataFrame, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "AnalysisCache":
+        """Create a cache sized from application settings.
+
+        Args:
+            settings: Application settings.
+
+        Returns:
+            AnalysisCache with a budget of ``settings.analysis_cache_mb``,
+            or 0 if caching is disabled.
+        """
+        budget = settings.analysis_cache_mb if settings.cache_enabled else 0
+        return cls(max_bytes=budget * BYTES_PER_MB)
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated bytes held by cached entries."""
+        return self._nbytes
+
+    def get(self, key: Hashable) -> pl.DataFrame | None:
+        """Return a cached frame and mark it most recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached DataFrame, or None on miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, df: pl.DataFrame) -> None:
+        """Store a frame, evicting least recently used entries as needed.
+
+        Frames larger than the whole budget are not stored.
+
+        Args:
+            key: Cache key.
+            df: DataFrame to store.
+        """
+        size = int(df.estimated_size())
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {size:,} byte frame (budget {self.max_bytes:,})")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            self._entries[key] = (df, size)
+            self._nbytes += size
+            while self._nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], pl.DataFrame]
+    ) -> pl.DataFrame:
+        """Return a cached frame, computing and storing it on a miss.
+
+        ``compute`` runs outside the lock, so a slow analysis in one session
+        does not block lookups from others.
+
+        Args:
+            key: Cache key.
+            compute: Callable producing the frame on a miss.
+
+        Returns:
+            Cached or freshly computed DataFrame.
+        """
+        df = self.get(key)
+        if df is not None:
+            self.hits += 1
+            return df
+
+        self.misses += 1
+        df = compute()
+        self.put(key, df)
+        return df
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+
+_analysis_cache: AnalysisCache | None = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Return the process-wide analysis cache.
+
+    Returns:
+        AnalysisCache built from ``Settings.from_env()`` on first use.
+    """
+    global _analysis_cache
+    if _analysis_cache is None:
+        _analysis_cache = AnalysisCache.from_settings(Settings.from_env())
+    return _analysis_cache
+
+
+def set_analysis_cache(cache: AnalysisCache | None) -> None:
+    """Replace the process-wide analysis cache.
+
+    Args:
+        cache: Cache to use, or None to re-read settings on next use.
+    """
+    global _analysis_cache
+    _analysis_cache = cache
+
+
+def frame_fingerprint(df: pl.DataFrame) -> str:
+    """Compute a content fingerprint of a DataFrame.
+
+    Combines the schema with per-row hashes in row order. Hashes are only
+    stable within one Polars version, which suits an in-process cache key.
+
+    Args:
+        df: DataFrame to fingerprint.
+
+    Returns:
+        Hex digest identifying the frame's content.
+    """
+    digest = hashlib.sha256(str(df.schema).encode())
+    digest.update(df.hash_rows().to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cached_opportunities(
+    drugs: pl.DataFrame,
+    data_version: str,
+    scenario: Scenario,
+    cache: AnalysisCache | None = None,
+) -> pl.DataFrame:
+    """Return the ranked opportunity frame for a scenario, cached.
+
+    Args:
+        drugs: Drug frame to score.
+        data_version: Fingerprint of ``drugs`` (see ``frame_fingerprint``).
+        scenario: Scenario parameters.
+        cache: Cache to use. Defaults to :func:`get_analysis_cache`.
+
+    Returns:
+        Frame from ``rank_opportunities`` for ``drugs`` under ``scenario``.
+    """
+    if cache is None:
+        cache = get_analysis_cache()
+    return cache.get_or_compute(
+        ("opportunities", data_version, scenario),
+        lambda: rank_opportunities(drugs, **asdict(scenario)),
+    )
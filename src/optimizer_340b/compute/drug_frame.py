@@ -0,0 +1,634 @@
+"""Columnar drug frame assembly for catalog-wide scoring (Gold Layer).
+
+The dashboard used to build one ``Drug`` object per catalog row before
+scoring it. This module builds the same fields as a single Polars frame
+(one row per catalog NDC) so the whole catalog can be scored with
+expressions, and only materializes ``Drug`` objects for rows that are
+actually displayed.
+
+Column names match the ``Drug`` dataclass attributes, plus
+``ndc_normalized`` for joins. The HCPCS/ASP and NOC lookups the frame is
+joined against are built here too, so every page shares one definition.
+"""
+
+import logging
+from decimal import Decimal
+
+import polars as pl
+
+from optimizer_340b.compute.retail_pricing import (
+    DrugCategory,
+    classify_drug_categories,
+)
+from optimizer_340b.models import Drug
+from optimizer_340b.risk.ira_flags import ira_years
+from optimizer_340b.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Schema of the drug frame (mirrors models.Drug)
+DRUG_FRAME_SCHEMA: dict[str, pl.DataType] = {
+    "ndc": pl.String(),
+    "ndc_normalized": pl.String(),
+    "drug_name": pl.String(),
+    "manufacturer": pl.String(),
+    "contract_cost": pl.Float64(),
+    "awp": pl.Float64(),
+    "asp": pl.Float64(),
+    "hcpcs_code": pl.String(),
+    "bill_units_per_package": pl.Int64(),
+    "therapeutic_class": pl.String(),
+    "is_biologic": pl.Boolean(),
+    "is_brand": pl.Boolean(),
+    "ira_flag": pl.Boolean(),
+    "penny_pricing_flag": pl.Boolean(),
+    "off_contract": pl.Boolean(),
+    "nadac_price": pl.Float64(),
+}
+
+# CMS Payment Limit already includes the 6% markup (Payment Limit = ASP x 1.06);
+# the true ASP is back-calculated for correct margin calculations
+PAYMENT_LIMIT_MARKUP = 1.06
+
+# Catalog column candidates, in priority order (first non-empty value wins)
+DRUG_NAME_COLUMNS = ("Drug Name", "Trade Name", "DRUG_NAME")
+MANUFACTURER_COLUMNS = ("Manufacturer", "MANUFACTURER")
+CONTRACT_COST_COLUMNS = (
+    "Unit Price (Current Catalog)",
+    "Contract Cost",
+    "CONTRACT_COST",
+)
+AWP_COLUMNS = ("AWP", "Medispan AWP", "MEDISPAN_AWP")
+
+
+@traced("compute.build_hcpcs_lookup")
+def build_hcpcs_lookup(
+    crosswalk: pl.DataFrame | None,
+    asp_pricing: pl.DataFrame | None,
+) -> dict[str, dict[str, object]]:
+    """Build HCPCS lookup from crosswalk and ASP pricing.
+
+    Args:
+        crosswalk: NDC-HCPCS crosswalk DataFrame.
+        asp_pricing: CMS ASP pricing file DataFrame.
+
+    Returns:
+        Dictionary mapping normalized NDC to HCPCS info.
+    """
+    if crosswalk is None or asp_pricing is None:
+        return {}
+
+    lookup: dict[str, dict[str, object]] = {}
+
+    # Normalize column names for crosswalk
+    ndc_col = "NDC" if "NDC" in crosswalk.columns else "NDC2"
+    hcpcs_col = "HCPCS Code" if "HCPCS Code" in crosswalk.columns else "_2025_CODE"
+
+    if ndc_col not in crosswalk.columns or hcpcs_col not in crosswalk.columns:
+        return {}
+
+    # Build ASP pricing lookup by HCPCS
+    asp_lookup: dict[str, float] = {}
+    payment_col = (
+        "Payment Limit" if "Payment Limit" in asp_pricing.columns else "PAYMENT_LIMIT"
+    )
+
+    if payment_col in asp_pricing.columns and "HCPCS Code" in asp_pricing.columns:
+        for row in asp_pricing.iter_rows(named=True):
+            hcpcs = row.get("HCPCS Code")
+            payment = row.get(payment_col)
+            if hcpcs and payment:
+                # Handle N/A and other non-numeric values
+                try:
+                    payment_limit = float(payment)
+                    # Back-calculate true ASP from Payment Limit
+                    true_asp = payment_limit / PAYMENT_LIMIT_MARKUP
+                    asp_lookup[str(hcpcs).upper()] = true_asp
+                except (ValueError, TypeError):
+                    continue  # Skip non-numeric payment values
+
+    # Build combined lookup
+    for row in crosswalk.iter_rows(named=True):
+        ndc = str(row.get(ndc_col, "")).replace("-", "").strip()
+        hcpcs = str(row.get(hcpcs_col, "")).upper().strip()
+
+        if ndc and hcpcs:
+            asp = asp_lookup.get(hcpcs)
+            bill_units = (
+                row.get("Bill Units Per Pkg")
+                or row.get("BILLUNITSPKG")
+                or row.get("Billing Units Per Package")
+                or 1
+            )
+
+            lookup[ndc] = {
+                "hcpcs_code": hcpcs,
+                "asp": asp,
+                "bill_units": int(bill_units),
+            }
+
+    return lookup
+
+
+@traced("compute.build_noc_lookup")
+def build_noc_lookup(
+    noc_crosswalk: pl.DataFrame | None,
+    noc_pricing: pl.DataFrame | None,
+) -> dict[str, dict[str, object]]:
+    """Build NOC lookup for drugs without permanent J-codes.
+
+    NOC (Not Otherwise Classified) provides fallback pricing for new drugs
+    that don't yet have a permanent HCPCS code.
+
+    Args:
+        noc_crosswalk: NOC NDC-HCPCS crosswalk DataFrame.
+        noc_pricing: NOC pricing file DataFrame.
+
+    Returns:
+        Dictionary mapping normalized NDC to NOC pricing info.
+    """
+    if noc_crosswalk is None or noc_pricing is None:
+        return {}
+
+    lookup: dict[str, dict[str, object]] = {}
+
+    # Build pricing lookup by generic drug name
+    pricing_lookup: dict[str, float] = {}
+    if (
+        "Drug Generic Name" in noc_pricing.columns
+        and "Payment Limit" in noc_pricing.columns
+    ):
+        for row in noc_pricing.iter_rows(named=True):
+            drug_name = row.get("Drug Generic Name")
+            payment = row.get("Payment Limit")
+            if drug_name and payment:
+                try:
+                    # Normalize name for matching
+                    # Back-calculate true ASP from Payment Limit
+                    payment_limit = float(payment)
+                    true_asp = payment_limit / PAYMENT_LIMIT_MARKUP
+                    pricing_lookup[str(drug_name).upper().strip()] = true_asp
+                except (ValueError, TypeError):
+                    continue
+
+    # Build NDC lookup from crosswalk
+    ndc_col = "NDC" if "NDC" in noc_crosswalk.columns else "NDC or ALTERNATE ID"
+    generic_col = "Drug Generic Name"
+    bill_units_col = (
+        "Bill Units Per Pkg"
+        if "Bill Units Per Pkg" in noc_crosswalk.columns
+        else "BILLUNITSPKG"
+    )
+
+    if ndc_col not in noc_crosswalk.columns or generic_col not in noc_crosswalk.columns:
+        return {}
+
+    for row in noc_crosswalk.iter_rows(named=True):
+        ndc = str(row.get(ndc_col, "")).replace("-", "").strip()
+        generic_name = str(row.get(generic_col, "")).upper().strip()
+
+        if ndc and generic_name:
+            # Look up payment from pricing file
+            asp = pricing_lookup.get(generic_name)
+            bill_units = row.get(bill_units_col, 1) or 1
+
+            if asp is not None:
+                lookup[ndc] = {
+                    "generic_name": generic_name,
+                    "asp": asp,
+                    "bill_units": int(bill_units) if bill_units else 1,
+                    "is_noc": True,
+                }
+
+    return lookup
+
+
+def _first_text(
+    columns: list[str], candidates: tuple[str, ...], default: str
+) -> pl.Expr:
+    """Build an expression returning the first non-empty text column value.
+
+    Mirrors ``row.get(a) or row.get(b) or default`` for string columns.
+    """
+    exprs: list[pl.Expr] = []
+    for name in candidates:
+        if name in columns:
+            value = pl.col(name).cast(pl.String)
+            exprs.append(pl.when(value.str.len_chars() > 0).then(value))
+    exprs.append(pl.lit(default))
+    return pl.coalesce(exprs)
+
+
+def _amount(schema: pl.Schema, name: str) -> tuple[pl.Expr, pl.Expr]:
+    """Build (value present, parsed value) expressions for a price column.
+
+    Text values are stripped before parsing; a present value that does not
+    parse gives a null parsed value.
+    """
+    if schema[name] == pl.String:
+        text = pl.col(name).str.strip_chars()
+        return (
+            text.is_not_null() & (text != ""),
+            text.cast(pl.Float64, strict=False),
+        )
+    value = pl.col(name).cast(pl.Float64, strict=False)
+    return value.is_not_null(), value
+
+
+def _first_amount(schema: pl.Schema, candidates: tuple[str, ...]) -> pl.Expr:
+    """Build an expression returning the first non-zero numeric column value.
+
+    Mirrors ``row.get(a) or row.get(b) or 0`` for price columns. Rows whose
+    first value does not parse are removed by :func:`catalog_rows`.
+    """
+    exprs: list[pl.Expr] = []
+    for name in candidates:
+        if name in schema:
+            _, value = _amount(schema, name)
+            exprs.append(pl.when(value != 0).then(value))
+    exprs.append(pl.lit(0.0))
+    return pl.coalesce(exprs)
+
+
+def _unparseable_amount(schema: pl.Schema, candidates: tuple[str, ...]) -> pl.Expr:
+    """Build an expression that is True where the first price value is not numeric.
+
+    Walks the candidates like :func:`_first_amount`: zero or empty values
+    fall through to the next column, the first non-zero number stops.
+    """
+    exprs: list[pl.Expr] = []
+    for name in candidates:
+        if name in schema:
+            present, value = _amount(schema, name)
+            exprs.append(
+                pl.when(present & value.is_null())
+                .then(pl.lit(True))
+                .when(value != 0)
+                .then(pl.lit(False))
+            )
+    exprs.append(pl.lit(False))
+    return pl.coalesce(exprs)
+
+
+def catalog_rows(catalog: pl.DataFrame) -> pl.DataFrame:
+    """Return the catalog rows that become drug frame rows.
+
+    Rows without an NDC are dropped, as are rows whose contract cost or AWP
+    is not a number (the per-row builder skipped them when ``Decimal``
+    parsing failed). ``DrugIndex`` applies the same filter so its catalog
+    stays position-aligned with the drug frame.
+
+    Args:
+        catalog: Product catalog DataFrame with an ``NDC`` column.
+
+    Returns:
+        Filtered catalog, in catalog order.
+    """
+    ndc = pl.col("NDC").cast(pl.String)
+    rows = catalog.filter(
+        ndc.is_not_null()
+        & (ndc != "")
+        & ~_unparseable_amount(catalog.schema, CONTRACT_COST_COLUMNS)
+        & ~_unparseable_amount(catalog.schema, AWP_COLUMNS)
+    )
+    skipped = catalog.filter(ndc.is_not_null() & (ndc != "")).height - rows.height
+    if skipped:
+        logger.warning(f"Skipped {skipped:,} catalog rows with non-numeric prices")
+    return rows
+
+
+def _lookup_frame(
+    lookup: dict[str, dict[str, object]],
+    fields: dict[str, tuple[str, pl.DataType]],
+) -> pl.DataFrame:
+    """Convert an NDC-keyed lookup dict into a joinable frame.
+
+    Args:
+        lookup: Dictionary mapping normalized NDC to a dict of values.
+        fields: Mapping of lookup key to (output column, dtype).
+
+    Returns:
+        DataFrame with an ``ndc_normalized`` column plus one column per field.
+    """
+    data: dict[str, list[object]] = {"ndc_normalized": list(lookup.keys())}
+    schema: dict[str, pl.DataType] = {"ndc_normalized": pl.String()}
+    for key, (column, dtype) in fields.items():
+        values = [entry.get(key) for entry in lookup.values()]
+        if dtype == pl.Float64:
+            values = [float(str(v)) if v is not None else None for v in values]
+        data[column] = values
+        schema[column] = dtype
+    return pl.DataFrame(data, schema=schema)
+
+
+def _name_flags(
+    names: pl.Series,
+    category_lookup: dict[str, DrugCategory] | None,
+) -> pl.DataFrame:
+    """Classify each distinct drug name once (IRA status and brand/generic).
+
+    Args:
+        names: Distinct drug names.
+        category_lookup: Drug category lookup from Ravenswood matrix.
+
+    Returns:
+        DataFrame with drug_name, ira_flag and is_brand columns.
+    """
+    names = names.cast(pl.String)
+    return pl.DataFrame(
+        {
+            "drug_name": names,
+            "ira_flag": ira_years(names).is_not_null(),
+            "is_brand": classify_drug_categories(names, category_lookup)
+            != DrugCategory.GENERIC.value,
+        }
+    )
+
+
+@traced("compute.build_drug_base")
+def build_drug_base(
+    catalog: pl.DataFrame,
+    category_lookup: dict[str, DrugCategory] | None = None,
+) -> pl.DataFrame:
+    """Build the catalog-only part of the drug frame.
+
+    Extracts catalog fields and classifies each drug name (IRA status and
+    brand/generic). Pricing columns are left empty for
+    :func:`apply_asp_pricing` and :func:`apply_nadac_pricing`.
+
+    Args:
+        catalog: Product catalog DataFrame (normalized column names).
+        category_lookup: Drug category lookup from Ravenswood matrix.
+
+    Returns:
+        DataFrame with ``DRUG_FRAME_SCHEMA`` columns, in catalog order.
+    """
+    if "NDC" not in catalog.columns:
+        logger.warning("Catalog missing 'NDC' column - cannot build drug frame")
+        return pl.DataFrame(schema=DRUG_FRAME_SCHEMA)
+
+    columns = catalog.columns
+
+    if "Contract Name" in columns:
+        off_contract = (
+            pl.col("Contract Name").cast(pl.String).str.strip_chars() == "Off-Contract"
+        ).fill_null(False)
+    else:
+        off_contract = pl.lit(False)
+
+    frame = (
+        catalog_rows(catalog)
+        .with_row_index("_row")
+        .with_columns(pl.col("NDC").cast(pl.String).alias("ndc"))
+        .select(
+            "_row",
+            "ndc",
+            pl.col("ndc")
+            .str.replace_all("-", "", literal=True)
+            .str.strip_chars()
+            .str.zfill(11)
+            .str.slice(-11)
+            .alias("ndc_normalized"),
+            _first_text(columns, DRUG_NAME_COLUMNS, "Unknown").alias("drug_name"),
+            _first_text(columns, MANUFACTURER_COLUMNS, "Unknown").alias("manufacturer"),
+            _first_amount(catalog.schema, CONTRACT_COST_COLUMNS).alias("contract_cost"),
+            _first_amount(catalog.schema, AWP_COLUMNS).alias("awp"),
+            off_contract.alias("off_contract"),
+            pl.lit(None, dtype=pl.Float64).alias("asp"),
+            pl.lit(None, dtype=pl.String).alias("hcpcs_code"),
+            pl.lit(1).alias("bill_units_per_package"),
+            pl.lit(None, dtype=pl.String).alias("therapeutic_class"),
+            pl.lit(False).alias("is_biologic"),
+            pl.lit(False).alias("penny_pricing_flag"),
+            pl.lit(None, dtype=pl.Float64).alias("nadac_price"),
+        )
+    )
+
+    # Name-based classification runs once per distinct drug name
+    name_flags = _name_flags(frame["drug_name"].unique(), category_lookup)
+    frame = frame.join(name_flags, on="drug_name", how="left")
+
+    return frame.sort("_row").select(
+        [pl.col(name).cast(dtype) for name, dtype in DRUG_FRAME_SCHEMA.items()]
+    )
+
+
+@traced("compute.apply_asp_pricing")
+def apply_asp_pricing(
+    frame: pl.DataFrame,
+    hcpcs_lookup: dict[str, dict[str, object]] | None = None,
+    noc_lookup: dict[str, dict[str, object]] | None = None,
+) -> pl.DataFrame:
+    """Set HCPCS code, ASP and billing units on a drug frame.
+
+    ASP comes from the crosswalk lookup, with the NOC lookup as fallback
+    when the crosswalk has no ASP for an NDC. Existing values are replaced.
+
+    Args:
+        frame: Drug frame (see :func:`build_drug_base`).
+        hcpcs_lookup: HCPCS/ASP lookup by normalized NDC.
+        noc_lookup: NOC fallback lookup by normalized NDC.
+
+    Returns:
+        Drug frame with the medical pricing columns filled in.
+    """
+    hcpcs_frame = _lookup_frame(
+        hcpcs_lookup or {},
+        {
+            "hcpcs_code": ("_hcpcs_code", pl.String()),
+            "asp": ("_hcpcs_asp", pl.Float64()),
+            "bill_units": ("_hcpcs_bill_units", pl.Int64()),
+        },
+    )
+    noc_frame = _lookup_frame(
+        noc_lookup or {},
+        {
+            "asp": ("_noc_asp", pl.Float64()),
+            "bill_units": ("_noc_bill_units", pl.Int64()),
+        },
+    )
+
+    use_noc = pl.col("_hcpcs_asp").is_null() & pl.col("_noc_asp").is_not_null()
+    asp = pl.when(use_noc).then(pl.col("_noc_asp")).otherwise(pl.col("_hcpcs_asp"))
+    hcpcs_code = pl.when(use_noc).then(pl.lit("NOC")).otherwise(pl.col("_hcpcs_code"))
+    bill_units = (
+        pl.when(use_noc)
+        .then(pl.col("_noc_bill_units"))
+        .otherwise(pl.col("_hcpcs_bill_units"))
+    )
+
+    return (
+        frame.join(hcpcs_frame, on="ndc_normalized", how="left", maintain_order="left")
+        .join(noc_frame, on="ndc_normalized", how="left", maintain_order="left")
+        .with_columns(
+            pl.when(asp != 0).then(asp).alias("asp"),
+            pl.when(hcpcs_code.str.len_chars() > 0)
+            .then(hcpcs_code)
+            .alias("hcpcs_code"),
+            pl.when(bill_units.fill_null(0) != 0)
+            .then(bill_units)
+            .otherwise(1)
+            .alias("bill_units_per_package"),
+        )
+        .select([pl.col(name).cast(dtype) for name, dtype in DRUG_FRAME_SCHEMA.items()])
+    )
+
+
+@traced("compute.apply_nadac_pricing")
+def apply_nadac_pricing(
+    frame: pl.DataFrame,
+    nadac_lookup: dict[str, dict[str, object]] | None = None,
+    nadac_flags: pl.DataFrame | None = None,
+) -> pl.DataFrame:
+    """Apply NADAC price and the penny pricing cost override to a drug frame.
+
+    Expects catalog contract costs, i.e. a frame that has not already been
+    through this function.
+
+    Args:
+        frame: Drug frame (see :func:`build_drug_base`).
+        nadac_lookup: Enhanced NADAC lookup (see ``build_nadac_lookup``).
+        nadac_flags: NADAC flags frame (see ``build_nadac_flags``); joined
+            directly and takes precedence over ``nadac_lookup``.
+
+    Returns:
+        Drug frame with NADAC price, penny flag and overridden cost.
+    """
+    if nadac_flags is not None:
+        nadac_frame = nadac_flags.select(
+            "ndc_normalized",
+            pl.col("is_penny_priced").alias("_is_penny"),
+            pl.col("override_cost").alias("_override_cost"),
+            pl.col("nadac_price").alias("_nadac_price"),
+        )
+    else:
+        nadac_frame = _lookup_frame(
+            nadac_lookup or {},
+            {
+                "is_penny_priced": ("_is_penny", pl.Boolean()),
+                "override_cost": ("_override_cost", pl.Float64()),
+                "nadac_price": ("_nadac_price", pl.Float64()),
+            },
+        )
+    is_penny = pl.col("_is_penny").fill_null(False)
+
+    return (
+        frame.join(nadac_frame, on="ndc_normalized", how="left", maintain_order="left")
+        .with_columns(
+            # Penny pricing override per manifest: Cost_Basis -> $0.01
+            pl.when(is_penny & pl.col("_override_cost").fill_null(0).ne(0))
+            .then(pl.col("_override_cost"))
+            .otherwise(pl.col("contract_cost"))
+            .alias("contract_cost"),
+            is_penny.alias("penny_pricing_flag"),
+            pl.col("_nadac_price").alias("nadac_price"),
+        )
+        .select([pl.col(name).cast(dtype) for name, dtype in DRUG_FRAME_SCHEMA.items()])
+    )
+
+
+@traced("compute.build_drug_frame")
+def build_drug_frame(
+    catalog: pl.DataFrame,
+    hcpcs_lookup: dict[str, dict[str, object]] | None = None,
+    nadac_lookup: dict[str, dict[str, object]] | None = None,
+    noc_lookup: dict[str, dict[str, object]] | None = None,
+    category_lookup: dict[str, DrugCategory] | None = None,
+) -> pl.DataFrame:
+    """Build a drug frame (one row per catalog row) from catalog and lookups.
+
+    Applies the same rules the dashboard applied per row:
+    - HCPCS/ASP from the crosswalk lookup, NOC fallback when ASP is missing
+    - Penny pricing cost override ($0.01) from the NADAC lookup
+    - IRA flag and brand/generic classification by drug name
+
+    Equivalent to chaining :func:`build_drug_base`, :func:`apply_asp_pricing`
+    and :func:`apply_nadac_pricing`; the pipeline runs those stages separately
+    so a new pricing file does not reclassify the catalog.
+
+    Args:
+        catalog: Product catalog DataFrame (normalized column names).
+        hcpcs_lookup: HCPCS/ASP lookup by normalized NDC.
+        nadac_lookup: Enhanced NADAC lookup (see ``build_nadac_lookup``).
+        noc_lookup: NOC fallback lookup by normalized NDC.
+        category_lookup: Drug category lookup from Ravenswood matrix.
+
+    Returns:
+        DataFrame with ``DRUG_FRAME_SCHEMA`` columns, in catalog order.
+    """
+    frame = build_drug_base(catalog, category_lookup)
+    frame = apply_asp_pricing(frame, hcpcs_lookup, noc_lookup)
+    result = apply_nadac_pricing(frame, nadac_lookup)
+
+    logger.info(f"Built drug frame with {result.height:,} rows")
+    return result
+
+
+def drugs_to_frame(drugs: list[Drug]) -> pl.DataFrame:
+    """Convert Drug objects into a drug frame.
+
+    Args:
+        drugs: Drugs to convert.
+
+    Returns:
+        DataFrame with ``DRUG_FRAME_SCHEMA`` columns, one row per drug.
+    """
+    rows = [
+        {
+            "ndc": drug.ndc,
+            "ndc_normalized": drug.ndc_normalized,
+            "drug_name": drug.drug_name,
+            "manufacturer": drug.manufacturer,
+            "contract_cost": float(drug.contract_cost),
+            "awp": float(drug.awp),
+            "asp": float(drug.asp) if drug.asp is not None else None,
+            "hcpcs_code": drug.hcpcs_code,
+            "bill_units_per_package": drug.bill_units_per_package,
+            "therapeutic_class": drug.therapeutic_class,
+            "is_biologic": drug.is_biologic,
+            "is_brand": drug.is_brand,
+            "ira_flag": drug.ira_flag,
+            "penny_pricing_flag": drug.penny_pricing_flag,
+            "off_contract": drug.off_contract,
+            "nadac_price": (
+                float(drug.nadac_price) if drug.nadac_price is not None else None
+            ),
+        }
+        for drug in drugs
+    ]
+    return pl.DataFrame(rows, schema=DRUG_FRAME_SCHEMA)
+
+
+def _to_decimal(value: object) -> Decimal | None:
+    """Convert a frame value to Decimal, preserving None."""
+    if value is None:
+        return None
+    return Decimal(str(value))
+
+
+def drug_from_row(row: dict[str, object]) -> Drug:
+    """Materialize a Drug from one drug frame row.
+
+    Args:
+        row: Row from a drug frame (``iter_rows(named=True)``).
+
+    Returns:
+        Drug object with Decimal prices.
+    """
+    return Drug(
+        ndc=str(row["ndc"]),
+        drug_name=str(row["drug_name"]),
+        manufacturer=str(row["manufacturer"]),
+        contract_cost=_to_decimal(row["contract_cost"]) or Decimal("0"),
+        awp=_to_decimal(row["awp"]) or Decimal("0"),
+        asp=_to_decimal(row.get("asp")),
+        hcpcs_code=row.get("hcpcs_code"),  # type: ignore[arg-type]
+        bill_units_per_package=int(row.get("bill_units_per_package") or 1),  # type: ignore[call-overload]
+        therapeutic_class=row.get("therapeutic_class"),  # type: ignore[arg-type]
+        is_biologic=bool(row.get("is_biologic", False)),
+        is_brand=bool(row.get("is_brand", True)),
+        ira_flag=bool(row.get("ira_flag", False)),
+        penny_pricing_flag=bool(row.get("penny_pricing_flag", False)),
+        off_contract=bool(row.get("off_contract", False)),
+        nadac_price=_to_decimal(row.get("nadac_price")),
+    )
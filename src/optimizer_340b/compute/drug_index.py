@@ -0,0 +1,267 @@
+"""NDC-keyed index over the joined drug frame (Gold Layer).
+
+Pages used to build their own NDC lookups by iterating the catalog, and the
+drug detail page scanned every row per lookup. ``DrugIndex`` is built once
+per data load: it joins the catalog with the HCPCS/ASP, NOC, NADAC and
+category lookups (see ``build_drug_frame``) and hashes each normalized NDC
+to its row positions, so single lookups, batch ``take`` and ``Drug``
+materialization no longer touch the rest of the catalog.
+
+Catalogs may list the same NDC more than once (e.g. one contract row and
+one Off-Contract billing row). ``row``/``get``/``take`` return the first
+occurrence in catalog order; ``positions`` and ``take_catalog`` expose every
+occurrence for callers with their own duplicate policy.
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+from functools import cached_property
+
+import polars as pl
+
+from optimizer_340b.compute.analysis_cache import frame_fingerprint
+from optimizer_340b.compute.drug_frame import (
+    build_drug_frame,
+    build_hcpcs_lookup,
+    build_noc_lookup,
+    catalog_rows,
+    drug_from_row,
+)
+from optimizer_340b.compute.retail_pricing import (
+    DrugCategory,
+    load_drug_category_lookup,
+)
+from optimizer_340b.compute.search_index import SearchIndex
+from optimizer_340b.ingest.normalizers import ndc_expr, normalize_ndc
+from optimizer_340b.models import Drug
+from optimizer_340b.risk.penny_pricing import build_nadac_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class DrugIndex:
+    """Hash index from normalized NDC to rows of the joined drug frame.
+
+    Attributes:
+        frame: Drug frame (``DRUG_FRAME_SCHEMA``), one row per catalog row
+            with an NDC.
+        catalog: Catalog rows the frame was built from, position-aligned
+            with ``frame``.
+        hcpcs_lookup: HCPCS/ASP lookup by normalized NDC.
+        noc_lookup: NOC fallback lookup by normalized NDC.
+        nadac_lookup: Enhanced NADAC lookup by normalized NDC.
+        category_lookup: Drug category lookup from the Ravenswood matrix.
+    """
+
+    def __init__(
+        self,
+        catalog: pl.DataFrame,
+        hcpcs_lookup: dict[str, dict[str, object]] | None = None,
+        nadac_lookup: dict[str, dict[str, object]] | None = None,
+        noc_lookup: dict[str, dict[str, object]] | None = None,
+        category_lookup: dict[str, DrugCategory] | None = None,
+        frame: pl.DataFrame | None = None,
+    ):
+        """Build the drug frame and NDC index.
+
+        Args:
+            catalog: Product catalog DataFrame (normalized column names).
+            hcpcs_lookup: HCPCS/ASP lookup by normalized NDC.
+            nadac_lookup: Enhanced NADAC lookup (see ``build_nadac_lookup``).
+            noc_lookup: NOC fallback lookup by normalized NDC.
+            category_lookup: Drug category lookup from Ravenswood matrix.
+            frame: Drug frame already built from ``catalog`` and these
+                lookups (e.g. by the recompute pipeline). Built if omitted.
+        """
+        self.hcpcs_lookup = hcpcs_lookup or {}
+        self.nadac_lookup = nadac_lookup or {}
+        self.noc_lookup = noc_lookup or {}
+        self.category_lookup = category_lookup or {}
+
+        if "NDC" in catalog.columns:
+            # Same row filter as build_drug_frame, so positions line up
+            self.catalog = catalog_rows(catalog)
+        else:
+            self.catalog = catalog.clear()
+
+        if frame is None:
+            frame = build_drug_frame(
+                self.catalog,
+                self.hcpcs_lookup,
+                self.nadac_lookup,
+                self.noc_lookup,
+                self.category_lookup,
+            )
+        self.frame = frame
+
+        keys = (
+            self.frame.select(ndc_expr("ndc").alias("key"))
+            .with_row_index("position")
+            .filter(pl.col("key") != "")
+            .group_by("key", maintain_order=True)
+            .agg("position")
+        )
+        self._positions: dict[str, list[int]] = dict(
+            zip(keys["key"].to_list(), keys["position"].to_list(), strict=True)
+        )
+        self._drugs: dict[str, Drug] = {}
+
+        logger.info(
+            f"Built drug index: {len(self._positions):,} NDCs "
+            f"over {self.frame.height:,} rows"
+        )
+
+    @classmethod
+    def from_uploaded_data(
+        cls, uploaded: Mapping[str, pl.DataFrame | None]
+    ) -> "DrugIndex | None":
+        """Build an index from the session's uploaded datasets.
+
+        Args:
+            uploaded: Mapping of dataset name to DataFrame (catalog,
+                crosswalk, asp_pricing, noc_crosswalk, noc_pricing, nadac,
+                ravenswood_categories).
+
+        Returns:
+            DrugIndex, or None if no catalog has been loaded.
+        """
+        catalog = uploaded.get("catalog")
+        if catalog is None:
+            return None
+
+        nadac = uploaded.get("nadac")
+        categories = uploaded.get("ravenswood_categories")
+
+        return cls(
+            catalog,
+            hcpcs_lookup=build_hcpcs_lookup(
+                uploaded.get("crosswalk"), uploaded.get("asp_pricing")
+            ),
+            nadac_lookup=build_nadac_lookup(nadac) if nadac is not None else {},
+            noc_lookup=build_noc_lookup(
+                uploaded.get("noc_crosswalk"), uploaded.get("noc_pricing")
+            ),
+            category_lookup=(
+                load_drug_category_lookup(categories) if categories is not None else {}
+            ),
+        )
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """Content fingerprint of ``frame``, the data version for caching."""
+        return frame_fingerprint(self.frame)
+
+    @cached_property
+    def search_index(self) -> SearchIndex:
+        """Name/NDC/HCPCS search index over ``frame``, built on first use."""
+        return SearchIndex.from_frame(self.frame, self.catalog)
+
+    def __len__(self) -> int:
+        """Return the number of distinct NDCs."""
+        return len(self._positions)
+
+    def __contains__(self, ndc: object) -> bool:
+        """Return True if the NDC (any format) is in the catalog."""
+        return isinstance(ndc, str) and normalize_ndc(ndc) in self._positions
+
+    def positions(self, ndc: str) -> list[int]:
+        """Return every frame position for an NDC, in catalog order.
+
+        Args:
+            ndc: NDC in any format (11-digit, 5-4-2, etc.).
+
+        Returns:
+            Row positions into ``frame`` and ``catalog`` (empty if absent).
+        """
+        return self._positions.get(normalize_ndc(ndc), [])
+
+    def row(self, ndc: str) -> dict[str, object] | None:
+        """Fetch the drug frame row for an NDC.
+
+        Args:
+            ndc: NDC in any format.
+
+        Returns:
+            First matching row as a dict, or None if the NDC is not indexed.
+        """
+        positions = self.positions(ndc)
+        if not positions:
+            return None
+        return self.frame.row(positions[0], named=True)
+
+    def get(self, ndc: str) -> Drug | None:
+        """Materialize the Drug for an NDC.
+
+        Drugs are built on first access and memoized for the index lifetime.
+
+        Args:
+            ndc: NDC in any format.
+
+        Returns:
+            Drug, or None if the NDC is not indexed.
+        """
+        key = normalize_ndc(ndc)
+        drug = self._drugs.get(key)
+        if drug is None:
+            row = self.row(key)
+            if row is None:
+                return None
+            drug = drug_from_row(row)
+            self._drugs[key] = drug
+        return drug
+
+    def take(self, ndcs: Iterable[str]) -> pl.DataFrame:
+        """Fetch drug frame rows for a batch of NDCs.
+
+        Args:
+            ndcs: NDCs in any format. Unknown NDCs are skipped.
+
+        Returns:
+            Drug frame with the first row per requested NDC, in request order.
+        """
+        positions = [p[0] for p in map(self.positions, ndcs) if p]
+        return self.frame[positions]
+
+    def take_catalog(self, ndcs: Iterable[str]) -> pl.DataFrame:
+        """Fetch every raw catalog row for a batch of NDCs.
+
+        Args:
+            ndcs: NDCs in any format. Unknown NDCs are skipped.
+
+        Returns:
+            Catalog rows (all duplicates) for the requested NDCs.
+        """
+        positions = [i for p in map(self.positions, ndcs) for i in p]
+        return self.catalog[positions]
+
+    def drugs(self, ndcs: Iterable[str]) -> list[Drug]:
+        """Materialize Drugs for a batch of NDCs.
+
+        Args:
+            ndcs: NDCs in any format. Unknown NDCs are skipped.
+
+        Returns:
+            Drugs in request order.
+        """
+        return [drug for drug in map(self.get, ndcs) if drug is not None]
+
+    def search(self, query: str) -> Drug | None:
+        """Find the first drug whose name contains the query or whose NDC matches.
+
+        Args:
+            query: Drug name fragment (case-insensitive) or NDC in any format.
+
+        Returns:
+            Drug for the earliest matching catalog row, or None.
+        """
+        candidates: list[int] = []
+        if any(c.isdigit() for c in query):
+            candidates.extend(self.positions(query)[:1])
+
+        name_match = self.search_index.first_position(query, "drug_name")
+        if name_match is not None:
+            candidates.append(name_match)
+
+        if not candidates:
+            return None
+        return drug_from_row(self.frame.row(min(candidates), named=True))
@@ -0,0 +1,205 @@
+"""Array-backed margin analyses with lightweight row views (Gold Layer).
+
+A ``MarginAnalysis`` holds its ``Drug`` plus a dozen ``Decimal`` margins,
+roughly 1.4 KB per analyzed drug once the strings and Decimals are counted.
+``MarginTable`` keeps the analyzed frame's columns instead and hands out
+``MarginRow``/``DrugRow`` views: two slots each (table and row position),
+with values read from the columns and converted to Decimal on attribute
+access. The views share ``DrugMixin``/``MarginAnalysisMixin`` with
+``Drug`` and ``MarginAnalysis``, so they expose the same attributes
+(including ``ndc_normalized``, ``ndc_formatted`` and ``to_display_dict``)
+and display code accepts either.
+
+Example:
+    >>> table = MarginTable(rank_opportunities(drug_index.frame))
+    >>> table[0].drug.ndc_formatted, table[0].retail_net_margin
+"""
+
+from collections.abc import Callable, Iterator, Sequence
+from dataclasses import fields
+from decimal import Decimal
+from typing import Any, overload
+
+import polars as pl
+
+from optimizer_340b.compute.money import from_micros
+from optimizer_340b.models import (
+    Drug,
+    DrugMixin,
+    MarginAnalysis,
+    MarginAnalysisMixin,
+    RecommendedPath,
+)
+
+
+def _decimal(value: float | int | None) -> Decimal | None:
+    """Frame value as Decimal; Int64 values are micro-dollars."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return from_micros(value)
+    return Decimal(str(value))
+
+
+def _money(value: float | int) -> Decimal:
+    """Non-null money column value as Decimal."""
+    return _decimal(value) or Decimal("0")
+
+
+def _column(
+    name: str,
+    convert: Callable[[Any], Any] | None = None,
+    default: Any = None,
+) -> Any:
+    """Property reading one column at the view's row.
+
+    Args:
+        name: Column name.
+        convert: Applied to the raw value (including null).
+        default: Value when the frame lacks the column.
+    """
+
+    def get(view: "DrugRow | MarginRow") -> Any:
+        column = view._table.columns.get(name)
+        if column is None:
+            return default
+        value = column[view._index]
+        return value if convert is None else convert(value)
+
+    return property(get)
+
+
+class DrugRow(DrugMixin):
+    """Read-only ``Drug`` view of one row of a drug or margin frame.
+
+    Prices convert like ``drug_frame.drug_from_row``: dollars to Decimal,
+    a null contract cost or AWP to 0.
+    """
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "MarginTable", index: int):
+        """Point the view at a table row."""
+        self._table = table
+        self._index = index
+
+    ndc: str = _column("ndc", str)
+    drug_name: str = _column("drug_name", str)
+    manufacturer: str = _column("manufacturer", str)
+    contract_cost: Decimal = _column("contract_cost", _money)
+    awp: Decimal = _column("awp", _money)
+    asp: Decimal | None = _column("asp", _decimal)
+    hcpcs_code: str | None = _column("hcpcs_code")
+    bill_units_per_package: int = _column(
+        "bill_units_per_package", lambda v: int(v or 1), default=1
+    )
+    therapeutic_class: str | None = _column("therapeutic_class")
+    is_biologic: bool = _column("is_biologic", bool, default=False)
+    is_brand: bool = _column("is_brand", bool, default=True)
+    ira_flag: bool = _column("ira_flag", bool, default=False)
+    penny_pricing_flag: bool = _column("penny_pricing_flag", bool, default=False)
+    off_contract: bool = _column("off_contract", bool, default=False)
+    nadac_price: Decimal | None = _column("nadac_price", _decimal)
+
+    def to_drug(self) -> Drug:
+        """Materialize the row as a ``Drug``."""
+        return Drug(**{f.name: getattr(self, f.name) for f in fields(Drug)})
+
+
+def _drug_view() -> Any:
+    """Property returning the ``DrugRow`` view of a margin row's drug."""
+    return property(lambda row: DrugRow(row._table, row._index))
+
+
+class MarginRow(MarginAnalysisMixin):
+    """Read-only ``MarginAnalysis`` view of one analyzed frame row."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "MarginTable", index: int):
+        """Point the view at a table row."""
+        self._table = table
+        self._index = index
+
+    drug: DrugRow = _drug_view()
+    pharmacy_medicaid_margin: Decimal | None = _column(
+        "pharmacy_medicaid_margin", _decimal
+    )
+    pharmacy_medicare_commercial_margin: Decimal | None = _column(
+        "pharmacy_medicare_commercial_margin", _decimal
+    )
+    medical_medicaid_margin: Decimal | None = _column(
+        "medical_medicaid_margin", _decimal
+    )
+    medical_medicare_margin: Decimal | None = _column(
+        "medical_medicare_margin", _decimal
+    )
+    medical_commercial_margin: Decimal | None = _column(
+        "medical_commercial_margin", _decimal
+    )
+    retail_gross_margin: Decimal = _column("retail_gross_margin", _money)
+    retail_net_margin: Decimal = _column("retail_net_margin", _money)
+    retail_capture_rate: Decimal = _column(
+        "retail_capture_rate", lambda v: Decimal(str(v))
+    )
+    medicare_margin: Decimal | None = _column("medicare_margin", _decimal)
+    commercial_margin: Decimal | None = _column("commercial_margin", _decimal)
+    recommended_path: RecommendedPath = _column("recommended_path", RecommendedPath)
+    margin_delta: Decimal = _column("margin_delta", _money)
+    crossover_capture_rate: Decimal | None = _column("crossover_capture_rate", _decimal)
+
+    def to_analysis(self) -> MarginAnalysis:
+        """Materialize the row as a ``MarginAnalysis`` (with its ``Drug``)."""
+        values = {
+            f.name: getattr(self, f.name)
+            for f in fields(MarginAnalysis)
+            if f.name != "drug"
+        }
+        return MarginAnalysis(drug=self.drug.to_drug(), **values)
+
+
+class MarginTable(Sequence[MarginRow]):
+    """Columnar sequence of margin analyses.
+
+    Attributes:
+        frame: Analyzed frame (``analyze_catalog_margins`` or
+            ``rank_opportunities`` output, or a slice), in Float64 dollars
+            or Int64 micro-dollars.
+        columns: The frame's columns by name.
+    """
+
+    def __init__(self, frame: pl.DataFrame):
+        """Wrap an analyzed frame."""
+        self.frame = frame
+        self.columns: dict[str, pl.Series] = {s.name: s for s in frame.get_columns()}
+
+    def __len__(self) -> int:
+        """Number of analyzed drugs."""
+        return self.frame.height
+
+    @overload
+    def __getitem__(self, index: int) -> MarginRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "MarginTable": ...
+
+    def __getitem__(self, index: int | slice) -> "MarginRow | MarginTable":
+        """Row view by position, or a table over a contiguous slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("MarginTable slices must be contiguous")
+            return MarginTable(self.frame.slice(start, max(stop - start, 0)))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MarginTable index out of range")
+        return MarginRow(self, index)
+
+    def __iter__(self) -> Iterator[MarginRow]:
+        """Row views in frame order."""
+        return (MarginRow(self, i) for i in range(len(self)))
+
+    def to_analyses(self) -> list[MarginAnalysis]:
+        """Materialize every row as a ``MarginAnalysis``."""
+        return [row.to_analysis() for row in self]
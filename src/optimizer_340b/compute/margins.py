@@ -5,6 +5,11 @@ This module implements the core margin formulas:
 - Medicare Medical: ASP × 1.06 × Bill_Units - Contract_Cost
 - Commercial Medical: ASP × 1.15 × Bill_Units - Contract_Cost
 
+Scalar functions take a single ``Drug``; ``analyze_catalog_margins`` applies
+the 5-pathway formulas to a whole drug frame as Polars expressions. Both
+5-pathway APIs accept ``micros=True`` to do the money math in integer
+micro-dollars (see ``compute.money``) instead of Decimal or Float64.
+
 Gatekeeper Tests (from Project Charter):
 - Medicare Unit Test: Manual calculation matches to the penny
 - Commercial Unit Test: 1.15x multiplier correctly applied
@@ -14,7 +19,19 @@ Gatekeeper Tests (from Project Charter):
 import logging
 from decimal import Decimal
 
+import polars as pl
+
+from optimizer_340b.compute.margin_table import MarginTable
+from optimizer_340b.compute.money import (
+    from_micros,
+    micros_expr,
+    product_micros_expr,
+    scale_micros,
+    scale_micros_expr,
+    to_micros,
+)
 from optimizer_340b.models import Drug, MarginAnalysis, RecommendedPath
+from optimizer_340b.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -330,12 +347,136 @@ def calculate_medical_commercial_margin(
     return margin
 
 
+def _pathway_margins_micros(
+    drug: Drug,
+    capture_rate: Decimal,
+    dispense_fee: Decimal,
+    medicaid_markup_pct: Decimal,
+    commercial_asp_pct: Decimal,
+) -> dict[str, int | None]:
+    """Compute the 5 pathway margins in integer micro-dollars.
+
+    Same formulas as the ``calculate_*`` functions, with each product of an
+    amount and a rate rounded to the micro-dollar exactly as
+    ``analyze_catalog_margins(micros=True)`` rounds it. ASP is converted
+    after multiplying by bill units: per-unit ASPs derived from payment
+    limits have more than six decimals, and rounding them first would be
+    multiplied by the unit count.
+    """
+    cost = to_micros(drug.contract_cost)
+    awp = to_micros(drug.awp)
+    awp_factor = AWP_BRAND_FACTOR if drug.is_brand else AWP_GENERIC_FACTOR
+
+    pharmacy_medicaid = None
+    if drug.nadac_price is not None:
+        pharmacy_medicaid = (
+            scale_micros(
+                to_micros(drug.nadac_price) + to_micros(dispense_fee),
+                (Decimal("1") + medicaid_markup_pct) * capture_rate,
+            )
+            - cost
+        )
+
+    medical: dict[str, int | None] = dict.fromkeys(
+        (
+            "medical_medicaid_margin",
+            "medical_medicare_margin",
+            "medical_commercial_margin",
+        )
+    )
+    if drug.has_medical_path():
+        assert drug.asp is not None
+        billed = to_micros(drug.asp * drug.bill_units_per_package)
+        medical = {
+            "medical_medicaid_margin": scale_micros(billed, MEDICAID_ASP_MULTIPLIER)
+            - cost,
+            "medical_medicare_margin": scale_micros(billed, MEDICARE_ASP_MULTIPLIER)
+            - cost,
+            "medical_commercial_margin": scale_micros(
+                billed, Decimal("1") + commercial_asp_pct
+            )
+            - cost,
+        }
+
+    return {
+        "pharmacy_medicaid_margin": pharmacy_medicaid,
+        "pharmacy_medicare_commercial_margin": (
+            scale_micros(awp, awp_factor * capture_rate) - cost
+        ),
+        **medical,
+    }
+
+
+def _retail_margin_micros(drug: Drug, capture_rate: Decimal) -> tuple[int, int]:
+    """Integer micro-dollar version of ``calculate_retail_margin``."""
+    gross = scale_micros(to_micros(drug.awp), AWP_DISCOUNT_FACTOR) - to_micros(
+        drug.contract_cost
+    )
+    return gross, scale_micros(gross, capture_rate)
+
+
+def calculate_crossover_capture_rate(
+    drug: Drug,
+    dispense_fee: Decimal = DEFAULT_DISPENSE_FEE,
+    medicaid_markup_pct: Decimal = DEFAULT_MEDICAID_MARKUP,
+    commercial_asp_pct: Decimal = Decimal("0.15"),
+) -> Decimal | None:
+    """Calculate the capture rate at which the 5-pathway recommendation flips.
+
+    Every pathway subtracts the same contract cost, and only the pharmacy
+    pathways scale with capture rate, so:
+
+        Retail(c) = max(AWP × rate, (NADAC + Fee) × (1 + Markup)) × c - Cost
+        Medical   = ASP × max(1.04, 1.06, 1 + Commercial %) × Bill_Units - Cost
+        Crossover = Medical revenue / Retail revenue at 100% capture
+
+    Retail is recommended at capture rates at or above the crossover (ties
+    go to retail) and medical billing below it. A crossover above 1.0 means
+    medical wins at every capture rate up to 100%.
+
+    Args:
+        drug: Drug to analyze.
+        dispense_fee: Medicaid dispense fee (default $0).
+        medicaid_markup_pct: Medicaid pharmacy markup (default 0%).
+        commercial_asp_pct: Commercial ASP markup % (default 15%).
+
+    Returns:
+        Crossover capture rate, or None if the recommendation is the same at
+        every capture rate (no medical path, or no positive revenue).
+    """
+    if not drug.has_medical_path():
+        return None
+    assert drug.asp is not None
+
+    awp_factor = AWP_BRAND_FACTOR if drug.is_brand else AWP_GENERIC_FACTOR
+    retail_revenue = drug.awp * awp_factor
+    if drug.nadac_price is not None:
+        retail_revenue = max(
+            retail_revenue,
+            (drug.nadac_price + dispense_fee) * (Decimal("1") + medicaid_markup_pct),
+        )
+    medical_revenue = (
+        drug.asp
+        * drug.bill_units_per_package
+        * max(
+            MEDICAID_ASP_MULTIPLIER,
+            MEDICARE_ASP_MULTIPLIER,
+            Decimal("1") + commercial_asp_pct,
+        )
+    )
+
+    if retail_revenue <= 0 or medical_revenue <= 0:
+        return None
+    return medical_revenue / retail_revenue
+
+
 def analyze_drug_margin_5pathway(
     drug: Drug,
     capture_rate: Decimal = DEFAULT_CAPTURE_RATE,
     dispense_fee: Decimal = DEFAULT_DISPENSE_FEE,
     medicaid_markup_pct: Decimal = DEFAULT_MEDICAID_MARKUP,
     commercial_asp_pct: Decimal = Decimal("0.15"),
+    micros: bool = False,
 ) -> MarginAnalysis:
     """Perform complete 5-pathway margin analysis for a drug.
 
@@ -352,22 +493,45 @@ def analyze_drug_margin_5pathway(
         dispense_fee: Medicaid dispense fee (default $0).
         medicaid_markup_pct: Medicaid pharmacy markup (default 0%).
         commercial_asp_pct: Commercial ASP markup % (default 15%).
+        micros: Compute in integer micro-dollars instead of Decimal. Margins
+            are still returned as Decimal, exact to the micro-dollar.
 
     Returns:
-        MarginAnalysis with all 5 pathway margins.
+        MarginAnalysis with all 5 pathway margins and the crossover capture
+        rate (see ``calculate_crossover_capture_rate``).
     """
-    # Calculate all 5 margins
-    pharmacy_medicaid = calculate_pharmacy_medicaid_margin(
-        drug, dispense_fee, medicaid_markup_pct, capture_rate
-    )
-    pharmacy_medicare_commercial = calculate_pharmacy_medicare_commercial_margin(
-        drug, capture_rate
-    )
-    medical_medicaid = calculate_medical_medicaid_margin(drug)
-    medical_medicare = calculate_medical_medicare_margin(drug)
-    medical_commercial = calculate_medical_commercial_margin(
-        drug, Decimal("1") + commercial_asp_pct
-    )
+    if micros:
+        margins = {
+            name: None if value is None else from_micros(value)
+            for name, value in _pathway_margins_micros(
+                drug,
+                capture_rate,
+                dispense_fee,
+                medicaid_markup_pct,
+                commercial_asp_pct,
+            ).items()
+        }
+        pharmacy_medicaid = margins["pharmacy_medicaid_margin"]
+        pharmacy_medicare_commercial = margins["pharmacy_medicare_commercial_margin"]
+        medical_medicaid = margins["medical_medicaid_margin"]
+        medical_medicare = margins["medical_medicare_margin"]
+        medical_commercial = margins["medical_commercial_margin"]
+        gross_micros, net_micros = _retail_margin_micros(drug, capture_rate)
+        retail_gross, retail_net = from_micros(gross_micros), from_micros(net_micros)
+    else:
+        pharmacy_medicaid = calculate_pharmacy_medicaid_margin(
+            drug, dispense_fee, medicaid_markup_pct, capture_rate
+        )
+        pharmacy_medicare_commercial = calculate_pharmacy_medicare_commercial_margin(
+            drug, capture_rate
+        )
+        medical_medicaid = calculate_medical_medicaid_margin(drug)
+        medical_medicare = calculate_medical_medicare_margin(drug)
+        medical_commercial = calculate_medical_commercial_margin(
+            drug, Decimal("1") + commercial_asp_pct
+        )
+        # Legacy fields for backward compatibility
+        retail_gross, retail_net = calculate_retail_margin(drug, capture_rate)
 
     # Build list of available margins for recommendation
     options: list[tuple[RecommendedPath, Decimal]] = []
@@ -392,9 +556,6 @@ def analyze_drug_margin_5pathway(
         best_path = RecommendedPath.RETAIL
         delta = Decimal("0")
 
-    # Legacy fields for backward compatibility
-    retail_gross, retail_net = calculate_retail_margin(drug, capture_rate)
-
     return MarginAnalysis(
         drug=drug,
         # New 5-pathway margins
@@ -411,6 +572,9 @@ def analyze_drug_margin_5pathway(
         commercial_margin=medical_commercial,
         recommended_path=best_path,
         margin_delta=abs(delta),
+        crossover_capture_rate=calculate_crossover_capture_rate(
+            drug, dispense_fee, medicaid_markup_pct, commercial_asp_pct
+        ),
     )
 
 
@@ -555,6 +719,7 @@ def analyze_drug_with_payer(
     )
 
 
+@traced("compute.calculate_margin_sensitivity")
 def calculate_margin_sensitivity(
     drug: Drug,
     capture_rates: list[Decimal] | None = None,
@@ -601,3 +766,345 @@ def calculate_margin_sensitivity(
         })
 
     return results
+
+
+# ============================================================================
+# CATALOG-WIDE (COLUMNAR) MARGIN ENGINE
+# ============================================================================
+
+# Margin columns in the order analyze_drug_margin_5pathway ranks them
+PATHWAY_MARGIN_COLUMNS = [
+    ("pharmacy_medicaid_margin", RecommendedPath.RETAIL),
+    ("pharmacy_medicare_commercial_margin", RecommendedPath.RETAIL),
+    ("medical_medicaid_margin", RecommendedPath.MEDICARE_MEDICAL),
+    ("medical_medicare_margin", RecommendedPath.MEDICARE_MEDICAL),
+    ("medical_commercial_margin", RecommendedPath.COMMERCIAL_MEDICAL),
+]
+
+# Margin of the recommended pathway: the largest available pathway margin
+_BEST_PATHWAY_MARGIN = pl.max_horizontal([name for name, _ in PATHWAY_MARGIN_COLUMNS])
+
+
+_HAS_MEDICAL_PATH = pl.col("hcpcs_code").is_not_null() & pl.col("asp").is_not_null()
+
+# Temporary column holding ASP x bill units in micro-dollars (micros mode)
+_BILLED_MICROS = "_billed_micros"
+
+
+def _margin_exprs(
+    capture_rate: Decimal,
+    dispense_fee: Decimal,
+    medicaid_markup_pct: Decimal,
+    commercial_asp_pct: Decimal,
+) -> dict[str, pl.Expr]:
+    """Float64 dollar expressions for the pathway and retail margins."""
+    capture = float(capture_rate)
+    cost = pl.col("contract_cost")
+    units = pl.col("bill_units_per_package")
+
+    def medical_margin(multiplier: Decimal) -> pl.Expr:
+        return pl.when(_HAS_MEDICAL_PATH).then(
+            pl.col("asp") * float(multiplier) * units - cost
+        )
+
+    awp_factor = (
+        pl.when(pl.col("is_brand"))
+        .then(float(AWP_BRAND_FACTOR))
+        .otherwise(float(AWP_GENERIC_FACTOR))
+    )
+    retail_gross = pl.col("awp") * float(AWP_DISCOUNT_FACTOR) - cost
+
+    return {
+        "pharmacy_medicaid_margin": (
+            (pl.col("nadac_price") + float(dispense_fee))
+            * (1 + float(medicaid_markup_pct))
+            * capture
+            - cost
+        ),
+        "pharmacy_medicare_commercial_margin": pl.col("awp") * awp_factor * capture
+        - cost,
+        "medical_medicaid_margin": medical_margin(MEDICAID_ASP_MULTIPLIER),
+        "medical_medicare_margin": medical_margin(MEDICARE_ASP_MULTIPLIER),
+        "medical_commercial_margin": medical_margin(Decimal("1") + commercial_asp_pct),
+        "retail_gross_margin": retail_gross,
+        "retail_net_margin": retail_gross * capture,
+    }
+
+
+def _margin_exprs_micros(
+    capture_rate: Decimal,
+    dispense_fee: Decimal,
+    medicaid_markup_pct: Decimal,
+    commercial_asp_pct: Decimal,
+) -> dict[str, pl.Expr]:
+    """Int64 micro-dollar expressions for the pathway and retail margins.
+
+    Mirrors ``_pathway_margins_micros`` operation for operation. Reads the
+    billed ASP from the ``_BILLED_MICROS`` column, which the caller adds
+    once because the exact Decimal product is costlier than the rest.
+    """
+    cost = micros_expr(pl.col("contract_cost"))
+    awp = micros_expr(pl.col("awp"))
+    billed = pl.col(_BILLED_MICROS)
+
+    def medical_margin(multiplier: Decimal) -> pl.Expr:
+        return pl.when(_HAS_MEDICAL_PATH).then(
+            scale_micros_expr(billed, multiplier) - cost
+        )
+
+    retail_gross = scale_micros_expr(awp, AWP_DISCOUNT_FACTOR) - cost
+
+    return {
+        "pharmacy_medicaid_margin": scale_micros_expr(
+            micros_expr(pl.col("nadac_price")) + to_micros(dispense_fee),
+            (Decimal("1") + medicaid_markup_pct) * capture_rate,
+        )
+        - cost,
+        "pharmacy_medicare_commercial_margin": pl.when(pl.col("is_brand"))
+        .then(scale_micros_expr(awp, AWP_BRAND_FACTOR * capture_rate))
+        .otherwise(scale_micros_expr(awp, AWP_GENERIC_FACTOR * capture_rate))
+        - cost,
+        "medical_medicaid_margin": medical_margin(MEDICAID_ASP_MULTIPLIER),
+        "medical_medicare_margin": medical_margin(MEDICARE_ASP_MULTIPLIER),
+        "medical_commercial_margin": medical_margin(Decimal("1") + commercial_asp_pct),
+        "retail_gross_margin": retail_gross,
+        "retail_net_margin": scale_micros_expr(retail_gross, capture_rate),
+    }
+
+
+def _crossover_expr(
+    dispense_fee: Decimal,
+    medicaid_markup_pct: Decimal,
+    commercial_asp_pct: Decimal,
+) -> pl.Expr:
+    """Float64 expression for ``calculate_crossover_capture_rate``."""
+    awp_factor = (
+        pl.when(pl.col("is_brand"))
+        .then(float(AWP_BRAND_FACTOR))
+        .otherwise(float(AWP_GENERIC_FACTOR))
+    )
+    retail_revenue = pl.max_horizontal(
+        pl.col("awp") * awp_factor,
+        (pl.col("nadac_price") + float(dispense_fee))
+        * (1 + float(medicaid_markup_pct)),
+    )
+    medical_multiplier = max(
+        MEDICAID_ASP_MULTIPLIER,
+        MEDICARE_ASP_MULTIPLIER,
+        Decimal("1") + commercial_asp_pct,
+    )
+    medical_revenue = (
+        pl.col("asp") * pl.col("bill_units_per_package") * float(medical_multiplier)
+    )
+    return pl.when(
+        _HAS_MEDICAL_PATH & (retail_revenue > 0) & (medical_revenue > 0)
+    ).then(medical_revenue / retail_revenue)
+
+
+@traced("compute.analyze_catalog_margins")
+def analyze_catalog_margins(
+    drugs: pl.DataFrame,
+    capture_rate: Decimal = DEFAULT_CAPTURE_RATE,
+    dispense_fee: Decimal = DEFAULT_DISPENSE_FEE,
+    medicaid_markup_pct: Decimal = DEFAULT_MEDICAID_MARKUP,
+    commercial_asp_pct: Decimal = Decimal("0.15"),
+    micros: bool = False,
+) -> pl.DataFrame:
+    """Perform 5-pathway margin analysis for a whole drug frame at once.
+
+    Columnar equivalent of ``analyze_drug_margin_5pathway``: the same formulas
+    and ranking rules, evaluated as Polars expressions over every row.
+
+    Args:
+        drugs: Drug frame (see ``compute.drug_frame.DRUG_FRAME_SCHEMA``).
+        capture_rate: Retail capture rate (default 100%).
+        dispense_fee: Medicaid dispense fee (default $0).
+        medicaid_markup_pct: Medicaid pharmacy markup (default 0%).
+        commercial_asp_pct: Commercial ASP markup % (default 15%).
+        micros: Compute in integer micro-dollars. Margin columns (including
+            margin_delta) are then Int64 micro-dollars instead of Float64
+            dollars and match ``analyze_drug_margin_5pathway(micros=True)``
+            exactly.
+
+    Returns:
+        Input frame with the MarginAnalysis margin columns added:
+        the 5 pathway margins, legacy retail/medicare/commercial margins,
+        retail_capture_rate, recommended_path, margin_delta and
+        crossover_capture_rate (Float64 in both modes; null when the
+        recommendation does not depend on capture rate).
+    """
+    capture = float(capture_rate)
+    if micros:
+        billed = product_micros_expr(pl.col("asp"), pl.col("bill_units_per_package"))
+        drugs = drugs.with_columns(billed.alias(_BILLED_MICROS))
+        margins = _margin_exprs_micros(
+            capture_rate, dispense_fee, medicaid_markup_pct, commercial_asp_pct
+        )
+    else:
+        margins = _margin_exprs(
+            capture_rate, dispense_fee, medicaid_markup_pct, commercial_asp_pct
+        )
+    result = drugs.with_columns(
+        *[expr.alias(name) for name, expr in margins.items()],
+        pl.lit(capture).alias("retail_capture_rate"),
+        _crossover_expr(dispense_fee, medicaid_markup_pct, commercial_asp_pct).alias(
+            "crossover_capture_rate"
+        ),
+    )
+
+    # Rank available pathways: best margin wins, ties go to the earlier pathway
+    margin_names = [name for name, _ in PATHWAY_MARGIN_COLUMNS]
+    ranked = pl.concat_list(margin_names).list.drop_nulls().list.sort(descending=True)
+    best = pl.col("_best_margin")
+
+    # Nest from the last pathway out, so the earliest matching pathway wins
+    retail = pl.lit(RecommendedPath.RETAIL.value)
+    recommended: pl.Expr = retail
+    for name, path in reversed(PATHWAY_MARGIN_COLUMNS):
+        recommended = (
+            pl.when(pl.col(name) == best)
+            .then(pl.lit(path.value))
+            .otherwise(recommended)
+        )
+    recommended = pl.when(best.is_null()).then(retail).otherwise(recommended)
+
+    result = (
+        result.with_columns(
+            ranked.list.first().alias("_best_margin"),
+            ranked.list.get(1, null_on_oob=True).alias("_second_margin"),
+        )
+        .with_columns(
+            recommended.alias("recommended_path"),
+            (best - pl.col("_second_margin").fill_null(0))
+            .abs()
+            .fill_null(0)
+            .alias("margin_delta"),
+            pl.col("medical_medicare_margin").alias("medicare_margin"),
+            pl.col("medical_commercial_margin").alias("commercial_margin"),
+        )
+        .drop("_best_margin", "_second_margin", _BILLED_MICROS, strict=False)
+    )
+
+    logger.info(f"Analyzed {result.height:,} drugs across 5 pathways")
+    return result
+
+
+@traced("compute.rank_opportunities")
+def rank_opportunities(
+    drugs: pl.DataFrame,
+    capture_rate: Decimal = DEFAULT_CAPTURE_RATE,
+    dispense_fee: Decimal = DEFAULT_DISPENSE_FEE,
+    medicaid_markup_pct: Decimal = DEFAULT_MEDICAID_MARKUP,
+    commercial_asp_pct: Decimal = Decimal("0.15"),
+    micros: bool = False,
+) -> pl.DataFrame:
+    """Score a drug frame and rank it by margin delta.
+
+    This is the dashboard's opportunity list; the batch CLI writes the same
+    frame.
+
+    Args:
+        drugs: Drug frame (see ``compute.drug_frame.DRUG_FRAME_SCHEMA``).
+        capture_rate: Retail capture rate.
+        dispense_fee: Medicaid dispense fee (default $0).
+        medicaid_markup_pct: Medicaid pharmacy markup (default 0%).
+        commercial_asp_pct: Commercial ASP markup % (default 15%).
+        micros: Score in integer micro-dollars (see ``analyze_catalog_margins``).
+
+    Returns:
+        Analyzed frame sorted by margin delta (descending). The sort is
+        stable, so catalog order breaks ties.
+    """
+    analyses = analyze_catalog_margins(
+        drugs,
+        capture_rate,
+        dispense_fee,
+        medicaid_markup_pct,
+        commercial_asp_pct,
+        micros=micros,
+    )
+    return analyses.sort("margin_delta", descending=True, maintain_order=True)
+
+
+# Opportunity table sort keys: a frame column, or the best pathway margin
+OPPORTUNITY_SORT_KEYS: dict[str, pl.Expr] = {
+    "drug_name": pl.col("drug_name"),
+    "ndc": pl.col("ndc"),
+    "best_margin": _BEST_PATHWAY_MARGIN,
+    "pharmacy_medicaid_margin": pl.col("pharmacy_medicaid_margin"),
+    "pharmacy_medicare_commercial_margin": pl.col(
+        "pharmacy_medicare_commercial_margin"
+    ),
+    "retail_net_margin": pl.col("retail_net_margin"),
+    "medicare_margin": pl.col("medicare_margin"),
+    "commercial_margin": pl.col("commercial_margin"),
+    "margin_delta": pl.col("margin_delta"),
+    "crossover_capture_rate": pl.col("crossover_capture_rate"),
+}
+
+
+@traced("compute.opportunity_page")
+def opportunity_page(
+    ranked: pl.DataFrame,
+    sort_by: str = "margin_delta",
+    descending: bool = True,
+    page: int = 1,
+    page_size: int = 100,
+) -> pl.DataFrame:
+    """Return one page of ranked opportunities under any sort order.
+
+    Only the sort key and row position are ranked: rows up to the end of
+    the requested page are selected with ``top_k`` and sorted, and the
+    page's rows are then gathered from ``ranked``, so early pages of a
+    100k-row frame never sort the whole frame. Ties keep ``ranked`` order
+    and nulls sort last in both directions. Margin delta descending is
+    ``ranked``'s own order, so that page is a slice.
+
+    Args:
+        ranked: Frame from ``rank_opportunities`` (optionally filtered).
+        sort_by: Key in ``OPPORTUNITY_SORT_KEYS``.
+        descending: Sort largest first.
+        page: 1-based page number.
+        page_size: Rows per page.
+
+    Returns:
+        At most ``page_size`` rows of ``ranked`` with the same columns.
+
+    Raises:
+        ValueError: If ``sort_by`` is not a known sort key.
+    """
+    if sort_by not in OPPORTUNITY_SORT_KEYS:
+        raise ValueError(f"Unknown opportunity sort key: {sort_by}")
+
+    offset = (max(page, 1) - 1) * page_size
+    if sort_by == "margin_delta" and descending:
+        return ranked.slice(offset, page_size)
+
+    # Rank a narrow (key, position) frame, then gather the page's rows
+    keys = ["_sort_key", "_position"]
+    positions = (
+        ranked.select(OPPORTUNITY_SORT_KEYS[sort_by].alias("_sort_key"))
+        .with_row_index("_position")
+        .top_k(offset + page_size, by=keys, reverse=[not descending, True])
+        .sort(keys, descending=[descending, False], nulls_last=True)
+        .get_column("_position")
+        .slice(offset, page_size)
+    )
+    return ranked[positions]
+
+
+def margin_analyses_from_frame(margins: pl.DataFrame) -> list[MarginAnalysis]:
+    """Materialize MarginAnalysis objects from analyzed frame rows.
+
+    Intended for the handful of rows actually displayed; the full catalog
+    should stay columnar (see ``MarginTable`` for row views without
+    materializing).
+
+    Args:
+        margins: Frame returned by ``analyze_catalog_margins`` (or a slice),
+            in either Float64 dollars or Int64 micro-dollars.
+
+    Returns:
+        MarginAnalysis objects in frame order.
+    """
+    return MarginTable(margins).to_analyses()
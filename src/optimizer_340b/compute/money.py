@@ -0,0 +1,161 @@
+"""Fixed-point money arithmetic in integer micro-dollars.
+
+Amounts are held as ints (Python) or Int64 columns (Polars) counting
+millionths of a dollar, so additions and subtractions are exact and run at
+native integer speed. Multiplying by a rate (a capture rate, ASP + 6%, ...)
+is the only inexact step: the rate is kept as an exact fraction and the
+product is rounded half away from zero to the nearest micro-dollar. The
+scalar and expression versions round identically, so per-drug and
+catalog-wide margins agree to the micro-dollar, far inside penny precision.
+
+Example:
+    >>> scale_micros(to_micros(Decimal("2800")), Decimal("1.06")) * 2
+    5936000000
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from fractions import Fraction
+from functools import lru_cache
+
+import polars as pl
+
+MICROS_PER_DOLLAR = 1_000_000
+MICROS_PER_CENT = 10_000
+
+# Decimal places kept when a Float64 price is multiplied exactly: covers the
+# shortest repr of any per-unit price (e.g. payment limit / 1.06)
+EXACT_SCALE = 20
+
+_ONE = Decimal(1)
+
+
+def to_micros(amount: Decimal | float | int | str) -> int:
+    """Convert a dollar amount to integer micro-dollars.
+
+    Floats are converted through their shortest repr (as
+    ``Decimal(str(value))``) and sub-micro digits are rounded half up.
+
+    Args:
+        amount: Dollar amount.
+
+    Returns:
+        Amount in micro-dollars.
+    """
+    value = Decimal(str(amount)) if isinstance(amount, float) else Decimal(amount)
+    return int(value.scaleb(6).quantize(_ONE, ROUND_HALF_UP))
+
+
+def from_micros(micros: int) -> Decimal:
+    """Convert micro-dollars back to an exact Decimal dollar amount."""
+    return Decimal(micros).scaleb(-6)
+
+
+@lru_cache(maxsize=256)
+def as_rate(value: Decimal | Fraction | float | int | str) -> Fraction:
+    """Return a rate as an exact fraction (floats via their shortest repr).
+
+    Cached: the same few rates (capture rate, ASP multipliers) recur for
+    every drug.
+    """
+    if isinstance(value, float):
+        value = str(value)
+    return Fraction(value)
+
+
+def _round_div(numerator: int, denominator: int) -> int:
+    """Divide, rounding half away from zero (``denominator`` > 0)."""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def scale_micros(micros: int, rate: Decimal | Fraction | float | int | str) -> int:
+    """Multiply a micro-dollar amount by a rate.
+
+    Args:
+        micros: Amount in micro-dollars.
+        rate: Multiplier, e.g. ``Decimal("1.06")``.
+
+    Returns:
+        Product rounded half away from zero to the nearest micro-dollar.
+    """
+    ratio = as_rate(rate)
+    return _round_div(micros * ratio.numerator, ratio.denominator)
+
+
+def round_to_cents(micros: int) -> int:
+    """Round micro-dollars to the nearest cent (half away from zero).
+
+    Returns:
+        Rounded amount, still in micro-dollars.
+    """
+    return _round_div(micros, MICROS_PER_CENT) * MICROS_PER_CENT
+
+
+def micros_expr(dollars: pl.Expr) -> pl.Expr:
+    """Convert a Float64 dollar expression to Int64 micro-dollars."""
+    return (
+        (dollars * MICROS_PER_DOLLAR)
+        .round(0, mode="half_away_from_zero")
+        .cast(pl.Int64)
+    )
+
+
+def product_micros_expr(dollars: pl.Expr, count: pl.Expr) -> pl.Expr:
+    """Multiply a Float64 dollar expression by an integer count, in micros.
+
+    Expression equivalent of ``to_micros(Decimal(str(dollars)) * count)``.
+    The price is taken through its shortest repr into an exact Decimal, so
+    the product is rounded once, half away from zero. Rounding the price to
+    micro-dollars first, or multiplying in Float64, would be off by a micro
+    for prices with more than six decimals.
+
+    Args:
+        dollars: Float64 dollar expression, e.g. a per-unit ASP.
+        count: Integer expression, e.g. billing units per package.
+
+    Returns:
+        Int64 micro-dollar expression, nulls preserved.
+    """
+    exact = dollars.cast(pl.String).str.to_decimal(scale=EXACT_SCALE) * count
+    micros = exact.round(6, mode="half_away_from_zero") * MICROS_PER_DOLLAR
+    return micros.cast(pl.Int64)
+
+
+def round_to_cents_expr(micros: pl.Expr) -> pl.Expr:
+    """Round an Int64 micro-dollar expression to the nearest cent.
+
+    Expression equivalent of ``round_to_cents`` (half away from zero).
+    """
+    return (
+        (micros.abs() + MICROS_PER_CENT // 2)
+        // MICROS_PER_CENT
+        * MICROS_PER_CENT
+        * micros.sign()
+    )
+
+
+def scale_micros_expr(
+    micros: pl.Expr, rate: Decimal | Fraction | float | int | str
+) -> pl.Expr:
+    """Multiply an Int64 micro-dollar expression by a rate.
+
+    Integer-only equivalent of ``scale_micros``. The rate is split into its
+    whole and fractional parts so intermediate products stay within Int64
+    for any realistic drug price.
+
+    Args:
+        micros: Int64 micro-dollar expression.
+        rate: Multiplier.
+
+    Returns:
+        Int64 expression rounded half away from zero.
+    """
+    ratio = as_rate(rate)
+    whole, part = divmod(ratio.numerator, ratio.denominator)
+    denominator = ratio.denominator
+    rounded_part = (
+        (micros.abs() * part + denominator // 2) // denominator * micros.sign()
+    )
+    return micros * whole + rounded_part
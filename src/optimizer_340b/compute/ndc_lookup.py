@@ -0,0 +1,543 @@
+"""Batch NDC lookup with pharmacy channel margins.
+
+Backs the NDC Lookup page: a user-supplied list of drug names and NDCs is
+checked against the product catalog and priced for the two pharmacy
+channels. Payer claim extracts can run to 100k+ lines, so the input is
+processed in fixed-size chunks, each one a pair of left joins against
+NDC-keyed catalog and NADAC lookup frames. Each chunk is written to disk
+as it completes and the parts are streamed into the final CSV or Parquet
+file, so the full result is never held in memory.
+
+Margin columns are numeric (Float64 dollars, null when not computable);
+currency formatting is left to whatever displays them. The money math runs
+in integer micro-dollars (see ``money``) and margins are rounded to the
+cent.
+
+Example:
+    >>> lookup = NdcLookup(drug_index.catalog, nadac)
+    >>> summary = stream_ndc_lookup(read_ndc_list(data), lookup, "out.parquet")
+"""
+
+import io
+import logging
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+
+import polars as pl
+
+from optimizer_340b.compute.money import (
+    MICROS_PER_DOLLAR,
+    micros_expr,
+    round_to_cents_expr,
+    scale_micros_expr,
+    to_micros,
+)
+from optimizer_340b.ingest.normalizers import ndc_expr
+from optimizer_340b.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Input list columns, in positional order for header-less files
+INPUT_COLUMNS = ("Drug Description", "NDC11", "Type", "Product Description", "HCPCS")
+
+# Words that mark the first line of an input file as a header row
+HEADER_KEYWORDS = (
+    "DRUG",
+    "DESC",
+    "NDC",
+    "TYPE",
+    "PRODUCT",
+    "MED_DESC",
+    "NAME",
+    "HCPCS",
+)
+
+# NDC cell values that mark a repeated header row ("NDC11" has digits)
+HEADER_NDC_VALUES = ("NDC", "NDC11", "NDC_CODE", "NDC CODE")
+
+# Result columns holding dollar amounts
+MONEY_COLUMNS = (
+    "340B Purchase Price",
+    "AWP",
+    "Pharmacy Medicaid Margin",
+    "Pharmacy Medicare/Commercial Margin",
+)
+
+# Catalog column candidates (case-insensitive, first present wins)
+CATALOG_NDC_COLUMNS = ("NDC", "NDC11", "NDC Code")
+CATALOG_NAME_COLUMNS = ("Product Description", "Description", "Drug Name")
+CATALOG_GENERIC_COLUMNS = ("Generic Name", "GenericName", "Generic")
+CATALOG_COST_COLUMNS = (
+    "Unit Price (Current Catalog)",
+    "Contract Cost",
+    "ContractCost",
+    "Cost",
+)
+CATALOG_AWP_COLUMNS = ("Medispan AWP", "AWP", "MedispanAWP", "Medispan_AWP")
+CATALOG_PACKAGE_SIZE_COLUMNS = ("Package Size", "PackageSize", "Pkg Size", "Size")
+
+# NADAC column candidates; last_price is the most recent NADAC
+NADAC_NDC_COLUMNS = (
+    "ndc",
+    "NDC11",
+    "NDC_Code",
+    "NDC Description",
+)
+NADAC_PRICE_COLUMNS = (
+    "last_price",
+    "Last Price",
+    "last_nadac",
+    "NADAC_Per_Unit",
+    "NADAC Per Unit",
+    "NADAC",
+    "nadac_price",
+    "Price",
+    "mean_price",
+    "median_price",
+)
+
+# Lookup frames the input is joined against
+CATALOG_LOOKUP_SCHEMA: dict[str, pl.DataType] = {
+    "ndc11": pl.String(),
+    "catalog_name": pl.String(),
+    "generic_name": pl.String(),
+    "contract_cost": pl.Float64(),
+    "awp": pl.Float64(),
+    "package_size": pl.Float64(),
+}
+NADAC_LOOKUP_SCHEMA: dict[str, pl.DataType] = {
+    "ndc11": pl.String(),
+    "nadac_price": pl.Float64(),
+}
+
+
+@dataclass
+class NdcLookupSummary:
+    """Row counts accumulated while streaming a lookup.
+
+    Attributes:
+        total: Input rows processed (header-like rows excluded).
+        matches: Rows whose trade name matches the catalog description.
+        mismatches: Rows that mismatch or whose NDC is not in the catalog.
+        with_margins: Rows with a Medicare/Commercial margin.
+    """
+
+    total: int = 0
+    matches: int = 0
+    mismatches: int = 0
+    with_margins: int = 0
+
+    def add(self, chunk: pl.DataFrame) -> None:
+        """Add the counts of one result chunk."""
+        status = pl.col("Match Status")
+        counts = chunk.select(
+            (status == "MATCH").sum().alias("matches"),
+            status.str.contains("MISMATCH|NOT FOUND").sum().alias("mismatches"),
+            pl.col("Pharmacy Medicare/Commercial Margin")
+            .is_not_null()
+            .sum()
+            .alias("with_margins"),
+        ).row(0, named=True)
+        self.total += chunk.height
+        self.matches += counts["matches"]
+        self.mismatches += counts["mismatches"]
+        self.with_margins += counts["with_margins"]
+
+
+def find_column(columns: list[str], *candidates: str) -> str | None:
+    """Find a column name from a list of candidates (case-insensitive).
+
+    Args:
+        columns: Available column names.
+        candidates: Possible column names, in priority order.
+
+    Returns:
+        Matching column name or None.
+    """
+    columns_upper = {c.upper(): c for c in columns}
+    for candidate in candidates:
+        if candidate.upper() in columns_upper:
+            return columns_upper[candidate.upper()]
+    return None
+
+
+def read_ndc_list(content: bytes) -> pl.DataFrame | None:
+    """Parse an uploaded NDC list into string columns.
+
+    Files with a header row (detected by keyword) keep their column names;
+    header-less files are named positionally from ``INPUT_COLUMNS``, and a
+    first line without commas is read as tab-separated. Every column is
+    read as text so NDC leading zeros survive. Missing ``Type``,
+    ``Product Description`` and ``HCPCS`` columns are added.
+
+    Args:
+        content: Raw file bytes (UTF-8).
+
+    Returns:
+        Input DataFrame, or None if the file cannot be parsed.
+    """
+    try:
+        first_line = content.decode("utf-8").split("\n")[0].strip().upper()
+        source = io.BytesIO(content)
+
+        if "," not in first_line:
+            df = pl.read_csv(
+                source,
+                separator="\t",
+                has_header=False,
+                new_columns=list(INPUT_COLUMNS[:4]),
+                missing_columns="insert",
+                infer_schema=False,
+            )
+        elif any(kw in first_line for kw in HEADER_KEYWORDS):
+            df = pl.read_csv(source, infer_schema=False)
+        else:
+            df = pl.read_csv(source, has_header=False, infer_schema=False)
+            df.columns = list(INPUT_COLUMNS[: df.width])
+
+        # Standardize column names if they don't match expected
+        if df.width >= 4 and "Drug Description" not in df.columns:
+            df.columns = list(INPUT_COLUMNS[: df.width])
+
+        if df.width < 2:
+            logger.error("CSV must have at least Drug Description and NDC11 columns")
+            return None
+
+        defaults = {"Type": "BRAND", "Product Description": "", "HCPCS": ""}
+        return df.with_columns(
+            pl.lit(value).alias(name)
+            for name, value in defaults.items()
+            if name not in df.columns
+        )
+
+    except Exception as e:
+        logger.exception(f"Error parsing CSV: {e}")
+        return None
+
+
+@traced("compute.build_catalog_lookup")
+def build_catalog_lookup(catalog: pl.DataFrame) -> pl.DataFrame:
+    """Build the NDC-keyed catalog lookup frame.
+
+    When an NDC appears more than once, the row with the lowest contract
+    cost (best 340B price) wins; ties and rows without a cost keep the
+    first occurrence.
+
+    Args:
+        catalog: Product catalog DataFrame.
+
+    Returns:
+        One row per normalized NDC (``ndc11``) with ``catalog_name``,
+        ``generic_name``, ``contract_cost`` and ``awp`` (Float64 dollars)
+        and ``package_size`` (Float64, 1 when missing or not positive).
+    """
+    columns = catalog.columns
+    ndc_col = find_column(columns, *CATALOG_NDC_COLUMNS)
+    if ndc_col is None:
+        logger.error(f"NDC column not found in catalog. Available: {columns}")
+        return pl.DataFrame(schema=CATALOG_LOOKUP_SCHEMA)
+
+    def text(column: str | None) -> pl.Expr:
+        if column is None:
+            return pl.lit("")
+        return pl.col(column).cast(pl.String).fill_null("")
+
+    def number(column: str | None) -> pl.Expr:
+        if column is None:
+            return pl.lit(None, dtype=pl.Float64)
+        return pl.col(column).cast(pl.String).cast(pl.Float64, strict=False)
+
+    package_size = number(find_column(columns, *CATALOG_PACKAGE_SIZE_COLUMNS))
+    lookup = (
+        catalog.lazy()
+        .select(
+            ndc_expr(ndc_col).alias("ndc11"),
+            text(find_column(columns, *CATALOG_NAME_COLUMNS)).alias("catalog_name"),
+            text(find_column(columns, *CATALOG_GENERIC_COLUMNS)).alias("generic_name"),
+            number(find_column(columns, *CATALOG_COST_COLUMNS)).alias("contract_cost"),
+            number(find_column(columns, *CATALOG_AWP_COLUMNS)).alias("awp"),
+            pl.when(package_size > 0)
+            .then(package_size)
+            .otherwise(1.0)
+            .alias("package_size"),
+        )
+        .filter(pl.col("ndc11") != "")
+        .with_row_index("_row")
+        .sort("contract_cost", "_row", nulls_last=True)
+        .unique("ndc11", keep="first", maintain_order=True)
+        .sort("_row")
+        .drop("_row")
+        .collect()
+    )
+    logger.info(f"Built catalog lookup with {lookup.height} unique NDCs")
+    return lookup
+
+
+@traced("compute.build_nadac_lookup")
+def build_nadac_lookup(nadac: pl.DataFrame) -> pl.DataFrame:
+    """Build the NDC-keyed NADAC price lookup frame.
+
+    Args:
+        nadac: NADAC pricing DataFrame.
+
+    Returns:
+        One row per normalized NDC (``ndc11``) with its per-unit
+        ``nadac_price``; the last priced row wins for duplicate NDCs.
+    """
+    ndc_col = find_column(nadac.columns, *NADAC_NDC_COLUMNS)
+    price_col = find_column(nadac.columns, *NADAC_PRICE_COLUMNS)
+    if not ndc_col or not price_col:
+        logger.warning(
+            f"NADAC columns not found. NDC col: {ndc_col}, Price col: {price_col}. "
+            f"Available columns: {nadac.columns}"
+        )
+        return pl.DataFrame(schema=NADAC_LOOKUP_SCHEMA)
+
+    lookup = (
+        nadac.lazy()
+        .select(
+            ndc_expr(ndc_col).alias("ndc11"),
+            pl.col(price_col)
+            .cast(pl.String)
+            .cast(pl.Float64, strict=False)
+            .alias("nadac_price"),
+        )
+        .filter((pl.col("ndc11") != "") & pl.col("nadac_price").is_not_null())
+        .unique("ndc11", keep="last", maintain_order=True)
+        .collect()
+    )
+    logger.info(f"Built NADAC lookup with {lookup.height} NDCs using {price_col}")
+    return lookup
+
+
+def _dollars(column: str) -> pl.Expr:
+    """Micro-dollar column as Float64 dollars rounded to the cent.
+
+    The trailing ``round`` snaps the float quotient to the nearest double of
+    the cent value, so CSV output prints e.g. 561.33 rather than 561.3299...
+    """
+    cents = round_to_cents_expr(pl.col(column))
+    return (cents / MICROS_PER_DOLLAR).round(2)
+
+
+def _first_word(column: str) -> pl.Expr:
+    """First whitespace-delimited word, uppercased (trade name); null if none."""
+    return pl.col(column).str.to_uppercase().str.extract(r"^\s*(\S+)", 1)
+
+
+def _match_status() -> pl.Expr:
+    """Match status from the input and catalog trade names.
+
+    The input's first word is compared with the first word of the catalog
+    Product Description, then of the Generic Name.
+    """
+    trade = _first_word("Input Drug Name")
+    return (
+        pl.when(pl.col("catalog_name").is_null())
+        .then(pl.lit("NDC NOT FOUND"))
+        .when((pl.col("catalog_name") == "") & (pl.col("generic_name") == ""))
+        .then(pl.lit("NO CATALOG NAME"))
+        .when((trade == _first_word("catalog_name")).fill_null(False))
+        .then(pl.lit("MATCH"))
+        .when((trade == _first_word("generic_name")).fill_null(False))
+        .then(pl.lit("MATCH (GENERIC)"))
+        .otherwise(pl.lit("MISMATCH - VERIFY"))
+    )
+
+
+class NdcLookup:
+    """Catalog and NADAC lookups plus margin parameters for one run.
+
+    Pharmacy Medicaid margin:
+        ((NADAC x Pkg Size) + Dispense Fee) x (1 + Markup) x Capture Rate
+        - 340B Purchase Price
+    Pharmacy Medicare/Commercial margin:
+        AWP x (1 - Discount) x Capture Rate - 340B Purchase Price
+
+    NADAC is per unit while the 340B price and AWP are per package. When a
+    Medicare/Commercial margin exists, a missing or negative Medicaid margin
+    is floored to $0.00.
+
+    Attributes:
+        catalog_lookup: Frame from ``build_catalog_lookup``.
+        nadac_lookup: Frame from ``build_nadac_lookup`` (empty without NADAC).
+    """
+
+    def __init__(
+        self,
+        catalog: pl.DataFrame,
+        nadac: pl.DataFrame | None = None,
+        dispense_fee: Decimal = Decimal("0"),
+        medicaid_markup: Decimal = Decimal("0"),
+        awp_discount: Decimal = Decimal("0.15"),
+        capture_rate: Decimal = Decimal("1"),
+    ):
+        """Build the lookups.
+
+        Args:
+            catalog: Product catalog DataFrame.
+            nadac: Optional NADAC pricing DataFrame.
+            dispense_fee: Dispense fee added to the NADAC package price.
+            medicaid_markup: Medicaid markup as a decimal (0.05 = 5%).
+            awp_discount: AWP discount as a decimal (0.15 = AWP x 0.85).
+            capture_rate: Capture rate as a decimal (1 = 100%).
+        """
+        self.catalog_lookup = build_catalog_lookup(catalog)
+        self.nadac_lookup = (
+            build_nadac_lookup(nadac)
+            if nadac is not None
+            else pl.DataFrame(schema=NADAC_LOOKUP_SCHEMA)
+        )
+        self._dispense_fee = to_micros(dispense_fee)
+        self._medicaid_rate = (Decimal("1") + medicaid_markup) * capture_rate
+        self._awp_rate = (Decimal("1") - awp_discount) * capture_rate
+
+    def process(self, chunk: pl.DataFrame) -> pl.DataFrame:
+        """Look up and price one chunk of the input list.
+
+        Rows whose NDC holds no digits or is a header name such as
+        ``NDC11`` (repeated header lines, blanks) are skipped; the rest keep
+        their input order.
+
+        Args:
+            chunk: Rows from ``read_ndc_list``.
+
+        Returns:
+            Result rows: input name, NDC11, HCPCS, match status, catalog
+            description, type, then the ``MONEY_COLUMNS`` in dollars.
+        """
+
+        def text(name: str, default: str = "") -> pl.Expr:
+            if name not in chunk.columns:
+                return pl.lit(default)
+            return pl.col(name).cast(pl.String).fill_null(default).str.strip_chars()
+
+        cost = micros_expr(pl.col("contract_cost"))
+        medicaid = (
+            scale_micros_expr(
+                micros_expr(pl.col("nadac_price") * pl.col("package_size"))
+                + self._dispense_fee,
+                self._medicaid_rate,
+            )
+            - cost
+        )
+        medicare_commercial = (
+            scale_micros_expr(micros_expr(pl.col("awp")), self._awp_rate) - cost
+        )
+
+        return (
+            chunk.lazy()
+            .filter(
+                text("NDC11").str.contains(r"\d")
+                & ~text("NDC11").str.to_uppercase().is_in(HEADER_NDC_VALUES)
+            )
+            .select(
+                text("Drug Description").alias("Input Drug Name"),
+                ndc_expr(text("NDC11")).alias("NDC11"),
+                text("HCPCS").alias("HCPCS"),
+                text("Type", "BRAND").str.to_uppercase().alias("Type"),
+            )
+            .join(
+                self.catalog_lookup.lazy(),
+                left_on="NDC11",
+                right_on="ndc11",
+                how="left",
+                maintain_order="left",
+            )
+            .join(
+                self.nadac_lookup.lazy(),
+                left_on="NDC11",
+                right_on="ndc11",
+                how="left",
+                maintain_order="left",
+            )
+            .with_columns(
+                medicaid.alias("_medicaid"),
+                medicare_commercial.alias("_medicare_commercial"),
+            )
+            .with_columns(
+                pl.when(pl.col("_medicare_commercial").is_not_null())
+                .then(pl.col("_medicaid").fill_null(0).clip(lower_bound=0))
+                .otherwise(pl.col("_medicaid"))
+                .alias("_medicaid")
+            )
+            .select(
+                "Input Drug Name",
+                "NDC11",
+                "HCPCS",
+                _match_status().alias("Match Status"),
+                pl.col("catalog_name").fill_null("").alias("Catalog Description"),
+                "Type",
+                pl.col("contract_cost").alias("340B Purchase Price"),
+                pl.col("awp").alias("AWP"),
+                _dollars("_medicaid").alias("Pharmacy Medicaid Margin"),
+                _dollars("_medicare_commercial").alias(
+                    "Pharmacy Medicare/Commercial Margin"
+                ),
+            )
+            .collect()
+        )
+
+
+@traced("compute.stream_ndc_lookup")
+def stream_ndc_lookup(
+    input_df: pl.DataFrame,
+    lookup: NdcLookup,
+    output_path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> NdcLookupSummary:
+    """Run the lookup chunk by chunk and stream the result to a file.
+
+    Each processed chunk is written to a temporary Parquet part; the parts
+    are then streamed into ``output_path`` (Parquet, or CSV for a ``.csv``
+    suffix). Only one chunk of results is in memory at a time.
+
+    Args:
+        input_df: Rows from ``read_ndc_list``.
+        lookup: Lookups and margin parameters for this run.
+        output_path: Result file; the format follows its suffix.
+        chunk_size: Input rows per chunk.
+        on_progress: Called with (rows processed, total rows) after each
+            chunk.
+
+    Returns:
+        Summary counts over the whole result.
+    """
+    output_path = Path(output_path)
+    summary = NdcLookupSummary()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parts: list[Path] = []
+        done = 0
+        for i, chunk in enumerate(input_df.iter_slices(chunk_size)):
+            result = lookup.process(chunk)
+            summary.add(result)
+            part = Path(tmp) / f"part-{i:05d}.parquet"
+            result.write_parquet(part)
+            parts.append(part)
+
+            done += chunk.height
+            if on_progress is not None:
+                on_progress(done, input_df.height)
+
+        if parts:
+            results = pl.scan_parquet(parts)
+        else:
+            results = lookup.process(input_df.clear()).lazy()
+
+        if output_path.suffix.lower() == ".csv":
+            results.sink_csv(output_path)
+        else:
+            results.sink_parquet(output_path)
+
+    logger.info(
+        f"NDC lookup: {summary.total:,} rows ({summary.matches:,} matches, "
+        f"{summary.mismatches:,} mismatches) written to {output_path}"
+    )
+    return summary
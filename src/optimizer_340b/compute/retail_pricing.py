@@ -21,6 +21,12 @@ from enum import Enum
 
 import polars as pl
 
+from optimizer_340b.risk.name_matcher import (
+    NameMatcher,
+    normalize_name,
+    normalize_name_expr,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -172,6 +178,11 @@ GENERIC_KEYWORDS = {
     "MYCOPHENOLATE",
 }
 
+# Compiled matchers for the name lists above
+_SPECIALTY_MATCHER = NameMatcher(SPECIALTY_DRUGS)
+_BRAND_MATCHER = NameMatcher(BRAND_DRUGS)
+_GENERIC_MATCHER = NameMatcher(GENERIC_KEYWORDS)
+
 
 @dataclass
 class RetailPricingResult:
@@ -212,7 +223,7 @@ def classify_drug_category(
     if not drug_name:
         return DrugCategory.UNKNOWN
 
-    name_upper = drug_name.upper().strip()
+    name_upper = normalize_name(drug_name)
 
     # Check explicit lookup first
     if category_lookup:
@@ -220,25 +231,76 @@ def classify_drug_category(
             if key.upper() in name_upper or name_upper in key.upper():
                 return category
 
-    # Check specialty drugs
-    for specialty in SPECIALTY_DRUGS:
-        if specialty in name_upper or name_upper.startswith(specialty):
-            return DrugCategory.SPECIALTY
-
-    # Check brand drugs
-    for brand in BRAND_DRUGS:
-        if brand in name_upper or name_upper.startswith(brand):
-            return DrugCategory.BRAND
-
-    # Check generic keywords
-    for generic in GENERIC_KEYWORDS:
-        if generic in name_upper:
-            return DrugCategory.GENERIC
+    # Specialty, then brand, then generic keywords
+    if _SPECIALTY_MATCHER.contains_any(name_upper):
+        return DrugCategory.SPECIALTY
+    if _BRAND_MATCHER.contains_any(name_upper):
+        return DrugCategory.BRAND
+    if _GENERIC_MATCHER.contains_any(name_upper):
+        return DrugCategory.GENERIC
 
     # Default to Brand (conservative - higher reimbursement)
     return DrugCategory.BRAND
 
 
+def classify_drug_categories(
+    drug_names: pl.Series,
+    category_lookup: dict[str, DrugCategory] | None = None,
+) -> pl.Series:
+    """Vectorized ``classify_drug_category`` for a Series of drug names.
+
+    The lookup keys are compiled into one matcher per call, so the whole
+    Series is classified in a single pass with the same precedence: first
+    matching lookup key (in dict order), then specialty, brand and generic
+    lists, defaulting to Brand.
+
+    Args:
+        drug_names: Drug names (any case).
+        category_lookup: Optional lookup dict from Ravenswood matrix.
+
+    Returns:
+        String Series of ``DrugCategory`` values.
+    """
+    names = drug_names.to_frame("name").select(
+        pl.when(pl.col("name") != "").then(normalize_name_expr(pl.col("name")))
+    )["name"]
+
+    lookup_categories: dict[str, str] = {}
+    for key, category in (category_lookup or {}).items():
+        lookup_categories.setdefault(normalize_name(key), category.value)
+    lookup_matcher = NameMatcher(lookup_categories)
+    categories = pl.Series(
+        [lookup_categories[key] for key in lookup_matcher.patterns], dtype=pl.String
+    )
+
+    return (
+        pl.DataFrame(
+            {
+                "name": names,
+                "lookup": categories.gather(lookup_matcher.first_match_series(names)),
+                "specialty": _SPECIALTY_MATCHER.contains_any_series(names),
+                "brand": _BRAND_MATCHER.contains_any_series(names),
+                "generic": _GENERIC_MATCHER.contains_any_series(names),
+            }
+        )
+        .select(
+            pl.when(pl.col("name").is_null())
+            .then(pl.lit(DrugCategory.UNKNOWN.value))
+            .when(pl.col("lookup").is_not_null())
+            .then(pl.col("lookup"))
+            .when(pl.col("specialty"))
+            .then(pl.lit(DrugCategory.SPECIALTY.value))
+            .when(pl.col("brand"))
+            .then(pl.lit(DrugCategory.BRAND.value))
+            .when(pl.col("generic"))
+            .then(pl.lit(DrugCategory.GENERIC.value))
+            .otherwise(pl.lit(DrugCategory.BRAND.value))
+            .alias(drug_names.name)
+        )
+        .to_series()
+    )
+
+
 def get_awp_multiplier(
     drug_category: DrugCategory,
     payer_category: PayerCategory = PayerCategory.COMMERCIAL,
@@ -0,0 +1,315 @@
+"""Prebuilt drug search index for name, NDC and HCPCS queries (Gold Layer).
+
+The search box and autocomplete used to scan the whole catalog with
+``iter_rows`` on every submit. ``SearchIndex`` is built once per data
+version (lazily, from ``DrugIndex.search_index``) over the distinct values of
+each searchable field:
+
+- Queries of three or more characters look up the rarest query trigram in an
+  inverted index and verify substring matches on that candidate list only.
+- Shorter queries use a sorted array of word tokens (prefix bisect).
+- When fewer than ``limit`` rows match exactly, keys that share trigrams with
+  the query are scored with ``thefuzz`` for typo-tolerant matches.
+
+Hits are ranked by match quality (exact, prefix, word prefix, substring,
+then fuzzy score), then field, then catalog order.
+"""
+
+import bisect
+import logging
+import re
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import polars as pl
+from thefuzz import fuzz  # type: ignore[import-untyped]
+
+from optimizer_340b.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Searchable fields, in tie-break priority order
+SEARCH_FIELDS = ("drug_name", "ndc", "hcpcs_code", "generic_name", "manufacturer")
+
+# Fields eligible for typo-tolerant matching
+FUZZY_FIELDS = frozenset({"drug_name", "generic_name", "manufacturer"})
+
+# Catalog columns holding the generic name
+GENERIC_NAME_COLUMNS = ("Generic Name", "GENERIC_NAME")
+
+# Match quality scores for exact (non-fuzzy) hits
+SCORE_EQUAL = 100
+SCORE_PREFIX = 90
+SCORE_WORD_PREFIX = 80
+SCORE_SUBSTRING = 70
+
+DEFAULT_FUZZY_THRESHOLD = 75
+
+# Fuzzy scoring is limited to the keys sharing the most trigrams with the query
+MAX_FUZZY_CANDIDATES = 200
+
+_TOKEN_SPLIT = re.compile(r"[^0-9A-Z]+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A ranked search result.
+
+    Attributes:
+        position: Row position in the indexed frame.
+        field: Field that matched (see ``SEARCH_FIELDS``).
+        value: Matched field value (uppercase).
+        score: Match score (0-100); fuzzy hits carry the ``thefuzz`` score.
+        fuzzy: Whether this is a typo-tolerant match.
+    """
+
+    position: int
+    field: str
+    value: str
+    score: int
+    fuzzy: bool = False
+
+
+def _trigrams(text: str) -> set[str]:
+    """Return the set of 3-character substrings of ``text``."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Trigram and prefix index over searchable drug fields.
+
+    Attributes:
+        names: Sorted distinct drug names for autocomplete.
+    """
+
+    def __init__(self, fields: Mapping[str, Sequence[str | None]]):
+        """Index per-row field values.
+
+        Args:
+            fields: Mapping of field name (from ``SEARCH_FIELDS``) to one
+                value per row; every sequence has the same length.
+        """
+        keys: dict[tuple[int, str], int] = {}
+        self._key_field: list[int] = []
+        self._key_value: list[str] = []
+        self._key_rows: list[list[int]] = []
+
+        for field_id, field in enumerate(SEARCH_FIELDS):
+            for position, raw in enumerate(fields.get(field, ())):
+                value = (raw or "").upper().strip()
+                if not value:
+                    continue
+                key_id = keys.get((field_id, value))
+                if key_id is None:
+                    key_id = keys[(field_id, value)] = len(self._key_value)
+                    self._key_field.append(field_id)
+                    self._key_value.append(value)
+                    self._key_rows.append([])
+                self._key_rows[key_id].append(position)
+
+        self._trigram_keys: dict[str, list[int]] = {}
+        tokens: list[tuple[str, int]] = []
+        for key_id, value in enumerate(self._key_value):
+            for trigram in _trigrams(value):
+                self._trigram_keys.setdefault(trigram, []).append(key_id)
+            tokens.extend(
+                (token, key_id) for token in set(_TOKEN_SPLIT.split(value)) if token
+            )
+        tokens.sort()
+        self._tokens = [token for token, _ in tokens]
+        self._token_keys = [key_id for _, key_id in tokens]
+
+        self.names = sorted(
+            {
+                name.strip()
+                for name in fields.get("drug_name", ())
+                if name and name.strip() and name.strip().lower() != "unknown"
+            }
+        )
+
+        logger.info(
+            f"Built search index: {len(self._key_value):,} keys, "
+            f"{len(self._trigram_keys):,} trigrams"
+        )
+
+    @classmethod
+    @traced("compute.build_search_index")
+    def from_frame(
+        cls, frame: pl.DataFrame, catalog: pl.DataFrame | None = None
+    ) -> "SearchIndex":
+        """Build an index over a drug frame.
+
+        Args:
+            frame: Drug frame (``DRUG_FRAME_SCHEMA``).
+            catalog: Catalog rows position-aligned with ``frame``; supplies
+                the generic name when present.
+
+        Returns:
+            SearchIndex whose positions are rows of ``frame``.
+        """
+        fields: dict[str, Sequence[str | None]] = {
+            "drug_name": frame["drug_name"].to_list(),
+            "ndc": frame["ndc_normalized"].to_list(),
+            "hcpcs_code": frame["hcpcs_code"].to_list(),
+            "manufacturer": frame["manufacturer"].to_list(),
+        }
+        if catalog is not None:
+            for column in GENERIC_NAME_COLUMNS:
+                if column in catalog.columns:
+                    fields["generic_name"] = catalog[column].cast(pl.String).to_list()
+                    break
+        return cls(fields)
+
+    def __len__(self) -> int:
+        """Return the number of distinct indexed (field, value) keys."""
+        return len(self._key_value)
+
+    def _matching_keys(self, query: str) -> list[int]:
+        """Return ids of keys containing ``query`` (3+ chars) or a word
+        starting with it (shorter queries)."""
+        if len(query) >= 3:
+            postings = [self._trigram_keys.get(t, []) for t in _trigrams(query)]
+            rarest = min(postings, key=len)
+            return [k for k in rarest if query in self._key_value[k]]
+
+        start = bisect.bisect_left(self._tokens, query)
+        end = bisect.bisect_left(self._tokens, query + "\uffff", lo=start)
+        return sorted(set(self._token_keys[start:end]))
+
+    def _score(self, key_id: int, query: str) -> int:
+        """Score an exact (substring or word prefix) key match."""
+        value = self._key_value[key_id]
+        if value == query:
+            return SCORE_EQUAL
+        if value.startswith(query):
+            return SCORE_PREFIX
+        if any(token.startswith(query) for token in _TOKEN_SPLIT.split(value)):
+            return SCORE_WORD_PREFIX
+        return SCORE_SUBSTRING
+
+    def _fuzzy_keys(
+        self, query: str, exclude: set[int], threshold: int
+    ) -> list[tuple[int, int]]:
+        """Score keys sharing trigrams with ``query`` using ``thefuzz``."""
+        shared: Counter[int] = Counter()
+        for trigram in _trigrams(query):
+            shared.update(self._trigram_keys.get(trigram, ()))
+
+        scored: list[tuple[int, int]] = []
+        for key_id, _ in shared.most_common(MAX_FUZZY_CANDIDATES + len(exclude)):
+            if key_id in exclude:
+                continue
+            if SEARCH_FIELDS[self._key_field[key_id]] not in FUZZY_FIELDS:
+                continue
+            score = fuzz.partial_ratio(query, self._key_value[key_id])
+            if score >= threshold:
+                scored.append((key_id, score))
+        return scored
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        fuzzy: bool = True,
+        fuzzy_threshold: int = DEFAULT_FUZZY_THRESHOLD,
+    ) -> list[SearchHit]:
+        """Return the top ``limit`` rows matching a query.
+
+        Args:
+            query: Drug name, generic name, manufacturer, NDC (any format)
+                or HCPCS code fragment; case-insensitive.
+            limit: Maximum number of hits.
+            fuzzy: Fill remaining slots with typo-tolerant matches.
+            fuzzy_threshold: Minimum ``thefuzz`` partial ratio (0-100).
+
+        Returns:
+            Hits ranked best first, at most one per row.
+        """
+        query = query.upper().strip()
+        if not query or limit <= 0:
+            return []
+
+        ranked: list[tuple[int, int, int, int]] = []  # (-score, field, row, key)
+        matched: set[int] = set()
+        queries = {query}
+        digits = re.sub(r"[^0-9]", "", query)
+        if digits and digits != query and not re.search(r"[A-Z]", query):
+            queries.add(digits)  # NDC typed with dashes or spaces
+        for text in queries:
+            for key_id in self._matching_keys(text):
+                if key_id in matched:
+                    continue
+                matched.add(key_id)
+                score = self._score(key_id, text)
+                ranked.append(
+                    (-score, self._key_field[key_id], self._key_rows[key_id][0], key_id)
+                )
+
+        hits = self._expand(sorted(ranked), limit, fuzzy=False)
+
+        if fuzzy and len(hits) < limit and len(query) >= 3:
+            fuzzy_ranked = [
+                (-score, self._key_field[key_id], self._key_rows[key_id][0], key_id)
+                for key_id, score in self._fuzzy_keys(query, matched, fuzzy_threshold)
+            ]
+            seen = {hit.position for hit in hits}
+            for hit in self._expand(sorted(fuzzy_ranked), limit, fuzzy=True):
+                if len(hits) >= limit:
+                    break
+                if hit.position not in seen:
+                    seen.add(hit.position)
+                    hits.append(hit)
+
+        return hits
+
+    def _expand(
+        self, ranked: list[tuple[int, int, int, int]], limit: int, fuzzy: bool
+    ) -> list[SearchHit]:
+        """Expand ranked keys into at most ``limit`` distinct row hits."""
+        hits: list[SearchHit] = []
+        seen: set[int] = set()
+        for negative_score, field_id, _, key_id in ranked:
+            for position in self._key_rows[key_id]:
+                if position in seen:
+                    continue
+                seen.add(position)
+                hits.append(
+                    SearchHit(
+                        position=position,
+                        field=SEARCH_FIELDS[field_id],
+                        value=self._key_value[key_id],
+                        score=-negative_score,
+                        fuzzy=fuzzy,
+                    )
+                )
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+    def first_position(self, query: str, field: str = "drug_name") -> int | None:
+        """Return the earliest row whose ``field`` contains the query.
+
+        Args:
+            query: Case-insensitive substring (not stripped).
+            field: Field to match (see ``SEARCH_FIELDS``).
+
+        Returns:
+            Smallest matching row position, or None.
+        """
+        query = query.upper()
+        if not query:
+            return None
+        field_id = SEARCH_FIELDS.index(field)
+        if len(query) >= 3:
+            keys = self._matching_keys(query)
+        else:
+            keys = [
+                k
+                for k, value in enumerate(self._key_value)
+                if self._key_field[k] == field_id and query in value
+            ]
+        positions = [
+            self._key_rows[k][0] for k in keys if self._key_field[k] == field_id
+        ]
+        return min(positions, default=None)
@@ -19,12 +19,25 @@ class Settings:
         data_dir: Directory for uploaded data files.
         cache_enabled: Whether to cache computed results.
         cache_ttl_hours: Cache time-to-live in hours.
+        analysis_cache_mb: Memory budget for cached margin analyses.
+        trace_enabled: Whether to record tracing spans (see ``tracing``).
+        snapshot_enabled: Whether scoring runs write Arrow IPC snapshots
+            (see ``snapshots``).
+        trace_path_override: Trace file to use instead of the default
+            under ``data_dir``.
+        snapshot_dir_override: Snapshot directory to use instead of the
+            default under ``data_dir``.
     """
 
     log_level: str
     data_dir: Path
     cache_enabled: bool
     cache_ttl_hours: int
+    analysis_cache_mb: int = 256
+    trace_enabled: bool = False
+    snapshot_enabled: bool = False
+    trace_path_override: Path | None = None
+    snapshot_dir_override: Path | None = None
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -39,6 +52,11 @@ class Settings:
         data_dir = Path(os.getenv("DATA_DIR", "./data/uploads"))
         cache_enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
         cache_ttl_hours = int(os.getenv("CACHE_TTL_HOURS", "24"))
+        analysis_cache_mb = int(os.getenv("ANALYSIS_CACHE_MB", "256"))
+        trace_enabled = os.getenv("TRACE_ENABLED", "false").lower() == "true"
+        snapshot_enabled = os.getenv("SNAPSHOT_ENABLED", "false").lower() == "true"
+        trace_path = os.getenv("TRACE_PATH")
+        snapshot_dir = os.getenv("SNAPSHOT_DIR")
 
         logger.debug(
             f"Loaded settings: log_level={log_level}, "
@@ -50,8 +68,28 @@ class Settings:
             data_dir=data_dir,
             cache_enabled=cache_enabled,
             cache_ttl_hours=cache_ttl_hours,
+            analysis_cache_mb=analysis_cache_mb,
+            trace_enabled=trace_enabled,
+            snapshot_enabled=snapshot_enabled,
+            trace_path_override=Path(trace_path) if trace_path else None,
+            snapshot_dir_override=Path(snapshot_dir) if snapshot_dir else None,
         )
 
+    @property
+    def cache_dir(self) -> Path:
+        """Directory for cached parsed input files."""
+        return self.data_dir / "cache"
+
+    @property
+    def trace_path(self) -> Path:
+        """JSON-lines file tracing spans are exported to."""
+        return self.trace_path_override or self.data_dir / "traces.jsonl"
+
+    @property
+    def snapshot_dir(self) -> Path:
+        """Directory for versioned Silver/Gold snapshots."""
+        return self.snapshot_dir_override or self.data_dir / "snapshots"
+
     def ensure_directories(self) -> None:
         """Create required directories if they don't exist."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
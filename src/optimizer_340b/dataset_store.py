@@ -0,0 +1,350 @@
+"""Process-wide store of read-only datasets shared across Streamlit sessions.
+
+Every browser session used to keep its own copy of each uploaded frame (and
+of the drug index built from them) in ``st.session_state``. Analysts mostly
+load the same quarterly files, so the copies were identical.
+
+``DatasetStore`` holds one copy per distinct content. Frames are keyed by a
+content fingerprint, so identical uploads from different sessions resolve to
+the same frame; derived read-only objects (the drug index) are keyed by the
+fingerprints they were built from. Entries are reference counted and dropped
+when the last handle is released.
+
+Sessions keep a ``SessionDatasets`` mapping in place of the plain
+``uploaded_data`` dict. It stores a handle per name and returns the shared
+frame on access; values that are not DataFrames (user-specific parameters)
+stay in a small per-session overlay and never enter the store. Handles are
+released when a name is overwritten or deleted, and all of them when the
+session's mapping is garbage-collected.
+
+Shared frames are read-only by convention: Polars operations return new
+frames, and no caller mutates a frame in place.
+"""
+
+import logging
+import threading
+import weakref
+from collections.abc import Callable, Hashable, Iterator, MutableMapping
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+import polars as pl
+
+from optimizer_340b.compute.analysis_cache import frame_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    """A stored value and the number of live handles to it."""
+
+    value: Any
+    refs: int
+    nbytes: int
+
+
+@dataclass
+class _Pending:
+    """A value being built, and the callers waiting for it."""
+
+    future: Future[Any]
+    waiters: int = 0
+
+
+def _nbytes(value: Any) -> int:
+    """Estimated size of a frame (0 for other values)."""
+    if isinstance(value, pl.DataFrame):
+        return int(value.estimated_size())
+    return 0
+
+
+class DatasetHandle:
+    """Reference to one store entry; release it when no longer needed.
+
+    Attributes:
+        key: Store key (content fingerprint for frames).
+    """
+
+    __slots__ = ("key", "_store", "_released")
+
+    def __init__(self, store: "DatasetStore", key: Hashable):
+        """Wrap an already-counted reference (see ``DatasetStore``)."""
+        self.key = key
+        self._store = store
+        self._released = False
+
+    @property
+    def value(self) -> Any:
+        """The shared value.
+
+        Raises:
+            KeyError: If the handle was released.
+        """
+        if self._released:
+            raise KeyError(f"Dataset handle released: {self.key}")
+        return self._store.get(self.key)
+
+    def release(self) -> None:
+        """Drop this reference; releasing twice is a no-op."""
+        if not self._released:
+            self._released = True
+            self._store.release(self.key)
+
+
+class DatasetStore:
+    """Thread-safe, reference-counted store of shared read-only values.
+
+    Attributes:
+        dedup_hits: ``put`` calls answered with an already-stored frame.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty store."""
+        self.dedup_hits = 0
+        self._entries: dict[Hashable, _Entry] = {}
+        self._pending: dict[Hashable, _Pending] = {}
+        self._lock = threading.RLock()
+
+    def put(self, frame: pl.DataFrame) -> DatasetHandle:
+        """Store a frame, or reference the identical frame already stored.
+
+        Args:
+            frame: Frame to share.
+
+        Returns:
+            Handle to the stored frame (possibly an earlier, equal one).
+        """
+        key = frame_fingerprint(frame)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._entries[key] = _Entry(frame, 1, _nbytes(frame))
+            else:
+                entry.refs += 1
+                self.dedup_hits += 1
+                logger.debug(f"Dataset {key[:12]} already stored ({entry.refs} refs)")
+        return DatasetHandle(self, key)
+
+    def share(self, key: Hashable, build: Callable[[], Any]) -> DatasetHandle:
+        """Reference a derived value, building it if no session has yet.
+
+        ``build`` runs outside the store lock, so one session's build does
+        not stall other sessions. Concurrent requests for the same key wait
+        on the first caller's build instead of repeating it.
+
+        Args:
+            key: Identifies the value, e.g. the fingerprints it is built from.
+            build: Produces the value on a miss.
+
+        Returns:
+            Handle to the shared value.
+
+        Raises:
+            Exception: Whatever ``build`` raised, in the builder and in every
+                caller waiting on it.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += 1
+                return DatasetHandle(self, key)
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _Pending(Future())
+                building = True
+            else:
+                pending.waiters += 1
+                building = False
+
+        if not building:
+            # The builder counted this reference when it published the value
+            pending.future.result()
+            return DatasetHandle(self, key)
+
+        try:
+            value = build()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[key]
+            pending.future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._pending[key]
+            self._entries[key] = _Entry(value, 1 + pending.waiters, _nbytes(value))
+        pending.future.set_result(value)
+        return DatasetHandle(self, key)
+
+    def acquire(self, key: Hashable) -> DatasetHandle:
+        """Take another reference to a stored entry.
+
+        Raises:
+            KeyError: If ``key`` is not stored.
+        """
+        with self._lock:
+            self._entries[key].refs += 1
+        return DatasetHandle(self, key)
+
+    def get(self, key: Hashable) -> Any:
+        """Return a stored value.
+
+        Raises:
+            KeyError: If ``key`` is not stored.
+        """
+        with self._lock:
+            return self._entries[key].value
+
+    def release(self, key: Hashable) -> None:
+        """Drop one reference, removing the entry with the last one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs <= 0:
+                del self._entries[key]
+
+    def refs(self, key: Hashable) -> int:
+        """Live references to ``key`` (0 if not stored)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry.refs if entry is not None else 0
+
+    @property
+    def nbytes(self) -> int:
+        """Summed ``estimated_size`` of the stored frames."""
+        with self._lock:
+            return sum(entry.nbytes for entry in self._entries.values())
+
+    def __len__(self) -> int:
+        """Return the number of stored entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Return True if ``key`` is stored."""
+        return key in self._entries
+
+
+def _release_all(handles: dict[str, DatasetHandle]) -> None:
+    """Release every handle in a mapping (session finalizer)."""
+    for handle in handles.values():
+        handle.release()
+    handles.clear()
+
+
+class SessionDatasets(MutableMapping[str, Any]):
+    """A session's named datasets: shared-store handles plus an overlay.
+
+    DataFrames assigned to a name are put in the store and held by handle;
+    any other value is kept in the session-local overlay.
+    """
+
+    def __init__(self, store: DatasetStore | None = None):
+        """Initialize an empty mapping.
+
+        Args:
+            store: Store to share frames through (default: process-wide).
+        """
+        self.store = store if store is not None else get_dataset_store()
+        self.overlay: dict[str, Any] = {}
+        self._handles: dict[str, DatasetHandle] = {}
+        self._shared: dict[str, DatasetHandle] = {}
+        weakref.finalize(self, _release_all, self._handles)
+        weakref.finalize(self, _release_all, self._shared)
+
+    def __getitem__(self, name: str) -> Any:
+        """Return the overlay value or shared frame stored under ``name``."""
+        if name in self.overlay:
+            return self.overlay[name]
+        return self._handles[name].value
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        """Share a DataFrame through the store, or keep any other value local."""
+        self._discard(name)
+        if isinstance(value, pl.DataFrame):
+            self._handles[name] = self.store.put(value)
+        else:
+            self.overlay[name] = value
+
+    def __delitem__(self, name: str) -> None:
+        """Remove ``name``, releasing its handle."""
+        if name not in self:
+            raise KeyError(name)
+        self._discard(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over shared then overlay names."""
+        yield from self._handles
+        yield from self.overlay
+
+    def __len__(self) -> int:
+        """Return the number of names."""
+        return len(self._handles) + len(self.overlay)
+
+    def __contains__(self, name: object) -> bool:
+        """Return True if ``name`` is set (cheaper than the Mapping default)."""
+        return name in self._handles or name in self.overlay
+
+    def key(self, name: str) -> Hashable | None:
+        """Store key of a shared frame, or None for overlay or missing names."""
+        handle = self._handles.get(name)
+        return handle.key if handle is not None else None
+
+    def shared(self, name: str, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return a derived value shared by every session with the same key.
+
+        The session keeps one derived handle per ``name``; asking with a new
+        key releases the previous one.
+
+        Args:
+            name: Session-local slot, e.g. ``"drug_index"``.
+            key: Store key identifying the value's inputs.
+            build: Produces the value if no session has built it.
+
+        Returns:
+            The shared value.
+        """
+        handle = self._shared.get(name)
+        if handle is None or handle.key != key:
+            if handle is not None:
+                handle.release()
+            handle = self.store.share(key, build)
+            self._shared[name] = handle
+        return handle.value
+
+    def _discard(self, name: str) -> None:
+        """Drop ``name`` from the overlay and release any handle to it."""
+        self.overlay.pop(name, None)
+        handle = self._handles.pop(name, None)
+        if handle is not None:
+            handle.release()
+
+
+_dataset_store: DatasetStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_dataset_store() -> DatasetStore:
+    """Return the process-wide dataset store.
+
+    Returns:
+        DatasetStore created on first use.
+    """
+    global _dataset_store
+    with _store_lock:
+        if _dataset_store is None:
+            _dataset_store = DatasetStore()
+        return _dataset_store
+
+
+def set_dataset_store(store: DatasetStore | None) -> None:
+    """Replace the process-wide dataset store.
+
+    Args:
+        store: Store to use, or None to create a fresh one on next use.
+    """
+    global _dataset_store
+    with _store_lock:
+        _dataset_store = store
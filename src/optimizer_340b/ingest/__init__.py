@@ -2,10 +2,19 @@
 
 This module handles:
 - Loading raw data files (Bronze Layer)
+- Caching parsed files as Parquet
+- Loading independent files concurrently
 - Validating schemas and data quality
 - Normalizing and joining data (Silver Layer)
 """
 
+from optimizer_340b.ingest.cache import (
+    ParquetCache,
+    cached_frame,
+    get_default_cache,
+    set_default_cache,
+)
+from optimizer_340b.ingest.fuzzy_matcher import FuzzyMatcher
 from optimizer_340b.ingest.loaders import (
     detect_file_type,
     load_csv_to_polars,
@@ -14,10 +23,12 @@ from optimizer_340b.ingest.loaders import (
 )
 from optimizer_340b.ingest.normalizers import (
     build_silver_dataset,
+    build_silver_dataset_lazy,
     fuzzy_match_drug_name,
     fuzzy_match_drug_partial,
     join_asp_pricing,
     join_catalog_to_crosswalk,
+    ndc_expr,
     normalize_asp_pricing,
     normalize_catalog,
     normalize_crosswalk,
@@ -25,6 +36,13 @@ from optimizer_340b.ingest.normalizers import (
     normalize_ndc_column,
     preprocess_cms_csv,
 )
+from optimizer_340b.ingest.orchestrator import IngestResult, ingest_sources
+from optimizer_340b.ingest.sources import (
+    REFERENCE_FILES,
+    SOURCE_FILES,
+    load_source,
+    resolve_source_paths,
+)
 from optimizer_340b.ingest.validators import (
     ValidationResult,
     validate_asp_quarter,
@@ -37,11 +55,24 @@ from optimizer_340b.ingest.validators import (
 )
 
 __all__ = [
+    # Cache
+    "ParquetCache",
+    "cached_frame",
+    "get_default_cache",
+    "set_default_cache",
     # Loaders
     "load_excel_to_polars",
     "load_csv_to_polars",
     "load_file_auto",
     "detect_file_type",
+    # Sources
+    "SOURCE_FILES",
+    "REFERENCE_FILES",
+    "load_source",
+    "resolve_source_paths",
+    # Orchestrator
+    "IngestResult",
+    "ingest_sources",
     # Validators
     "ValidationResult",
     "validate_catalog_schema",
@@ -54,13 +85,16 @@ __all__ = [
     # Normalizers (Silver Layer)
     "normalize_ndc",
     "normalize_ndc_column",
+    "ndc_expr",
     "normalize_catalog",
     "normalize_crosswalk",
     "normalize_asp_pricing",
     "preprocess_cms_csv",
     "fuzzy_match_drug_name",
     "fuzzy_match_drug_partial",
+    "FuzzyMatcher",
     "join_catalog_to_crosswalk",
     "join_asp_pricing",
     "build_silver_dataset",
+    "build_silver_dataset_lazy",
 ]
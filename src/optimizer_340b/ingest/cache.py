@@ -0,0 +1,264 @@
+"""Content-addressed Parquet cache for parsed input files.
+
+Parsing the product catalog through openpyxl dominates cold start, and the
+CMS CSVs are re-parsed on every session. This module stores each parsed
+frame as Parquet, keyed on a SHA-256 of the raw file bytes plus the loader
+arguments that shape the result (sheet, skip_rows, encoding, dtype
+overrides). A repeat load of an unchanged file costs one Parquet read.
+
+The cache honours ``Settings.cache_enabled`` and ``Settings.cache_ttl_hours``
+and lives under ``Settings.cache_dir``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Any
+
+import polars as pl
+
+from optimizer_340b.config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when loader output changes shape so stale entries are never served
+CACHE_FORMAT_VERSION = 1
+
+CACHE_FILE_SUFFIX = ".parquet"
+
+
+class ParquetCache:
+    """Parquet-backed cache of parsed DataFrames.
+
+    Attributes:
+        cache_dir: Directory holding the cached Parquet files.
+        enabled: Whether reads and writes go through the cache.
+        ttl_hours: Entries older than this are treated as misses.
+    """
+
+    def __init__(self, cache_dir: Path, enabled: bool = True, ttl_hours: int = 24):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached Parquet files.
+            enabled: Whether reads and writes go through the cache.
+            ttl_hours: Entries older than this are treated as misses.
+        """
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.ttl_hours = ttl_hours
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ParquetCache":
+        """Create a cache configured from application settings.
+
+        Args:
+            settings: Application settings.
+
+        Returns:
+            ParquetCache rooted at ``settings.cache_dir``.
+        """
+        return cls(
+            cache_dir=settings.cache_dir,
+            enabled=settings.cache_enabled,
+            ttl_hours=settings.cache_ttl_hours,
+        )
+
+    def path_for(self, key: str) -> Path:
+        """Return the Parquet path for a cache key."""
+        return self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+
+    def get(self, key: str) -> pl.DataFrame | None:
+        """Read a cached frame.
+
+        Args:
+            key: Cache key from :func:`make_cache_key`.
+
+        Returns:
+            Cached DataFrame, or None on miss, expiry, or read failure.
+        """
+        if not self.enabled:
+            return None
+
+        path = self.path_for(key)
+        try:
+            age_hours = (time.time() - path.stat().st_mtime) / 3600
+        except FileNotFoundError:
+            return None
+
+        if age_hours > self.ttl_hours:
+            logger.debug(f"Cache entry expired ({age_hours:.1f}h old): {key}")
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            df = pl.read_parquet(path)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        logger.info(f"Cache hit: {df.height} rows from {path.name}")
+        return df
+
+    def put(self, key: str, df: pl.DataFrame) -> None:
+        """Write a frame to the cache.
+
+        Writes go to a uniquely named temporary file that is atomically
+        renamed into place, so concurrent writers (threads included) never
+        observe or clobber a partial entry. Frames that
+        cannot be represented in Parquet are skipped with a warning.
+
+        Args:
+            key: Cache key from :func:`make_cache_key`.
+            df: DataFrame to store.
+        """
+        if not self.enabled:
+            return
+
+        path = self.path_for(key)
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            df.write_parquet(tmp_path)
+            os.replace(tmp_path, path)
+            logger.debug(f"Cached {df.height} rows as {path.name}")
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            logger.warning(f"Could not cache frame {key}: {e}")
+
+    def clear(self) -> int:
+        """Remove all cached entries.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        removed = 0
+        for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+            path.unlink(missing_ok=True)
+            removed += 1
+        logger.info(f"Cleared {removed} cache entries")
+        return removed
+
+
+_default_cache: ParquetCache | None = None
+
+
+def get_default_cache() -> ParquetCache:
+    """Return the process-wide cache configured from the environment.
+
+    Returns:
+        ParquetCache built from ``Settings.from_env()`` on first use.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParquetCache.from_settings(Settings.from_env())
+    return _default_cache
+
+
+def set_default_cache(cache: ParquetCache | None) -> None:
+    """Replace the process-wide cache.
+
+    Args:
+        cache: Cache to use, or None to re-read settings on next use.
+    """
+    global _default_cache
+    _default_cache = cache
+
+
+def hash_source(source: IO[bytes] | IO[str] | Path | str) -> str:
+    """Compute the SHA-256 of a file's raw bytes.
+
+    File-like objects are rewound after hashing so the loader can read them.
+
+    Args:
+        source: File path, path string, or file-like object.
+
+    Returns:
+        Hex digest of the file contents.
+    """
+    if isinstance(source, str | Path):
+        with open(source, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    if hasattr(source, "getvalue"):
+        content = source.getvalue()
+    else:
+        content = source.read()
+        source.seek(0)
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(content_hash: str, loader: str, params: dict[str, Any]) -> str:
+    """Build a cache key from file content and loader arguments.
+
+    Args:
+        content_hash: SHA-256 of the raw file bytes.
+        loader: Name of the loader producing the frame.
+        params: Loader arguments that affect the parsed result.
+
+    Returns:
+        Hex digest identifying this (content, loader, params) combination.
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_FORMAT_VERSION,
+            "polars": pl.__version__,
+            "content": content_hash,
+            "loader": loader,
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def cached_frame(
+    source: IO[bytes] | IO[str] | Path | str,
+    loader: str,
+    params: dict[str, Any],
+    build: Callable[[], pl.DataFrame],
+    cache: ParquetCache | None = None,
+) -> pl.DataFrame:
+    """Return a parsed frame from cache, building and storing it on a miss.
+
+    Args:
+        source: File the frame is parsed from.
+        loader: Name of the loader producing the frame.
+        params: Loader arguments that affect the parsed result.
+        build: Callable that parses ``source`` when the cache misses.
+        cache: Cache to use. Defaults to :func:`get_default_cache`.
+
+    Returns:
+        Parsed DataFrame.
+    """
+    cache = cache or get_default_cache()
+    if not cache.enabled:
+        return build()
+
+    try:
+        key = make_cache_key(hash_source(source), loader, params)
+    except (OSError, AttributeError, TypeError) as e:
+        logger.debug(f"Cannot hash source for caching, loading directly: {e}")
+        return build()
+
+    df = cache.get(key)
+    if df is not None:
+        return df
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    df = build()
+    cache.put(key, df)
+    return df
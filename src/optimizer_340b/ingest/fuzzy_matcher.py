@@ -0,0 +1,238 @@
+"""Blocked fuzzy drug name matching (Silver Layer).
+
+``fuzzy_match_drug_name`` and ``fuzzy_match_drug_partial`` used to score
+every candidate in a Python loop, upper-casing each one on every call: O(N)
+per name and O(N*M) when reconciling two files. ``FuzzyMatcher``
+preprocesses a candidate list once and, per query:
+
+1. Bounds candidate lengths (ratio scoring only): a candidate much shorter
+   or longer than the query cannot reach the threshold.
+2. Counts shared bigrams through an inverted index and drops candidates
+   sharing fewer than any match above the threshold must share.
+3. Scores the surviving candidates in one ``rapidfuzz`` batch call.
+
+Both filters are lossless, so results equal the original loops: the best
+rounded score wins, and ties go to the earliest candidate.
+"""
+
+import bisect
+import logging
+import math
+from collections import Counter
+from collections.abc import Iterable
+
+from rapidfuzz import fuzz, process
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATIO_THRESHOLD = 80
+DEFAULT_PARTIAL_THRESHOLD = 70
+
+# Slack for float comparisons in the pruning bounds (bounds stay lossless)
+_EPSILON = 1e-6
+
+
+def _bigram_tokens(text: str) -> list[str]:
+    """Return the bigrams of ``text`` as a set-comparable multiset.
+
+    Repeated bigrams are numbered ("AN1", "AN2"), so the size of a plain set
+    intersection equals the multiset intersection of bigram counts.
+    """
+    seen: Counter[str] = Counter()
+    tokens = []
+    for i in range(len(text) - 1):
+        bigram = text[i : i + 2]
+        seen[bigram] += 1
+        tokens.append(f"{bigram}{seen[bigram]}")
+    return tokens
+
+
+class FuzzyMatcher:
+    """Candidate names preprocessed for repeated fuzzy lookups.
+
+    Scores are ``rapidfuzz`` ratios (or partial ratios) of the uppercased
+    strings, rounded to integers as ``thefuzz`` does.
+
+    Attributes:
+        partial: Whether candidates are scored with ``partial_ratio``.
+    """
+
+    def __init__(self, candidates: Iterable[str | None], partial: bool = False):
+        """Index candidate names.
+
+        Args:
+            candidates: Names to match against; None entries are ignored.
+            partial: Score with ``partial_ratio`` (substring-tolerant)
+                instead of ``ratio``.
+        """
+        self.partial = partial
+        self._scorer = fuzz.partial_ratio if partial else fuzz.ratio
+
+        # First occurrence of each uppercased name: (candidate order, original)
+        first: dict[str, tuple[int, str]] = {}
+        for order, candidate in enumerate(candidates):
+            if candidate is None:
+                continue
+            first.setdefault(candidate.upper(), (order, candidate))
+
+        # Sorted by length, so a length window is a contiguous id range
+        self._choices = sorted(first, key=len)
+        self._lengths = [len(choice) for choice in self._choices]
+        self._order = [first[choice][0] for choice in self._choices]
+        self._originals = [first[choice][1] for choice in self._choices]
+
+        # Bigram token -> increasing choice ids
+        self._postings: dict[str, list[int]] = {}
+        for choice_id, choice in enumerate(self._choices):
+            for token in _bigram_tokens(choice):
+                self._postings.setdefault(token, []).append(choice_id)
+
+        logger.debug(
+            f"Indexed {len(self._choices):,} fuzzy match candidates "
+            f"({len(self._postings):,} bigram tokens)"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of distinct (uppercased) candidates."""
+        return len(self._choices)
+
+    def _min_shared(self, query_len: int, choice_len: int, cutoff: float) -> float:
+        """Bigrams any candidate scoring ``cutoff`` or more must share.
+
+        A longest common subsequence of length M has at most ``len - M``
+        gaps in each string, so at least ``3M - 1 - (len1 + len2)`` of its
+        adjacent pairs are bigrams of both strings. The score bounds M from
+        below; partial ratios compare against a window of the longer string
+        and are bounded through the shorter length.
+        """
+        if self.partial:
+            shorter = min(query_len, choice_len)
+            return shorter * (3 * cutoff - 200) / (200 - cutoff) - 1
+        return (query_len + choice_len) * (3 * cutoff / 200 - 1) - 1
+
+    def _candidates(self, query: str, cutoff: float) -> list[int]:
+        """Return ids of choices that can score ``cutoff`` or more."""
+        query_len = len(query)
+        lo, hi = 0, len(self._choices)
+        if not self.partial:
+            # ratio <= 200 * min(len1, len2) / (len1 + len2)
+            min_len = math.ceil(cutoff * query_len / (200 - cutoff) - _EPSILON)
+            max_len = math.floor(query_len * (200 - cutoff) / cutoff + _EPSILON)
+            lo = bisect.bisect_left(self._lengths, min_len)
+            hi = bisect.bisect_right(self._lengths, max_len)
+        if lo >= hi:
+            return []
+
+        # The bound grows with candidate length: shorter ones are unblocked
+        blocked = bisect.bisect_left(
+            self._lengths,
+            True,
+            lo,
+            hi,
+            key=lambda length: self._min_shared(query_len, length, cutoff) > 0,
+        )
+        survivors = list(range(lo, blocked))
+        if blocked < hi:
+            shared: Counter[int] = Counter()
+            for token in _bigram_tokens(query):
+                posting = self._postings.get(token)
+                if posting:
+                    start = bisect.bisect_left(posting, blocked)
+                    end = bisect.bisect_left(posting, hi, lo=start)
+                    shared.update(posting[start:end])
+            survivors.extend(
+                choice_id
+                for choice_id, count in shared.items()
+                if count + _EPSILON
+                >= self._min_shared(query_len, self._lengths[choice_id], cutoff)
+            )
+        return survivors
+
+    def _best(self, query: str, threshold: int) -> tuple[int, int] | None:
+        """Return (choice id, score) of the best match, or None."""
+        # Only a positive score can win, and round(score) >= threshold
+        # requires score >= threshold - 0.5
+        threshold = max(threshold, 1)
+        cutoff = threshold - 0.5 - _EPSILON
+
+        survivors = self._candidates(query, cutoff)
+        if not survivors:
+            return None
+        scored = process.extract(
+            query,
+            [self._choices[choice_id] for choice_id in survivors],
+            scorer=self._scorer,
+            score_cutoff=cutoff,
+            limit=None,
+        )
+
+        best: tuple[int, int] | None = None
+        best_key = (0, 0)
+        for _, raw_score, index in scored:
+            score = int(round(raw_score))
+            if score < threshold:
+                continue
+            choice_id = survivors[index]
+            key = (-score, self._order[choice_id])
+            if best is None or key < best_key:
+                best, best_key = (choice_id, score), key
+        return best
+
+    def _threshold(self, threshold: int | None) -> int:
+        """Return the threshold, defaulting by scorer."""
+        if threshold is not None:
+            return threshold
+        return DEFAULT_PARTIAL_THRESHOLD if self.partial else DEFAULT_RATIO_THRESHOLD
+
+    def match(self, name: str, threshold: int | None = None) -> str | None:
+        """Find the best matching candidate for a name.
+
+        Args:
+            name: Drug name to match (case-insensitive).
+            threshold: Minimum similarity score (0-100); defaults to 80 for
+                ratio and 70 for partial matching.
+
+        Returns:
+            Best matching candidate (as given), or None if no candidate
+            scores at or above the threshold.
+        """
+        if not name or not self._choices:
+            return None
+        best = self._best(name.upper(), self._threshold(threshold))
+        if best is None:
+            return None
+        choice_id, score = best
+        match = self._originals[choice_id]
+        logger.debug(f"Fuzzy match '{name}' -> '{match}' (score: {score})")
+        return match
+
+    def match_many(
+        self, names: Iterable[str | None], threshold: int | None = None
+    ) -> list[str | None]:
+        """Match a list of names, e.g. to reconcile a file against a catalog.
+
+        Each distinct (uppercased) name is scored once.
+
+        Args:
+            names: Drug names to match; None and empty names match nothing.
+            threshold: Minimum similarity score (see ``match``).
+
+        Returns:
+            Best matching candidate per name, aligned with ``names``.
+        """
+        threshold = self._threshold(threshold)
+        matches: dict[str, str | None] = {}
+        results: list[str | None] = []
+        for name in names:
+            if not name:
+                results.append(None)
+                continue
+            query = name.upper()
+            if query not in matches:
+                best = self._best(query, threshold) if self._choices else None
+                matches[query] = None if best is None else self._originals[best[0]]
+            results.append(matches[query])
+
+        matched = sum(match is not None for match in results)
+        logger.info(f"Fuzzy matched {matched:,} of {len(results):,} names")
+        return results
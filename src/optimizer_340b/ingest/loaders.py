@@ -1,13 +1,16 @@
 """File loading utilities for 340B data sources."""
 
 import logging
-from io import BytesIO
+from importlib.util import find_spec
 from pathlib import Path
-from typing import BinaryIO
+from typing import IO, BinaryIO, cast
 
-import pandas as pd
+import openpyxl  # type: ignore[import-untyped]
 import polars as pl
 
+from optimizer_340b.ingest.cache import cached_frame
+from optimizer_340b.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Columns that should always be read as strings to preserve leading zeros
@@ -21,21 +24,56 @@ NDC_COLUMN_NAMES = {
     "Product Catalog NDC",  # Wholesaler catalog
 }
 
-
+# Excel engines accepted by load_excel_to_polars
+EXCEL_ENGINES = ("auto", "calamine", "openpyxl")
+
+# Cell text treated as missing (the pandas.read_excel defaults)
+EXCEL_NA_VALUES = frozenset(
+    {
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    }
+)
+
+
+@traced("ingest.load_excel")
 def load_excel_to_polars(
     file: BinaryIO | Path | str,
     sheet_name: str | int = 0,
+    engine: str = "auto",
 ) -> pl.DataFrame:
     """Load Excel file into Polars DataFrame.
 
-    Uses pandas as intermediate step for Excel parsing (openpyxl backend),
-    then converts to Polars for downstream processing efficiency.
+    The workbook is opened once: the header row is read and the data rows
+    are streamed from the same pass, with NDC columns typed as strings as
+    they are collected. The ``calamine`` engine (via the optional
+    ``fastexcel`` package) is used when installed; otherwise openpyxl runs
+    in read-only mode.
 
     NDC columns are automatically read as strings to preserve leading zeros.
 
     Args:
         file: File path, path string, or file-like object.
         sheet_name: Sheet name or index to load. Defaults to first sheet.
+        engine: "calamine", "openpyxl", or "auto" to pick the fastest
+            installed engine.
 
     Returns:
         Polars DataFrame with loaded data.
@@ -43,41 +81,23 @@ def load_excel_to_polars(
     Raises:
         ValueError: If file cannot be parsed as Excel.
     """
-    logger.info(f"Loading Excel file, sheet: {sheet_name}")
+    engine = resolve_excel_engine(engine)
+    logger.info(f"Loading Excel file, sheet: {sheet_name}, engine: {engine}")
 
     try:
         # Handle different input types
         if isinstance(file, str):
             file = Path(file)
 
-        # First pass: read headers to detect NDC columns
-        # Use pandas for Excel parsing (openpyxl backend)
-        pdf_headers = pd.read_excel(
-            file, sheet_name=sheet_name, engine="openpyxl", nrows=0
-        )
-
-        # Build dtype dict for NDC columns to preserve leading zeros
-        dtype_overrides: dict[str, type] = {}
-        for col in pdf_headers.columns:
-            if col in NDC_COLUMN_NAMES:
-                dtype_overrides[col] = str
-                logger.info(f"Reading '{col}' as string to preserve leading zeros")
-
-        # Reset file position if it's a file-like object
-        if hasattr(file, "seek"):
-            file.seek(0)
-
-        # Read with dtype overrides
-        pdf = pd.read_excel(
-            file,
-            sheet_name=sheet_name,
-            engine="openpyxl",
-            dtype=dtype_overrides if dtype_overrides else None,
+        params = {
+            "sheet_name": sheet_name,
+            "engine": engine,
+            "ndc_columns": sorted(NDC_COLUMN_NAMES),
+        }
+        df = cached_frame(
+            file, "excel", params, lambda: _read_excel(file, sheet_name, engine)
         )
 
-        # Convert to Polars
-        df = pl.from_pandas(pdf)
-
         logger.info(f"Loaded {df.height} rows, {df.width} columns")
         return df
 
@@ -86,8 +106,194 @@ def load_excel_to_polars(
         raise ValueError(f"Cannot parse Excel file: {e}") from e
 
 
+def resolve_excel_engine(engine: str) -> str:
+    """Map an engine name to the engine that will actually be used."""
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(
+            f"Unknown Excel engine: {engine}. Supported: {', '.join(EXCEL_ENGINES)}"
+        )
+    if engine == "auto":
+        return "calamine" if find_spec("fastexcel") is not None else "openpyxl"
+    return engine
+
+
+def _read_excel(
+    file: BinaryIO | Path, sheet_name: str | int, engine: str
+) -> pl.DataFrame:
+    """Parse an Excel sheet in a single pass, reading NDC columns as strings."""
+    if engine == "calamine":
+        return _read_excel_calamine(file, sheet_name)
+    return _read_excel_openpyxl(file, sheet_name)
+
+
+def _read_excel_openpyxl(file: BinaryIO | Path, sheet_name: str | int) -> pl.DataFrame:
+    """Stream an Excel sheet with openpyxl in read-only mode."""
+    workbook = openpyxl.load_workbook(
+        file, read_only=True, data_only=True, keep_links=False
+    )
+    try:
+        if isinstance(sheet_name, int):
+            sheet = workbook.worksheets[sheet_name]
+        else:
+            sheet = workbook[sheet_name]
+
+        rows = sheet.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        # NDC columns are typed as text while rows stream in
+        as_string: list[bool] = []
+        for name in _excel_column_names(header):
+            as_string.append(name in NDC_COLUMN_NAMES)
+            if as_string[-1]:
+                logger.info(f"Reading '{name}' as string to preserve leading zeros")
+
+        columns: list[list[object]] = [[] for _ in header]
+        height = 0
+        blank_run = 0
+        for row in rows:
+            cleaned = [None if _is_excel_null(v) else v for v in row]
+            # Trailing blank rows are formatting residue; pandas.read_excel
+            # drops them, so blank rows are only kept once data follows
+            if all(v is None for v in cleaned):
+                blank_run += 1
+                continue
+            if blank_run:
+                for column in columns:
+                    column.extend([None] * blank_run)
+                height += blank_run
+                blank_run = 0
+
+            while len(columns) < len(cleaned):
+                columns.append([None] * height)
+                as_string.append(False)
+            for idx, column in enumerate(columns):
+                value = cleaned[idx] if idx < len(cleaned) else None
+                if as_string[idx] and value is not None:
+                    value = _excel_text(value)
+                column.append(value)
+            height += 1
+    finally:
+        workbook.close()
+
+    # Trailing columns without a header or any data are formatting residue
+    header += [None] * (len(columns) - len(header))
+    width = len(columns)
+    while (
+        width
+        and header[width - 1] is None
+        and all(v is None for v in columns[width - 1])
+    ):
+        width -= 1
+
+    return pl.DataFrame(
+        [
+            _excel_series(name, values, as_string=is_ndc)
+            for name, values, is_ndc in zip(
+                _excel_column_names(header[:width]),
+                columns[:width],
+                as_string[:width],
+                strict=True,
+            )
+        ]
+    )
+
+
+def _read_excel_calamine(file: BinaryIO | Path, sheet_name: str | int) -> pl.DataFrame:
+    """Read an Excel sheet with the calamine engine (fastexcel)."""
+    import fastexcel  # type: ignore[import-not-found,unused-ignore]
+
+    source = str(file) if isinstance(file, Path) else file.read()
+    reader = fastexcel.read_excel(source)
+    sheet = reader.load_sheet(
+        sheet_name, dtypes=dict.fromkeys(NDC_COLUMN_NAMES, "string")
+    )
+    df = sheet.to_polars()
+
+    # Align with the openpyxl engine: pandas-style unnamed headers, NA strings
+    # as null, trailing blank rows dropped, and whole-number columns as integers
+    df = df.rename(
+        {
+            col: f"Unnamed: {col.removeprefix('__UNNAMED__')}"
+            for col in df.columns
+            if col.startswith("__UNNAMED__")
+        }
+    )
+    na_values = list(EXCEL_NA_VALUES)
+    df = df.with_columns(
+        pl.when(~pl.col(col).is_in(na_values)).then(pl.col(col))
+        for col, dtype in df.schema.items()
+        if dtype == pl.String
+    )
+    if df.width and df.height:
+        has_data = ~pl.all_horizontal(pl.all().is_null())
+        last_row = df.select(has_data.arg_true().max()).item()
+        df = df.head(0 if last_row is None else last_row + 1)
+    df = df.with_columns(pl.col(pl.Datetime).dt.cast_time_unit("us"))
+    whole_number_columns = [
+        col
+        for col, dtype in df.schema.items()
+        if dtype == pl.Float64
+        and df.height
+        and df[col].null_count() == 0
+        and (df[col] == df[col].round()).all()
+    ]
+    return df.with_columns(pl.col(whole_number_columns).cast(pl.Int64))
+
+
+def _is_excel_null(value: object) -> bool:
+    """Return True for cells pandas.read_excel would treat as missing."""
+    return value is None or (isinstance(value, str) and value in EXCEL_NA_VALUES)
+
+
+def _excel_column_names(header: list[object]) -> list[str]:
+    """Build column names the way pandas does: unnamed and mangled duplicates."""
+    names: list[str] = []
+    seen: dict[str, int] = {}
+    for idx, value in enumerate(header):
+        name = f"Unnamed: {idx}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def _excel_text(value: object) -> str:
+    """Render a cell as text, dropping the ``.0`` Excel adds to whole numbers."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _excel_series(name: str, values: list[object], as_string: bool) -> pl.Series:
+    """Type one column of cell values, with missing cells already ``None``.
+
+    ``as_string`` columns must already hold text (see ``_excel_text``).
+    """
+    if as_string:
+        return pl.Series(name, values, pl.String)
+
+    present = [v for v in values if v is not None]
+    kinds = {type(v) for v in present}
+    if not kinds:
+        return pl.Series(name, values, pl.Float64)
+    if kinds <= {int, float}:
+        numbers = cast(list[int | float], present)
+        whole = all(isinstance(v, int) or v.is_integer() for v in numbers)
+        if whole and len(present) == len(values):
+            return pl.Series(name, [int(v) for v in numbers], pl.Int64)
+        return pl.Series(name, values, pl.Float64)
+    if len(kinds) == 1:
+        return pl.Series(name, values)
+    # Mixed text and numbers: keep every value as text
+    return pl.Series(
+        name, [None if v is None else _excel_text(v) for v in values], pl.String
+    )
+
+
+@traced("ingest.load_csv")
 def load_csv_to_polars(
-    file: BinaryIO | Path | str,
+    file: IO[bytes] | IO[str] | Path | str,
     encoding: str = "latin-1",
     infer_schema_length: int = 10000,
 ) -> pl.DataFrame:
@@ -113,69 +319,17 @@ def load_csv_to_polars(
         if isinstance(file, str):
             file = Path(file)
 
-        # First pass: read headers to detect NDC columns
-        if isinstance(file, Path):
-            df_headers = pl.read_csv(
-                file,
-                encoding=encoding,
-                n_rows=0,
-                truncate_ragged_lines=True,
-            )
-        else:
-            # File-like object - read bytes
-            content = file.read()
-            if isinstance(content, str):
-                content = content.encode(encoding)
-            df_headers = pl.read_csv(
-                BytesIO(content),
-                encoding=encoding,
-                n_rows=0,
-                truncate_ragged_lines=True,
-            )
-
-        # Build schema overrides for NDC columns (to preserve leading zeros)
-        schema_overrides = {
-            col: pl.String for col in df_headers.columns if col in NDC_COLUMN_NAMES
+        params = {
+            "encoding": encoding,
+            "infer_schema_length": infer_schema_length,
+            "ndc_columns": sorted(NDC_COLUMN_NAMES),
         }
-        for col in schema_overrides:
-            logger.info(f"Reading '{col}' as string to preserve leading zeros")
-
-        # Reset file position if it's a file-like object
-        if hasattr(file, "seek"):
-            file.seek(0)
-        elif not isinstance(file, Path):
-            # Recreate BytesIO from content
-            file = BytesIO(content)
-
-        if isinstance(file, Path):
-            df = pl.read_csv(
-                file,
-                encoding=encoding,
-                infer_schema_length=infer_schema_length,
-                truncate_ragged_lines=True,
-                schema_overrides=schema_overrides if schema_overrides else None,
-            )
-        else:
-            # File-like object - read bytes and parse
-            if hasattr(file, "read"):
-                content = file.read()
-                if isinstance(content, str):
-                    content = content.encode(encoding)
-                file = BytesIO(content)
-            df = pl.read_csv(
-                file,
-                encoding=encoding,
-                infer_schema_length=infer_schema_length,
-                truncate_ragged_lines=True,
-                schema_overrides=schema_overrides if schema_overrides else None,
-            )
-
-        # Drop completely empty columns (common in CMS crosswalk files)
-        non_empty_cols = [col for col in df.columns if df[col].null_count() < df.height]
-        if len(non_empty_cols) < len(df.columns):
-            dropped_count = len(df.columns) - len(non_empty_cols)
-            logger.info(f"Dropped {dropped_count} empty columns")
-            df = df.select(non_empty_cols)
+        df = cached_frame(
+            file,
+            "csv",
+            params,
+            lambda: _read_csv(file, encoding, infer_schema_length),
+        )
 
         logger.info(f"Loaded {df.height} rows, {df.width} columns")
         return df
@@ -185,6 +339,140 @@ def load_csv_to_polars(
         raise ValueError(f"Cannot parse CSV file: {e}") from e
 
 
+def _read_csv(
+    file: IO[bytes] | IO[str] | Path,
+    encoding: str,
+    infer_schema_length: int,
+) -> pl.DataFrame:
+    """Parse a CSV file, reading NDC columns as strings."""
+    source, encoding = csv_source(file, encoding)
+
+    # Build schema overrides for NDC columns (to preserve leading zeros)
+    schema_overrides = {
+        col: pl.String
+        for col in csv_header(source, encoding)
+        if col in NDC_COLUMN_NAMES
+    }
+    for col in schema_overrides:
+        logger.info(f"Reading '{col}' as string to preserve leading zeros")
+
+    df = pl.read_csv(
+        source,
+        encoding=encoding,
+        infer_schema_length=infer_schema_length,
+        truncate_ragged_lines=True,
+        schema_overrides=schema_overrides if schema_overrides else None,
+    )
+
+    # Drop completely empty columns (common in CMS crosswalk files)
+    return drop_empty_columns(df)
+
+
+def csv_source(
+    file: IO[bytes] | IO[str] | Path | str, encoding: str
+) -> tuple[Path | bytes, str]:
+    """Resolve a CSV input to one immutable buffer Polars can parse.
+
+    Uploads are taken from their underlying buffer without copying
+    (``getvalue()`` on a ``BytesIO``, including Streamlit's ``UploadedFile``,
+    returns the bytes it was created from), and that single buffer is shared
+    by the header sniff and the full parse. Polars decodes non-UTF-8 input
+    by materializing a re-encoded copy, so ASCII-only data in an
+    ASCII-compatible encoding (the usual case for CMS latin-1 files) is
+    parsed as UTF-8 directly.
+
+    Args:
+        file: File path, path string, or file-like object.
+        encoding: Declared character encoding of the file.
+
+    Returns:
+        Tuple of (path or raw bytes, encoding to pass to Polars).
+    """
+    if isinstance(file, str):
+        file = Path(file)
+
+    if isinstance(file, Path):
+        if _is_utf8(encoding):
+            return file, "utf8"
+        content = file.read_bytes()
+    else:
+        raw = file.getvalue() if hasattr(file, "getvalue") else file.read()
+        if isinstance(raw, str):
+            # Already-decoded text: encode once and parse as UTF-8
+            return raw.encode("utf-8"), "utf8"
+        content = raw
+
+    if _is_utf8(encoding) or (content.isascii() and _is_ascii_compatible(encoding)):
+        return content, "utf8"
+    return content, encoding
+
+
+def csv_header(source: Path | bytes, encoding: str, skip_rows: int = 0) -> list[str]:
+    """Read the column names of a CSV without parsing the data rows.
+
+    Args:
+        source: Path or raw bytes from :func:`csv_source`.
+        encoding: Encoding returned by :func:`csv_source`.
+        skip_rows: Metadata rows above the header.
+
+    Returns:
+        Column names.
+    """
+    if isinstance(source, bytes):
+        # Only the leading lines are handed to Polars, so a non-UTF-8 file
+        # is not decoded in full just to read its header
+        end = -1
+        for _ in range(skip_rows + 1):
+            end = source.find(b"\n", end + 1)
+            if end == -1:
+                break
+        source = source if end == -1 else source[: end + 1]
+
+    return pl.read_csv(
+        source,
+        encoding=encoding,
+        skip_rows=skip_rows,
+        n_rows=0,
+        truncate_ragged_lines=True,
+        infer_schema_length=0,
+    ).columns
+
+
+def drop_empty_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """Drop columns that contain only nulls, using a single null-count pass.
+
+    Args:
+        df: DataFrame to clean.
+
+    Returns:
+        DataFrame without all-null columns.
+    """
+    null_counts = df.null_count().row(0)
+    non_empty_cols = [
+        col
+        for col, nulls in zip(df.columns, null_counts, strict=True)
+        if nulls < df.height
+    ]
+    if len(non_empty_cols) < len(df.columns):
+        dropped_count = len(df.columns) - len(non_empty_cols)
+        logger.info(f"Dropped {dropped_count} empty columns")
+        df = df.select(non_empty_cols)
+    return df
+
+
+def _is_utf8(encoding: str) -> bool:
+    """Return True if the encoding name refers to strict UTF-8."""
+    return encoding.lower().replace("-", "").replace("_", "") == "utf8"
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    """Return True if ASCII bytes decode to the same text in this encoding."""
+    try:
+        return b"\n,az09".decode(encoding) == "\n,az09"
+    except (LookupError, UnicodeDecodeError):
+        return False
+
+
 def detect_file_type(filename: str) -> str:
     """Detect file type from filename extension.
 
@@ -6,16 +6,40 @@ This module handles:
 - CMS file preprocessing (skip header rows)
 - Fuzzy drug name matching
 - NDC-to-HCPCS crosswalk joins
+- A lazy Silver build (``build_silver_dataset_lazy``) that lets Polars push
+  projections into the scans and run the joins in its streaming engine
+
+The column-mapping and catalog/crosswalk/ASP normalizers accept either a
+DataFrame or a LazyFrame and return the same kind.
 """
 
+import functools
 import logging
 import re
+from collections.abc import Sequence
+from pathlib import Path
+from typing import BinaryIO, TypeVar
 
 import polars as pl
-from thefuzz import fuzz  # type: ignore[import-untyped]
+
+from optimizer_340b.ingest.cache import cached_frame
+from optimizer_340b.ingest.fuzzy_matcher import FuzzyMatcher
+from optimizer_340b.ingest.loaders import csv_header, csv_source, drop_empty_columns
+from optimizer_340b.tracing import traced
 
 logger = logging.getLogger(__name__)
 
+FrameT = TypeVar("FrameT", pl.DataFrame, pl.LazyFrame)
+
+# Optional crosswalk columns carried onto the catalog by the crosswalk join
+CROSSWALK_JOIN_COLUMNS = (
+    "Drug Name",
+    "Bill Units",
+    "Bill Units Per Pkg",
+    "Pkg Size",
+    "Pkg Qty",
+)
+
 # Columns that should always be read as strings to preserve leading zeros
 NDC_COLUMN_NAMES = {
     "NDC",
@@ -102,42 +126,71 @@ def normalize_ndc(ndc: str) -> str:
     return cleaned.zfill(11)[-11:]
 
 
+def ndc_expr(column: str | pl.Expr) -> pl.Expr:
+    """Build a native Polars expression equivalent to :func:`normalize_ndc`.
+
+    Runs entirely in the Polars engine (no per-row Python calls), so it is
+    the preferred way to normalize whole NDC columns. Nulls become "" to
+    match ``normalize_ndc(None)``.
+
+    Args:
+        column: Column name or expression holding raw NDC values.
+
+    Returns:
+        Expression producing 11-digit normalized NDC strings.
+    """
+    expr = pl.col(column) if isinstance(column, str) else column
+    return (
+        expr.cast(pl.String)
+        .str.replace_all(r"[^0-9]", "")
+        .str.zfill(11)
+        .str.slice(-11)
+        .fill_null("")
+    )
+
+
+def _column_names(df: pl.DataFrame | pl.LazyFrame) -> list[str]:
+    """Return column names without materializing a LazyFrame."""
+    return df.collect_schema().names()
+
+
+def _size(df: pl.DataFrame | pl.LazyFrame) -> str:
+    """Describe a frame's size for log messages."""
+    return f"{df.height} rows" if isinstance(df, pl.DataFrame) else "a lazy frame"
+
+
 def normalize_ndc_column(
-    df: pl.DataFrame,
+    df: FrameT,
     ndc_column: str = "NDC",
     output_column: str = "ndc_normalized",
-) -> pl.DataFrame:
+) -> FrameT:
     """Apply NDC normalization to a DataFrame column.
 
     Args:
-        df: DataFrame with NDC column.
+        df: DataFrame (or LazyFrame) with NDC column.
         ndc_column: Name of the NDC column.
         output_column: Name for the normalized output column.
 
     Returns:
         DataFrame with normalized NDC column added.
     """
-    if ndc_column not in df.columns:
+    if ndc_column not in _column_names(df):
         logger.warning(f"NDC column '{ndc_column}' not found in DataFrame")
         return df
 
-    return df.with_columns(
-        pl.col(ndc_column)
-        .map_elements(normalize_ndc, return_dtype=pl.String)
-        .alias(output_column)
-    )
+    return df.with_columns(ndc_expr(ndc_column).alias(output_column))
 
 
 def apply_column_mapping(
-    df: pl.DataFrame,
+    df: FrameT,
     column_map: dict[str, str],
-) -> pl.DataFrame:
+) -> FrameT:
     """Rename columns according to a mapping.
 
     Only renames columns that exist in the DataFrame.
 
     Args:
-        df: DataFrame to rename columns in.
+        df: DataFrame (or LazyFrame) to rename columns in.
         column_map: Mapping of old names to new names.
 
     Returns:
@@ -145,8 +198,9 @@ def apply_column_mapping(
     """
     # Build rename dict for columns that exist
     renames = {}
+    columns = _column_names(df)
     for old_name, new_name in column_map.items():
-        if old_name in df.columns:
+        if old_name in columns:
             renames[old_name] = new_name
             logger.debug(f"Mapping column: '{old_name}' -> '{new_name}'")
 
@@ -157,18 +211,19 @@ def apply_column_mapping(
     return df
 
 
-def normalize_catalog(df: pl.DataFrame) -> pl.DataFrame:
+@traced("normalize.catalog")
+def normalize_catalog(df: FrameT) -> FrameT:
     """Normalize product catalog to standard schema.
 
     Applies column mapping and NDC normalization.
 
     Args:
-        df: Raw catalog DataFrame.
+        df: Raw catalog DataFrame (or LazyFrame).
 
     Returns:
         Normalized catalog DataFrame with standard column names.
     """
-    logger.info(f"Normalizing catalog with {df.height} rows")
+    logger.info(f"Normalizing catalog with {_size(df)}")
 
     # Apply column mapping
     df = apply_column_mapping(df, CATALOG_COLUMN_MAP)
@@ -177,27 +232,29 @@ def normalize_catalog(df: pl.DataFrame) -> pl.DataFrame:
     df = normalize_ndc_column(df, ndc_column="NDC")
 
     # Derive Drug Name from Trade Name or Product Description if needed
-    if "Drug Name" not in df.columns:
-        if "Trade Name" in df.columns:
+    columns = _column_names(df)
+    if "Drug Name" not in columns:
+        if "Trade Name" in columns:
             df = df.with_columns(pl.col("Trade Name").alias("Drug Name"))
             logger.info("Using 'Trade Name' as 'Drug Name'")
-        elif "Product Description" in df.columns:
+        elif "Product Description" in columns:
             df = df.with_columns(pl.col("Product Description").alias("Drug Name"))
             logger.info("Using 'Product Description' as 'Drug Name'")
 
     return df
 
 
-def normalize_crosswalk(df: pl.DataFrame) -> pl.DataFrame:
+@traced("normalize.crosswalk")
+def normalize_crosswalk(df: FrameT) -> FrameT:
     """Normalize NDC-HCPCS crosswalk to standard schema.
 
     Args:
-        df: Raw crosswalk DataFrame.
+        df: Raw crosswalk DataFrame (or LazyFrame).
 
     Returns:
         Normalized crosswalk DataFrame with standard column names.
     """
-    logger.info(f"Normalizing crosswalk with {df.height} rows")
+    logger.info(f"Normalizing crosswalk with {_size(df)}")
 
     # Apply column mapping
     df = apply_column_mapping(df, CROSSWALK_COLUMN_MAP)
@@ -208,22 +265,23 @@ def normalize_crosswalk(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
-def normalize_asp_pricing(df: pl.DataFrame) -> pl.DataFrame:
+@traced("normalize.asp_pricing")
+def normalize_asp_pricing(df: FrameT) -> FrameT:
     """Normalize ASP pricing file to standard schema.
 
     Args:
-        df: Raw ASP pricing DataFrame.
+        df: Raw ASP pricing DataFrame (or LazyFrame).
 
     Returns:
         Normalized ASP pricing DataFrame with standard column names.
     """
-    logger.info(f"Normalizing ASP pricing with {df.height} rows")
+    logger.info(f"Normalizing ASP pricing with {_size(df)}")
 
     # Apply column mapping
     df = apply_column_mapping(df, ASP_PRICING_COLUMN_MAP)
 
     # Ensure Payment Limit is numeric
-    if "Payment Limit" in df.columns:
+    if "Payment Limit" in _column_names(df):
         df = df.with_columns(
             pl.col("Payment Limit")
             .cast(pl.Float64, strict=False)
@@ -233,6 +291,7 @@ def normalize_asp_pricing(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
+@traced("normalize.noc_pricing")
 def normalize_noc_pricing(df: pl.DataFrame) -> pl.DataFrame:
     """Normalize NOC pricing file to standard schema.
 
@@ -262,6 +321,7 @@ def normalize_noc_pricing(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
+@traced("normalize.noc_crosswalk")
 def normalize_noc_crosswalk(df: pl.DataFrame) -> pl.DataFrame:
     """Normalize NOC crosswalk file to standard schema.
 
@@ -286,8 +346,9 @@ def normalize_noc_crosswalk(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
+@traced("normalize.preprocess_cms_csv")
 def preprocess_cms_csv(
-    file_path: str,
+    file_path: BinaryIO | Path | str,
     skip_rows: int = 8,
     encoding: str = "latin-1",
 ) -> pl.DataFrame:
@@ -298,7 +359,7 @@ def preprocess_cms_csv(
     preserve leading zeros.
 
     Args:
-        file_path: Path to the CSV file.
+        file_path: Path to the CSV file, or an uploaded file-like object.
         skip_rows: Number of header rows to skip.
         encoding: File encoding (CMS uses latin-1).
 
@@ -307,25 +368,42 @@ def preprocess_cms_csv(
     """
     logger.info(f"Preprocessing CMS CSV, skipping {skip_rows} header rows")
 
-    # First pass: read a small sample to detect column names
-    df_sample = pl.read_csv(
+    if isinstance(file_path, str):
+        file_path = Path(file_path)
+
+    params = {
+        "skip_rows": skip_rows,
+        "encoding": encoding,
+        "ndc_columns": sorted(NDC_COLUMN_NAMES),
+    }
+    df = cached_frame(
         file_path,
-        encoding=encoding,
-        skip_rows=skip_rows,
-        n_rows=5,
-        truncate_ragged_lines=True,
-        infer_schema_length=0,  # Read all as strings for header detection
+        "cms_csv",
+        params,
+        lambda: _read_cms_csv(file_path, skip_rows, encoding),
     )
 
+    logger.info(f"Loaded {df.height} rows, {df.width} columns after preprocessing")
+    return df
+
+
+def _read_cms_csv(
+    file_path: BinaryIO | Path, skip_rows: int, encoding: str
+) -> pl.DataFrame:
+    """Parse a CMS CSV below its metadata rows, dropping empty columns."""
+    source, encoding = csv_source(file_path, encoding)
+
     # Build schema overrides for NDC columns (to preserve leading zeros)
     schema_overrides = {
-        col: pl.String for col in df_sample.columns if col in NDC_COLUMN_NAMES
+        col: pl.String
+        for col in csv_header(source, encoding, skip_rows=skip_rows)
+        if col in NDC_COLUMN_NAMES
     }
     for col in schema_overrides:
         logger.info(f"Reading '{col}' as string to preserve leading zeros")
 
     df = pl.read_csv(
-        file_path,
+        source,
         encoding=encoding,
         skip_rows=skip_rows,
         infer_schema_length=10000,
@@ -334,14 +412,15 @@ def preprocess_cms_csv(
     )
 
     # Drop completely empty columns (CMS files have many empty trailing columns)
-    non_empty_cols = [col for col in df.columns if df[col].null_count() < df.height]
-    if len(non_empty_cols) < len(df.columns):
-        dropped = len(df.columns) - len(non_empty_cols)
-        logger.info(f"Dropped {dropped} empty columns")
-        df = df.select(non_empty_cols)
+    return drop_empty_columns(df)
 
-    logger.info(f"Loaded {df.height} rows, {df.width} columns after preprocessing")
-    return df
+
+@functools.lru_cache(maxsize=8)
+def _candidate_matcher(
+    candidates: tuple[str | None, ...], partial: bool
+) -> FuzzyMatcher:
+    """Build (or reuse) the matcher for a candidate list."""
+    return FuzzyMatcher(candidates, partial=partial)
 
 
 def fuzzy_match_drug_name(
@@ -351,6 +430,9 @@ def fuzzy_match_drug_name(
 ) -> str | None:
     """Find best fuzzy match for a drug name.
 
+    Repeated calls with the same candidates reuse one ``FuzzyMatcher``; use
+    ``FuzzyMatcher.match_many`` to reconcile whole lists.
+
     Args:
         name: Drug name to match.
         candidates: List of candidate names to match against.
@@ -361,23 +443,7 @@ def fuzzy_match_drug_name(
     """
     if not name or not candidates:
         return None
-
-    best_match = None
-    best_score = 0
-
-    name_upper = name.upper()
-    for candidate in candidates:
-        if candidate is None:
-            continue
-        score = fuzz.ratio(name_upper, candidate.upper())
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-
-    if best_match:
-        logger.debug(f"Fuzzy match '{name}' -> '{best_match}' (score: {best_score})")
-
-    return best_match
+    return _candidate_matcher(tuple(candidates), False).match(name, threshold)
 
 
 def fuzzy_match_drug_partial(
@@ -400,25 +466,10 @@ def fuzzy_match_drug_partial(
     """
     if not name or not candidates:
         return None
-
-    best_match = None
-    best_score = 0
-
-    name_upper = name.upper()
-    for candidate in candidates:
-        if candidate is None:
-            continue
-        score = fuzz.partial_ratio(name_upper, candidate.upper())
-        if score > best_score and score >= threshold:
-            best_score = score
-            best_match = candidate
-
-    if best_match:
-        logger.debug(f"Partial match '{name}' -> '{best_match}' (score: {best_score})")
-
-    return best_match
+    return _candidate_matcher(tuple(candidates), True).match(name, threshold)
 
 
+@traced("normalize.join_catalog_to_crosswalk")
 def join_catalog_to_crosswalk(
     catalog_df: pl.DataFrame,
     crosswalk_df: pl.DataFrame,
@@ -450,10 +501,7 @@ def join_catalog_to_crosswalk(
 
     # Select only relevant columns from crosswalk to avoid duplication
     crosswalk_cols = [crosswalk_ndc_col, "HCPCS Code"]
-    optional_cols = [
-        "Drug Name", "Bill Units", "Bill Units Per Pkg", "Pkg Size", "Pkg Qty"
-    ]
-    for col in optional_cols:
+    for col in CROSSWALK_JOIN_COLUMNS:
         if col in crosswalk_df.columns:
             crosswalk_cols.append(col)
 
@@ -488,6 +536,7 @@ def join_catalog_to_crosswalk(
     return matched, orphans
 
 
+@traced("normalize.join_asp_pricing")
 def join_asp_pricing(
     joined_df: pl.DataFrame,
     asp_df: pl.DataFrame,
@@ -541,6 +590,7 @@ def join_asp_pricing(
     return result
 
 
+@traced("normalize.build_silver_dataset")
 def build_silver_dataset(
     catalog_df: pl.DataFrame,
     crosswalk_df: pl.DataFrame,
@@ -579,3 +629,93 @@ def build_silver_dataset(
     )
 
     return silver, orphans
+
+
+@traced("normalize.build_silver_dataset_lazy")
+def build_silver_dataset_lazy(
+    catalog: pl.DataFrame | pl.LazyFrame,
+    crosswalk: pl.DataFrame | pl.LazyFrame,
+    asp: pl.DataFrame | pl.LazyFrame,
+    catalog_columns: Sequence[str] | None = None,
+    streaming: bool = True,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Build the Silver Layer dataset as one lazy query.
+
+    Same result as ``build_silver_dataset``, but the normalizations and both
+    joins form a single plan. Inputs may be ``pl.scan_parquet`` /
+    ``pl.scan_csv`` frames, so only the columns the joins carry are read.
+    The matched and orphan outputs are collected together: the shared
+    catalog-crosswalk join runs once and is never materialized as a whole.
+
+    Args:
+        catalog: Raw product catalog.
+        crosswalk: Raw NDC-HCPCS crosswalk.
+        asp: Raw ASP pricing file.
+        catalog_columns: Catalog columns (after normalization) to carry;
+            None keeps every column.
+        streaming: Run the plan on Polars' streaming engine.
+
+    Returns:
+        Tuple of (silver_df, orphans_df), as ``build_silver_dataset``.
+    """
+    logger.info("Building Silver Layer dataset (lazy)...")
+    ndc_col, hcpcs_col = "ndc_normalized", "HCPCS Code"
+
+    catalog_lf = normalize_catalog(catalog.lazy())
+    if catalog_columns is not None:
+        keep = {*catalog_columns, ndc_col}
+        catalog_lf = catalog_lf.select(
+            [c for c in _column_names(catalog_lf) if c in keep]
+        )
+
+    crosswalk_lf = normalize_crosswalk(crosswalk.lazy())
+    crosswalk_columns = _column_names(crosswalk_lf)
+    crosswalk_cols = [ndc_col, hcpcs_col] + [
+        c for c in CROSSWALK_JOIN_COLUMNS if c in crosswalk_columns
+    ]
+    joined = catalog_lf.join(
+        crosswalk_lf.select(crosswalk_cols).unique(
+            subset=[ndc_col], keep="first", maintain_order=True
+        ),
+        on=ndc_col,
+        how="left",
+        suffix="_crosswalk",
+        maintain_order="left",
+    )
+    silver_lf = joined.filter(pl.col(hcpcs_col).is_not_null())
+    orphans_lf = joined.filter(pl.col(hcpcs_col).is_null())
+
+    asp_lf = normalize_asp_pricing(asp.lazy())
+    asp_columns = _column_names(asp_lf)
+    if hcpcs_col in asp_columns:
+        asp_cols = [hcpcs_col, "Payment Limit"] + [
+            c for c in ("Short Description", "Dosage") if c in asp_columns
+        ]
+        silver_lf = silver_lf.join(
+            asp_lf.select(asp_cols).unique(
+                subset=[hcpcs_col], keep="first", maintain_order=True
+            ),
+            on=hcpcs_col,
+            how="left",
+            suffix="_asp",
+            maintain_order="left",
+        )
+        if "Payment Limit" in _column_names(silver_lf):
+            silver_lf = silver_lf.rename({"Payment Limit": "ASP"})
+    else:
+        logger.warning(f"HCPCS column '{hcpcs_col}' not found in ASP data")
+
+    silver, orphans = pl.collect_all(
+        [silver_lf, orphans_lf], engine="streaming" if streaming else "auto"
+    )
+
+    total = silver.height + orphans.height
+    match_rate = (silver.height / total * 100) if total > 0 else 0
+    logger.info(
+        f"Crosswalk join: {silver.height:,}/{total:,} matched ({match_rate:.1f}%)"
+    )
+    logger.info(
+        f"Silver Layer complete: {silver.height:,} enriched rows, "
+        f"{orphans.height:,} orphans"
+    )
+    return silver, orphans
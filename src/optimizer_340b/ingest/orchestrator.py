@@ -0,0 +1,204 @@
+"""Concurrent multi-file ingest (Bronze Layer).
+
+Loading the sample data used to parse about a dozen files one after another
+on the Streamlit script thread. The loads are independent, so
+``ingest_sources`` runs them concurrently:
+
+- Excel workbooks parsed by openpyxl hold the GIL, so they go to a process
+  pool (``spawn`` start method; Polars is not fork-safe).
+- CSV reads and calamine Excel reads run in Rust and release the GIL, so
+  they share a thread pool.
+
+Steps that depend on loaded frames then run in order on the calling
+thread: catalog schema validation, ``reload_ira_drugs`` and
+``reload_cp_restrictions``. Normalization already happens per source in
+``load_source``. Per-file wall times are logged and returned.
+"""
+
+import contextvars
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import polars as pl
+
+from optimizer_340b.ingest.loaders import resolve_excel_engine
+from optimizer_340b.ingest.sources import load_source
+from optimizer_340b.ingest.validators import validate_catalog_schema
+from optimizer_340b.risk.ira_flags import reload_ira_drugs
+from optimizer_340b.risk.manufacturer_cp import reload_cp_restrictions
+from optimizer_340b.tracing import Tracer, record_span, set_tracer, span
+
+logger = logging.getLogger(__name__)
+
+EXCEL_SUFFIXES = frozenset({".xlsx", ".xlsm", ".xls"})
+
+
+@dataclass
+class IngestResult:
+    """Frames and timings from one concurrent ingest.
+
+    Attributes:
+        frames: Loaded frame per source key (failed sources are absent).
+        timings: Wall seconds spent loading each source.
+        errors: Error message per source that failed to load or validate.
+        wall_seconds: Elapsed time for the whole ingest.
+    """
+
+    frames: dict[str, pl.DataFrame] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+
+def _timed_load(key: str, path: Path) -> tuple[pl.DataFrame, float]:
+    """Load one source and return it with its wall time (runs in workers)."""
+    start = time.perf_counter()
+    df = load_source(key, path)
+    return df, time.perf_counter() - start
+
+
+def _traced_load(key: str, path: Path) -> tuple[pl.DataFrame, float]:
+    """``_timed_load`` inside a span (serial and thread-pool loads)."""
+    with span("ingest.load_source", source=key) as load_span:
+        df, seconds = _timed_load(key, path)
+        load_span.set_rows(df.height)
+    return df, seconds
+
+
+def _init_process_worker() -> None:
+    """Disable tracing in spawned workers; the parent records their loads."""
+    set_tracer(Tracer(enabled=False))
+
+
+def _needs_process(path: Path) -> bool:
+    """Whether a file is parsed by a GIL-bound Python loader."""
+    return (
+        path.suffix.lower() in EXCEL_SUFFIXES
+        and resolve_excel_engine("auto") == "openpyxl"
+    )
+
+
+def ingest_sources(
+    paths: Mapping[str, Path],
+    max_workers: int | None = None,
+    use_processes: bool = True,
+) -> IngestResult:
+    """Load input files concurrently, then apply dependent steps in order.
+
+    Args:
+        paths: File path per source key (see ``resolve_source_paths``).
+        max_workers: Worker count per pool. Defaults to the CPU count;
+            1 loads every file serially on the calling thread.
+        use_processes: Parse openpyxl-bound Excel files in a process pool.
+
+    Returns:
+        IngestResult with frames, per-file timings and errors. A catalog
+        that fails schema validation is reported as an error and dropped.
+    """
+    result = IngestResult()
+    start = time.perf_counter()
+    workers = min(max_workers or os.cpu_count() or 1, max(len(paths), 1))
+
+    with span("ingest.ingest_sources", files=len(paths), workers=workers) as ingest:
+        if workers <= 1:
+            for key, path in paths.items():
+                try:
+                    result.frames[key], result.timings[key] = _traced_load(key, path)
+                except Exception as e:
+                    result.errors[key] = str(e)
+        else:
+            _load_concurrently(paths, workers, use_processes, result)
+
+        for key, message in result.errors.items():
+            logger.warning(f"Could not load {key}: {message}")
+
+        _apply_dependent_steps(result)
+        ingest.set_rows(sum(df.height for df in result.frames.values()))
+
+    result.wall_seconds = time.perf_counter() - start
+    for key, seconds in sorted(result.timings.items(), key=lambda kv: -kv[1]):
+        logger.info(f"Ingest {key}: {seconds:.3f}s")
+    logger.info(
+        f"Ingested {len(result.frames)} of {len(paths)} files in "
+        f"{result.wall_seconds:.3f}s wall ({sum(result.timings.values()):.3f}s "
+        f"summed, {workers} workers)"
+    )
+    return result
+
+
+def _load_concurrently(
+    paths: Mapping[str, Path],
+    workers: int,
+    use_processes: bool,
+    result: IngestResult,
+) -> None:
+    """Load files on thread and process pools into ``result``.
+
+    Thread-pool loads run in a copy of the caller's context so their spans
+    nest under the current one; process-pool loads are recorded as spans
+    from their measured wall times.
+    """
+    with ExitStack() as stack:
+        threads = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+        processes: Executor | None = None
+        futures: dict[str, Future[tuple[pl.DataFrame, float]]] = {}
+        in_process: set[str] = set()
+        for key, path in paths.items():
+            if use_processes and _needs_process(path):
+                if processes is None:
+                    processes = stack.enter_context(
+                        ProcessPoolExecutor(
+                            max_workers=workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                            initializer=_init_process_worker,
+                        )
+                    )
+                futures[key] = processes.submit(_timed_load, key, path)
+                in_process.add(key)
+            else:
+                context = contextvars.copy_context()
+                futures[key] = threads.submit(context.run, _traced_load, key, path)
+
+        for key, future in futures.items():
+            try:
+                result.frames[key], result.timings[key] = future.result()
+            except Exception as e:
+                result.errors[key] = str(e)
+                continue
+            if key in in_process:
+                record_span(
+                    "ingest.load_source",
+                    result.timings[key],
+                    rows=result.frames[key].height,
+                    source=key,
+                    worker="process",
+                )
+
+
+def _apply_dependent_steps(result: IngestResult) -> None:
+    """Validate the catalog and reload the IRA and CP reference lists."""
+    catalog = result.frames.get("catalog")
+    if catalog is not None:
+        validation = validate_catalog_schema(catalog)
+        if not validation.is_valid:
+            logger.warning(f"Catalog validation failed: {validation.message}")
+            result.errors["catalog"] = validation.message
+            del result.frames["catalog"]
+
+    if "ira_drugs" in result.frames:
+        reload_ira_drugs(df=result.frames["ira_drugs"])
+
+    if "cp_restrictions" in result.frames:
+        try:
+            reload_cp_restrictions(df=result.frames["cp_restrictions"])
+        except Exception as e:
+            logger.warning(f"Could not load CP restrictions: {e}")
+            result.errors["cp_restrictions"] = str(e)
+            del result.frames["cp_restrictions"]
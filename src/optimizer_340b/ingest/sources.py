@@ -0,0 +1,137 @@
+"""Standard input files and how each is loaded (Bronze Layer).
+
+Maps each ``uploaded_data`` key to its default file name and the loader
+chain that produces the frame the rest of the app expects (CMS header rows
+skipped, columns normalized). The sample-data page and the batch CLI both
+load through here, concurrently via ``ingest.orchestrator``.
+"""
+
+import logging
+from collections.abc import Callable, Mapping
+from pathlib import Path
+
+import polars as pl
+
+from optimizer_340b.ingest.loaders import (
+    load_csv_to_polars,
+    load_excel_to_polars,
+    load_file_auto,
+)
+from optimizer_340b.ingest.normalizers import (
+    normalize_catalog,
+    normalize_crosswalk,
+    normalize_noc_crosswalk,
+    normalize_noc_pricing,
+    preprocess_cms_csv,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default file name for each source, relative to the data directory
+SOURCE_FILES: dict[str, str] = {
+    "catalog": "product_catalog.xlsx",
+    "asp_pricing": "asp_pricing.csv",
+    "crosswalk": "asp_crosswalk.csv",
+    "nadac": "ndc_nadac_master_statistics.csv",
+    "noc_pricing": "noc_pricing.csv",
+    "noc_crosswalk": "noc_crosswalk.csv",
+    "ravenswood_categories": "Ravenswood_AWP_Reimbursement_Matrix.xlsx",
+    "ira_drugs": "ira_drug_list.csv",
+}
+
+# Reference files the sample-data page also loads (no CLI option)
+REFERENCE_FILES: dict[str, str] = {
+    "biologics": "biologics_logic_grid.xlsx",
+    "ravenswood_summary": "Ravenswood_AWP_Reimbursement_Matrix.xlsx",
+    "wholesaler_catalog": "wholesaler_catalog.xlsx",
+    "cp_restrictions": "Mfr_CP_Restrictions_Lookup_FQHC.xlsx",
+}
+
+
+def _load_ravenswood_summary(path: str) -> pl.DataFrame:
+    """Load the AWP matrix Summary sheet with every cell as text."""
+    import pandas as pd
+
+    return pl.from_pandas(pd.read_excel(path, sheet_name="Summary").astype(str))
+
+
+_SOURCE_LOADERS: dict[str, Callable[[str], pl.DataFrame]] = {
+    # Maps Medispan AWP -> AWP, etc.
+    "catalog": lambda path: normalize_catalog(load_file_auto(path)),
+    "asp_pricing": lambda path: preprocess_cms_csv(path, skip_rows=8),
+    # Maps _2025_CODE -> HCPCS Code, NDC2 -> NDC
+    "crosswalk": lambda path: normalize_crosswalk(
+        preprocess_cms_csv(path, skip_rows=8)
+    ),
+    "nadac": load_csv_to_polars,
+    "noc_pricing": lambda path: normalize_noc_pricing(
+        preprocess_cms_csv(path, skip_rows=12)
+    ),
+    "noc_crosswalk": lambda path: normalize_noc_crosswalk(
+        preprocess_cms_csv(path, skip_rows=9)
+    ),
+    "ravenswood_categories": lambda path: load_excel_to_polars(
+        path, sheet_name="Drug Categories"
+    ),
+    "ira_drugs": load_csv_to_polars,
+    "biologics": load_excel_to_polars,
+    "ravenswood_summary": _load_ravenswood_summary,
+    "wholesaler_catalog": load_excel_to_polars,
+    "cp_restrictions": lambda path: load_excel_to_polars(
+        path, sheet_name="Mfr CP Restrictions"
+    ),
+}
+
+
+def load_source(key: str, path: Path | str) -> pl.DataFrame:
+    """Load one input file the way the app expects it.
+
+    Args:
+        key: Source key (see ``SOURCE_FILES`` and ``REFERENCE_FILES``).
+        path: Path to the file.
+
+    Returns:
+        Loaded and normalized DataFrame.
+
+    Raises:
+        KeyError: If ``key`` is not a known source.
+    """
+    if key not in _SOURCE_LOADERS:
+        raise KeyError(f"Unknown source: {key}")
+    df = _SOURCE_LOADERS[key](str(path))
+    logger.info(f"Loaded {key}: {df.height:,} rows from {Path(path).name}")
+    return df
+
+
+def resolve_source_paths(
+    data_dir: Path | None,
+    overrides: Mapping[str, Path | None] | None = None,
+    files: Mapping[str, str] = SOURCE_FILES,
+) -> dict[str, Path]:
+    """Find the file for each source.
+
+    Explicit paths win; otherwise the default file name is looked up in
+    ``data_dir``. Sources with no file are left out.
+
+    Args:
+        data_dir: Directory holding files with the default names, or None.
+        overrides: Explicit path per source key.
+        files: Default file name per source key to resolve.
+
+    Returns:
+        Mapping of source key to existing file path.
+
+    Raises:
+        FileNotFoundError: If an explicitly given path does not exist.
+    """
+    overrides = overrides or {}
+    paths: dict[str, Path] = {}
+    for key, filename in files.items():
+        path = overrides.get(key)
+        if path is not None:
+            if not path.exists():
+                raise FileNotFoundError(f"{key} file not found: {path}")
+            paths[key] = path
+        elif data_dir is not None and (data_dir / filename).exists():
+            paths[key] = data_dir / filename
+    return paths
@@ -1,4 +1,9 @@
-"""Data models for 340B Optimizer."""
+"""Data models for 340B Optimizer.
+
+``Drug`` and ``MarginAnalysis`` are slotted (no per-instance ``__dict__``).
+For many rows, ``compute.margin_table.MarginTable`` offers row views with the
+same attributes over columnar storage.
+"""
 
 from dataclasses import dataclass
 from decimal import Decimal
@@ -21,41 +26,24 @@ class RiskLevel(str, Enum):
     HIGH = "HIGH"
 
 
-@dataclass
-class Drug:
-    """Core drug entity combining catalog and pricing data.
+class DrugMixin:
+    """NDC formatting and pathway checks shared by ``Drug`` and its row views.
 
-    Attributes:
-        ndc: National Drug Code (various formats accepted, normalized internally).
-        drug_name: Trade/brand name of the drug.
-        manufacturer: Drug manufacturer name.
-        contract_cost: 340B Purchase Price (Unit Price Current Catalog, Column O).
-        awp: Average Wholesale Price per package.
-        asp: Average Sales Price per billing unit (None if no HCPCS mapping).
-        hcpcs_code: Medicare billing code (None for retail-only drugs).
-        bill_units_per_package: Number of HCPCS billing units per NDC package.
-        therapeutic_class: Drug classification (e.g., "TNF Inhibitor").
-        is_biologic: Whether the drug is a biologic (affects dosing logic).
-        ira_flag: Whether subject to IRA price negotiation.
-        penny_pricing_flag: Whether NADAC is at 340B floor.
-        nadac_price: National Average Drug Acquisition Cost (most recent).
+    Declares the ``Drug`` attributes the methods below (and
+    ``MarginAnalysisMixin``) read; subclasses provide them.
     """
 
+    __slots__ = ()
+
     ndc: str
     drug_name: str
     manufacturer: str
     contract_cost: Decimal
     awp: Decimal
-    asp: Decimal | None = None
-    hcpcs_code: str | None = None
-    bill_units_per_package: int = 1
-    therapeutic_class: str | None = None
-    is_biologic: bool = False
-    is_brand: bool = True  # True=Brand (85% AWP), False=Generic (20% AWP)
-    ira_flag: bool = False
-    penny_pricing_flag: bool = False
-    off_contract: bool = False
-    nadac_price: Decimal | None = None
+    asp: Decimal | None
+    hcpcs_code: str | None
+    ira_flag: bool
+    penny_pricing_flag: bool
 
     def has_medical_path(self) -> bool:
         """Check if drug can be billed through medical channel.
@@ -90,8 +78,109 @@ class Drug:
         return f"{normalized[:5]}-{normalized[5:9]}-{normalized[9:11]}"
 
 
-@dataclass
-class MarginAnalysis:
+class MarginAnalysisMixin:
+    """Display conversion shared by ``MarginAnalysis`` and its row views."""
+
+    __slots__ = ()
+
+    drug: DrugMixin
+    pharmacy_medicaid_margin: Decimal | None
+    pharmacy_medicare_commercial_margin: Decimal | None
+    medical_medicaid_margin: Decimal | None
+    medical_medicare_margin: Decimal | None
+    medical_commercial_margin: Decimal | None
+    retail_gross_margin: Decimal
+    retail_net_margin: Decimal
+    retail_capture_rate: Decimal
+    medicare_margin: Decimal | None
+    commercial_margin: Decimal | None
+    recommended_path: RecommendedPath
+    margin_delta: Decimal
+
+    @property
+    def best_margin(self) -> Decimal:
+        """Margin of the recommended pathway (the largest pathway margin)."""
+        margins = [
+            margin
+            for margin in (
+                self.pharmacy_medicaid_margin,
+                self.pharmacy_medicare_commercial_margin,
+                self.medical_medicaid_margin,
+                self.medical_medicare_margin,
+                self.medical_commercial_margin,
+            )
+            if margin is not None
+        ]
+        return max(margins, default=self.retail_net_margin)
+
+    def to_display_dict(self) -> dict[str, object]:
+        """Convert to dictionary for UI display.
+
+        Returns:
+            Dictionary with all fields formatted for display.
+        """
+        return {
+            "ndc": self.drug.ndc,
+            "drug_name": self.drug.drug_name,
+            "manufacturer": self.drug.manufacturer,
+            "contract_cost": float(self.drug.contract_cost),
+            "awp": float(self.drug.awp),
+            "asp": float(self.drug.asp) if self.drug.asp else None,
+            "retail_gross_margin": float(self.retail_gross_margin),
+            "retail_net_margin": float(self.retail_net_margin),
+            "retail_capture_rate": float(self.retail_capture_rate),
+            "medicare_margin": (
+                float(self.medicare_margin) if self.medicare_margin else None
+            ),
+            "commercial_margin": (
+                float(self.commercial_margin) if self.commercial_margin else None
+            ),
+            "recommendation": self.recommended_path.value,
+            "margin_delta": float(self.margin_delta),
+            "ira_risk": self.drug.ira_flag,
+            "penny_pricing": self.drug.penny_pricing_flag,
+        }
+
+
+@dataclass(slots=True)
+class Drug(DrugMixin):
+    """Core drug entity combining catalog and pricing data.
+
+    Attributes:
+        ndc: National Drug Code (various formats accepted, normalized internally).
+        drug_name: Trade/brand name of the drug.
+        manufacturer: Drug manufacturer name.
+        contract_cost: 340B Purchase Price (Unit Price Current Catalog, Column O).
+        awp: Average Wholesale Price per package.
+        asp: Average Sales Price per billing unit (None if no HCPCS mapping).
+        hcpcs_code: Medicare billing code (None for retail-only drugs).
+        bill_units_per_package: Number of HCPCS billing units per NDC package.
+        therapeutic_class: Drug classification (e.g., "TNF Inhibitor").
+        is_biologic: Whether the drug is a biologic (affects dosing logic).
+        ira_flag: Whether subject to IRA price negotiation.
+        penny_pricing_flag: Whether NADAC is at 340B floor.
+        nadac_price: National Average Drug Acquisition Cost (most recent).
+    """
+
+    ndc: str
+    drug_name: str
+    manufacturer: str
+    contract_cost: Decimal
+    awp: Decimal
+    asp: Decimal | None = None
+    hcpcs_code: str | None = None
+    bill_units_per_package: int = 1
+    therapeutic_class: str | None = None
+    is_biologic: bool = False
+    is_brand: bool = True  # True=Brand (85% AWP), False=Generic (20% AWP)
+    ira_flag: bool = False
+    penny_pricing_flag: bool = False
+    off_contract: bool = False
+    nadac_price: Decimal | None = None
+
+
+@dataclass(slots=True)
+class MarginAnalysis(MarginAnalysisMixin):
     """Complete margin analysis for a drug across 5 pathways.
 
     Pathways:
@@ -111,6 +200,8 @@ class MarginAnalysis:
         retail_capture_rate: Assumed capture rate for pharmacy channels.
         recommended_path: Pathway with highest margin.
         margin_delta: Difference between best and second-best path.
+        crossover_capture_rate: Capture rate below which medical billing
+            beats retail (None if the recommendation ignores capture rate).
         # Legacy fields for backwards compatibility
         retail_gross_margin: AWP * Reimb_Rate - Contract_Cost.
         retail_net_margin: Gross margin * Capture_Rate.
@@ -133,34 +224,7 @@ class MarginAnalysis:
     commercial_margin: Decimal | None = None
     recommended_path: RecommendedPath = RecommendedPath.RETAIL
     margin_delta: Decimal = Decimal("0")
-
-    def to_display_dict(self) -> dict[str, object]:
-        """Convert to dictionary for UI display.
-
-        Returns:
-            Dictionary with all fields formatted for display.
-        """
-        return {
-            "ndc": self.drug.ndc,
-            "drug_name": self.drug.drug_name,
-            "manufacturer": self.drug.manufacturer,
-            "contract_cost": float(self.drug.contract_cost),
-            "awp": float(self.drug.awp),
-            "asp": float(self.drug.asp) if self.drug.asp else None,
-            "retail_gross_margin": float(self.retail_gross_margin),
-            "retail_net_margin": float(self.retail_net_margin),
-            "retail_capture_rate": float(self.retail_capture_rate),
-            "medicare_margin": (
-                float(self.medicare_margin) if self.medicare_margin else None
-            ),
-            "commercial_margin": (
-                float(self.commercial_margin) if self.commercial_margin else None
-            ),
-            "recommendation": self.recommended_path.value,
-            "margin_delta": float(self.margin_delta),
-            "ira_risk": self.drug.ira_flag,
-            "penny_pricing": self.drug.penny_pricing_flag,
-        }
+    crossover_capture_rate: Decimal | None = None
 
 
 @dataclass
@@ -0,0 +1,369 @@
+"""Incremental Bronze -> Silver -> Gold recompute graph.
+
+Each uploaded file is a graph input with a version that is bumped only when
+its content changes. Each stage remembers the versions of the inputs and
+stages it was computed from, and is recomputed on access only when one of
+them has moved. Re-uploading the quarterly ASP file therefore rebuilds the
+HCPCS lookup, the Silver ``join_asp_pricing`` step and the drug frame's
+ASP columns, while the normalized catalog, the catalog-crosswalk join and
+name classification are reused.
+
+Typical use::
+
+    pipeline = build_pipeline()
+    pipeline.update_inputs(st.session_state.uploaded_data)
+    index = pipeline.get("drug_index")
+"""
+
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import polars as pl
+
+from optimizer_340b.compute.drug_frame import (
+    apply_asp_pricing,
+    apply_nadac_pricing,
+    build_drug_base,
+    build_hcpcs_lookup,
+    build_noc_lookup,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.retail_pricing import load_drug_category_lookup
+from optimizer_340b.ingest.normalizers import (
+    join_asp_pricing,
+    join_catalog_to_crosswalk,
+    normalize_asp_pricing,
+    normalize_catalog,
+    normalize_crosswalk,
+)
+from optimizer_340b.risk.penny_pricing import (
+    build_nadac_flags,
+    nadac_lookup_from_flags,
+)
+from optimizer_340b.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A derived dataset in the recompute graph.
+
+    Attributes:
+        name: Stage name, used as the key for :meth:`DependencyGraph.get`.
+        func: Callable receiving the values of ``inputs`` positionally.
+        inputs: Names of graph inputs or other stages this stage reads.
+        optional: Inputs that may be missing (passed as None). The stage is
+            skipped (its value is None) if any other input is missing.
+    """
+
+    name: str
+    func: Callable[..., Any]
+    inputs: tuple[str, ...]
+    optional: frozenset[str] = field(default_factory=frozenset)
+
+
+@dataclass
+class _StageState:
+    """Cached result of a stage and the upstream versions it was built from."""
+
+    upstream: tuple[int, ...]
+    value: Any
+    version: int
+
+
+class DependencyGraph:
+    """Versioned dependency graph that recomputes only stale stages.
+
+    Names that no stage produces are graph inputs; set them with
+    :meth:`set_input` or :meth:`update_inputs`.
+    """
+
+    def __init__(self, stages: Iterable[Stage]):
+        """Initialize the graph.
+
+        Args:
+            stages: Stages to register.
+
+        Raises:
+            ValueError: If stage names repeat or the stages form a cycle.
+        """
+        self._stages: dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self._stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self._stages[stage.name] = stage
+
+        self.inputs: tuple[str, ...] = tuple(
+            dict.fromkeys(
+                name
+                for stage in self._stages.values()
+                for name in stage.inputs
+                if name not in self._stages
+            )
+        )
+        self._check_acyclic()
+
+        self._values: dict[str, Any] = {}
+        self._versions: dict[str, int] = dict.fromkeys(self.inputs, 0)
+        self._state: dict[str, _StageState] = {}
+
+    def _check_acyclic(self) -> None:
+        """Raise ValueError if any stage depends on itself transitively."""
+        done: set[str] = set()
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name in path:
+                raise ValueError(f"Cycle in stages: {' -> '.join((*path, name))}")
+            if name in done or name not in self._stages:
+                return
+            for dep in self._stages[name].inputs:
+                visit(dep, (*path, name))
+            done.add(name)
+
+        for name in self._stages:
+            visit(name, ())
+
+    def set_input(self, name: str, value: Any) -> bool:
+        """Set an input value, bumping its version if the content changed.
+
+        DataFrames are compared by content, so re-parsing an unchanged file
+        on a Streamlit rerun does not invalidate downstream stages.
+
+        Args:
+            name: Input name.
+            value: New value, or None to mark the input as missing.
+
+        Returns:
+            True if the input changed.
+
+        Raises:
+            KeyError: If ``name`` is not a graph input.
+        """
+        if name not in self._versions:
+            raise KeyError(f"Unknown pipeline input: {name}")
+
+        current = self._values.get(name)
+        if _same_value(current, value):
+            return False
+
+        self._values[name] = value
+        self._versions[name] += 1
+        logger.info(f"Input '{name}' changed (version {self._versions[name]})")
+        return True
+
+    def update_inputs(self, data: Mapping[str, Any]) -> list[str]:
+        """Sync every graph input from a mapping (e.g. ``uploaded_data``).
+
+        Inputs absent from ``data`` are set to None.
+
+        Args:
+            data: Mapping of input name to value.
+
+        Returns:
+            Names of inputs that changed.
+        """
+        return [name for name in self.inputs if self.set_input(name, data.get(name))]
+
+    def version(self, name: str) -> int:
+        """Return the current version of an input or stage.
+
+        Stage versions only advance when the stage is recomputed.
+        """
+        if name in self._versions:
+            return self._versions[name]
+        state = self._state.get(name)
+        return state.version if state is not None else 0
+
+    def downstream(self, name: str) -> set[str]:
+        """Return every stage that depends on ``name``, directly or not."""
+        result: set[str] = set()
+        frontier = [name]
+        while frontier:
+            current = frontier.pop()
+            for stage in self._stages.values():
+                if current in stage.inputs and stage.name not in result:
+                    result.add(stage.name)
+                    frontier.append(stage.name)
+        return result
+
+    def get(self, name: str) -> Any:
+        """Return the value of an input or stage, recomputing stale stages.
+
+        Args:
+            name: Input or stage name.
+
+        Returns:
+            Current value, or None if a required input is missing.
+
+        Raises:
+            KeyError: If ``name`` is neither an input nor a stage.
+        """
+        if name in self._versions:
+            return self._values.get(name)
+        if name not in self._stages:
+            raise KeyError(f"Unknown pipeline stage: {name}")
+
+        stage = self._stages[name]
+        args = [self.get(dep) for dep in stage.inputs]
+        upstream = tuple(self.version(dep) for dep in stage.inputs)
+
+        state = self._state.get(name)
+        if state is not None and state.upstream == upstream:
+            return state.value
+
+        missing = [
+            dep
+            for dep, arg in zip(stage.inputs, args, strict=True)
+            if arg is None and dep not in stage.optional
+        ]
+        if missing:
+            value = None
+        else:
+            logger.info(f"Recomputing stage '{name}'")
+            with span(f"pipeline.{name}"):
+                value = stage.func(*args)
+
+        version = state.version + 1 if state is not None else 1
+        self._state[name] = _StageState(upstream, value, version)
+        return value
+
+
+def _same_value(current: Any, new: Any) -> bool:
+    """Return True if an input value is unchanged."""
+    if current is new:
+        return True
+    if isinstance(current, pl.DataFrame) and isinstance(new, pl.DataFrame):
+        return current.schema == new.schema and current.equals(new)
+    return False
+
+
+def _silver(
+    catalog_crosswalk_join: tuple[pl.DataFrame, pl.DataFrame],
+    asp_normalized: pl.DataFrame,
+) -> tuple[pl.DataFrame, pl.DataFrame]:
+    """Join ASP pricing onto the catalog-crosswalk join.
+
+    Same result as ``build_silver_dataset``, reusing the cached join.
+    """
+    joined, orphans = catalog_crosswalk_join
+    return join_asp_pricing(joined, asp_normalized), orphans
+
+
+def _drug_base(
+    catalog: pl.DataFrame,
+    category_lookup: dict[str, Any] | None,
+    ira_drugs: pl.DataFrame | None,
+) -> pl.DataFrame:
+    """Build the catalog-only drug frame.
+
+    The upload pages install ``ira_drugs`` with ``reload_ira_drugs``; it is a
+    stage input so that a new IRA list reclassifies the catalog.
+    """
+    return build_drug_base(catalog, category_lookup)
+
+
+def _drug_frame(
+    drug_priced: pl.DataFrame, nadac_flags: pl.DataFrame | None
+) -> pl.DataFrame:
+    """Join the NADAC flags frame onto the priced drug frame."""
+    return apply_nadac_pricing(drug_priced, nadac_flags=nadac_flags)
+
+
+def _drug_index(
+    catalog: pl.DataFrame,
+    drug_frame: pl.DataFrame,
+    hcpcs_lookup: dict[str, dict[str, object]],
+    nadac_lookup: dict[str, dict[str, object]] | None,
+    noc_lookup: dict[str, dict[str, object]],
+    category_lookup: dict[str, Any] | None,
+) -> DrugIndex:
+    """Index the pipeline's drug frame."""
+    return DrugIndex(
+        catalog,
+        hcpcs_lookup=hcpcs_lookup,
+        nadac_lookup=nadac_lookup,
+        noc_lookup=noc_lookup,
+        category_lookup=category_lookup,
+        frame=drug_frame,
+    )
+
+
+def build_pipeline() -> DependencyGraph:
+    """Build the recompute graph for the uploaded data sources.
+
+    Inputs are the ``uploaded_data`` keys: catalog, crosswalk, asp_pricing,
+    noc_crosswalk, noc_pricing, nadac, ravenswood_categories and ira_drugs.
+    CP restrictions are read at render time by the risk checks, so no cached
+    stage depends on them.
+
+    Returns:
+        DependencyGraph whose ``drug_index`` stage feeds every page.
+    """
+    return DependencyGraph(
+        [
+            # Silver
+            Stage("catalog_normalized", normalize_catalog, ("catalog",)),
+            Stage("crosswalk_normalized", normalize_crosswalk, ("crosswalk",)),
+            Stage(
+                "catalog_crosswalk_join",
+                join_catalog_to_crosswalk,
+                ("catalog_normalized", "crosswalk_normalized"),
+            ),
+            Stage("asp_normalized", normalize_asp_pricing, ("asp_pricing",)),
+            Stage("silver", _silver, ("catalog_crosswalk_join", "asp_normalized")),
+            # Lookups
+            Stage(
+                "hcpcs_lookup",
+                build_hcpcs_lookup,
+                ("crosswalk", "asp_pricing"),
+                optional=frozenset({"crosswalk", "asp_pricing"}),
+            ),
+            Stage(
+                "noc_lookup",
+                build_noc_lookup,
+                ("noc_crosswalk", "noc_pricing"),
+                optional=frozenset({"noc_crosswalk", "noc_pricing"}),
+            ),
+            Stage("nadac_flags", build_nadac_flags, ("nadac",)),
+            Stage("nadac_lookup", nadac_lookup_from_flags, ("nadac_flags",)),
+            Stage(
+                "category_lookup",
+                load_drug_category_lookup,
+                ("ravenswood_categories",),
+            ),
+            # Gold
+            Stage(
+                "drug_base",
+                _drug_base,
+                ("catalog", "category_lookup", "ira_drugs"),
+                optional=frozenset({"category_lookup", "ira_drugs"}),
+            ),
+            Stage(
+                "drug_priced",
+                apply_asp_pricing,
+                ("drug_base", "hcpcs_lookup", "noc_lookup"),
+            ),
+            Stage(
+                "drug_frame",
+                _drug_frame,
+                ("drug_priced", "nadac_flags"),
+                optional=frozenset({"nadac_flags"}),
+            ),
+            Stage(
+                "drug_index",
+                _drug_index,
+                (
+                    "catalog",
+                    "drug_frame",
+                    "hcpcs_lookup",
+                    "nadac_lookup",
+                    "noc_lookup",
+                    "category_lookup",
+                ),
+                optional=frozenset({"nadac_lookup", "category_lookup"}),
+            ),
+        ]
+    )
@@ -27,6 +27,7 @@ from optimizer_340b.risk.penny_pricing import (
     HIGH_DISCOUNT_THRESHOLD,
     PENNY_THRESHOLD,
     PennyPricingStatus,
+    build_nadac_flags,
     check_penny_pricing,
     check_penny_pricing_for_drug,
     filter_top_opportunities,
@@ -52,6 +53,7 @@ __all__ = [
     "HIGH_DISCOUNT_THRESHOLD",
     "PENNY_THRESHOLD",
     "PennyPricingStatus",
+    "build_nadac_flags",
     "check_penny_pricing",
     "check_penny_pricing_for_drug",
     "filter_top_opportunities",
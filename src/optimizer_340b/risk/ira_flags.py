@@ -24,6 +24,13 @@ from pathlib import Path
 
 import polars as pl
 
+from optimizer_340b.risk.name_matcher import (
+    NameMatcher,
+    normalize_name,
+    normalize_name_expr,
+)
+from optimizer_340b.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Hardcoded fallback values - used only if CSV file is not available
@@ -179,7 +186,11 @@ for drug in IRA_2026_DRUGS:
 for drug in IRA_2027_DRUGS:
     IRA_DRUGS_BY_YEAR[drug.upper()] = 2027
 
+# Compiled partial-match automaton over IRA_DRUGS_BY_YEAR (in its order)
+_IRA_MATCHER = NameMatcher(IRA_DRUGS_BY_YEAR)
+
 
+@traced("risk.reload_ira_drugs")
 def reload_ira_drugs(
     csv_path: Path | None = None, df: pl.DataFrame | None = None
 ) -> None:
@@ -192,7 +203,7 @@ def reload_ira_drugs(
         csv_path: Path to CSV file. If provided, loads from file.
         df: DataFrame to load from. If provided, takes precedence over csv_path.
     """
-    global IRA_2026_DRUGS, IRA_2027_DRUGS, IRA_DRUGS_BY_YEAR
+    global IRA_2026_DRUGS, IRA_2027_DRUGS, IRA_DRUGS_BY_YEAR, _IRA_MATCHER
 
     if df is not None:
         IRA_2026_DRUGS, IRA_2027_DRUGS = load_ira_drugs_from_dataframe(df)
@@ -205,6 +216,7 @@ def reload_ira_drugs(
         IRA_DRUGS_BY_YEAR[drug.upper()] = 2026
     for drug in IRA_2027_DRUGS:
         IRA_DRUGS_BY_YEAR[drug.upper()] = 2027
+    _IRA_MATCHER = NameMatcher(IRA_DRUGS_BY_YEAR)
 
     logger.info(f"Reloaded IRA drugs: {len(IRA_DRUGS_BY_YEAR)} total drugs")
 
@@ -260,7 +272,7 @@ def check_ira_status(drug_name: str) -> dict[str, object]:
         }
 
     # Normalize drug name for matching
-    name_upper = drug_name.upper().strip()
+    name_upper = normalize_name(drug_name)
 
     # Check for exact match first
     if name_upper in IRA_DRUGS_BY_YEAR:
@@ -284,26 +296,26 @@ def check_ira_status(drug_name: str) -> dict[str, object]:
             "risk_level": "High Risk",
         }
 
-    # Check for partial match (drug name contains IRA drug)
-    for ira_drug, year in IRA_DRUGS_BY_YEAR.items():
-        if ira_drug in name_upper or name_upper in ira_drug:
-            description = (
-                IRA_2026_DRUGS.get(ira_drug) or IRA_2027_DRUGS.get(ira_drug)
-            )
-
-            logger.warning(f"Potential IRA drug match: {drug_name} -> {ira_drug}")
-
-            return {
-                "is_ira_drug": True,
-                "ira_year": year,
-                "drug_name": ira_drug,
-                "description": description,
-                "warning_message": (
-                    f"High Risk / IRA {year}: {drug_name} appears to match "
-                    f"{ira_drug}, which is subject to Medicare price negotiation."
-                ),
-                "risk_level": "High Risk",
-            }
+    # Check for partial match (either name contains the other)
+    match = _IRA_MATCHER.first_match(name_upper)
+    if match is not None:
+        ira_drug = _IRA_MATCHER.patterns[match]
+        year = IRA_DRUGS_BY_YEAR[ira_drug]
+        description = IRA_2026_DRUGS.get(ira_drug) or IRA_2027_DRUGS.get(ira_drug)
+
+        logger.warning(f"Potential IRA drug match: {drug_name} -> {ira_drug}")
+
+        return {
+            "is_ira_drug": True,
+            "ira_year": year,
+            "drug_name": ira_drug,
+            "description": description,
+            "warning_message": (
+                f"High Risk / IRA {year}: {drug_name} appears to match "
+                f"{ira_drug}, which is subject to Medicare price negotiation."
+            ),
+            "risk_level": "High Risk",
+        }
 
     # Not an IRA drug
     return {
@@ -316,6 +328,31 @@ def check_ira_status(drug_name: str) -> dict[str, object]:
     }
 
 
+@traced("risk.ira_years")
+def ira_years(drug_names: pl.Series) -> pl.Series:
+    """Vectorized IRA year lookup for a Series of drug names.
+
+    Same matching as ``check_ira_status`` (exact hit first, then the first
+    IRA drug in list order that the name contains or is contained in), in
+    one pass over the Series and without per-drug logging.
+
+    Args:
+        drug_names: Drug names (any case).
+
+    Returns:
+        Int64 Series of IRA years, null for non-IRA drugs.
+    """
+    names = drug_names.to_frame("name").select(
+        pl.when(pl.col("name") != "").then(normalize_name_expr(pl.col("name")))
+    )["name"]
+    years = pl.Series(
+        [IRA_DRUGS_BY_YEAR[drug] for drug in _IRA_MATCHER.patterns], dtype=pl.Int64
+    )
+    exact = names.replace_strict(IRA_DRUGS_BY_YEAR, default=None, return_dtype=pl.Int64)
+    partial = years.gather(_IRA_MATCHER.first_match_series(names))
+    return exact.fill_null(partial).alias(drug_names.name)
+
+
 def get_ira_risk_status(drug_name: str) -> IRARiskStatus:
     """Get structured IRA risk status for a drug.
 
@@ -336,6 +373,7 @@ def get_ira_risk_status(drug_name: str) -> IRARiskStatus:
     )
 
 
+@traced("risk.filter_ira_drugs")
 def filter_ira_drugs(drug_names: list[str]) -> list[dict[str, object]]:
     """Filter a list of drugs to find IRA-affected drugs.
 
@@ -0,0 +1,157 @@
+"""Compiled multi-pattern drug name matching.
+
+IRA detection and drug category classification both ask "which listed name
+does this drug name contain, or which listed name contains it?". Looping over
+every list entry with two substring tests per catalog row dominated
+drug-frame builds, so lists are compiled once into a ``NameMatcher``:
+
+- Forward ("name contains pattern"): an Aho-Corasick automaton (Polars
+  ``str.extract_many``) for Series, a lookahead alternation regex for
+  single names.
+- Reverse ("pattern contains name"): every pattern is joined into one
+  haystack, so a single substring search finds the earliest pattern that
+  contains the name.
+
+Patterns keep their list order, and the lowest-index hit in either direction
+wins, matching the original first-match-in-order loops.
+"""
+
+import bisect
+import logging
+import re
+from collections.abc import Iterable
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Joins patterns into the reverse-search haystack; never occurs in drug names
+_SEPARATOR = "\x00"
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a drug name for matching (uppercase, trimmed)."""
+    return name.upper().strip()
+
+
+def normalize_name_expr(names: pl.Expr) -> pl.Expr:
+    """Polars equivalent of ``normalize_name``."""
+    return names.str.to_uppercase().str.strip_chars()
+
+
+class NameMatcher:
+    """Ordered list of name patterns compiled for substring matching.
+
+    Attributes:
+        patterns: Normalized patterns in precedence order (duplicates and
+            empty strings dropped).
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        """Compile patterns.
+
+        Args:
+            patterns: Names in precedence order. Normalized with
+                ``normalize_name``.
+        """
+        index: dict[str, int] = {}
+        for pattern in patterns:
+            key = normalize_name(pattern)
+            if key and key not in index:
+                index[key] = len(index)
+        self.patterns: tuple[str, ...] = tuple(index)
+        self._index = index
+
+        # Lookahead at every offset reports overlapping hits; at each offset
+        # the alternation tries patterns in order, so the first hit there is
+        # the lowest-index pattern starting at that offset.
+        alternation = "|".join(re.escape(p) for p in self.patterns)
+        self._forward = re.compile(f"(?=({alternation}))") if index else None
+        self._any = re.compile(alternation) if index else None
+
+        self._haystack = _SEPARATOR.join(self.patterns)
+        self._starts: list[int] = []
+        offset = 0
+        for pattern in self.patterns:
+            self._starts.append(offset)
+            offset += len(pattern) + len(_SEPARATOR)
+
+        logger.debug(f"Compiled name matcher with {len(self.patterns)} patterns")
+
+    def __len__(self) -> int:
+        """Return the number of patterns."""
+        return len(self.patterns)
+
+    def first_match(self, name: str, reverse: bool = True) -> int | None:
+        """Find the first pattern contained in ``name`` (or containing it).
+
+        Args:
+            name: Normalized drug name.
+            reverse: Also match patterns that contain ``name``.
+
+        Returns:
+            Index into ``patterns`` of the earliest match, or None.
+        """
+        if self._forward is None:
+            return None
+
+        best: int | None = None
+        for match in self._forward.finditer(name):
+            position = self._index[match.group(1)]
+            if best is None or position < best:
+                best = position
+                if best == 0:
+                    return best
+
+        if reverse:
+            found = self._haystack.find(name)
+            if found >= 0:
+                position = bisect.bisect_right(self._starts, found) - 1
+                if best is None or position < best:
+                    best = position
+        return best
+
+    def contains_any(self, name: str) -> bool:
+        """Check whether a normalized name contains any pattern."""
+        return self._any is not None and self._any.search(name) is not None
+
+    def first_match_series(self, names: pl.Series, reverse: bool = True) -> pl.Series:
+        """Vectorized ``first_match`` over a Series of normalized names.
+
+        Args:
+            names: Normalized drug names.
+            reverse: Also match patterns that contain each name.
+
+        Returns:
+            UInt32 Series of pattern indices (null where nothing matched).
+        """
+        if not self.patterns:
+            return pl.Series(names.name, [None] * len(names), dtype=pl.UInt32)
+
+        forward = (
+            pl.col("name")
+            .str.extract_many(list(self.patterns), overlapping=True)
+            .list.eval(pl.element().replace_strict(self._index, return_dtype=pl.UInt32))
+            .list.min()
+        )
+        exprs = [forward]
+        if reverse:
+            starts = pl.lit(pl.Series(self._starts, dtype=pl.UInt32))
+            found = pl.lit(self._haystack).str.find(pl.col("name"), literal=True)
+            exprs.append(
+                pl.when(found.is_not_null()).then(
+                    starts.search_sorted(found, side="right") - 1
+                )
+            )
+
+        return (
+            pl.DataFrame({"name": names})
+            .select(pl.min_horizontal(exprs).cast(pl.UInt32).alias(names.name))
+            .to_series()
+        )
+
+    def contains_any_series(self, names: pl.Series) -> pl.Series:
+        """Vectorized ``contains_any`` over a Series of normalized names."""
+        if not self.patterns:
+            return pl.Series(names.name, [False] * len(names), dtype=pl.Boolean)
+        return names.str.contains_any(list(self.patterns)).fill_null(False)
@@ -20,6 +20,9 @@ from decimal import Decimal
 
 import polars as pl
 
+from optimizer_340b.ingest.normalizers import ndc_expr
+from optimizer_340b.tracing import traced
+
 logger = logging.getLogger(__name__)
 
 # Threshold below which pricing is considered "penny pricing"
@@ -34,6 +37,20 @@ PENNY_COST_OVERRIDE = Decimal("0.01")  # $0.01 as per manifest
 # Inflation penalty threshold
 INFLATION_PENALTY_THRESHOLD = Decimal("20.0")  # 20% threshold
 
+# Values of the NADAC penny_pricing column that mean "yes"
+PENNY_FLAG_VALUES = ("YES", "TRUE", "1", "Y")
+
+# Schema of build_nadac_flags() output, one row per normalized NDC
+NADAC_FLAGS_SCHEMA: dict[str, pl.DataType] = {
+    "ndc_normalized": pl.String(),
+    "is_penny_priced": pl.Boolean(),
+    "override_cost": pl.Float64(),
+    "has_inflation_penalty": pl.Boolean(),
+    "inflation_penalty_pct": pl.Float64(),
+    "discount_340b_pct": pl.Float64(),
+    "nadac_price": pl.Float64(),
+}
+
 
 @dataclass
 class PennyPricingStatus:
@@ -56,11 +73,68 @@ class PennyPricingStatus:
     should_exclude: bool
 
 
+def _float_column(nadac_df: pl.DataFrame, column: str) -> pl.Expr:
+    """Column as Float64 (unparseable values become null), or a null literal."""
+    if column not in nadac_df.columns:
+        return pl.lit(None, dtype=pl.Float64)
+    if nadac_df.schema[column].is_numeric():
+        return pl.col(column).cast(pl.Float64)
+    return (
+        pl.col(column).cast(pl.String).str.strip_chars().cast(pl.Float64, strict=False)
+    )
+
+
+def _ndc_column(nadac_df: pl.DataFrame) -> pl.Expr:
+    """Raw NDC as a string ("" if the column is missing)."""
+    if "ndc" not in nadac_df.columns:
+        return pl.lit("")
+    return pl.col("ndc").cast(pl.String)
+
+
+def _discount_column(nadac_df: pl.DataFrame) -> pl.Expr:
+    """Raw 340B discount column, or a null literal if missing."""
+    if "total_discount_340b_pct" not in nadac_df.columns:
+        return pl.lit(None)
+    return pl.col("total_discount_340b_pct")
+
+
+def penny_flag_expr(column: str | pl.Expr = "penny_pricing") -> pl.Expr:
+    """Parse a NADAC penny_pricing column (Yes/True/1/Y, any case) to Boolean.
+
+    Args:
+        column: Column name or expression with the raw flag.
+
+    Returns:
+        Boolean expression, False for nulls and any other value.
+    """
+    expr = pl.col(column) if isinstance(column, str) else column
+    return (
+        expr.cast(pl.String)
+        .str.to_uppercase()
+        .is_in(PENNY_FLAG_VALUES)
+        .fill_null(False)
+    )
+
+
+def _is_penny_expr(nadac_df: pl.DataFrame) -> pl.Expr:
+    """Penny flag set, or 340B discount at or above HIGH_DISCOUNT_THRESHOLD."""
+    is_penny = pl.lit(False)
+    if "penny_pricing" in nadac_df.columns:
+        is_penny = is_penny | penny_flag_expr("penny_pricing")
+    if "total_discount_340b_pct" in nadac_df.columns:
+        discount = _float_column(nadac_df, "total_discount_340b_pct")
+        is_penny = is_penny | (discount >= float(HIGH_DISCOUNT_THRESHOLD)).fill_null(
+            False
+        )
+    return is_penny
+
+
+@traced("risk.check_penny_pricing")
 def check_penny_pricing(nadac_df: pl.DataFrame) -> list[dict[str, object]]:
     """Check NADAC data for penny-priced drugs.
 
-    Drugs with penny_pricing=True or extremely high discount percentages
-    are flagged as having limited 340B opportunity.
+    Drugs with penny_pricing set (Yes/True/1/Y) or extremely high discount
+    percentages are flagged as having limited 340B opportunity.
 
     Args:
         nadac_df: NADAC DataFrame with columns:
@@ -73,46 +147,40 @@ def check_penny_pricing(nadac_df: pl.DataFrame) -> list[dict[str, object]]:
     """
     flagged: list[dict[str, object]] = []
 
-    # Check if required columns exist
-    has_penny_column = "penny_pricing" in nadac_df.columns
-    has_discount_column = "total_discount_340b_pct" in nadac_df.columns
-
-    if not has_penny_column and not has_discount_column:
+    if (
+        "penny_pricing" not in nadac_df.columns
+        and "total_discount_340b_pct" not in nadac_df.columns
+    ):
         logger.warning("NADAC data missing penny_pricing and discount columns")
         return flagged
 
-    for row in nadac_df.iter_rows(named=True):
-        ndc = str(row.get("ndc", ""))
-        is_penny = False
-        reason = ""
+    penny_rows = nadac_df.filter(_is_penny_expr(nadac_df)).select(
+        _ndc_column(nadac_df).alias("ndc"),
+        _discount_column(nadac_df).alias("discount_pct"),
+        _float_column(nadac_df, "total_discount_340b_pct").alias("_discount"),
+    )
 
-        # Check explicit penny_pricing flag
-        if has_penny_column and row.get("penny_pricing"):
-            is_penny = True
+    for row in penny_rows.iter_rows(named=True):
+        ndc = row["ndc"]
+        discount = row["_discount"]
+        discount_decimal = Decimal(str(discount)) if discount is not None else None
+        if discount_decimal is not None and discount_decimal >= HIGH_DISCOUNT_THRESHOLD:
+            reason = f"340B discount is {discount_decimal:.1f}%"
+        else:
             reason = "Penny pricing flag is set"
 
-        # Check high discount percentage
-        if has_discount_column:
-            discount = row.get("total_discount_340b_pct")
-            if discount is not None:
-                discount_decimal = Decimal(str(discount))
-                if discount_decimal >= HIGH_DISCOUNT_THRESHOLD:
-                    is_penny = True
-                    reason = f"340B discount is {discount_decimal:.1f}%"
-
-        if is_penny:
-            flagged.append({
-                "ndc": ndc,
-                "is_penny_priced": True,
-                "discount_pct": row.get("total_discount_340b_pct"),
-                "warning_message": (
-                    f"Penny Pricing Alert: {ndc} - {reason}. "
-                    "This drug should NOT appear in Top Opportunities."
-                ),
-                "should_exclude": True,
-            })
-
-            logger.info(f"Penny pricing detected: NDC {ndc} - {reason}")
+        flagged.append({
+            "ndc": ndc,
+            "is_penny_priced": True,
+            "discount_pct": row["discount_pct"],
+            "warning_message": (
+                f"Penny Pricing Alert: {ndc} - {reason}. "
+                "This drug should NOT appear in Top Opportunities."
+            ),
+            "should_exclude": True,
+        })
+
+        logger.info(f"Penny pricing detected: NDC {ndc} - {reason}")
 
     logger.info(
         f"Found {len(flagged)} penny-priced drugs out of {nadac_df.height} total"
@@ -264,23 +332,30 @@ def filter_top_opportunities(
 def get_penny_pricing_summary(nadac_df: pl.DataFrame) -> dict[str, object]:
     """Get summary statistics for penny pricing in dataset.
 
+    Computed as a single aggregation over the NADAC frame.
+
     Args:
         nadac_df: NADAC DataFrame with pricing data.
 
     Returns:
         Dictionary with penny pricing summary statistics.
     """
-    flagged = check_penny_pricing(nadac_df)
-
-    total_drugs = nadac_df.height
-    penny_count = len(flagged)
+    is_penny = _is_penny_expr(nadac_df)
+    summary = nadac_df.select(
+        pl.len().alias("total_drugs"),
+        is_penny.sum().alias("penny_priced_count"),
+        _ndc_column(nadac_df).filter(is_penny).implode().alias("flagged_ndcs"),
+    ).row(0, named=True)
+
+    total_drugs = summary["total_drugs"]
+    penny_count = summary["penny_priced_count"]
     penny_pct = (penny_count / total_drugs * 100) if total_drugs > 0 else 0
 
     return {
         "total_drugs": total_drugs,
         "penny_priced_count": penny_count,
         "penny_priced_pct": round(penny_pct, 2),
-        "flagged_ndcs": [item["ndc"] for item in flagged],
+        "flagged_ndcs": summary["flagged_ndcs"],
     }
 
 
@@ -305,6 +380,92 @@ class NADACEnhancedStatus:
     warnings: list[str]
 
 
+@traced("risk.build_nadac_flags")
+def build_nadac_flags(nadac_df: pl.DataFrame) -> pl.DataFrame:
+    """Compute penny pricing and inflation flags for every NADAC row.
+
+    Frame-level counterpart of :func:`build_nadac_lookup`: the flag parsing
+    and threshold comparisons are Polars expressions, and the result is keyed
+    by ``ndc_normalized`` so it can be joined straight onto the Silver or
+    drug frame. Unparseable numbers are treated as missing; for duplicate
+    NDCs the last row wins.
+
+    Args:
+        nadac_df: NADAC DataFrame with pricing data.
+
+    Returns:
+        DataFrame with ``NADAC_FLAGS_SCHEMA`` columns, one row per NDC.
+    """
+    if "ndc" not in nadac_df.columns:
+        logger.warning("NADAC data missing 'ndc' column")
+        return pl.DataFrame(schema=NADAC_FLAGS_SCHEMA)
+
+    is_penny = _is_penny_expr(nadac_df)
+    inflation = _float_column(nadac_df, "inflation_penalty_pct")
+
+    # ndc_expr zero-fills blank NDCs, so drop them before normalizing
+    raw_ndc = pl.col("ndc").cast(pl.String).str.strip_chars()
+    flags = (
+        nadac_df.filter(raw_ndc.is_not_null() & (raw_ndc != ""))
+        .select(
+            ndc_expr("ndc").alias("ndc_normalized"),
+            is_penny.alias("is_penny_priced"),
+            pl.when(is_penny).then(float(PENNY_COST_OVERRIDE)).alias("override_cost"),
+            (inflation > float(INFLATION_PENALTY_THRESHOLD))
+            .fill_null(False)
+            .alias("has_inflation_penalty"),
+            inflation.alias("inflation_penalty_pct"),
+            _float_column(nadac_df, "total_discount_340b_pct").alias(
+                "discount_340b_pct"
+            ),
+            _float_column(nadac_df, "last_price").alias("nadac_price"),
+        )
+        .unique(subset="ndc_normalized", keep="last", maintain_order=True)
+        .select(
+            [pl.col(name).cast(dtype) for name, dtype in NADAC_FLAGS_SCHEMA.items()]
+        )
+    )
+
+    counts = flags.select(
+        pl.col("is_penny_priced").sum(), pl.col("has_inflation_penalty").sum()
+    ).row(0)
+    logger.info(f"Built NADAC flags for {flags.height} NDCs")
+    logger.info(
+        f"NADAC summary: {counts[0]} penny-priced, "
+        f"{counts[1]} with high inflation penalty"
+    )
+
+    return flags
+
+
+def nadac_lookup_from_flags(flags: pl.DataFrame) -> dict[str, dict[str, object]]:
+    """Convert a :func:`build_nadac_flags` frame to the NDC-keyed lookup dict.
+
+    Args:
+        flags: Output of :func:`build_nadac_flags`.
+
+    Returns:
+        Dictionary mapping normalized NDC to the flag values, with amounts
+        and percentages as Decimals.
+    """
+
+    def to_decimal(value: float | None) -> Decimal | None:
+        return Decimal(str(value)) if value is not None else None
+
+    return {
+        row["ndc_normalized"]: {
+            "is_penny_priced": row["is_penny_priced"],
+            "override_cost": PENNY_COST_OVERRIDE if row["is_penny_priced"] else None,
+            "has_inflation_penalty": row["has_inflation_penalty"],
+            "inflation_penalty_pct": to_decimal(row["inflation_penalty_pct"]),
+            "discount_340b_pct": to_decimal(row["discount_340b_pct"]),
+            "nadac_price": to_decimal(row["nadac_price"]),
+        }
+        for row in flags.iter_rows(named=True)
+    }
+
+
+@traced("risk.build_nadac_lookup")
 def build_nadac_lookup(nadac_df: pl.DataFrame) -> dict[str, dict[str, object]]:
     """Build comprehensive NADAC lookup with penny pricing and inflation data.
 
@@ -320,89 +481,20 @@ def build_nadac_lookup(nadac_df: pl.DataFrame) -> dict[str, dict[str, object]]:
         - discount_340b_pct: Decimal or None
         - nadac_price: Decimal or None (last_price from NADAC)
     """
-    lookup: dict[str, dict[str, object]] = {}
+    return nadac_lookup_from_flags(build_nadac_flags(nadac_df))
 
-    # Check available columns
-    has_penny_col = "penny_pricing" in nadac_df.columns
-    has_discount_col = "total_discount_340b_pct" in nadac_df.columns
-    has_inflation_col = "inflation_penalty_pct" in nadac_df.columns
-    has_last_price_col = "last_price" in nadac_df.columns
 
-    if "ndc" not in nadac_df.columns:
-        logger.warning("NADAC data missing 'ndc' column")
-        return lookup
+def _optional_decimal(value: object) -> Decimal | None:
+    """Read an amount from a NADAC lookup entry as a Decimal.
 
-    for row in nadac_df.iter_rows(named=True):
-        ndc = str(row.get("ndc", "")).replace("-", "").strip()
-        if not ndc:
-            continue
-
-        # Normalize NDC to 11 digits
-        ndc_normalized = ndc.zfill(11)[-11:]
-
-        # Check penny pricing
-        is_penny = False
-        if has_penny_col:
-            penny_val = row.get("penny_pricing")
-            if penny_val and str(penny_val).upper() in ("YES", "TRUE", "1", "Y"):
-                is_penny = True
-
-        # Check discount percentage as alternative
-        discount_pct = None
-        if has_discount_col:
-            discount_val = row.get("total_discount_340b_pct")
-            if discount_val is not None:
-                try:
-                    discount_pct = Decimal(str(discount_val))
-                    if discount_pct >= HIGH_DISCOUNT_THRESHOLD:
-                        is_penny = True
-                except (ValueError, TypeError):
-                    pass
-
-        # Check inflation penalty
-        has_inflation = False
-        inflation_pct = None
-        if has_inflation_col:
-            inflation_val = row.get("inflation_penalty_pct")
-            if inflation_val is not None:
-                try:
-                    inflation_pct = Decimal(str(inflation_val))
-                    if inflation_pct > INFLATION_PENALTY_THRESHOLD:
-                        has_inflation = True
-                except (ValueError, TypeError):
-                    pass
-
-        # Get NADAC price (last_price is the most recent NADAC)
-        nadac_price = None
-        if has_last_price_col:
-            price_val = row.get("last_price")
-            if price_val is not None:
-                try:
-                    nadac_price = Decimal(str(price_val))
-                except (ValueError, TypeError):
-                    pass
-
-        # Build lookup entry
-        lookup[ndc_normalized] = {
-            "is_penny_priced": is_penny,
-            "override_cost": PENNY_COST_OVERRIDE if is_penny else None,
-            "has_inflation_penalty": has_inflation,
-            "inflation_penalty_pct": inflation_pct,
-            "discount_340b_pct": discount_pct,
-            "nadac_price": nadac_price,
-        }
-
-    logger.info(f"Built NADAC lookup with {len(lookup)} NDCs")
-
-    # Log summary
-    penny_count = sum(1 for v in lookup.values() if v["is_penny_priced"])
-    inflation_count = sum(1 for v in lookup.values() if v["has_inflation_penalty"])
-    logger.info(
-        f"NADAC summary: {penny_count} penny-priced, "
-        f"{inflation_count} with high inflation penalty"
-    )
-
-    return lookup
+    Lookups from :func:`build_nadac_lookup` already hold Decimals; plain
+    numbers from hand-built lookups are converted through ``str``.
+    """
+    if value is None or isinstance(value, Decimal):
+        return value
+    if isinstance(value, int | float | str):
+        return Decimal(str(value))
+    raise TypeError(f"Expected a number, got {type(value).__name__}: {value!r}")
 
 
 def get_nadac_enhanced_status(
@@ -451,9 +543,9 @@ def get_nadac_enhanced_status(
     return NADACEnhancedStatus(
         ndc=ndc,
         is_penny_priced=bool(nadac_data["is_penny_priced"]),
-        override_cost=nadac_data["override_cost"],
+        override_cost=_optional_decimal(nadac_data["override_cost"]),
         has_inflation_penalty=bool(nadac_data["has_inflation_penalty"]),
-        inflation_penalty_pct=nadac_data["inflation_penalty_pct"],
+        inflation_penalty_pct=_optional_decimal(nadac_data["inflation_penalty_pct"]),
         warnings=warnings,
     )
 
@@ -16,27 +16,15 @@ from decimal import Decimal
 
 import polars as pl
 
+from optimizer_340b.compute.money import as_rate, micros_expr
+from optimizer_340b.ingest.normalizers import ndc_expr, normalize_ndc
+
 logger = logging.getLogger(__name__)
 
 # Threshold for flagging retail confidence as "Low"
 RETAIL_VARIANCE_THRESHOLD = Decimal("0.20")  # 20%
 
 
-def _normalize_ndc(ndc: str) -> str:
-    """Normalize NDC to 11-digit format, preserving leading zeros.
-
-    Args:
-        ndc: Raw NDC string.
-
-    Returns:
-        11-digit normalized NDC string.
-    """
-    if ndc is None:
-        return ""
-    cleaned = str(ndc).replace("-", "").replace(" ", "").strip()
-    return cleaned.zfill(11)[-11:]
-
-
 @dataclass
 class RetailValidationResult:
     """Result of retail price validation.
@@ -90,11 +78,7 @@ def load_wholesaler_catalog(df: pl.DataFrame) -> pl.DataFrame:
 
     # Normalize NDC column
     if "NDC" in df.columns:
-        df = df.with_columns(
-            pl.col("NDC")
-            .map_elements(_normalize_ndc, return_dtype=pl.String)
-            .alias("ndc_normalized")
-        )
+        df = df.with_columns(ndc_expr("NDC").alias("ndc_normalized"))
 
     # Ensure actual_retail is numeric
     if "actual_retail" in df.columns:
@@ -107,32 +91,61 @@ def load_wholesaler_catalog(df: pl.DataFrame) -> pl.DataFrame:
     return df
 
 
-def build_retail_validation_lookup(
-    wholesaler_df: pl.DataFrame,
-) -> dict[str, Decimal]:
-    """Build NDC to actual retail price lookup.
+def build_retail_price_frame(wholesaler_df: pl.DataFrame) -> pl.DataFrame:
+    """Build the NDC to actual retail price frame used for batch joins.
+
+    Keeps rows with an NDC and a positive retail price; for duplicate NDCs
+    the last row wins.
 
     Args:
-        wholesaler_df: Normalized wholesaler catalog DataFrame.
+        wholesaler_df: Normalized wholesaler catalog DataFrame
+            (see :func:`load_wholesaler_catalog`).
 
     Returns:
-        Dictionary mapping normalized NDC to actual retail price.
+        DataFrame with ndc_normalized and actual_retail (Float64) columns.
     """
-    lookup: dict[str, Decimal] = {}
-
     ndc_col = "ndc_normalized" if "ndc_normalized" in wholesaler_df.columns else "NDC"
     retail_col = "actual_retail"
 
     if ndc_col not in wholesaler_df.columns or retail_col not in wholesaler_df.columns:
         logger.warning("Required columns not found for retail validation lookup")
-        return lookup
+        return pl.DataFrame(
+            schema={"ndc_normalized": pl.String(), "actual_retail": pl.Float64()}
+        )
 
-    for row in wholesaler_df.iter_rows(named=True):
-        ndc = row.get(ndc_col)
-        retail = row.get(retail_col)
+    return (
+        wholesaler_df.select(
+            pl.col(ndc_col).cast(pl.String).alias("ndc_normalized"),
+            pl.col(retail_col).cast(pl.Float64, strict=False).alias("actual_retail"),
+        )
+        .filter(
+            pl.col("ndc_normalized").fill_null("") != "",
+            pl.col("actual_retail") > 0,
+        )
+        .unique(subset="ndc_normalized", keep="last", maintain_order=True)
+    )
 
-        if ndc and retail is not None and retail > 0:
-            lookup[str(ndc)] = Decimal(str(retail))
+
+def build_retail_validation_lookup(
+    wholesaler_df: pl.DataFrame,
+) -> dict[str, Decimal]:
+    """Build NDC to actual retail price lookup.
+
+    Args:
+        wholesaler_df: Normalized wholesaler catalog DataFrame.
+
+    Returns:
+        Dictionary mapping normalized NDC to actual retail price.
+    """
+    prices = build_retail_price_frame(wholesaler_df)
+    lookup = {
+        ndc: Decimal(str(retail))
+        for ndc, retail in zip(
+            prices["ndc_normalized"].to_list(),
+            prices["actual_retail"].to_list(),
+            strict=True,
+        )
+    }
 
     logger.info(f"Built retail validation lookup with {len(lookup)} NDCs")
     return lookup
@@ -156,7 +169,7 @@ def validate_retail_price(
     Returns:
         RetailValidationResult with validation details.
     """
-    ndc_normalized = _normalize_ndc(ndc)
+    ndc_normalized = normalize_ndc(ndc)
     actual_retail = retail_lookup.get(ndc_normalized)
 
     # No actual retail available - cannot validate
@@ -199,20 +212,27 @@ def validate_retail_price(
 
 def validate_batch_retail(
     drugs_df: pl.DataFrame,
-    retail_lookup: dict[str, Decimal],
+    retail_prices: pl.DataFrame | dict[str, Decimal],
     ndc_col: str = "ndc_normalized",
     calculated_col: str = "retail_revenue",
 ) -> pl.DataFrame:
     """Validate retail prices for a batch of drugs.
 
+    Left-joins the wholesaler prices on normalized NDC and computes the
+    same variance and confidence as :func:`validate_retail_price` with
+    expressions. The threshold test runs on integer micro-dollars, so it
+    is exact for prices with up to six decimal places.
+
     Adds columns:
     - actual_retail: From wholesaler catalog
-    - retail_variance_pct: Percentage difference
-    - retail_confidence: "High" or "Low"
+    - retail_variance_pct: Percentage difference (as decimal)
+    - retail_confidence: "High", "Low", or "Unknown" (no benchmark or
+      no calculated retail)
 
     Args:
         drugs_df: DataFrame with drug data.
-        retail_lookup: Lookup dict from wholesaler catalog.
+        retail_prices: Frame from :func:`build_retail_price_frame`, or a
+            lookup dict from :func:`build_retail_validation_lookup`.
         ndc_col: Column containing NDC.
         calculated_col: Column containing calculated retail revenue.
 
@@ -227,48 +247,57 @@ def validate_batch_retail(
         logger.warning(f"Calculated retail column '{calculated_col}' not found")
         return drugs_df
 
-    # Add validation columns
-    actual_values = []
-    variance_values = []
-    confidence_values = []
-
-    for row in drugs_df.iter_rows(named=True):
-        ndc = str(row.get(ndc_col, ""))
-        calculated = row.get(calculated_col)
+    if isinstance(retail_prices, dict):
+        retail_prices = pl.DataFrame(
+            {
+                "ndc_normalized": list(retail_prices.keys()),
+                "actual_retail": [float(v) for v in retail_prices.values()],
+            },
+            schema={"ndc_normalized": pl.String(), "actual_retail": pl.Float64()},
+        )
 
-        if calculated is None:
-            actual_values.append(None)
-            variance_values.append(None)
-            confidence_values.append("Unknown")
-            continue
+    calculated = pl.col(calculated_col).cast(pl.Float64)
+    actual = pl.col("_actual_retail")
+    has_benchmark = calculated.is_not_null() & actual.is_not_null()
 
-        result = validate_retail_price(
-            ndc, Decimal(str(calculated)), retail_lookup
-        )
+    # variance > threshold, as |calc - actual| * den > actual * num in micros
+    threshold = as_rate(RETAIL_VARIANCE_THRESHOLD)
+    difference = (micros_expr(calculated) - micros_expr(actual)).abs()
+    is_low = difference * threshold.denominator > (
+        micros_expr(actual) * threshold.numerator
+    )
 
-        actual_values.append(
-            float(result.actual_retail) if result.actual_retail else None
+    result_df = (
+        drugs_df.with_columns(ndc_expr(ndc_col).alias("_ndc_key"))
+        .join(
+            retail_prices.select(
+                pl.col("ndc_normalized").alias("_ndc_key"),
+                pl.col("actual_retail").alias("_actual_retail"),
+            ),
+            on="_ndc_key",
+            how="left",
+            maintain_order="left",
         )
-        variance_values.append(
-            float(result.variance_pct) if result.variance_pct else None
+        .with_columns(
+            pl.when(has_benchmark).then(actual).alias("actual_retail"),
+            pl.when(has_benchmark)
+            .then((calculated - actual).abs() / actual)
+            .alias("retail_variance_pct"),
+            pl.when(~has_benchmark)
+            .then(pl.lit("Unknown"))
+            .when(is_low)
+            .then(pl.lit("Low"))
+            .otherwise(pl.lit("High"))
+            .alias("retail_confidence"),
         )
-        confidence_values.append(result.confidence)
-
-    # Add new columns
-    result_df = drugs_df.with_columns([
-        pl.Series("actual_retail", actual_values),
-        pl.Series("retail_variance_pct", variance_values),
-        pl.Series("retail_confidence", confidence_values),
-    ])
+        .drop("_ndc_key", "_actual_retail")
+    )
 
     # Log summary statistics
-    high_confidence = sum(1 for c in confidence_values if c == "High")
-    low_confidence = sum(1 for c in confidence_values if c == "Low")
-    unknown = sum(1 for c in confidence_values if c == "Unknown")
-
+    counts = dict(result_df.group_by("retail_confidence").len().iter_rows())
     logger.info(
-        f"Retail validation: {high_confidence} High, "
-        f"{low_confidence} Low, {unknown} Unknown confidence"
+        f"Retail validation: {counts.get('High', 0)} High, "
+        f"{counts.get('Low', 0)} Low, {counts.get('Unknown', 0)} Unknown confidence"
     )
 
     return result_df
@@ -0,0 +1,474 @@
+"""Versioned Arrow IPC snapshots of the Silver and Gold datasets.
+
+After ingest the joined Silver dataset, the scored Gold frame and the drug
+index only live in process memory, so a restart or a new worker has to rerun
+the whole pipeline. A snapshot writes them as uncompressed Arrow IPC
+(Feather v2) files::
+
+    snapshots/
+        LATEST                  # version of the newest snapshot
+        <version>/
+            manifest.json       # format, scenario, index fingerprint, rows
+            silver.arrow        # Silver dataset (catalog + crosswalk + ASP)
+            orphans.arrow       # catalog rows without a crosswalk match
+            gold.arrow          # ranked opportunities for the scenario
+            drug_frame.arrow    # DrugIndex.frame
+            drug_catalog.arrow  # DrugIndex.catalog
+
+The version is a hash of the snapshotted content and scenario, so writing
+the same results twice reuses the existing directory. Snapshots are written
+to a uniquely named temporary directory and renamed into place, so readers
+never see a partial one.
+
+Reads memory-map the files through pyarrow (installed with Streamlit) and
+wrap the mapped buffers with ``pl.from_arrow`` without copying. Polars 2 no
+longer takes ``read_ipc(memory_map=True)``, and its IPC readers copy every
+buffer; they are the fallback when pyarrow is missing. Loading a mapped
+snapshot takes milliseconds regardless of size, and the column buffers are
+file pages shared by every worker through the OS page cache. Loaded frames
+must be treated as read-only.
+
+With ``Settings.snapshot_enabled`` set, :func:`load_latest_snapshot` maps
+the ``LATEST`` snapshot once per worker and seeds the analysis cache with its
+Gold frame, so UI sessions without uploads start from the last scored run.
+Writes honour the same setting; snapshots live under
+``Settings.snapshot_dir``.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from functools import cached_property
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, cast
+
+import polars as pl
+
+from optimizer_340b.compute.analysis_cache import (
+    AnalysisCache,
+    Scenario,
+    frame_fingerprint,
+    get_analysis_cache,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.config import Settings
+from optimizer_340b.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot layout or frame schemas change
+SNAPSHOT_FORMAT_VERSION = 1
+
+SNAPSHOT_SUFFIX = ".arrow"
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+
+# Frames a snapshot may hold; silver and orphans are absent without ASP data
+SNAPSHOT_FRAMES = ("silver", "orphans", "gold", "drug_frame", "drug_catalog")
+
+
+@dataclass
+class Snapshot:
+    """Frames loaded from one snapshot version.
+
+    Attributes:
+        version: Snapshot version (content hash).
+        path: Snapshot directory.
+        manifest: Parsed ``manifest.json``.
+        frames: Memory-mapped frames by name (see ``SNAPSHOT_FRAMES``).
+    """
+
+    version: str
+    path: Path
+    manifest: dict[str, Any]
+    frames: dict[str, pl.DataFrame] = field(default_factory=dict)
+
+    @property
+    def silver(self) -> pl.DataFrame | None:
+        """Silver dataset, or None if the run had no crosswalk/ASP data."""
+        return self.frames.get("silver")
+
+    @property
+    def orphans(self) -> pl.DataFrame | None:
+        """Catalog rows without a crosswalk match, if Silver was built."""
+        return self.frames.get("orphans")
+
+    @property
+    def gold(self) -> pl.DataFrame:
+        """Ranked opportunity frame for ``scenario``."""
+        return self.frames["gold"]
+
+    @property
+    def scenario(self) -> Scenario:
+        """Scenario the Gold frame was scored under."""
+        return Scenario(
+            **{
+                name: Decimal(value)
+                for name, value in self.manifest["scenario"].items()
+            }
+        )
+
+    @cached_property
+    def index(self) -> DrugIndex:
+        """Drug index over the snapshot's drug frame."""
+        index = DrugIndex(self.frames["drug_catalog"], frame=self.frames["drug_frame"])
+        # The fingerprint was computed at write time; skip rehashing the frame
+        index.fingerprint = self.manifest["fingerprint"]
+        return index
+
+    def seed_analysis_cache(self, cache: AnalysisCache | None = None) -> None:
+        """Put the Gold frame in the analysis cache under the index version.
+
+        Pages scoring ``index`` under ``scenario`` then read the snapshot's
+        frame instead of rescoring the catalog.
+
+        Args:
+            cache: Cache to seed. Defaults to :func:`get_analysis_cache`.
+        """
+        if cache is None:
+            cache = get_analysis_cache()
+        key = ("opportunities", self.manifest["fingerprint"], self.scenario)
+        cache.put(key, self.gold)
+
+
+def map_ipc(path: Path) -> pl.DataFrame:
+    """Read an Arrow IPC file, memory-mapped when pyarrow is installed.
+
+    Args:
+        path: Uncompressed Arrow IPC file.
+
+    Returns:
+        DataFrame whose buffers are the mapped file pages (a copy without
+        pyarrow).
+    """
+    if find_spec("pyarrow") is None:
+        return pl.read_ipc(path)
+
+    import pyarrow as pa  # type: ignore[import-untyped,unused-ignore]
+    import pyarrow.ipc  # type: ignore[import-untyped,unused-ignore]
+
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return cast(pl.DataFrame, pl.from_arrow(table, rechunk=False))
+
+
+def snapshot_version(frames: dict[str, pl.DataFrame], scenario: Scenario) -> str:
+    """Compute the version of a snapshot from its content.
+
+    Args:
+        frames: Frames to snapshot by name.
+        scenario: Scenario the Gold frame was scored under.
+
+    Returns:
+        Hex digest identifying the content (first 16 characters).
+    """
+    payload = json.dumps(
+        {
+            "format": SNAPSHOT_FORMAT_VERSION,
+            "polars": pl.__version__,
+            "scenario": asdict(scenario),
+            "frames": {name: frame_fingerprint(df) for name, df in frames.items()},
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class SnapshotStore:
+    """Directory of versioned Arrow IPC snapshots.
+
+    Attributes:
+        root: Directory holding one subdirectory per version.
+        enabled: Whether new snapshots are written (reads always work).
+        keep: Number of most recent versions kept when writing.
+    """
+
+    def __init__(self, root: Path, enabled: bool = True, keep: int = 3):
+        """Initialize the store.
+
+        Args:
+            root: Directory holding one subdirectory per version.
+            enabled: Whether new snapshots are written.
+            keep: Number of most recent versions kept when writing.
+        """
+        self.root = root
+        self.enabled = enabled
+        self.keep = keep
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SnapshotStore":
+        """Create a store configured from application settings.
+
+        Args:
+            settings: Application settings.
+
+        Returns:
+            SnapshotStore rooted at ``settings.snapshot_dir``.
+        """
+        return cls(root=settings.snapshot_dir, enabled=settings.snapshot_enabled)
+
+    def path_for(self, version: str) -> Path:
+        """Return the directory of a snapshot version."""
+        return self.root / version
+
+    def versions(self) -> list[str]:
+        """Return stored versions, oldest first."""
+        if not self.root.exists():
+            return []
+        paths = [
+            p
+            for p in self.root.iterdir()
+            if not p.name.startswith(".") and (p / MANIFEST_FILE).exists()
+        ]
+        return [p.name for p in sorted(paths, key=lambda p: p.stat().st_mtime)]
+
+    def latest(self) -> str | None:
+        """Return the most recently written version, if any."""
+        try:
+            version = (self.root / LATEST_FILE).read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def write(
+        self,
+        frames: dict[str, pl.DataFrame],
+        scenario: Scenario,
+        fingerprint: str,
+    ) -> str | None:
+        """Write a snapshot and mark it as the latest.
+
+        Failures are logged and skipped, like cache writes: a missing
+        snapshot only costs the next worker a pipeline run.
+
+        Args:
+            frames: Frames by name (see ``SNAPSHOT_FRAMES``).
+            scenario: Scenario the Gold frame was scored under.
+            fingerprint: ``DrugIndex.fingerprint`` of the drug frame.
+
+        Returns:
+            Snapshot version, or None if disabled or the write failed.
+        """
+        if not self.enabled:
+            return None
+
+        version = snapshot_version(frames, scenario)
+        path = self.path_for(version)
+        tmp_path: Path | None = None
+        try:
+            if not (path / MANIFEST_FILE).exists():
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp_path = Path(tempfile.mkdtemp(prefix=f".{version}.", dir=self.root))
+                for name, df in frames.items():
+                    df.write_ipc(tmp_path / f"{name}{SNAPSHOT_SUFFIX}")
+                manifest = {
+                    "format": SNAPSHOT_FORMAT_VERSION,
+                    "polars": pl.__version__,
+                    "created_at": time.time(),
+                    "scenario": {k: str(v) for k, v in asdict(scenario).items()},
+                    "fingerprint": fingerprint,
+                    "rows": {name: df.height for name, df in frames.items()},
+                }
+                (tmp_path / MANIFEST_FILE).write_text(
+                    json.dumps(manifest, indent=2), encoding="utf-8"
+                )
+                try:
+                    os.replace(tmp_path, path)
+                except OSError:
+                    # Another worker renamed the same version into place first
+                    shutil.rmtree(tmp_path, ignore_errors=True)
+                logger.info(f"Wrote snapshot {version} to {path}")
+            else:
+                os.utime(path)
+            self._set_latest(version)
+        except Exception as e:
+            if tmp_path is not None:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+            logger.warning(f"Could not write snapshot {version}: {e}")
+            return None
+
+        self.prune()
+        return version
+
+    def read(self, version: str | None = None) -> Snapshot | None:
+        """Memory-map a snapshot.
+
+        Args:
+            version: Version to read. Defaults to the latest.
+
+        Returns:
+            Snapshot, or None if missing, from another format, or unreadable.
+        """
+        version = version or self.latest()
+        if version is None:
+            return None
+
+        path = self.path_for(version)
+        try:
+            manifest = json.loads((path / MANIFEST_FILE).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            logger.warning(f"Snapshot {version} not found in {self.root}")
+            return None
+
+        if manifest.get("format") != SNAPSHOT_FORMAT_VERSION:
+            logger.warning(
+                f"Ignoring snapshot {version} in format {manifest.get('format')}"
+            )
+            return None
+
+        snapshot = Snapshot(version, path, manifest)
+        try:
+            for name in manifest["rows"]:
+                snapshot.frames[name] = map_ipc(path / f"{name}{SNAPSHOT_SUFFIX}")
+        except Exception as e:
+            logger.warning(f"Discarding unreadable snapshot {version}: {e}")
+            return None
+
+        logger.info(f"Loaded snapshot {version} ({manifest['rows']['gold']:,} rows)")
+        return snapshot
+
+    def prune(self) -> int:
+        """Remove all but the ``keep`` most recent versions.
+
+        The latest version is never removed. Workers that already mapped a
+        removed snapshot keep reading it until they drop the frames.
+
+        Returns:
+            Number of versions removed.
+        """
+        latest = self.latest()
+        stale = [v for v in self.versions()[: -self.keep or None] if v != latest]
+        for version in stale:
+            shutil.rmtree(self.path_for(version), ignore_errors=True)
+        if stale:
+            logger.debug(f"Pruned {len(stale)} old snapshots")
+        return len(stale)
+
+    def _set_latest(self, version: str) -> None:
+        """Atomically point ``LATEST`` at ``version``."""
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{LATEST_FILE}.", dir=self.root)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(version)
+            os.replace(tmp_name, self.root / LATEST_FILE)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+_snapshot_store: SnapshotStore | None = None
+_latest_snapshot: Snapshot | None = None
+_latest_lock = threading.Lock()
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Return the process-wide snapshot store.
+
+    Returns:
+        SnapshotStore built from ``Settings.from_env()`` on first use.
+    """
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore.from_settings(Settings.from_env())
+    return _snapshot_store
+
+
+def set_snapshot_store(store: SnapshotStore | None) -> None:
+    """Replace the process-wide snapshot store.
+
+    Args:
+        store: Store to use, or None to re-read settings on next use.
+    """
+    global _snapshot_store, _latest_snapshot
+    _snapshot_store = store
+    _latest_snapshot = None
+
+
+@traced("snapshot.write")
+def write_snapshot(
+    index: DrugIndex,
+    gold: pl.DataFrame,
+    scenario: Scenario,
+    silver: tuple[pl.DataFrame, pl.DataFrame] | None = None,
+    store: SnapshotStore | None = None,
+) -> str | None:
+    """Snapshot a scored run.
+
+    Args:
+        index: Drug index the Gold frame was scored from.
+        gold: Full ranked frame from ``rank_opportunities``.
+        scenario: Scenario ``gold`` was scored under.
+        silver: ``(enriched, orphans)`` Silver frames, if built.
+        store: Store to write to. Defaults to :func:`get_snapshot_store`.
+
+    Returns:
+        Snapshot version, or None if snapshots are disabled or the write
+        failed.
+    """
+    store = store or get_snapshot_store()
+    if not store.enabled:
+        return None
+
+    frames = {"gold": gold, "drug_frame": index.frame, "drug_catalog": index.catalog}
+    if silver is not None:
+        frames["silver"], frames["orphans"] = silver
+    return store.write(frames, scenario, index.fingerprint)
+
+
+@traced("snapshot.read")
+def read_snapshot(
+    version: str | None = None, store: SnapshotStore | None = None
+) -> Snapshot | None:
+    """Memory-map a snapshot from the process-wide store.
+
+    Args:
+        version: Version to read. Defaults to the latest.
+        store: Store to read from. Defaults to :func:`get_snapshot_store`.
+
+    Returns:
+        Snapshot, or None if there is none to read.
+    """
+    return (store or get_snapshot_store()).read(version)
+
+
+def load_latest_snapshot(store: SnapshotStore | None = None) -> Snapshot | None:
+    """Return the latest snapshot for this worker, if snapshots are enabled.
+
+    The first call in a worker, and the first after ``LATEST`` moves, maps
+    the snapshot, builds its drug index and seeds the analysis cache with
+    its Gold frame. Later calls return the same mapped snapshot, so every
+    session in the worker shares it.
+
+    Args:
+        store: Store to read from. Defaults to :func:`get_snapshot_store`.
+
+    Returns:
+        Latest snapshot, or None if snapshots are disabled or none is
+        readable.
+    """
+    global _latest_snapshot
+    store = store or get_snapshot_store()
+    if not store.enabled:
+        return None
+    version = store.latest()
+    if version is None:
+        return None
+
+    with _latest_lock:
+        loaded = _latest_snapshot
+        if loaded is None or loaded.path != store.path_for(version):
+            loaded = read_snapshot(version, store)
+            if loaded is None:
+                return None
+            _ = loaded.index  # Build once here, not racily per session
+            loaded.seed_analysis_cache()
+            _latest_snapshot = loaded
+        return loaded
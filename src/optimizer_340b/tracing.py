@@ -0,0 +1,374 @@
+"""Lightweight tracing spans for ingest, normalize, compute and risk stages.
+
+A span times a block, records an optional row count and attributes, and
+nests under whichever span is open in the current context::
+
+    with span("ingest.load_excel", file=path.name) as s:
+        df = ...
+        s.set_rows(df.height)
+
+    @traced("compute.build_nadac_lookup")
+    def build_nadac_lookup(nadac): ...
+
+Instrument stage and batch entry points (``analyze_catalog_margins``,
+``filter_ira_drugs``), not per-drug helpers called once per catalog row:
+a span per row floods the trace and costs more than the work it times.
+
+Tracing is off unless ``TRACE_ENABLED=true`` (see ``Settings``). When off,
+``span`` returns a shared no-op context manager and ``traced`` calls the
+wrapped function directly, so instrumented code pays one attribute check.
+When on, each finished root span is appended to ``Settings.trace_path`` as
+JSON lines (one record per span, parents before children) and kept as
+``Tracer.last_trace`` for the UI.
+"""
+
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, ParamSpec, TypeVar
+
+import polars as pl
+
+from optimizer_340b.config import Settings
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+@dataclass(slots=True)
+class Span:
+    """A timed block of work and the spans opened inside it.
+
+    Attributes:
+        name: Dotted stage name, e.g. ``"compute.build_drug_frame"``.
+        started_at: Wall-clock start (seconds since the epoch).
+        seconds: Duration, set when the span closes.
+        rows: Rows produced, if the stage reports them.
+        attrs: Extra JSON-serializable attributes.
+        error: Exception type name if the block raised.
+        children: Spans opened while this one was current, in close order.
+    """
+
+    name: str
+    started_at: float = field(default_factory=time.time)
+    seconds: float = 0.0
+    rows: int | None = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    children: list["Span"] = field(default_factory=list)
+
+    def set_rows(self, rows: int | None) -> None:
+        """Record the number of rows this stage produced."""
+        self.rows = rows
+
+    def set(self, **attrs: Any) -> None:
+        """Add attributes to the span."""
+        self.attrs.update(attrs)
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, "Span"]]:
+        """Yield ``(depth, span)`` for this span and its descendants, preorder."""
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth + 1)
+
+    def to_records(self, trace_id: str) -> list[dict[str, Any]]:
+        """Flatten the tree into JSON-lines records, parents first.
+
+        Args:
+            trace_id: Identifier shared by every span in the tree.
+
+        Returns:
+            One dict per span with ``span_id``/``parent_id`` links.
+        """
+        records: list[dict[str, Any]] = []
+
+        def visit(node: Span, parent_id: int | None) -> None:
+            span_id = len(records)
+            records.append(
+                {
+                    "trace_id": trace_id,
+                    "span_id": span_id,
+                    "parent_id": parent_id,
+                    "name": node.name,
+                    "started_at": node.started_at,
+                    "seconds": round(node.seconds, 6),
+                    "rows": node.rows,
+                    "attrs": node.attrs,
+                    "error": node.error,
+                }
+            )
+            for child in node.children:
+                visit(child, span_id)
+
+        visit(self, None)
+        return records
+
+
+class _NullSpan:
+    """Stand-in yielded by disabled spans; every method is a no-op."""
+
+    __slots__ = ()
+
+    def set_rows(self, rows: int | None) -> None:
+        """Ignore the row count."""
+
+    def set(self, **attrs: Any) -> None:
+        """Ignore the attributes."""
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _ActiveSpan:
+    """Context manager that opens a span under the current one."""
+
+    __slots__ = ("_tracer", "_span", "_start", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict[str, Any]):
+        self._tracer = tracer
+        self._span = Span(name, attrs=attrs)
+        self._start = 0.0
+        self._token: Token[Span | None] | None = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self._span)
+        self._start = time.perf_counter()
+        return self._span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._span.seconds = time.perf_counter() - self._start
+        if exc_type is not None:
+            self._span.error = exc_type.__name__
+        assert self._token is not None
+        _current_span.reset(self._token)
+        self._tracer._close(self._span, _current_span.get())
+
+
+class Tracer:
+    """Collects span trees and exports finished ones as JSON lines.
+
+    Attributes:
+        path: JSON-lines export file, or None to keep traces in memory only.
+        enabled: Whether spans are recorded at all.
+        last_trace: Most recently finished root span.
+    """
+
+    def __init__(self, path: Path | None = None, enabled: bool = True):
+        """Initialize the tracer.
+
+        Args:
+            path: JSON-lines file finished traces are appended to.
+            enabled: False makes every span a no-op.
+        """
+        self.path = path
+        self.enabled = enabled
+        self.last_trace: Span | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "Tracer":
+        """Create a tracer from application settings.
+
+        Args:
+            settings: Loaded settings (``trace_enabled``, ``trace_path``).
+
+        Returns:
+            Configured Tracer.
+        """
+        return cls(path=settings.trace_path, enabled=settings.trace_enabled)
+
+    def span(self, name: str, **attrs: Any) -> _ActiveSpan | _NullSpan:
+        """Open a span nested under the current one.
+
+        Args:
+            name: Dotted stage name.
+            **attrs: Attributes recorded on the span.
+
+        Returns:
+            Context manager yielding the Span (a no-op stand-in if disabled).
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _ActiveSpan(self, name, attrs)
+
+    def record(
+        self, name: str, seconds: float, rows: int | None = None, **attrs: Any
+    ) -> None:
+        """Add an already-timed span, e.g. work measured in a worker process.
+
+        Args:
+            name: Dotted stage name.
+            seconds: Measured duration.
+            rows: Rows produced, if known.
+            **attrs: Attributes recorded on the span.
+        """
+        if not self.enabled:
+            return
+        finished = Span(
+            name, started_at=time.time() - seconds, seconds=seconds, rows=rows
+        )
+        finished.attrs.update(attrs)
+        self._close(finished, _current_span.get())
+
+    def _close(self, finished: Span, parent: Span | None) -> None:
+        """Attach a closed span to its parent, or export it as a new trace."""
+        if parent is not None:
+            parent.children.append(finished)
+            return
+
+        self.last_trace = finished
+        if self.path is None:
+            return
+        records = finished.to_records(uuid.uuid4().hex)
+        try:
+            with self._lock:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", encoding="utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps(record, default=str) + "\n")
+        except OSError as e:
+            logger.warning(f"Could not write trace to {self.path}: {e}")
+
+
+_tracer: Tracer | None = None
+
+
+def get_tracer() -> Tracer:
+    """Return the process-wide tracer.
+
+    Returns:
+        Tracer built from ``Settings.from_env()`` on first use.
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer.from_settings(Settings.from_env())
+    return _tracer
+
+
+def set_tracer(tracer: Tracer | None) -> None:
+    """Replace the process-wide tracer.
+
+    Args:
+        tracer: Tracer to use, or None to re-read settings on next use.
+    """
+    global _tracer
+    _tracer = tracer
+
+
+def span(name: str, **attrs: Any) -> _ActiveSpan | _NullSpan:
+    """Open a span on the process-wide tracer (see ``Tracer.span``)."""
+    return get_tracer().span(name, **attrs)
+
+
+def record_span(
+    name: str, seconds: float, rows: int | None = None, **attrs: Any
+) -> None:
+    """Record a pre-timed span on the process-wide tracer (see ``Tracer.record``)."""
+    get_tracer().record(name, seconds, rows, **attrs)
+
+
+def _row_count(result: object) -> int | None:
+    """Rows in a stage result: frame height or mapping/sequence length."""
+    if isinstance(result, pl.DataFrame):
+        return result.height
+    if isinstance(result, dict | list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], pl.DataFrame):
+        return result[0].height
+    return None
+
+
+def traced(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorate a function so each call is a span.
+
+    The span's row count is taken from the return value: a DataFrame's
+    height (the first frame of a tuple), or the length of a dict or list.
+
+    Args:
+        name: Dotted stage name.
+
+    Returns:
+        Decorator.
+    """
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(name) as active:
+                result = func(*args, **kwargs)
+                active.set_rows(_row_count(result))
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def read_traces(path: Path, limit: int | None = None) -> list[Span]:
+    """Rebuild span trees from a JSON-lines export.
+
+    Args:
+        path: File written by ``Tracer``.
+        limit: Only return the last N traces.
+
+    Returns:
+        Root spans in file order (empty if the file does not exist).
+    """
+    if not path.exists():
+        return []
+
+    roots: dict[str, Span] = {}
+    by_id: dict[tuple[str, int], Span] = {}
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            node = Span(
+                record["name"],
+                started_at=record["started_at"],
+                seconds=record["seconds"],
+                rows=record["rows"],
+                attrs=record["attrs"],
+                error=record["error"],
+            )
+            trace_id = record["trace_id"]
+            by_id[(trace_id, record["span_id"])] = node
+            if record["parent_id"] is None:
+                roots[trace_id] = node
+            else:
+                by_id[(trace_id, record["parent_id"])].children.append(node)
+
+    traces = list(roots.values())
+    return traces[-limit:] if limit else traces
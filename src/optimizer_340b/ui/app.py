@@ -8,9 +8,13 @@ from __future__ import annotations
 import logging
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import streamlit as st
 
+if TYPE_CHECKING:
+    from optimizer_340b.tracing import Span
+
 # Add src to path for imports when running directly
 src_path = Path(__file__).parent.parent.parent
 if str(src_path) not in sys.path:
@@ -27,11 +31,13 @@ logger = logging.getLogger(__name__)
 def main() -> None:
     """Main entry point for Streamlit application."""
     # Import pages here to avoid E402 at module level
+    from optimizer_340b.tracing import Span, get_tracer
     from optimizer_340b.ui.pages.dashboard import render_dashboard_page
     from optimizer_340b.ui.pages.drug_detail import render_drug_detail_page
     from optimizer_340b.ui.pages.manual_upload import render_manual_upload_page
     from optimizer_340b.ui.pages.ndc_lookup import render_ndc_lookup_page
     from optimizer_340b.ui.pages.upload import render_upload_page
+    from optimizer_340b.ui.session import get_snapshot
 
     # Page configuration - must be first Streamlit command
     st.set_page_config(
@@ -53,6 +59,9 @@ def main() -> None:
     # Custom CSS
     _apply_custom_styles()
 
+    # Start sessions without uploads from the latest snapshot, if enabled
+    get_snapshot()
+
     # Sidebar header
     st.sidebar.title("\U0001f48a 340B Optimizer")
     st.sidebar.caption("Site-of-Care Optimization Engine")
@@ -72,6 +81,7 @@ def main() -> None:
     # Data status
     st.sidebar.markdown("### Data Status")
     _render_data_status()
+    trace_slot = st.sidebar.container()
 
     st.sidebar.markdown("---")
 
@@ -95,7 +105,13 @@ def main() -> None:
         )
 
     # Render selected page
-    pages[selected_page]()
+    tracer = get_tracer()
+    with tracer.span(f"page.{selected_page}") as page_span:
+        pages[selected_page]()
+
+    if isinstance(page_span, Span):
+        with trace_slot:
+            _render_trace_panel(page_span)
 
 
 def _apply_custom_styles() -> None:
@@ -167,7 +183,15 @@ def _apply_custom_styles() -> None:
 
 def _render_data_status() -> None:
     """Render data loading status in sidebar."""
+    from optimizer_340b.ui.session import get_snapshot
+
     uploaded = st.session_state.get("uploaded_data", {})
+    snapshot = get_snapshot()
+    if "catalog" not in uploaded and snapshot is not None:
+        st.sidebar.markdown(
+            f"\U0001f4e6 Snapshot {snapshot.version}: "
+            f"{snapshot.gold.height:,} drugs scored"
+        )
 
     files = [
         ("catalog", "Product Catalog"),
@@ -193,5 +217,25 @@ def _render_data_status() -> None:
                 st.sidebar.markdown(f"\u274c {name}")
 
 
+def _render_trace_panel(root: Span) -> None:
+    """Render the span tree of this page run in the sidebar.
+
+    Args:
+        root: Page span from this script run.
+    """
+    import polars as pl
+
+    rows = [
+        {
+            "Stage": "\u2003" * depth + node.name,
+            "Seconds": round(node.seconds, 3),
+            "Rows": node.rows,
+        }
+        for depth, node in root.walk()
+    ]
+    with st.expander(f"Last Run Trace ({root.seconds:.2f}s)"):
+        st.dataframe(pl.DataFrame(rows), width="stretch", hide_index=True)
+
+
 if __name__ == "__main__":
     main()
@@ -17,9 +17,13 @@ import polars as pl
 import streamlit as st
 
 from optimizer_340b.ingest.normalizers import normalize_ndc
+from optimizer_340b.ui.session import get_drug_index
 
 logger = logging.getLogger(__name__)
 
+# Maximum ranked matches offered for a drug name search
+NAME_SEARCH_LIMIT = 50
+
 # Path to NDC-HCPCS mapping file
 MAPPING_FILE = Path(__file__).parent.parent.parent.parent.parent / "data" / "sample" / "ndc_hcpcs_mapping.csv"
 
@@ -64,26 +68,12 @@ def _get_drug_name_options() -> list[str]:
     """Get list of unique drug names from catalog for autocomplete.
 
     Returns:
-        Sorted list of unique drug names.
+        Sorted list of unique drug names (from the shared search index).
     """
-    if "drug_name_options" in st.session_state:
-        return st.session_state.drug_name_options
-
-    uploaded = st.session_state.get("uploaded_data", {})
-    catalog = uploaded.get("catalog")
-
-    if catalog is None:
+    index = get_drug_index()
+    if index is None:
         return []
-
-    names = set()
-    for row in catalog.iter_rows(named=True):
-        name = str(row.get("Drug Name") or row.get("Trade Name") or "").strip()
-        if name and name.lower() != "unknown":
-            names.add(name)
-
-    sorted_names = sorted(names)
-    st.session_state.drug_name_options = sorted_names
-    return sorted_names
+    return index.search_index.names
 
 
 def _detect_query_type(query: str) -> str:
@@ -130,7 +120,11 @@ def _format_ndc_for_display(ndc: str) -> str:
 
 
 def _search_drugs_by_name(query: str) -> list[dict[str, str]]:
-    """Search catalog for drugs matching the query name.
+    """Search catalog for drugs matching the query.
+
+    Uses the shared search index: matches drug name, generic name,
+    manufacturer, NDC or HCPCS, ranked best first, with typo-tolerant
+    matches when there are few exact ones.
 
     Args:
         query: Drug name search query (partial match).
@@ -138,31 +132,39 @@ def _search_drugs_by_name(query: str) -> list[dict[str, str]]:
     Returns:
         List of matching drugs with {ndc, drug_name, manufacturer, strength}.
     """
-    uploaded = st.session_state.get("uploaded_data", {})
-    catalog = uploaded.get("catalog")
-
-    if catalog is None:
+    index = get_drug_index()
+    if index is None:
         return []
 
-    query_upper = query.upper().strip()
-    matches: list[dict[str, str]] = []
-
-    for row in catalog.iter_rows(named=True):
-        drug_name = str(row.get("Drug Name") or row.get("Trade Name") or "").strip()
-        if query_upper in drug_name.upper():
-            ndc = str(row.get("NDC", "")).strip()
-            manufacturer = str(row.get("Manufacturer") or row.get("MANUFACTURER") or "").strip()
-            # Get strength/description for differentiation
-            strength = str(row.get("Strength") or row.get("Description") or "").strip()
-
-            matches.append({
-                "ndc": ndc,
-                "drug_name": drug_name,
-                "manufacturer": manufacturer,
-                "strength": strength,
-            })
-
-    return matches
+    hits = index.search_index.search(query, limit=NAME_SEARCH_LIMIT)
+    positions = [hit.position for hit in hits]
+    frame = index.frame[positions]
+    catalog = index.catalog[positions]
+    strength_col = next(
+        (c for c in ("Strength", "Description") if c in catalog.columns), None
+    )
+    strengths = (
+        catalog[strength_col].cast(pl.String).to_list()
+        if strength_col
+        else [None] * len(positions)
+    )
+
+    return [
+        {
+            "ndc": str(ndc or "").strip(),
+            "drug_name": str(drug_name or "").strip(),
+            "manufacturer": str(manufacturer or "").strip(),
+            # Strength/description for differentiation
+            "strength": str(strength or "").strip(),
+        }
+        for ndc, drug_name, manufacturer, strength in zip(
+            frame["ndc"].to_list(),
+            frame["drug_name"].to_list(),
+            frame["manufacturer"].to_list(),
+            strengths,
+            strict=True,
+        )
+    ]
 
 
 def render_drug_search(
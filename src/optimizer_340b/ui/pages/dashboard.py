@@ -6,28 +6,32 @@ from decimal import Decimal
 import polars as pl
 import streamlit as st
 
-from optimizer_340b.compute.margins import analyze_drug_margin
-from optimizer_340b.compute.retail_pricing import (
-    DrugCategory,
-    classify_drug_category,
-    load_drug_category_lookup,
-)
+from optimizer_340b.compute.analysis_cache import Scenario, cached_opportunities
+from optimizer_340b.compute.drug_frame import DRUG_FRAME_SCHEMA
+from optimizer_340b.compute.margin_table import MarginTable
+from optimizer_340b.compute.margins import opportunity_page, rank_opportunities
 from optimizer_340b.ingest.normalizers import normalize_ndc
-from optimizer_340b.models import Drug, MarginAnalysis
-from optimizer_340b.risk import check_ira_status
-from optimizer_340b.risk.penny_pricing import (
-    INFLATION_PENALTY_THRESHOLD,
-    PENNY_COST_OVERRIDE,
-    build_nadac_lookup,
-)
-from optimizer_340b.risk.retail_validation import (
-    build_retail_validation_lookup,
-    load_wholesaler_catalog,
-)
 from optimizer_340b.ui.components.drug_search import render_drug_search
+from optimizer_340b.ui.session import get_drug_index
 
 logger = logging.getLogger(__name__)
 
+# Opportunity table sort options: label -> OPPORTUNITY_SORT_KEYS key
+SORT_OPTIONS = {
+    "Delta": "margin_delta",
+    "Best Margin": "best_margin",
+    "Pharmacy Medicaid": "pharmacy_medicaid_margin",
+    "Pharmacy Medicare/Commercial": "pharmacy_medicare_commercial_margin",
+    "Medicare": "medicare_margin",
+    "Commercial": "commercial_margin",
+    "Crossover": "crossover_capture_rate",
+    "Drug": "drug_name",
+    "NDC": "ndc",
+}
+
+# Opportunity rows per page options
+PAGE_SIZES = (50, 100, 500)
+
 
 def render_dashboard_page() -> None:
     """Render the main optimization dashboard.
@@ -73,6 +77,17 @@ def render_dashboard_page() -> None:
             value=0,
             step=50,
         )
+        max_crossover_pct = st.number_input(
+            "Flips to medical below capture (%)",
+            min_value=0,
+            max_value=100,
+            value=0,
+            step=5,
+            help=(
+                "Show only drugs whose recommendation switches from retail to "
+                "medical billing at or below this capture rate (0 = all drugs)."
+            ),
+        )
 
     st.markdown("---")
 
@@ -103,6 +118,11 @@ def render_dashboard_page() -> None:
         show_ira_only=show_ira_only,
         hide_penny=hide_penny,
         min_delta=Decimal(str(min_delta)),
+        max_crossover=(
+            Decimal(str(max_crossover_pct)) / Decimal("100")
+            if max_crossover_pct
+            else None
+        ),
     )
 
     # Show filter context
@@ -113,9 +133,8 @@ def render_dashboard_page() -> None:
 
 
 def _check_data_loaded() -> bool:
-    """Check if required data is loaded in session state."""
-    uploaded = st.session_state.get("uploaded_data", {})
-    return "catalog" in uploaded
+    """Check if an uploaded catalog or startup snapshot is available."""
+    return get_drug_index() is not None
 
 
 def _render_summary_metrics() -> None:
@@ -126,6 +145,9 @@ def _render_summary_metrics() -> None:
 
     with col1:
         catalog = uploaded.get("catalog")
+        index = get_drug_index()
+        if catalog is None and index is not None:
+            catalog = index.catalog
         drug_count = catalog.height if catalog is not None else 0
         st.metric("Total Drugs", f"{drug_count:,}")
 
@@ -154,424 +176,142 @@ def _render_summary_metrics() -> None:
         st.metric("Penny Pricing", f"{penny_count:,}")
 
 
-def _calculate_opportunities(capture_rate: Decimal) -> list[MarginAnalysis]:
+def _calculate_opportunities(capture_rate: Decimal) -> pl.DataFrame:
     """Calculate margin opportunities for all drugs.
 
+    Scores the session's shared drug index in one columnar pass;
+    displayed rows are read through MarginTable row views. The
+    ranked frame is cached per (data, scenario), so reruns that only change
+    filters or the search box reuse it.
+
     Args:
         capture_rate: Retail capture rate.
 
     Returns:
-        List of MarginAnalysis objects sorted by margin delta.
-    """
-    uploaded = st.session_state.get("uploaded_data", {})
-    catalog = uploaded.get("catalog")
-    asp_pricing = uploaded.get("asp_pricing")
-    crosswalk = uploaded.get("crosswalk")
-    nadac = uploaded.get("nadac")
-    noc_pricing = uploaded.get("noc_pricing")
-    noc_crosswalk = uploaded.get("noc_crosswalk")
-    ravenswood_categories = uploaded.get("ravenswood_categories")
-
-    if catalog is None:
-        return []
-
-    # Build drug objects and analyze margins
-    analyses: list[MarginAnalysis] = []
-
-    # Prepare lookup tables
-    hcpcs_lookup = _build_hcpcs_lookup(crosswalk, asp_pricing)
-    noc_lookup = _build_noc_lookup(noc_crosswalk, noc_pricing)
-
-    # Build enhanced NADAC lookup with penny cost override and inflation
-    if nadac is not None:
-        nadac_enhanced = build_nadac_lookup(nadac)
-    else:
-        nadac_enhanced = {}
-
-    # Build drug category lookup from Ravenswood (if available)
-    if ravenswood_categories is not None:
-        category_lookup = load_drug_category_lookup(ravenswood_categories)
-    else:
-        category_lookup = {}
-
-    for row in catalog.iter_rows(named=True):
-        try:
-            drug = _row_to_drug(
-                row, hcpcs_lookup, nadac_enhanced, noc_lookup, category_lookup
-            )
-            if drug is not None:
-                analysis = analyze_drug_margin(drug, capture_rate)
-                analyses.append(analysis)
-        except Exception as e:
-            logger.debug(f"Error analyzing drug: {e}")
-            continue
-
-    # Sort by margin delta descending
-    analyses.sort(key=lambda a: a.margin_delta, reverse=True)
-
-    return analyses
-
-
-def _build_hcpcs_lookup(
-    crosswalk: pl.DataFrame | None,
-    asp_pricing: pl.DataFrame | None,
-) -> dict[str, dict[str, object]]:
-    """Build HCPCS lookup from crosswalk and ASP pricing.
-
-    Returns:
-        Dictionary mapping normalized NDC to HCPCS info.
+        Analyzed drug frame sorted by margin delta (descending).
     """
-    if crosswalk is None or asp_pricing is None:
-        return {}
-
-    lookup: dict[str, dict[str, object]] = {}
-
-    # Normalize column names for crosswalk
-    ndc_col = "NDC" if "NDC" in crosswalk.columns else "NDC2"
-    hcpcs_col = (
-        "HCPCS Code" if "HCPCS Code" in crosswalk.columns else "_2025_CODE"
-    )
+    index = get_drug_index()
+    if index is None:
+        return rank_opportunities(pl.DataFrame(schema=DRUG_FRAME_SCHEMA))
 
-    if ndc_col not in crosswalk.columns or hcpcs_col not in crosswalk.columns:
-        return {}
-
-    # Build ASP pricing lookup by HCPCS
-    # IMPORTANT: CMS Payment Limit already includes 6% markup (Payment Limit = ASP x 1.06)
-    # We must back-calculate the true ASP for correct margin calculations
-    PAYMENT_LIMIT_MARKUP = 1.06
-    asp_lookup: dict[str, float] = {}
-    payment_col = (
-        "Payment Limit"
-        if "Payment Limit" in asp_pricing.columns
-        else "PAYMENT_LIMIT"
+    return cached_opportunities(
+        index.frame, index.fingerprint, Scenario(capture_rate=capture_rate)
     )
 
-    if payment_col in asp_pricing.columns and "HCPCS Code" in asp_pricing.columns:
-        for row in asp_pricing.iter_rows(named=True):
-            hcpcs = row.get("HCPCS Code")
-            payment = row.get(payment_col)
-            if hcpcs and payment:
-                # Handle N/A and other non-numeric values
-                try:
-                    payment_limit = float(payment)
-                    # Back-calculate true ASP from Payment Limit
-                    true_asp = payment_limit / PAYMENT_LIMIT_MARKUP
-                    asp_lookup[str(hcpcs).upper()] = true_asp
-                except (ValueError, TypeError):
-                    continue  # Skip non-numeric payment values
-
-    # Build combined lookup
-    for row in crosswalk.iter_rows(named=True):
-        ndc = str(row.get(ndc_col, "")).replace("-", "").strip()
-        hcpcs = str(row.get(hcpcs_col, "")).upper().strip()
-
-        if ndc and hcpcs:
-            asp = asp_lookup.get(hcpcs)
-            bill_units = (
-                row.get("Bill Units Per Pkg")
-                or row.get("BILLUNITSPKG")
-                or row.get("Billing Units Per Package")
-                or 1
-            )
-
-            lookup[ndc] = {
-                "hcpcs_code": hcpcs,
-                "asp": asp,
-                "bill_units": int(bill_units),
-            }
-
-    return lookup
-
 
-def _build_noc_lookup(
-    noc_crosswalk: pl.DataFrame | None,
-    noc_pricing: pl.DataFrame | None,
-) -> dict[str, dict[str, object]]:
-    """Build NOC lookup for drugs without permanent J-codes.
-
-    NOC (Not Otherwise Classified) provides fallback pricing for new drugs
-    that don't yet have a permanent HCPCS code.
-
-    Returns:
-        Dictionary mapping normalized NDC to NOC pricing info.
-    """
-    if noc_crosswalk is None or noc_pricing is None:
-        return {}
-
-    lookup: dict[str, dict[str, object]] = {}
-
-    # Build pricing lookup by generic drug name
-    # IMPORTANT: CMS Payment Limit already includes 6% markup (Payment Limit = ASP x 1.06)
-    # We must back-calculate the true ASP for correct margin calculations
-    PAYMENT_LIMIT_MARKUP = 1.06
-    pricing_lookup: dict[str, float] = {}
-    if "Drug Generic Name" in noc_pricing.columns and "Payment Limit" in noc_pricing.columns:
-        for row in noc_pricing.iter_rows(named=True):
-            drug_name = row.get("Drug Generic Name")
-            payment = row.get("Payment Limit")
-            if drug_name and payment:
-                try:
-                    # Normalize name for matching
-                    # Back-calculate true ASP from Payment Limit
-                    payment_limit = float(payment)
-                    true_asp = payment_limit / PAYMENT_LIMIT_MARKUP
-                    pricing_lookup[str(drug_name).upper().strip()] = true_asp
-                except (ValueError, TypeError):
-                    continue
-
-    # Build NDC lookup from crosswalk
-    ndc_col = "NDC" if "NDC" in noc_crosswalk.columns else "NDC or ALTERNATE ID"
-    generic_col = "Drug Generic Name"
-    bill_units_col = "Bill Units Per Pkg" if "Bill Units Per Pkg" in noc_crosswalk.columns else "BILLUNITSPKG"
-
-    if ndc_col not in noc_crosswalk.columns or generic_col not in noc_crosswalk.columns:
-        return {}
-
-    for row in noc_crosswalk.iter_rows(named=True):
-        ndc = str(row.get(ndc_col, "")).replace("-", "").strip()
-        generic_name = str(row.get(generic_col, "")).upper().strip()
-
-        if ndc and generic_name:
-            # Look up payment from pricing file
-            asp = pricing_lookup.get(generic_name)
-            bill_units = row.get(bill_units_col, 1) or 1
-
-            if asp is not None:
-                lookup[ndc] = {
-                    "generic_name": generic_name,
-                    "asp": asp,
-                    "bill_units": int(bill_units) if bill_units else 1,
-                    "is_noc": True,
-                }
-
-    return lookup
-
-
-def _row_to_drug(
-    row: dict[str, object],
-    hcpcs_lookup: dict[str, dict[str, object]],
-    nadac_lookup: dict[str, dict[str, object]],
-    noc_lookup: dict[str, dict[str, object]] | None = None,
-    category_lookup: dict[str, DrugCategory] | None = None,
-) -> Drug | None:
-    """Convert a catalog row to a Drug object.
+def _search_filter(search_query: str) -> pl.Expr:
+    """Build the search predicate for drug name, NDC or HCPCS code.
 
     Args:
-        row: Row from catalog DataFrame.
-        hcpcs_lookup: HCPCS/ASP lookup by NDC.
-        nadac_lookup: Enhanced NADAC lookup with penny override and inflation.
-        noc_lookup: NOC fallback lookup by NDC (for drugs without J-codes).
-        category_lookup: Drug category lookup from Ravenswood matrix.
+        search_query: Drug name, NDC (11-digit or 5-4-2 format), or HCPCS code.
 
     Returns:
-        Drug object or None if invalid.
+        Boolean expression over the analyzed drug frame.
     """
-    # Get NDC
-    ndc = str(row.get("NDC", ""))
-    if not ndc:
-        return None
-
-    ndc_normalized = ndc.replace("-", "").strip().zfill(11)[-11:]
-
-    # Get drug name (handle different column names)
-    drug_name = (
-        row.get("Drug Name")
-        or row.get("Trade Name")
-        or row.get("DRUG_NAME")
-        or "Unknown"
-    )
-
-    # Get manufacturer
-    manufacturer = row.get("Manufacturer") or row.get("MANUFACTURER") or "Unknown"
-
-    # Get contract cost (340B acquisition cost from Unit Price Current Catalog)
-    contract_cost = (
-        row.get("Unit Price (Current Catalog)")
-        or row.get("Contract Cost")
-        or row.get("CONTRACT_COST")
-        or 0
-    )
-    try:
-        contract_cost = Decimal(str(contract_cost))
-    except Exception:
-        return None
-
-    # Get AWP (handle different column names)
-    awp = row.get("AWP") or row.get("Medispan AWP") or row.get("MEDISPAN_AWP") or 0
-    try:
-        awp = Decimal(str(awp))
-    except Exception:
-        return None
-
-    # Lookup HCPCS/ASP info (primary source)
-    hcpcs_info = hcpcs_lookup.get(ndc_normalized, {})
-    asp = hcpcs_info.get("asp")
-    hcpcs_code = hcpcs_info.get("hcpcs_code")
-    bill_units = hcpcs_info.get("bill_units", 1)
-
-    # NOC fallback: if not in ASP crosswalk, check NOC crosswalk
-    if asp is None and noc_lookup:
-        noc_info = noc_lookup.get(ndc_normalized, {})
-        if noc_info:
-            asp = noc_info.get("asp")
-            bill_units = noc_info.get("bill_units", 1)
-            # NOC drugs use generic codes, mark as NOC for display
-            hcpcs_code = "NOC"  # Indicates Not Otherwise Classified
-
-    # Lookup NADAC info (enhanced with penny override and inflation)
-    nadac_info = nadac_lookup.get(ndc_normalized, {})
-    penny_pricing = nadac_info.get("is_penny_priced", False)
-
-    # Apply penny cost override per manifest:
-    # "If penny_pricing == 'Yes', override Cost_Basis to $0.01"
-    if penny_pricing and nadac_info.get("override_cost"):
-        contract_cost = nadac_info["override_cost"]
-        logger.debug(f"Applied penny cost override for NDC {ndc}: ${contract_cost}")
-
-    # Check for high inflation penalty (>20%)
-    inflation_penalty = nadac_info.get("inflation_penalty_pct")
-    has_inflation_flag = nadac_info.get("has_inflation_penalty", False)
-
-    # Get NADAC price (most recent)
-    nadac_price = nadac_info.get("nadac_price")
-
-    # Check IRA status
-    ira_status = check_ira_status(str(drug_name))
-    ira_flag = ira_status.get("is_ira_drug", False)
-
-    # Classify drug category (for retail pricing multiplier)
-    drug_category = classify_drug_category(str(drug_name), category_lookup)
-    # Brand/Specialty use 85% AWP, Generic uses 20% AWP
-    is_brand = drug_category != DrugCategory.GENERIC
-
-    # Detect Off-Contract drugs
-    contract_name = str(row.get("Contract Name", "")).strip()
-    off_contract = contract_name == "Off-Contract"
-
-    return Drug(
-        ndc=ndc,
-        drug_name=str(drug_name),
-        manufacturer=str(manufacturer),
-        contract_cost=contract_cost,
-        awp=awp,
-        asp=Decimal(str(asp)) if asp else None,
-        hcpcs_code=str(hcpcs_code) if hcpcs_code else None,
-        bill_units_per_package=int(str(bill_units)) if bill_units else 1,
-        is_brand=is_brand,
-        ira_flag=bool(ira_flag),
-        penny_pricing_flag=bool(penny_pricing),
-        off_contract=off_contract,
-        nadac_price=nadac_price,
+    query = search_query.upper()
+    query_ndc = normalize_ndc(search_query)  # Normalize for NDC matching
+    return (
+        pl.col("drug_name").str.to_uppercase().str.contains(query, literal=True)
+        | pl.col("ndc").str.contains(query_ndc, literal=True)
+        # Also check raw query for partial matches
+        | pl.col("ndc").str.contains(query, literal=True)
+        # HCPCS match
+        | (pl.col("hcpcs_code").str.to_uppercase() == query).fill_null(False)
     )
 
 
 def _apply_filters(
-    analyses: list[MarginAnalysis],
+    analyses: pl.DataFrame,
     search_query: str = "",
     show_ira_only: bool = False,
     hide_penny: bool = True,
     min_delta: Decimal = Decimal("0"),
-) -> list[MarginAnalysis]:
+    max_crossover: Decimal | None = None,
+) -> pl.DataFrame:
     """Apply filters to opportunity list.
 
     Args:
-        analyses: List of MarginAnalysis objects.
+        analyses: Analyzed drug frame.
         search_query: Drug name, NDC, or HCPCS code search.
         show_ira_only: Show only IRA-affected drugs.
         hide_penny: Hide penny-priced drugs.
         min_delta: Minimum margin delta.
+        max_crossover: Keep only drugs whose crossover capture rate is at
+            most this value (None keeps all).
 
     Returns:
-        Filtered list of analyses.
+        Filtered analyzed drug frame.
     """
-    filtered = analyses
-
-    # Search filter - supports drug name, NDC (11-digit or 5-4-2 format), or HCPCS code
-    if search_query:
-        query = search_query.upper()
-        query_ndc = normalize_ndc(search_query)  # Normalize for NDC matching
-        filtered = [
-            a for a in filtered
-            if query in a.drug.drug_name.upper()
-            or query_ndc in a.drug.ndc
-            or query in a.drug.ndc  # Also check raw query for partial matches
-            or (a.drug.hcpcs_code and query == a.drug.hcpcs_code.upper())  # HCPCS match
-        ]
-
-    # IRA filter
-    if show_ira_only:
-        filtered = [a for a in filtered if a.drug.ira_flag]
-
-    # Penny pricing filter
-    if hide_penny:
-        filtered = [a for a in filtered if not a.drug.penny_pricing_flag]
-
-    # Margin delta filter
-    filtered = [a for a in filtered if a.margin_delta >= min_delta]
-
+    filtered, _ = _apply_filters_with_context(
+        analyses,
+        search_query=search_query,
+        show_ira_only=show_ira_only,
+        hide_penny=hide_penny,
+        min_delta=min_delta,
+        max_crossover=max_crossover,
+    )
     return filtered
 
 
 def _apply_filters_with_context(
-    analyses: list[MarginAnalysis],
+    analyses: pl.DataFrame,
     search_query: str = "",
     show_ira_only: bool = False,
     hide_penny: bool = True,
     min_delta: Decimal = Decimal("0"),
-) -> tuple[list[MarginAnalysis], dict[str, int]]:
+    max_crossover: Decimal | None = None,
+) -> tuple[pl.DataFrame, dict[str, int]]:
     """Apply filters and return context about what was filtered.
 
     Returns:
-        Tuple of (filtered list, context dict with counts).
+        Tuple of (filtered frame, context dict with counts).
     """
     context: dict[str, int] = {
-        "total": len(analyses),
+        "total": analyses.height,
         "search_matches": 0,
         "hidden_by_ira": 0,
         "hidden_by_penny": 0,
         "hidden_by_delta": 0,
+        "hidden_by_crossover": 0,
     }
 
     filtered = analyses
 
     # Search filter - supports drug name, NDC (11-digit or 5-4-2 format), or HCPCS code
     if search_query:
-        query = search_query.upper()
-        query_ndc = normalize_ndc(search_query)  # Normalize for NDC matching
-        search_results = [
-            a for a in filtered
-            if query in a.drug.drug_name.upper()
-            or query_ndc in a.drug.ndc
-            or query in a.drug.ndc  # Also check raw query for partial matches
-            or (a.drug.hcpcs_code and query == a.drug.hcpcs_code.upper())  # HCPCS match
-        ]
-        context["search_matches"] = len(search_results)
-        filtered = search_results
-    else:
-        context["search_matches"] = len(filtered)
+        filtered = filtered.filter(_search_filter(search_query))
+    context["search_matches"] = filtered.height
 
     # IRA filter
     if show_ira_only:
-        before_ira = len(filtered)
-        filtered = [a for a in filtered if a.drug.ira_flag]
-        context["hidden_by_ira"] = before_ira - len(filtered)
+        before_ira = filtered.height
+        filtered = filtered.filter(pl.col("ira_flag"))
+        context["hidden_by_ira"] = before_ira - filtered.height
 
     # Penny pricing filter
     if hide_penny:
-        before_penny = len(filtered)
-        filtered = [a for a in filtered if not a.drug.penny_pricing_flag]
-        context["hidden_by_penny"] = before_penny - len(filtered)
+        before_penny = filtered.height
+        filtered = filtered.filter(~pl.col("penny_pricing_flag"))
+        context["hidden_by_penny"] = before_penny - filtered.height
 
     # Margin delta filter
-    before_delta = len(filtered)
-    filtered = [a for a in filtered if a.margin_delta >= min_delta]
-    context["hidden_by_delta"] = before_delta - len(filtered)
+    before_delta = filtered.height
+    filtered = filtered.filter(pl.col("margin_delta") >= float(min_delta))
+    context["hidden_by_delta"] = before_delta - filtered.height
+
+    # Crossover filter: a precomputed column, so no rescoring
+    if max_crossover is not None:
+        before_crossover = filtered.height
+        filtered = filtered.filter(
+            pl.col("crossover_capture_rate") <= float(max_crossover)
+        )
+        context["hidden_by_crossover"] = before_crossover - filtered.height
 
     return filtered, context
 
 
 def _render_filter_summary(
-    filtered: list[MarginAnalysis],
+    filtered: pl.DataFrame,
     context: dict[str, int],
     search_query: str,
 ) -> None:
@@ -579,7 +319,7 @@ def _render_filter_summary(
     if search_query:
         # Show search-specific context
         matches = context["search_matches"]
-        shown = len(filtered)
+        shown = filtered.height
         hidden = matches - shown
 
         if hidden > 0:
@@ -595,6 +335,10 @@ def _render_filter_summary(
                 details.append(f"{context['hidden_by_delta']} below min delta")
             if context["hidden_by_ira"] > 0:
                 details.append(f"{context['hidden_by_ira']} non-IRA")
+            if context["hidden_by_crossover"] > 0:
+                details.append(
+                    f"{context['hidden_by_crossover']} not flipping to medical"
+                )
             if details:
                 st.caption(f"Hidden: {', '.join(details)}")
         else:
@@ -604,19 +348,106 @@ def _render_filter_summary(
             )
     else:
         # No search - show total context
-        st.markdown(f"**Showing {len(filtered)} of {context['total']} drugs**")
+        st.markdown(f"**Showing {filtered.height} of {context['total']} drugs**")
+
 
+def _render_opportunity_table(opportunities: pl.DataFrame) -> None:
+    """Render one sorted page of the opportunity table with detail links.
 
-def _render_opportunity_table(analyses: list[MarginAnalysis]) -> None:
-    """Render the opportunity table with clickable rows."""
-    if not analyses:
+    Sorting and paging run on the full ranked frame (see
+    ``opportunity_page``); only the visible page is formatted.
+    """
+    if opportunities.height == 0:
         st.info("No opportunities match the current filters.")
         return
 
-    # Prepare data for display
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 1])
+    with col1:
+        sort_label = st.selectbox(
+            "Sort by",
+            list(SORT_OPTIONS),
+            key="dashboard_sort",
+            on_change=_reset_page,
+        )
+    with col2:
+        descending = st.checkbox(
+            "Largest first",
+            value=True,
+            key="dashboard_descending",
+            on_change=_reset_page,
+        )
+    with col3:
+        page_size = st.selectbox(
+            "Rows per page",
+            PAGE_SIZES,
+            index=1,
+            key="dashboard_page_size",
+            on_change=_reset_page,
+        )
+    page_count = -(-opportunities.height // page_size)
+    # Widget state lives in session state so filters can clamp it
+    if st.session_state.get("dashboard_page", 1) > page_count:
+        st.session_state.dashboard_page = page_count
+    with col4:
+        page = st.number_input(
+            f"Page (of {page_count:,})",
+            min_value=1,
+            max_value=page_count,
+            key="dashboard_page",
+        )
+
+    analyses = MarginTable(
+        opportunity_page(
+            opportunities, SORT_OPTIONS[sort_label], descending, int(page), page_size
+        )
+    )
+
+    # Polars frames go to Streamlit as Arrow, without a pandas copy
+    st.dataframe(
+        _format_opportunity_page(analyses),
+        width="stretch",
+        hide_index=True,
+        column_config={
+            "Crossover": st.column_config.Column(
+                "Crossover",
+                help="Capture rate below which medical billing beats retail",
+            ),
+            "Risk": st.column_config.Column(
+                "Risk Flags",
+                help="IRA and Penny Pricing alerts",
+            ),
+        },
+    )
+
+    # Drug detail links
+    st.markdown("---")
+    st.markdown("**View Drug Details** - Select drug, then go to Drug Detail page")
+
+    cols = st.columns(5)
+    for i, analysis in enumerate(analyses[:5]):
+        with cols[i]:
+            if st.button(analysis.drug.drug_name, key=f"detail_{i}"):
+                st.session_state.selected_drug = analysis.drug.ndc
+                st.info(f"Selected {analysis.drug.drug_name}. Go to Drug Detail.")
+
+
+def _reset_page() -> None:
+    """Return to the first page when the sort order or page size changes."""
+    st.session_state.dashboard_page = 1
+
+
+def _format_opportunity_page(analyses: MarginTable) -> pl.DataFrame:
+    """Format one page of opportunities for display.
+
+    Args:
+        analyses: Row views over the visible page.
+
+    Returns:
+        Display frame with money as "$1,234.56" strings and risk flags.
+    """
     table_data = []
 
-    for analysis in analyses[:100]:  # Limit to top 100 for performance
+    for analysis in analyses:
         drug = analysis.drug
 
         # Build risk flags as plain text (HTML doesn't render in dataframes)
@@ -629,18 +460,19 @@ def _render_opportunity_table(analyses: list[MarginAnalysis]) -> None:
             flags.append("\u26a0\ufe0f Off-Contract")
         risk_text = " | ".join(flags) if flags else ""
 
-        # Determine best margin
-        best_margin = analysis.retail_net_margin
-        if analysis.commercial_margin and analysis.commercial_margin > best_margin:
-            best_margin = analysis.commercial_margin
-        if analysis.medicare_margin and analysis.medicare_margin > best_margin:
-            best_margin = analysis.medicare_margin
-
         table_data.append({
             "Drug": drug.drug_name,
             "NDC": drug.ndc_formatted,
-            "Best Margin": f"${best_margin:,.2f}",
-            "Retail": f"${analysis.retail_net_margin:,.2f}",
+            "Best Margin": f"${analysis.best_margin:,.2f}",
+            "Pharmacy Medicaid": (
+                f"${analysis.pharmacy_medicaid_margin:,.2f}"
+                if analysis.pharmacy_medicaid_margin is not None else "N/A"
+            ),
+            "Pharmacy Medicare/Commercial": (
+                f"${analysis.pharmacy_medicare_commercial_margin:,.2f}"
+                if analysis.pharmacy_medicare_commercial_margin is not None
+                else "N/A"
+            ),
             "Medicare": (
                 f"${analysis.medicare_margin:,.2f}"
                 if analysis.medicare_margin else "N/A"
@@ -651,32 +483,12 @@ def _render_opportunity_table(analyses: list[MarginAnalysis]) -> None:
             ),
             "Recommendation": analysis.recommended_path.value.replace("_", " "),
             "Delta": f"${analysis.margin_delta:,.2f}",
+            "Crossover": (
+                f"{analysis.crossover_capture_rate:.0%}"
+                if analysis.crossover_capture_rate is not None
+                else "N/A"
+            ),
             "Risk": risk_text,
         })
 
-    # Create DataFrame
-    df = pl.DataFrame(table_data)
-
-    # Display with st.dataframe for performance
-    st.dataframe(
-        df.to_pandas(),
-        width="stretch",
-        hide_index=True,
-        column_config={
-            "Risk": st.column_config.Column(
-                "Risk Flags",
-                help="IRA and Penny Pricing alerts",
-            ),
-        },
-    )
-
-    # Drug detail links
-    st.markdown("---")
-    st.markdown("**View Drug Details** - Select drug, then go to Drug Detail page")
-
-    cols = st.columns(5)
-    for i, analysis in enumerate(analyses[:5]):
-        with cols[i]:
-            if st.button(analysis.drug.drug_name, key=f"detail_{i}"):
-                st.session_state.selected_drug = analysis.drug.ndc
-                st.info(f"Selected {analysis.drug.drug_name}. Go to Drug Detail.")
+    return pl.DataFrame(table_data)
@@ -12,12 +12,11 @@ from optimizer_340b.compute.margins import (
     analyze_drug_margin_5pathway,
     calculate_margin_sensitivity,
 )
-from optimizer_340b.ingest.normalizers import normalize_ndc
 from optimizer_340b.models import Drug, MarginAnalysis
-from optimizer_340b.risk import check_ira_status
 from optimizer_340b.risk.manufacturer_cp import check_cp_restriction
 from optimizer_340b.ui.components.drug_search import render_drug_search
 from optimizer_340b.ui.components.risk_badge import render_risk_badges
+from optimizer_340b.ui.session import get_drug_index
 
 logger = logging.getLogger(__name__)
 
@@ -129,9 +128,10 @@ def render_drug_detail_page() -> None:
 
     st.markdown("---")
 
-    # Sensitivity analysis (uses legacy analysis for now)
+    # Sensitivity chart uses the legacy analysis; the crossover comes from
+    # the 5-pathway analysis above
     st.markdown("### Capture Rate Sensitivity")
-    _render_sensitivity_chart(drug)
+    _render_sensitivity_chart(drug, analysis)
 
     st.markdown("---")
 
@@ -225,25 +225,16 @@ def _get_or_search_drug() -> Drug | None:
 
 
 def _lookup_drug_by_ndc(ndc: str) -> Drug | None:
-    """Look up drug by NDC from uploaded data.
+    """Look up drug by NDC from the session's drug index.
 
     Supports NDC input in both 11-digit and 5-4-2 dash format.
     """
-    uploaded = st.session_state.get("uploaded_data", {})
-    catalog = uploaded.get("catalog")
+    index = get_drug_index()
 
-    if catalog is None:
+    if index is None:
         return _create_demo_drug("HUMIRA")  # Fallback to demo
 
-    # Normalize input NDC for matching
-    ndc_normalized = normalize_ndc(ndc)
-
-    for row in catalog.iter_rows(named=True):
-        row_ndc = normalize_ndc(str(row.get("NDC", "")))
-        if row_ndc == ndc_normalized:
-            return _row_to_drug(row)
-
-    return None
+    return index.get(ndc)
 
 
 def _search_drug(query: str) -> Drug | None:
@@ -251,10 +242,9 @@ def _search_drug(query: str) -> Drug | None:
 
     Supports NDC input in both 11-digit and 5-4-2 dash format.
     """
-    uploaded = st.session_state.get("uploaded_data", {})
-    catalog = uploaded.get("catalog")
+    index = get_drug_index()
 
-    if catalog is None:
+    if index is None:
         # Check if it's a demo drug
         if "HUMIRA" in query.upper():
             return _create_demo_drug("HUMIRA")
@@ -262,87 +252,7 @@ def _search_drug(query: str) -> Drug | None:
             return _create_demo_drug("ENBREL")
         return None
 
-    query_upper = query.upper()
-    query_ndc = normalize_ndc(query)  # Normalize for NDC matching (handles dashes)
-
-    for row in catalog.iter_rows(named=True):
-        drug_name = str(row.get("Drug Name") or row.get("Trade Name") or "").upper()
-        ndc = str(row.get("NDC", ""))
-        ndc_normalized = normalize_ndc(ndc)
-
-        # Match by drug name or normalized NDC
-        if query_upper in drug_name or query_ndc == ndc_normalized:
-            return _row_to_drug(row)
-
-    return None
-
-
-def _row_to_drug(row: dict[str, object]) -> Drug:
-    """Convert catalog row to Drug object."""
-    from optimizer_340b.compute.retail_pricing import DrugCategory, classify_drug_category
-    from optimizer_340b.risk.penny_pricing import build_nadac_lookup
-    from optimizer_340b.ui.pages.dashboard import _build_hcpcs_lookup
-
-    uploaded = st.session_state.get("uploaded_data", {})
-    hcpcs_lookup = _build_hcpcs_lookup(
-        uploaded.get("crosswalk"),
-        uploaded.get("asp_pricing"),
-    )
-    nadac_df = uploaded.get("nadac")
-    nadac_lookup = build_nadac_lookup(nadac_df) if nadac_df is not None else {}
-
-    ndc = str(row.get("NDC", ""))
-    ndc_normalized = ndc.replace("-", "").strip()
-
-    drug_name = (
-        row.get("Drug Name")
-        or row.get("Trade Name")
-        or "Unknown"
-    )
-
-    # Get contract cost (340B acquisition cost from Unit Price Current Catalog)
-    contract_cost_raw = (
-        row.get("Unit Price (Current Catalog)")
-        or row.get("Contract Cost")
-        or 0
-    )
-    contract_cost = Decimal(str(contract_cost_raw) if contract_cost_raw else "0")
-    awp = Decimal(str(row.get("AWP") or row.get("Medispan AWP") or 0))
-
-    hcpcs_info = hcpcs_lookup.get(ndc_normalized, {})
-    nadac_info = nadac_lookup.get(ndc_normalized, {})
-
-    ira_status = check_ira_status(str(drug_name))
-
-    hcpcs_code = hcpcs_info.get("hcpcs_code")
-    bill_units = hcpcs_info.get("bill_units", 1)
-
-    # Get NADAC price (most recent)
-    nadac_price = nadac_info.get("nadac_price")
-
-    # Classify drug as Brand/Specialty (is_brand=True) or Generic (is_brand=False)
-    drug_category = classify_drug_category(str(drug_name))
-    is_brand = drug_category != DrugCategory.GENERIC
-
-    # Detect Off-Contract drugs
-    contract_name = str(row.get("Contract Name", "")).strip()
-    off_contract = contract_name == "Off-Contract"
-
-    return Drug(
-        ndc=ndc,
-        drug_name=str(drug_name),
-        manufacturer=str(row.get("Manufacturer", "Unknown")),
-        contract_cost=contract_cost,
-        awp=awp,
-        asp=Decimal(str(hcpcs_info.get("asp"))) if hcpcs_info.get("asp") else None,
-        hcpcs_code=str(hcpcs_code) if hcpcs_code else None,
-        bill_units_per_package=int(str(bill_units)) if bill_units else 1,
-        is_brand=is_brand,
-        ira_flag=bool(ira_status.get("is_ira_drug", False)),
-        penny_pricing_flag=bool(nadac_info.get("is_penny_priced", False)),
-        off_contract=off_contract,
-        nadac_price=nadac_price,
-    )
+    return index.search(query)
 
 
 def _create_demo_drug(name: str) -> Drug:
@@ -646,7 +556,7 @@ def _render_margin_card_single(
         )
 
 
-def _render_sensitivity_chart(drug: Drug) -> None:
+def _render_sensitivity_chart(drug: Drug, analysis: MarginAnalysis) -> None:
     """Render capture rate sensitivity chart."""
     sensitivity = calculate_margin_sensitivity(drug)
 
@@ -700,37 +610,25 @@ def _render_sensitivity_chart(drug: Drug) -> None:
     st.plotly_chart(fig, width="stretch")
 
     # Crossover point analysis
-    _analyze_crossover_points(sensitivity)
+    _analyze_crossover_points(analysis)
 
 
-def _analyze_crossover_points(
-    sensitivity: list[dict[str, Decimal | str]],
-) -> None:
-    """Analyze where retail becomes better/worse than medical."""
-    for i, s in enumerate(sensitivity):
-        retail = float(str(s["retail_net"]))
-        commercial = float(str(s["commercial"]))
-
-        if i > 0 and commercial > 0:
-            prev = sensitivity[i - 1]
-            prev_retail = float(str(prev["retail_net"]))
-            prev_commercial = float(str(prev["commercial"]))
-
-            # Check for crossover
-            if (prev_retail < prev_commercial) and (retail >= commercial):
-                rate = float(str(s["capture_rate"])) * 100
-                st.info(
-                    f"**Crossover Point:** At {rate:.0f}% capture rate, "
-                    "retail becomes more profitable than medical billing."
-                )
-                return
-            elif (prev_retail >= prev_commercial) and (retail < commercial):
-                rate = float(str(s["capture_rate"])) * 100
-                st.info(
-                    f"**Crossover Point:** Below {rate:.0f}% capture rate, "
-                    "medical billing becomes more profitable than retail."
-                )
-                return
+def _analyze_crossover_points(analysis: MarginAnalysis) -> None:
+    """Report where retail becomes better/worse than medical."""
+    crossover = analysis.crossover_capture_rate
+    if crossover is None:
+        return
+
+    if crossover > 1:
+        st.info(
+            "**Crossover Point:** Medical billing is more profitable than "
+            "retail at every capture rate up to 100%."
+        )
+    else:
+        st.info(
+            f"**Crossover Point:** Below {crossover:.0%} capture rate, "
+            "medical billing becomes more profitable than retail."
+        )
 
 
 def _has_loading_dose(drug: Drug) -> bool:
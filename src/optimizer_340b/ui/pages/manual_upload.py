@@ -7,8 +7,6 @@ For quick testing, use the main Upload Data page with sample data.
 from __future__ import annotations
 
 import logging
-import tempfile
-from pathlib import Path
 from typing import Any
 
 import pandas as pd
@@ -33,20 +31,18 @@ from optimizer_340b.ingest.validators import (
     validate_noc_pricing_schema,
 )
 from optimizer_340b.risk.ira_flags import reload_ira_drugs
+from optimizer_340b.ui.session import (
+    get_shared_stage,
+    get_uploaded_data,
+    write_session_snapshot,
+)
 
 logger = logging.getLogger(__name__)
 
 
 def _load_cms_csv_with_skip(uploaded_file: Any, skip_rows: int = 8) -> pl.DataFrame:
     """Load CMS CSV file, skipping header metadata rows."""
-    with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as tmp:
-        tmp.write(uploaded_file.getvalue())
-        tmp_path = tmp.name
-
-    try:
-        return preprocess_cms_csv(tmp_path, skip_rows=skip_rows)
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+    return preprocess_cms_csv(uploaded_file, skip_rows=skip_rows)
 
 
 def render_manual_upload_page() -> None:
@@ -60,9 +56,8 @@ def render_manual_upload_page() -> None:
 
     st.markdown("---")
 
-    # Initialize session state
-    if "uploaded_data" not in st.session_state:
-        st.session_state.uploaded_data = {}
+    # Initialize session state (shared dataset handles)
+    get_uploaded_data()
 
     # File upload sections
     _render_catalog_upload()
@@ -535,31 +530,23 @@ def _render_validation_summary() -> None:
 
 
 def _process_uploaded_data() -> None:
-    """Process and normalize uploaded data."""
-    from optimizer_340b.ingest.normalizers import (
-        join_catalog_to_crosswalk,
-        normalize_catalog,
-        normalize_crosswalk,
-    )
+    """Process and normalize uploaded data.
 
-    uploaded = st.session_state.uploaded_data
+    Normalization and the catalog-crosswalk join run through the session's
+    recompute graph, so only stages downstream of changed files are redone,
+    and are shared with sessions that uploaded the same files. With
+    ``SNAPSHOT_ENABLED`` the results are also written as a snapshot.
+    """
+    uploaded = get_uploaded_data()
 
-    if "catalog" in uploaded:
-        catalog_normalized = normalize_catalog(uploaded["catalog"])
-        st.session_state.uploaded_data["catalog_normalized"] = catalog_normalized
+    for name in ("catalog_normalized", "crosswalk_normalized"):
+        value = get_shared_stage(name)
+        if value is not None:
+            uploaded[name] = value
 
-    if "crosswalk" in uploaded:
-        crosswalk_normalized = normalize_crosswalk(uploaded["crosswalk"])
-        st.session_state.uploaded_data["crosswalk_normalized"] = crosswalk_normalized
-
-    catalog_ready = "catalog_normalized" in st.session_state.uploaded_data
-    crosswalk_ready = "crosswalk_normalized" in st.session_state.uploaded_data
-    if catalog_ready and crosswalk_ready:
-        joined_df, orphan_df = join_catalog_to_crosswalk(
-            st.session_state.uploaded_data["catalog_normalized"],
-            st.session_state.uploaded_data["crosswalk_normalized"],
-        )
-        st.session_state.uploaded_data["joined_data"] = joined_df
-        st.session_state.uploaded_data["orphan_data"] = orphan_df
+    joined = get_shared_stage("catalog_crosswalk_join")
+    if joined is not None:
+        uploaded["joined_data"], uploaded["orphan_data"] = joined
 
+    write_session_snapshot()
     st.session_state.data_processed = True
@@ -9,22 +9,19 @@ from __future__ import annotations
 import logging
 from pathlib import Path
 
-import polars as pl
 import streamlit as st
 
-from optimizer_340b.ingest.loaders import load_csv_to_polars, load_excel_to_polars
-from optimizer_340b.ingest.normalizers import (
-    normalize_catalog,
-    normalize_crosswalk,
-    normalize_noc_crosswalk,
-    normalize_noc_pricing,
-    preprocess_cms_csv,
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.ingest.sources import (
+    REFERENCE_FILES,
+    SOURCE_FILES,
+    resolve_source_paths,
 )
-from optimizer_340b.ingest.validators import (
-    validate_catalog_schema,
+from optimizer_340b.ui.session import (
+    get_shared_stage,
+    get_uploaded_data,
+    write_session_snapshot,
 )
-from optimizer_340b.risk.ira_flags import reload_ira_drugs
-from optimizer_340b.risk.manufacturer_cp import reload_cp_restrictions
 
 # Sample data directory
 SAMPLE_DATA_DIR = Path(__file__).parent.parent.parent.parent.parent / "data" / "sample"
@@ -43,145 +40,39 @@ def _check_sample_data_available() -> bool:
 
 
 def _load_sample_data() -> None:
-    """Load sample data files into session state."""
-    if "uploaded_data" not in st.session_state:
-        st.session_state.uploaded_data = {}
-
-    # Load product catalog (normalize first to map column names)
-    catalog_path = SAMPLE_DATA_DIR / "product_catalog.xlsx"
-    if catalog_path.exists():
-        df = load_excel_to_polars(str(catalog_path))
-        df = normalize_catalog(df)  # Maps Medispan AWP -> AWP, etc.
-        result = validate_catalog_schema(df)
-        if result.is_valid:
-            st.session_state.uploaded_data["catalog"] = df
-            logger.info(f"Loaded sample catalog: {df.height} rows")
-        else:
-            logger.warning(f"Catalog validation failed: {result.message}")
-
-    # Load ASP pricing (CMS file with header rows)
-    asp_path = SAMPLE_DATA_DIR / "asp_pricing.csv"
-    if asp_path.exists():
-        df = preprocess_cms_csv(str(asp_path), skip_rows=8)
-        st.session_state.uploaded_data["asp_pricing"] = df
-        logger.info(f"Loaded sample ASP pricing: {df.height} rows")
-
-    # Load crosswalk (CMS file with header rows, normalize column names)
-    crosswalk_path = SAMPLE_DATA_DIR / "asp_crosswalk.csv"
-    if crosswalk_path.exists():
-        df = preprocess_cms_csv(str(crosswalk_path), skip_rows=8)
-        df = normalize_crosswalk(df)  # Maps _2025_CODE -> HCPCS Code, NDC2 -> NDC
-        st.session_state.uploaded_data["crosswalk"] = df
-        logger.info(f"Loaded sample crosswalk: {df.height} rows")
-
-    # Load NADAC statistics
-    nadac_path = SAMPLE_DATA_DIR / "ndc_nadac_master_statistics.csv"
-    if nadac_path.exists():
-        df = load_csv_to_polars(str(nadac_path))
-        st.session_state.uploaded_data["nadac"] = df
-        logger.info(f"Loaded sample NADAC: {df.height} rows")
-
-    # Load biologics logic grid
-    biologics_path = SAMPLE_DATA_DIR / "biologics_logic_grid.xlsx"
-    if biologics_path.exists():
-        df = load_excel_to_polars(str(biologics_path))
-        st.session_state.uploaded_data["biologics"] = df
-        logger.info(f"Loaded sample biologics grid: {df.height} rows")
-
-    # Load NOC pricing (fallback for drugs without J-codes)
-    noc_pricing_path = SAMPLE_DATA_DIR / "noc_pricing.csv"
-    if noc_pricing_path.exists():
-        df = preprocess_cms_csv(str(noc_pricing_path), skip_rows=12)
-        df = normalize_noc_pricing(df)
-        st.session_state.uploaded_data["noc_pricing"] = df
-        logger.info(f"Loaded sample NOC pricing: {df.height} rows")
-
-    # Load NOC crosswalk
-    noc_crosswalk_path = SAMPLE_DATA_DIR / "noc_crosswalk.csv"
-    if noc_crosswalk_path.exists():
-        df = preprocess_cms_csv(str(noc_crosswalk_path), skip_rows=9)
-        df = normalize_noc_crosswalk(df)
-        st.session_state.uploaded_data["noc_crosswalk"] = df
-        logger.info(f"Loaded sample NOC crosswalk: {df.height} rows")
-
-    # Load Ravenswood AWP matrix
-    ravenswood_path = SAMPLE_DATA_DIR / "Ravenswood_AWP_Reimbursement_Matrix.xlsx"
-    if ravenswood_path.exists():
-        try:
-            # Load Drug Categories sheet
-            import pandas as pd
-
-            df_categories = load_excel_to_polars(
-                str(ravenswood_path), sheet_name="Drug Categories"
-            )
-            st.session_state.uploaded_data["ravenswood_categories"] = df_categories
-
-            # Load Summary sheet
-            pdf_summary = pd.read_excel(ravenswood_path, sheet_name="Summary")
-            df_summary = pl.from_pandas(pdf_summary.astype(str))
-            st.session_state.uploaded_data["ravenswood_summary"] = df_summary
-            logger.info(f"Loaded Ravenswood matrix: {df_categories.height} categories")
-        except Exception as e:
-            logger.warning(f"Could not load Ravenswood matrix: {e}")
-
-    # Load wholesaler catalog
-    wholesaler_path = SAMPLE_DATA_DIR / "wholesaler_catalog.xlsx"
-    if wholesaler_path.exists():
-        df = load_excel_to_polars(str(wholesaler_path))
-        st.session_state.uploaded_data["wholesaler_catalog"] = df
-        logger.info(f"Loaded wholesaler catalog: {df.height} rows")
-
-    # Load IRA drug list
-    ira_path = SAMPLE_DATA_DIR / "ira_drug_list.csv"
-    if ira_path.exists():
-        df = load_csv_to_polars(str(ira_path))
-        st.session_state.uploaded_data["ira_drugs"] = df
-        reload_ira_drugs(df=df)
-        logger.info(f"Loaded IRA drug list: {df.height} drugs")
-
-    # Load Manufacturer CP Restrictions
-    cp_path = SAMPLE_DATA_DIR / "Mfr_CP_Restrictions_Lookup_FQHC.xlsx"
-    if cp_path.exists():
-        try:
-            df = load_excel_to_polars(str(cp_path), sheet_name="Mfr CP Restrictions")
-            st.session_state.uploaded_data["cp_restrictions"] = df
-            reload_cp_restrictions(df=df)
-            logger.info(f"Loaded CP restrictions: {df.height} manufacturers")
-        except Exception as e:
-            logger.warning(f"Could not load CP restrictions: {e}")
+    """Load sample data files into session state.
+
+    Files are loaded concurrently; per-file wall times are kept in
+    ``st.session_state.ingest_timings``.
+    """
+    paths = resolve_source_paths(
+        SAMPLE_DATA_DIR, files={**SOURCE_FILES, **REFERENCE_FILES}
+    )
+    result = ingest_sources(paths)
+    get_uploaded_data().update(result.frames)
+    st.session_state.ingest_timings = result.timings
 
 
 def _process_uploaded_data() -> None:
-    """Process and normalize uploaded data."""
-    from optimizer_340b.ingest.normalizers import (
-        join_catalog_to_crosswalk,
-        normalize_catalog,
-        normalize_crosswalk,
-    )
+    """Process and normalize uploaded data.
 
-    uploaded = st.session_state.uploaded_data
-
-    # Normalize catalog
-    if "catalog" in uploaded:
-        catalog_normalized = normalize_catalog(uploaded["catalog"])
-        st.session_state.uploaded_data["catalog_normalized"] = catalog_normalized
-
-    # Normalize crosswalk
-    if "crosswalk" in uploaded:
-        crosswalk_normalized = normalize_crosswalk(uploaded["crosswalk"])
-        st.session_state.uploaded_data["crosswalk_normalized"] = crosswalk_normalized
-
-    # Join catalog to crosswalk
-    catalog_ready = "catalog_normalized" in st.session_state.uploaded_data
-    crosswalk_ready = "crosswalk_normalized" in st.session_state.uploaded_data
-    if catalog_ready and crosswalk_ready:
-        joined_df, orphan_df = join_catalog_to_crosswalk(
-            st.session_state.uploaded_data["catalog_normalized"],
-            st.session_state.uploaded_data["crosswalk_normalized"],
-        )
-        st.session_state.uploaded_data["joined_data"] = joined_df
-        st.session_state.uploaded_data["orphan_data"] = orphan_df
+    Normalization and the catalog-crosswalk join run through the session's
+    recompute graph, so only stages downstream of changed files are redone,
+    and are shared with sessions that uploaded the same files. With
+    ``SNAPSHOT_ENABLED`` the results are also written as a snapshot.
+    """
+    uploaded = get_uploaded_data()
+
+    for name in ("catalog_normalized", "crosswalk_normalized"):
+        value = get_shared_stage(name)
+        if value is not None:
+            uploaded[name] = value
 
+    joined = get_shared_stage("catalog_crosswalk_join")
+    if joined is not None:
+        uploaded["joined_data"], uploaded["orphan_data"] = joined
+
+    write_session_snapshot()
     st.session_state.data_processed = True
 
 
@@ -199,9 +90,8 @@ def render_upload_page() -> None:
 
     st.markdown("---")
 
-    # Initialize session state for uploaded data
-    if "uploaded_data" not in st.session_state:
-        st.session_state.uploaded_data = {}
+    # Initialize session state for uploaded data (shared dataset handles)
+    get_uploaded_data()
 
     # Sample data section
     if _check_sample_data_available():
@@ -293,6 +183,12 @@ def _render_data_status() -> None:
             else:
                 st.markdown(f"\u2b1c {name}")
 
+    timings = st.session_state.get("ingest_timings")
+    if timings:
+        with st.expander("Load times"):
+            for key, seconds in sorted(timings.items(), key=lambda kv: -kv[1]):
+                st.markdown(f"- `{key}`: {seconds:.2f}s")
+
     # Ready message
     if "catalog" in uploaded and "asp_pricing" in uploaded and "crosswalk" in uploaded:
         st.success(
@@ -0,0 +1,140 @@
+"""Session-scoped data shared across UI pages.
+
+Uploaded frames live in the process-wide dataset store; each session's
+``uploaded_data`` is a ``SessionDatasets`` mapping of handles, and sessions
+with identical inputs share one drug index. Processed uploads can be
+written as Arrow IPC snapshots, and with ``SNAPSHOT_ENABLED`` a session that
+has not uploaded a catalog starts from the latest snapshot (see
+``snapshots``).
+"""
+
+import logging
+from typing import Any, cast
+
+import streamlit as st
+
+from optimizer_340b.compute.analysis_cache import Scenario, cached_opportunities
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.dataset_store import SessionDatasets
+from optimizer_340b.pipeline import DependencyGraph, build_pipeline
+from optimizer_340b.snapshots import (
+    Snapshot,
+    get_snapshot_store,
+    load_latest_snapshot,
+    write_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_KEY = "pipeline"
+UPLOADED_DATA_KEY = "uploaded_data"
+SNAPSHOT_KEY = "snapshot"
+
+
+def get_uploaded_data() -> SessionDatasets:
+    """Return the session's uploaded datasets, creating the mapping if needed.
+
+    Returns:
+        SessionDatasets backed by the process-wide dataset store.
+    """
+    uploaded = st.session_state.get(UPLOADED_DATA_KEY)
+    if not isinstance(uploaded, SessionDatasets):
+        shared = SessionDatasets()
+        shared.update(uploaded or {})
+        st.session_state[UPLOADED_DATA_KEY] = shared
+        uploaded = shared
+    return uploaded
+
+
+def get_pipeline() -> DependencyGraph:
+    """Return the session's recompute graph, synced with uploaded data.
+
+    Inputs are compared against the last sync, so only stages downstream of
+    a re-uploaded file are recomputed when they are next read.
+
+    Returns:
+        DependencyGraph for the current session.
+    """
+    pipeline = st.session_state.get(PIPELINE_KEY)
+    if pipeline is None:
+        pipeline = build_pipeline()
+        st.session_state[PIPELINE_KEY] = pipeline
+
+    changed = pipeline.update_inputs(get_uploaded_data())
+    if changed:
+        logger.info(f"Uploaded data changed: {', '.join(changed)}")
+    return cast(DependencyGraph, pipeline)
+
+
+def get_drug_index() -> DrugIndex | None:
+    """Return the drug index for the session's uploads.
+
+    Sessions whose pipeline inputs have the same content share one index
+    through the dataset store; the first such session builds it with its
+    recompute graph, rebuilding only stale stages. Without an uploaded
+    catalog, the session's startup snapshot supplies the index.
+
+    Returns:
+        DrugIndex for the uploaded catalog or startup snapshot, or None if
+        neither is available.
+    """
+    if "catalog" not in get_uploaded_data():
+        snapshot = get_snapshot()
+        return snapshot.index if snapshot is not None else None
+    return cast(DrugIndex | None, get_shared_stage("drug_index"))
+
+
+def get_snapshot() -> Snapshot | None:
+    """Return the snapshot this session started from, if any.
+
+    Resolved on the session's first call: the worker's copy of the latest
+    snapshot (see ``load_latest_snapshot``), or None with snapshots
+    disabled. The session keeps that version even if ``LATEST`` moves.
+
+    Returns:
+        Startup Snapshot, or None.
+    """
+    if SNAPSHOT_KEY not in st.session_state:
+        st.session_state[SNAPSHOT_KEY] = load_latest_snapshot()
+    return cast(Snapshot | None, st.session_state[SNAPSHOT_KEY])
+
+
+def get_shared_stage(name: str) -> Any:
+    """Return a pipeline stage value shared by sessions with equal inputs.
+
+    The value is keyed by the content fingerprints of every pipeline input,
+    so sessions that uploaded the same files share one copy; the first of
+    them computes it with its own recompute graph.
+
+    Args:
+        name: Pipeline stage name.
+
+    Returns:
+        The stage value (None if a required input is missing).
+    """
+    uploaded = get_uploaded_data()
+    pipeline = get_pipeline()
+    key = (name, *(uploaded.key(input_name) for input_name in pipeline.inputs))
+    return uploaded.shared(name, key, lambda: pipeline.get(name))
+
+
+def write_session_snapshot() -> str | None:
+    """Snapshot the session's Silver and Gold datasets, if enabled.
+
+    Gold is scored under the dashboard's default scenario through the
+    analysis cache, so the dashboard reuses the frame.
+
+    Returns:
+        Snapshot version, or None if snapshots are disabled, no catalog is
+        loaded, or the write failed.
+    """
+    if not get_snapshot_store().enabled:
+        return None
+
+    index = get_drug_index()
+    if index is None:
+        return None
+
+    scenario = Scenario()
+    gold = cached_opportunities(index.frame, index.fingerprint, scenario)
+    return write_snapshot(index, gold, scenario, get_shared_stage("silver"))
@@ -3,15 +3,25 @@
 import os
 from collections.abc import Generator
 from decimal import Decimal
+from pathlib import Path
 from unittest.mock import patch
 
 import polars as pl
 import pytest
 
 from optimizer_340b.config import Settings
+from optimizer_340b.ingest.cache import ParquetCache, set_default_cache
 from optimizer_340b.models import DosingProfile, Drug, MarginAnalysis, RecommendedPath
 
 
+@pytest.fixture(autouse=True)
+def _disable_parquet_cache(tmp_path: Path) -> Generator[None, None, None]:
+    """Keep loader tests hermetic by disabling the on-disk parse cache."""
+    set_default_cache(ParquetCache(tmp_path / "cache", enabled=False))
+    yield
+    set_default_cache(None)
+
+
 @pytest.fixture
 def mock_env_vars() -> Generator[dict[str, str], None, None]:
     """Set up mock environment variables for testing.
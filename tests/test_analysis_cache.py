@@ -0,0 +1,143 @@
+"""Tests for the scenario-keyed analysis cache."""
+
+import threading
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.analysis_cache import (
+    AnalysisCache,
+    Scenario,
+    cached_opportunities,
+    frame_fingerprint,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.margins import rank_opportunities
+from optimizer_340b.config import Settings
+
+
+def _frame(n: int) -> pl.DataFrame:
+    """Frame of ``n`` Int64 rows (8 bytes each)."""
+    return pl.DataFrame({"x": list(range(n))}, schema={"x": pl.Int64})
+
+
+class TestAnalysisCache:
+    """Tests for AnalysisCache LRU behaviour."""
+
+    def test_get_or_compute_memoizes(self) -> None:
+        """A second lookup should not recompute."""
+        cache = AnalysisCache(max_bytes=10_000)
+        calls = []
+
+        def compute() -> pl.DataFrame:
+            calls.append(1)
+            return _frame(10)
+
+        first = cache.get_or_compute("k", compute)
+        second = cache.get_or_compute("k", compute)
+
+        assert second is first
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Entries beyond the byte budget should be evicted LRU first."""
+        cache = AnalysisCache(max_bytes=200)
+        cache.put("a", _frame(10))
+        cache.put("b", _frame(10))
+        cache.get("a")
+        cache.put("c", _frame(10))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.evictions == 1
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_oversized_and_disabled(self) -> None:
+        """Frames over budget, or a zero budget, should not be stored."""
+        cache = AnalysisCache(max_bytes=50)
+        cache.put("big", _frame(100))
+        assert len(cache) == 0
+
+        settings = Settings(
+            log_level="INFO",
+            data_dir=Settings.from_env().data_dir,
+            cache_enabled=False,
+            cache_ttl_hours=24,
+        )
+        assert AnalysisCache.from_settings(settings).max_bytes == 0
+
+    def test_concurrent_puts_stay_within_budget(self) -> None:
+        """Concurrent sessions should not corrupt the byte accounting."""
+        cache = AnalysisCache(max_bytes=1_000)
+
+        def worker(offset: int) -> None:
+            for i in range(50):
+                cache.put((offset, i), _frame(10))
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.nbytes == sum(
+            frame.estimated_size()
+            for frame in map(cache.get, list(cache._entries))
+            if frame is not None
+        )
+        assert cache.nbytes <= cache.max_bytes
+
+
+class TestCachedOpportunities:
+    """Tests for cached_opportunities."""
+
+    @pytest.fixture
+    def index(self, sample_catalog_df: pl.DataFrame) -> DrugIndex:
+        """Drug index over the sample catalog."""
+        return DrugIndex(sample_catalog_df)
+
+    def test_matches_rank_opportunities(self, index: DrugIndex) -> None:
+        """Cached results should equal a direct ranking for the scenario."""
+        cache = AnalysisCache(max_bytes=10_000_000)
+        scenario = Scenario(capture_rate=Decimal("0.45"), dispense_fee=Decimal("5"))
+
+        result = cached_opportunities(index.frame, index.fingerprint, scenario, cache)
+
+        expected = rank_opportunities(
+            index.frame, Decimal("0.45"), dispense_fee=Decimal("5")
+        )
+        assert result.equals(expected)
+
+    def test_keyed_on_data_and_scenario(
+        self, index: DrugIndex, sample_catalog_df: pl.DataFrame
+    ) -> None:
+        """Equal data shares entries; a new scenario or data does not."""
+        cache = AnalysisCache(max_bytes=10_000_000)
+        same_data = DrugIndex(sample_catalog_df.clone())
+
+        cached_opportunities(index.frame, index.fingerprint, Scenario(), cache)
+        cached_opportunities(same_data.frame, same_data.fingerprint, Scenario(), cache)
+        cached_opportunities(
+            index.frame,
+            index.fingerprint,
+            Scenario(capture_rate=Decimal("0.40")),
+            cache,
+        )
+
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert Scenario(capture_rate=Decimal("1.0")) == Scenario(
+            capture_rate=Decimal("1")
+        )
+
+    def test_fingerprint_tracks_content(self) -> None:
+        """Fingerprints should change with values, order and schema."""
+        df = pl.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+        assert frame_fingerprint(df) == frame_fingerprint(df.clone())
+        assert frame_fingerprint(df) != frame_fingerprint(df.reverse())
+        assert frame_fingerprint(df) != frame_fingerprint(
+            df.with_columns(pl.col("a").cast(pl.Float64))
+        )
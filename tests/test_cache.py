@@ -0,0 +1,212 @@
+"""Tests for the content-addressed Parquet cache."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+import polars as pl
+import pytest
+
+from optimizer_340b.config import Settings
+from optimizer_340b.ingest.cache import (
+    ParquetCache,
+    cached_frame,
+    hash_source,
+    make_cache_key,
+    set_default_cache,
+)
+from optimizer_340b.ingest.loaders import load_csv_to_polars, load_excel_to_polars
+from optimizer_340b.ingest.normalizers import preprocess_cms_csv
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ParquetCache:
+    """Enabled cache rooted in a temporary directory, installed as default."""
+    cache = ParquetCache(tmp_path / "cache", enabled=True, ttl_hours=24)
+    set_default_cache(cache)
+    return cache
+
+
+@pytest.fixture
+def cms_csv(tmp_path: Path) -> Path:
+    """CMS-style CSV with metadata rows above the header."""
+    path = tmp_path / "crosswalk.csv"
+    path.write_text(
+        "CMS metadata\nMore metadata\n"
+        "NDC,HCPCS Code,Bill Units,Empty\n"
+        "00074433902,J0135,2,\n"
+        "00069001001,J9999,1,\n",
+        encoding="latin-1",
+    )
+    return path
+
+
+class TestCacheKey:
+    """Tests for content hashing and key construction."""
+
+    def test_same_content_same_hash(self, tmp_path: Path) -> None:
+        """Path and file-like sources with equal bytes should hash equally."""
+        path = tmp_path / "a.csv"
+        path.write_bytes(b"a,b\n1,2\n")
+        buffer = BytesIO(b"a,b\n1,2\n")
+
+        assert hash_source(path) == hash_source(buffer)
+        assert buffer.tell() == 0
+
+    def test_key_depends_on_params(self) -> None:
+        """Different loader arguments must produce different keys."""
+        key_8 = make_cache_key("abc", "cms_csv", {"skip_rows": 8})
+        key_9 = make_cache_key("abc", "cms_csv", {"skip_rows": 9})
+        assert key_8 != key_9
+        assert key_8 == make_cache_key("abc", "cms_csv", {"skip_rows": 8})
+
+    def test_key_depends_on_loader(self) -> None:
+        """The same file parsed by different loaders should not collide."""
+        assert make_cache_key("abc", "csv", {}) != make_cache_key("abc", "excel", {})
+
+
+class TestParquetCache:
+    """Tests for ParquetCache get/put semantics."""
+
+    def test_round_trip(self, cache: ParquetCache) -> None:
+        """Stored frames should be read back unchanged."""
+        df = pl.DataFrame({"ndc": ["00074433902"], "price": [1.5]})
+        cache.put("k", df)
+        result = cache.get("k")
+        assert result is not None
+        assert result.equals(df)
+
+    def test_miss_returns_none(self, cache: ParquetCache) -> None:
+        """Unknown keys should miss."""
+        assert cache.get("missing") is None
+
+    def test_disabled_cache_never_stores(self, tmp_path: Path) -> None:
+        """A disabled cache should neither write nor read."""
+        cache = ParquetCache(tmp_path / "off", enabled=False)
+        cache.put("k", pl.DataFrame({"a": [1]}))
+        assert cache.get("k") is None
+        assert not (tmp_path / "off").exists()
+
+    def test_expired_entry_is_a_miss(self, cache: ParquetCache) -> None:
+        """Entries older than the TTL should be discarded."""
+        cache.put("k", pl.DataFrame({"a": [1]}))
+        old = time.time() - 25 * 3600
+        os.utime(cache.path_for("k"), (old, old))
+
+        assert cache.get("k") is None
+        assert not cache.path_for("k").exists()
+
+    def test_corrupt_entry_is_a_miss(self, cache: ParquetCache) -> None:
+        """Unreadable Parquet files should be dropped rather than raise."""
+        cache.cache_dir.mkdir(parents=True)
+        cache.path_for("k").write_bytes(b"not parquet")
+        assert cache.get("k") is None
+
+    def test_concurrent_writers_same_key(self, cache: ParquetCache) -> None:
+        """Threads writing one key should not share a temporary file."""
+        df = pl.DataFrame({"ndc": ["00074433902"] * 1000, "price": [1.5] * 1000})
+        tmp_paths: list[Path] = []
+        write_parquet = pl.DataFrame.write_parquet
+
+        def record(self: pl.DataFrame, file: Path) -> None:
+            tmp_paths.append(file)
+            write_parquet(self, file)
+
+        with (
+            patch.object(pl.DataFrame, "write_parquet", record),
+            ThreadPoolExecutor(max_workers=8) as pool,
+        ):
+            list(pool.map(lambda _: cache.put("k", df), range(16)))
+
+        assert len(set(tmp_paths)) == 16
+        assert list(cache.cache_dir.glob("*.tmp")) == []
+        result = cache.get("k")
+        assert result is not None
+        assert result.equals(df)
+
+    def test_clear(self, cache: ParquetCache) -> None:
+        """clear should remove every entry."""
+        cache.put("a", pl.DataFrame({"a": [1]}))
+        cache.put("b", pl.DataFrame({"a": [2]}))
+        assert cache.clear() == 2
+        assert cache.get("a") is None
+
+    def test_from_settings(self, tmp_path: Path) -> None:
+        """Cache should honour cache_enabled, cache_ttl_hours and data_dir."""
+        settings = Settings(
+            log_level="INFO",
+            data_dir=tmp_path,
+            cache_enabled=False,
+            cache_ttl_hours=6,
+        )
+        cache = ParquetCache.from_settings(settings)
+        assert cache.cache_dir == tmp_path / "cache"
+        assert cache.enabled is False
+        assert cache.ttl_hours == 6
+
+
+class TestCachedLoaders:
+    """Tests for loaders reading through the cache."""
+
+    def test_cached_frame_builds_once(self, cache: ParquetCache, cms_csv: Path) -> None:
+        """A second load of the same content should not call the parser."""
+        calls: list[int] = []
+
+        def build() -> pl.DataFrame:
+            calls.append(1)
+            return pl.DataFrame({"a": [1, 2]})
+
+        first = cached_frame(cms_csv, "test", {}, build)
+        second = cached_frame(cms_csv, "test", {}, build)
+
+        assert len(calls) == 1
+        assert first.equals(second)
+
+    def test_preprocess_cms_csv_hits_cache(
+        self, cache: ParquetCache, cms_csv: Path
+    ) -> None:
+        """Repeat CMS loads should be served from Parquet with identical data."""
+        first = preprocess_cms_csv(str(cms_csv), skip_rows=2)
+        with patch("optimizer_340b.ingest.normalizers._read_cms_csv") as parse:
+            second = preprocess_cms_csv(str(cms_csv), skip_rows=2)
+            parse.assert_not_called()
+
+        assert second.equals(first)
+        assert second["NDC"].dtype == pl.String
+        assert "Empty" not in second.columns
+
+    def test_changed_content_misses(self, cache: ParquetCache, cms_csv: Path) -> None:
+        """Editing the file should invalidate the cached frame."""
+        first = preprocess_cms_csv(str(cms_csv), skip_rows=2)
+        with open(cms_csv, "a", encoding="latin-1") as f:
+            f.write("00002123401,J1234,5,\n")
+        second = preprocess_cms_csv(str(cms_csv), skip_rows=2)
+
+        assert second.height == first.height + 1
+
+    def test_csv_upload_buffer_hits_cache(self, cache: ParquetCache) -> None:
+        """Uploaded buffers should be cached by content, not identity."""
+        data = b"NDC,Price\n00074433902,1.5\n"
+        first = load_csv_to_polars(BytesIO(data))
+        with patch("optimizer_340b.ingest.loaders._read_csv") as parse:
+            second = load_csv_to_polars(BytesIO(data))
+            parse.assert_not_called()
+
+        assert second.equals(first)
+
+    def test_excel_hits_cache(self, cache: ParquetCache, tmp_path: Path) -> None:
+        """Excel parsing should be skipped for an unchanged workbook."""
+        path = tmp_path / "catalog.xlsx"
+        pl.DataFrame({"NDC": ["00074433902"], "AWP": [6500.0]}).to_pandas().to_excel(
+            path, index=False
+        )
+        first = load_excel_to_polars(path)
+        with patch("optimizer_340b.ingest.loaders._read_excel") as parse:
+            second = load_excel_to_polars(path)
+            parse.assert_not_called()
+
+        assert second.equals(first)
+        assert second["NDC"][0] == "00074433902"
@@ -0,0 +1,184 @@
+"""Tests for the headless batch scoring CLI."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from optimizer_340b.cli import main
+from optimizer_340b.ingest.sources import resolve_source_paths
+from optimizer_340b.snapshots import SnapshotStore, set_snapshot_store
+
+CMS_PREAMBLE = "Title row,,\n" + ",,\n" * 7
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    """Directory with a catalog CSV and CMS-style crosswalk/ASP files."""
+    pl.DataFrame(
+        {
+            "NDC": ["0074-4339-02", "1234-5678-901", "5555-5555-55"],
+            "Drug Name": ["HUMIRA", "GENERIC ORAL", "ENBREL"],
+            "Manufacturer": ["ABBVIE", "TEVA", "AMGEN"],
+            "Contract Cost": [150.00, 10.00, 200.00],
+            "AWP": [6500.00, 100.00, 7000.00],
+        }
+    ).write_csv(tmp_path / "catalog.csv")
+    (tmp_path / "asp_crosswalk.csv").write_text(
+        CMS_PREAMBLE + "_2025_CODE,NDC2,BILLUNITSPKG\n"
+        "J0135,00074-4339-02,2\n"
+        "J1438,55555-5555-05,4\n"
+    )
+    (tmp_path / "asp_pricing.csv").write_text(
+        CMS_PREAMBLE + "HCPCS Code,Short Description,Payment Limit\n"
+        "J0135,Adalimumab,2800.00\n"
+        "J1438,Etanercept,3000.00\n"
+    )
+    return tmp_path
+
+
+def _run(data_dir: Path, output: Path, *extra: str) -> int:
+    """Run the CLI against the fixture directory."""
+    return main(
+        [
+            "--data-dir",
+            str(data_dir),
+            "--catalog",
+            str(data_dir / "catalog.csv"),
+            "--output",
+            str(output),
+            "--log-level",
+            "WARNING",
+            *extra,
+        ]
+    )
+
+
+class TestCli:
+    """Tests for main()."""
+
+    def test_writes_ranked_parquet(
+        self, data_dir: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Opportunities should be written best margin delta first."""
+        output = tmp_path / "out" / "ranked.parquet"
+
+        assert _run(data_dir, output) == 0
+
+        ranked = pl.read_parquet(output)
+        assert ranked.height == 3
+        assert ranked["margin_delta"].is_sorted(descending=True, nulls_last=True)
+        assert ranked.filter(pl.col("drug_name") == "HUMIRA")["hcpcs_code"].item() == (
+            "J0135"
+        )
+        report = capsys.readouterr().out
+        assert "drug_index" in report
+        assert "Wrote 3 opportunities" in report
+
+    def test_csv_output_and_top(self, data_dir: Path, tmp_path: Path) -> None:
+        """A .csv suffix should select CSV and --top should truncate."""
+        output = tmp_path / "ranked.csv"
+
+        assert _run(data_dir, output, "--top", "2") == 0
+
+        assert pl.read_csv(output).height == 2
+
+    def test_missing_catalog_fails(self, tmp_path: Path) -> None:
+        """Without a catalog the CLI should exit non-zero and write nothing."""
+        output = tmp_path / "ranked.parquet"
+
+        code = main(["--data-dir", str(tmp_path), "--output", str(output)])
+
+        assert code == 2
+        assert not output.exists()
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            ("--capture-rate", "abc"),
+            ("--capture-rate", "NaN"),
+            ("--capture-rate", "inf"),
+            ("--capture-rate", "1.5"),
+            ("--capture-rate", "-0.1"),
+            ("--top", "0"),
+            ("--top", "two"),
+            ("--workers", "0"),
+        ],
+    )
+    def test_invalid_arguments_are_usage_errors(
+        self,
+        data_dir: Path,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        extra: tuple[str, str],
+    ) -> None:
+        """Bad numeric arguments should exit 2 with a usage error from argparse."""
+        output = tmp_path / "ranked.parquet"
+
+        with pytest.raises(SystemExit) as exc_info:
+            _run(data_dir, output, *extra)
+
+        assert exc_info.value.code == 2
+        assert f"argument {extra[0]}" in capsys.readouterr().err
+        assert not output.exists()
+
+    def test_snapshot_round_trip(self, data_dir: Path, tmp_path: Path) -> None:
+        """A run should snapshot its results and --from-snapshot reuse them."""
+        set_snapshot_store(SnapshotStore(tmp_path / "snapshots"))
+        try:
+            assert _run(data_dir, tmp_path / "ranked.parquet") == 0
+            codes = [
+                main(
+                    [
+                        "--from-snapshot",
+                        "--output",
+                        str(tmp_path / f"restored-{rate}.parquet"),
+                        "--capture-rate",
+                        rate,
+                        "--log-level",
+                        "WARNING",
+                    ]
+                )
+                for rate in ("1.0", "0.6")
+            ]
+        finally:
+            set_snapshot_store(None)
+
+        assert codes == [0, 0]
+        ranked = pl.read_parquet(tmp_path / "ranked.parquet")
+        assert pl.read_parquet(tmp_path / "restored-1.0.parquet").equals(ranked)
+        rescored = pl.read_parquet(tmp_path / "restored-0.6.parquet")
+        assert rescored.height == 3
+        assert not rescored.equals(ranked)
+
+    def test_missing_snapshot_fails(self, tmp_path: Path) -> None:
+        """--from-snapshot without a snapshot should exit non-zero."""
+        set_snapshot_store(SnapshotStore(tmp_path / "snapshots"))
+        try:
+            code = main(["--from-snapshot", "--output", str(tmp_path / "o.parquet")])
+        finally:
+            set_snapshot_store(None)
+
+        assert code == 1
+
+    def test_explicit_path_must_exist(self, tmp_path: Path) -> None:
+        """A missing explicit source path should raise FileNotFoundError."""
+        with pytest.raises(FileNotFoundError, match="catalog"):
+            resolve_source_paths(None, {"catalog": tmp_path / "missing.xlsx"})
+
+    def test_does_not_import_streamlit(self) -> None:
+        """The batch entry point must run without Streamlit."""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, optimizer_340b.cli; print('streamlit' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "False"
@@ -47,6 +47,40 @@ class TestSettings:
             settings = Settings.from_env()
             assert settings.cache_enabled is True
 
+    def test_analysis_cache_budget(self) -> None:
+        """ANALYSIS_CACHE_MB should set the analysis cache budget."""
+        with patch.dict(os.environ, {"ANALYSIS_CACHE_MB": "64"}, clear=False):
+            settings = Settings.from_env()
+            assert settings.analysis_cache_mb == 64
+
+    def test_trace_enabled(self, tmp_path: Path) -> None:
+        """TRACE_ENABLED should enable tracing into data_dir/traces.jsonl."""
+        env = {"TRACE_ENABLED": "true", "DATA_DIR": str(tmp_path)}
+        with patch.dict(os.environ, env, clear=False):
+            settings = Settings.from_env()
+            assert settings.trace_enabled is True
+            assert settings.trace_path == tmp_path / "traces.jsonl"
+
+    def test_snapshot_enabled(self, tmp_path: Path) -> None:
+        """SNAPSHOT_ENABLED should enable snapshots under data_dir/snapshots."""
+        env = {"SNAPSHOT_ENABLED": "true", "DATA_DIR": str(tmp_path)}
+        with patch.dict(os.environ, env, clear=False):
+            settings = Settings.from_env()
+            assert settings.snapshot_enabled is True
+            assert settings.snapshot_dir == tmp_path / "snapshots"
+
+    def test_trace_and_snapshot_paths_from_env(self, tmp_path: Path) -> None:
+        """TRACE_PATH and SNAPSHOT_DIR should override the data_dir defaults."""
+        env = {
+            "DATA_DIR": str(tmp_path / "data"),
+            "TRACE_PATH": str(tmp_path / "spans.jsonl"),
+            "SNAPSHOT_DIR": str(tmp_path / "snaps"),
+        }
+        with patch.dict(os.environ, env, clear=False):
+            settings = Settings.from_env()
+            assert settings.trace_path == tmp_path / "spans.jsonl"
+            assert settings.snapshot_dir == tmp_path / "snaps"
+
     def test_ensure_directories(self, tmp_path: Path) -> None:
         """ensure_directories should create data_dir."""
         settings = Settings(
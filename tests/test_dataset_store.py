@@ -0,0 +1,218 @@
+"""Tests for the shared, reference-counted dataset store."""
+
+import gc
+import threading
+import time
+from collections.abc import Hashable
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+import pytest
+
+from optimizer_340b.dataset_store import (
+    DatasetStore,
+    SessionDatasets,
+    get_dataset_store,
+    set_dataset_store,
+)
+
+
+def _frame() -> pl.DataFrame:
+    """A fresh frame with fixed content."""
+    return pl.DataFrame({"ndc": ["00074433902", "00002771001"], "awp": [1.0, 2.0]})
+
+
+def _await_waiter(store: DatasetStore, key: Hashable) -> None:
+    """Block until another caller is waiting on ``key``'s build."""
+    deadline = time.monotonic() + 5
+    while store._pending[key].waiters == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestDatasetStore:
+    """Tests for DatasetStore."""
+
+    def test_put_dedupes_equal_frames(self) -> None:
+        """Equal frames from different callers should share one entry."""
+        store = DatasetStore()
+        first = _frame()
+
+        a = store.put(first)
+        b = store.put(_frame())
+
+        assert a.key == b.key
+        assert len(store) == 1
+        assert store.refs(a.key) == 2
+        assert store.dedup_hits == 1
+        assert b.value is first
+        assert store.nbytes == first.estimated_size()
+
+    def test_release_drops_last_reference(self) -> None:
+        """An entry should live until its last handle is released."""
+        store = DatasetStore()
+        a = store.put(_frame())
+        b = store.put(_frame())
+
+        a.release()
+        a.release()
+        assert store.refs(b.key) == 1
+
+        b.release()
+        assert b.key not in store
+        assert store.nbytes == 0
+        with pytest.raises(KeyError):
+            _ = b.value
+
+    def test_share_builds_once(self) -> None:
+        """Derived values should be built on the first request only."""
+        store = DatasetStore()
+        builds: list[int] = []
+
+        def build() -> dict[str, int]:
+            builds.append(1)
+            return {"rows": 2}
+
+        a = store.share(("index", "abc"), build)
+        b = store.share(("index", "abc"), build)
+
+        assert len(builds) == 1
+        assert a.value is b.value
+        assert store.refs(("index", "abc")) == 2
+
+    def test_build_runs_outside_store_lock(self) -> None:
+        """A slow build should not block other keys or rebuild for waiters."""
+        store = DatasetStore()
+        started, finish = threading.Event(), threading.Event()
+        builds: list[str] = []
+
+        def slow() -> str:
+            builds.append("slow")
+            started.set()
+            assert finish.wait(5)
+            return "slow"
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            first = pool.submit(store.share, "a", slow)
+            assert started.wait(5)
+            second = pool.submit(store.share, "a", slow)
+            _await_waiter(store, "a")
+
+            # Other keys and reads are served while "a" is still building
+            other = store.share("b", lambda: "fast")
+            assert other.value == "fast"
+            assert not first.done()
+
+            finish.set()
+            a, b = first.result(5), second.result(5)
+
+        assert builds == ["slow"]
+        assert a.value == b.value == "slow"
+        assert store.refs("a") == 2
+
+    def test_failed_build_raises_for_waiters(self) -> None:
+        """A failed build should raise in every caller and leave no entry."""
+        store = DatasetStore()
+        started, finish = threading.Event(), threading.Event()
+
+        def broken() -> object:
+            started.set()
+            assert finish.wait(5)
+            raise ValueError("bad input")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(store.share, "k", broken)
+            assert started.wait(5)
+            second = pool.submit(store.share, "k", broken)
+            _await_waiter(store, "k")
+            finish.set()
+            for future in (first, second):
+                with pytest.raises(ValueError, match="bad input"):
+                    future.result(5)
+
+        assert "k" not in store
+        assert store.share("k", lambda: 1).value == 1
+
+    def test_process_wide_store(self) -> None:
+        """set_dataset_store(None) should make a fresh store on next use."""
+        store = DatasetStore()
+        set_dataset_store(store)
+        try:
+            assert get_dataset_store() is store
+            assert SessionDatasets().store is store
+        finally:
+            set_dataset_store(None)
+        assert get_dataset_store() is not store
+
+
+class TestSessionDatasets:
+    """Tests for SessionDatasets."""
+
+    def test_frames_shared_across_sessions(self) -> None:
+        """Two sessions uploading the same content should hold one frame."""
+        store = DatasetStore()
+        first, second = SessionDatasets(store), SessionDatasets(store)
+
+        first["catalog"] = _frame()
+        second["catalog"] = _frame()
+
+        assert first["catalog"] is second["catalog"]
+        assert first.key("catalog") == second.key("catalog")
+        assert len(store) == 1
+
+    def test_replace_and_delete_release(self) -> None:
+        """Overwriting or deleting a name should release its handle."""
+        store = DatasetStore()
+        session = SessionDatasets(store)
+        session["catalog"] = _frame()
+        old_key = session.key("catalog")
+
+        session["catalog"] = _frame().with_columns(pl.col("awp") * 2)
+        assert old_key not in store
+        assert len(store) == 1
+
+        del session["catalog"]
+        assert len(store) == 0
+        assert "catalog" not in session
+        with pytest.raises(KeyError):
+            del session["catalog"]
+
+    def test_non_frames_stay_local(self) -> None:
+        """Non-DataFrame values should live in the session overlay only."""
+        store = DatasetStore()
+        session = SessionDatasets(store)
+        session["catalog"] = _frame()
+        session["capture_rate"] = 0.45
+
+        assert session["capture_rate"] == 0.45
+        assert session.overlay == {"capture_rate": 0.45}
+        assert session.key("capture_rate") is None
+        assert len(store) == 1
+        assert dict(session).keys() == {"catalog", "capture_rate"}
+        assert session.get("missing") is None
+
+    def test_collected_session_releases(self) -> None:
+        """Dropping a session's mapping should release everything it held."""
+        store = DatasetStore()
+        session = SessionDatasets(store)
+        session["catalog"] = _frame()
+        session.shared("drug_index", ("drug_index", "k"), lambda: object())
+        assert len(store) == 2
+
+        del session
+        gc.collect()
+
+        assert len(store) == 0
+
+    def test_shared_rekeys_on_change(self) -> None:
+        """A new key should release the old derived value and build again."""
+        store = DatasetStore()
+        first, second = SessionDatasets(store), SessionDatasets(store)
+
+        index = first.shared("drug_index", ("drug_index", "a"), lambda: object())
+        assert second.shared("drug_index", ("drug_index", "a"), object) is index
+
+        rebuilt = first.shared("drug_index", ("drug_index", "b"), lambda: object())
+        assert rebuilt is not index
+        assert store.refs(("drug_index", "a")) == 1
+        assert store.refs(("drug_index", "b")) == 1
@@ -0,0 +1,127 @@
+"""Tests for columnar drug frame assembly."""
+
+from decimal import Decimal
+
+import polars as pl
+
+from optimizer_340b.compute.drug_frame import (
+    DRUG_FRAME_SCHEMA,
+    build_drug_frame,
+    drug_from_row,
+    drugs_to_frame,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.models import Drug
+
+
+class TestBuildDrugFrame:
+    """Tests for build_drug_frame."""
+
+    def test_basic_catalog(self, sample_catalog_df: pl.DataFrame) -> None:
+        """Every catalog row should become one drug row in catalog order."""
+        frame = build_drug_frame(sample_catalog_df)
+
+        assert frame.height == 3
+        assert frame.schema == pl.Schema(DRUG_FRAME_SCHEMA)
+        assert frame["ndc"].to_list() == ["0074-4339-02", "1234567890", "5555555555"]
+        assert frame["ndc_normalized"][0] == "00074433902"
+        assert frame["contract_cost"].to_list() == [150.0, 10.0, 200.0]
+
+    def test_hcpcs_lookup_and_noc_fallback(
+        self, sample_catalog_df: pl.DataFrame
+    ) -> None:
+        """ASP comes from the crosswalk lookup, falling back to NOC pricing."""
+        hcpcs_lookup: dict[str, dict[str, object]] = {
+            "00074433902": {"hcpcs_code": "J0135", "asp": 2641.5, "bill_units": 2},
+            "05555555555": {"hcpcs_code": "J1438", "asp": None, "bill_units": 4},
+        }
+        noc_lookup: dict[str, dict[str, object]] = {
+            "05555555555": {"asp": 100.0, "bill_units": 3, "is_noc": True},
+        }
+        frame = build_drug_frame(sample_catalog_df, hcpcs_lookup, noc_lookup=noc_lookup)
+
+        humira, generic, enbrel = frame.iter_rows(named=True)
+        assert humira["hcpcs_code"] == "J0135"
+        assert humira["asp"] == 2641.5
+        assert humira["bill_units_per_package"] == 2
+        assert generic["asp"] is None
+        assert generic["bill_units_per_package"] == 1
+        assert enbrel["hcpcs_code"] == "NOC"
+        assert enbrel["asp"] == 100.0
+        assert enbrel["bill_units_per_package"] == 3
+
+    def test_penny_pricing_override(self, sample_catalog_df: pl.DataFrame) -> None:
+        """Penny-priced NDCs should have contract cost overridden to $0.01."""
+        nadac_lookup: dict[str, dict[str, object]] = {
+            "01234567890": {
+                "is_penny_priced": True,
+                "override_cost": Decimal("0.01"),
+                "nadac_price": Decimal("0.005"),
+            },
+        }
+        frame = build_drug_frame(sample_catalog_df, nadac_lookup=nadac_lookup)
+
+        generic = frame.row(1, named=True)
+        assert generic["penny_pricing_flag"] is True
+        assert generic["contract_cost"] == 0.01
+        assert generic["nadac_price"] == 0.005
+        assert frame["penny_pricing_flag"].sum() == 1
+
+    def test_name_flags(self, sample_catalog_df: pl.DataFrame) -> None:
+        """IRA flag and brand classification should follow the drug name."""
+        frame = build_drug_frame(sample_catalog_df)
+        flags = dict(zip(frame["drug_name"], frame["ira_flag"], strict=True))
+        assert flags["ENBREL"] is True
+        assert flags["HUMIRA"] is False
+
+    def test_cost_column_fallback(self) -> None:
+        """Zero or missing current catalog price falls back to Contract Cost."""
+        catalog = pl.DataFrame(
+            {
+                "NDC": ["11111111111", "22222222222"],
+                "Trade Name": ["DRUG A", None],
+                "Unit Price (Current Catalog)": [0.0, 5.0],
+                "Contract Cost": [7.5, 9.0],
+                "Medispan AWP": [100.0, 200.0],
+                "Contract Name": ["Off-Contract", "PHS"],
+            }
+        )
+        frame = build_drug_frame(catalog)
+
+        assert frame["contract_cost"].to_list() == [7.5, 5.0]
+        assert frame["awp"].to_list() == [100.0, 200.0]
+        assert frame["drug_name"].to_list() == ["DRUG A", "Unknown"]
+        assert frame["off_contract"].to_list() == [True, False]
+
+    def test_non_numeric_price_skips_row(self) -> None:
+        """Rows whose first cost or AWP value is not a number are skipped."""
+        catalog = pl.DataFrame(
+            {
+                "NDC": ["11111111111", "22222222222", "33333333333", "44444444444"],
+                "Drug Name": ["GOOD", "BAD COST", "BAD AWP", "EMPTY COST"],
+                "Contract Cost": ["7.50", "N/A", "3.00", " "],
+                "AWP": ["100", "200", "call", "50"],
+            }
+        )
+        frame = build_drug_frame(catalog)
+
+        assert frame["drug_name"].to_list() == ["GOOD", "EMPTY COST"]
+        assert frame["contract_cost"].to_list() == [7.5, 0.0]
+        index = DrugIndex(catalog)
+        assert index.catalog["NDC"].to_list() == frame["ndc"].to_list()
+        assert "22222222222" not in index
+
+    def test_missing_ndc_column(self) -> None:
+        """Catalog without NDC column should produce an empty frame."""
+        frame = build_drug_frame(pl.DataFrame({"Drug Name": ["X"]}))
+        assert frame.height == 0
+
+
+class TestDrugRoundTrip:
+    """Tests for drugs_to_frame and drug_from_row."""
+
+    def test_round_trip(self, sample_drug: Drug, sample_drug_retail_only: Drug) -> None:
+        """Drugs should survive conversion to a frame and back."""
+        frame = drugs_to_frame([sample_drug, sample_drug_retail_only])
+        restored = [drug_from_row(row) for row in frame.iter_rows(named=True)]
+        assert restored == [sample_drug, sample_drug_retail_only]
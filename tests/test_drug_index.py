@@ -0,0 +1,137 @@
+"""Tests for the shared NDC drug index."""
+
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.drug_frame import build_drug_frame
+from optimizer_340b.compute.drug_index import DrugIndex
+
+
+@pytest.fixture
+def duplicate_catalog_df() -> pl.DataFrame:
+    """Catalog listing one NDC twice (contract row, then Off-Contract row)."""
+    return pl.DataFrame(
+        {
+            "NDC": ["00074433902", "12345678901", "00074433902", ""],
+            "Drug Name": ["HUMIRA", "GENERIC ORAL", "HUMIRA PEN", "BLANK"],
+            "Manufacturer": ["ABBVIE", "TEVA", "ABBVIE", "NONE"],
+            "Contract Cost": [150.00, 10.00, 900.00, 1.00],
+            "AWP": [6500.00, 100.00, 6500.00, 1.00],
+            "Contract Name": ["PHS", "PHS", "Off-Contract", "PHS"],
+        }
+    )
+
+
+class TestDrugIndex:
+    """Tests for DrugIndex lookups."""
+
+    def test_frame_matches_build_drug_frame(
+        self, duplicate_catalog_df: pl.DataFrame
+    ) -> None:
+        """The indexed frame should be the drug frame, minus rows without NDC."""
+        index = DrugIndex(duplicate_catalog_df)
+
+        assert index.frame.equals(build_drug_frame(duplicate_catalog_df))
+        assert index.catalog.height == index.frame.height == 3
+        assert len(index) == 2
+
+    def test_get_accepts_any_ndc_format(self, sample_catalog_df: pl.DataFrame) -> None:
+        """Dashed, 10-digit and 11-digit NDCs should resolve to the same Drug."""
+        index = DrugIndex(sample_catalog_df)
+
+        drug = index.get("00074-4339-02")
+        assert drug is not None
+        assert drug.drug_name == "HUMIRA"
+        assert drug.contract_cost == Decimal("150.0")
+        assert index.get("0074433902") is drug
+        assert "00074433902" in index
+
+    def test_unknown_ndc(self, sample_catalog_df: pl.DataFrame) -> None:
+        """Unknown NDCs should return None and empty positions."""
+        index = DrugIndex(sample_catalog_df)
+
+        assert index.get("99999999999") is None
+        assert index.row("99999999999") is None
+        assert index.positions("99999999999") == []
+        assert "99999999999" not in index
+
+    def test_duplicates_resolve_to_first_occurrence(
+        self, duplicate_catalog_df: pl.DataFrame
+    ) -> None:
+        """Duplicate NDCs return the first catalog row; positions list all."""
+        index = DrugIndex(duplicate_catalog_df)
+
+        drug = index.get("00074433902")
+        assert drug is not None
+        assert drug.drug_name == "HUMIRA"
+        assert drug.off_contract is False
+        assert index.positions("00074433902") == [0, 2]
+        assert index.take_catalog(["00074433902"])["Drug Name"].to_list() == [
+            "HUMIRA",
+            "HUMIRA PEN",
+        ]
+
+    def test_take_preserves_request_order(
+        self, sample_catalog_df: pl.DataFrame
+    ) -> None:
+        """Batch take should follow request order and skip unknown NDCs."""
+        index = DrugIndex(sample_catalog_df)
+
+        taken = index.take(["5555555555", "99999999999", "0074-4339-02"])
+
+        assert taken["drug_name"].to_list() == ["ENBREL", "HUMIRA"]
+        assert [d.drug_name for d in index.drugs(["1234567890", "0"])] == [
+            "GENERIC ORAL"
+        ]
+
+    def test_search_by_name_or_ndc(self, duplicate_catalog_df: pl.DataFrame) -> None:
+        """Search should return the earliest row matching the name or NDC."""
+        index = DrugIndex(duplicate_catalog_df)
+
+        by_name = index.search("humira pen")
+        by_ndc = index.search("1234-5678-901")
+
+        assert by_name is not None and by_name.drug_name == "HUMIRA PEN"
+        assert by_ndc is not None and by_ndc.drug_name == "GENERIC ORAL"
+        assert index.search("ENBREL") is None
+
+    def test_from_uploaded_data(
+        self,
+        sample_asp_pricing_df: pl.DataFrame,
+        sample_nadac_df: pl.DataFrame,
+    ) -> None:
+        """Lookups should be built from the uploaded datasets and joined."""
+        uploaded: dict[str, pl.DataFrame | None] = {
+            "catalog": pl.DataFrame(
+                {
+                    "NDC": ["00074433902", "01234567890"],
+                    "Drug Name": ["HUMIRA", "GENERIC ORAL"],
+                    "Contract Cost": [150.00, 10.00],
+                }
+            ),
+            "crosswalk": pl.DataFrame(
+                {
+                    "NDC": ["00074433902"],
+                    "HCPCS Code": ["J0135"],
+                    "Billing Units Per Package": [2],
+                }
+            ),
+            "asp_pricing": sample_asp_pricing_df,
+            "nadac": sample_nadac_df,
+        }
+
+        index = DrugIndex.from_uploaded_data(uploaded)
+
+        assert index is not None
+        humira = index.get("00074433902")
+        assert humira is not None
+        assert humira.hcpcs_code == "J0135"
+        assert humira.asp == pytest.approx(Decimal(str(2800.00 / 1.06)))
+        assert humira.bill_units_per_package == 2
+        assert set(index.nadac_lookup) == {"00074433902", "01234567890", "09999999999"}
+
+    def test_from_uploaded_data_without_catalog(self) -> None:
+        """No index should be built until a catalog is loaded."""
+        assert DrugIndex.from_uploaded_data({}) is None
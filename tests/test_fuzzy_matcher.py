@@ -0,0 +1,92 @@
+"""Tests for blocked fuzzy drug name matching."""
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+from thefuzz import fuzz  # type: ignore[import-untyped]
+
+from optimizer_340b.ingest.fuzzy_matcher import FuzzyMatcher
+
+CANDIDATES = [
+    "HUMIRA",
+    "Humira",
+    "HUMIRA 40MG/0.8ML PEN",
+    "ENBREL",
+    "STELARA",
+    None,
+    "ENBREL SURECLICK",
+    "",
+]
+
+
+def _scan(
+    name: str, candidates: list[str | None], threshold: int, partial: bool
+) -> str | None:
+    """Reference full scan (the original per-candidate loop)."""
+    scorer = fuzz.partial_ratio if partial else fuzz.ratio
+    best: str | None = None
+    best_score = 0
+    for candidate in candidates:
+        if candidate is None:
+            continue
+        score = scorer(name.upper(), candidate.upper())
+        if score > best_score and score >= threshold:
+            best = candidate
+            best_score = score
+    return best
+
+
+class TestFuzzyMatcher:
+    """Tests for FuzzyMatcher."""
+
+    def test_ratio_match(self) -> None:
+        """Ratio matching should return the earliest best candidate."""
+        matcher = FuzzyMatcher(CANDIDATES)
+
+        assert matcher.match("humira") == "HUMIRA"
+        assert matcher.match("ENBRL") == "ENBREL"
+        assert matcher.match("HUMIRA PEN", threshold=60) == "HUMIRA"
+        assert matcher.match("COMPLETELY DIFFERENT") is None
+        assert matcher.match("") is None
+        assert len(matcher) == 6
+
+    def test_partial_match(self) -> None:
+        """Partial matching should find names inside longer candidates."""
+        matcher = FuzzyMatcher(CANDIDATES[2:], partial=True)
+
+        assert matcher.match("HUMIRA") == "HUMIRA 40MG/0.8ML PEN"
+        assert matcher.match("SURECLICK") == "ENBREL SURECLICK"
+        assert matcher.match("XYZ") is None
+
+    def test_match_many(self) -> None:
+        """match_many should align results with the input names."""
+        matcher = FuzzyMatcher(CANDIDATES)
+
+        result = matcher.match_many(["ENBRL", None, "stelara", "ENBRL", "NOPE"])
+
+        assert result == ["ENBREL", None, "STELARA", "ENBREL", None]
+
+    def test_empty_candidates(self) -> None:
+        """A matcher without candidates should never match."""
+        matcher = FuzzyMatcher([None])
+
+        assert matcher.match("HUMIRA", threshold=0) is None
+        assert matcher.match_many(["HUMIRA"]) == [None]
+
+    @settings(max_examples=200, deadline=None)
+    @given(
+        name=st.text(alphabet="ABCEN ", min_size=1, max_size=12),
+        candidates=st.lists(
+            st.text(alphabet="abcenABCEN ", max_size=14), min_size=1, max_size=12
+        ),
+        threshold=st.integers(min_value=0, max_value=100),
+        partial=st.booleans(),
+    )
+    def test_matches_full_scan(
+        self, name: str, candidates: list[str], threshold: int, partial: bool
+    ) -> None:
+        """Pruning should never change the result of a full scan."""
+        matcher = FuzzyMatcher(candidates, partial=partial)
+
+        assert matcher.match(name, threshold) == _scan(
+            name, list(candidates), threshold, partial
+        )
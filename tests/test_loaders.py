@@ -1,6 +1,6 @@
 """Tests for file loading utilities."""
 
-from io import BytesIO
+from io import BytesIO, StringIO
 from pathlib import Path
 
 import pandas as pd
@@ -8,11 +8,15 @@ import polars as pl
 import pytest
 
 from optimizer_340b.ingest.loaders import (
+    csv_header,
+    csv_source,
     detect_file_type,
+    drop_empty_columns,
     load_csv_to_polars,
     load_excel_to_polars,
     load_file_auto,
 )
+from optimizer_340b.ingest.normalizers import preprocess_cms_csv
 
 
 class TestDetectFileType:
@@ -109,6 +113,108 @@ class TestLoadExcelToPolars:
             load_excel_to_polars(invalid_path)
 
 
+class TestExcelEngines:
+    """Tests for the single-pass Excel engines."""
+
+    @pytest.fixture(params=["openpyxl", "calamine"])
+    def engine(self, request: pytest.FixtureRequest) -> str:
+        """Each installed Excel engine."""
+        if request.param == "calamine":
+            pytest.importorskip("fastexcel")
+        return str(request.param)
+
+    def test_numeric_ndc_read_as_string(self, tmp_path: Path, engine: str) -> None:
+        """NDC cells stored as numbers should come back as digit strings."""
+        excel_path = tmp_path / "ndc.xlsx"
+        pd.DataFrame({"NDC": [74433902, 12345678901], "AWP": [1.5, 2.0]}).to_excel(
+            excel_path, index=False
+        )
+
+        result = load_excel_to_polars(excel_path, engine=engine)
+
+        assert result["NDC"].dtype == pl.String
+        assert result["NDC"].to_list() == ["74433902", "12345678901"]
+
+    def test_column_types_match_pandas(self, tmp_path: Path, engine: str) -> None:
+        """Types should follow pandas.read_excel so downstream code is unchanged."""
+        excel_path = tmp_path / "types.xlsx"
+        pd.DataFrame(
+            {
+                "Whole": [1, 2, 3],
+                "WithGap": [1, None, 3],
+                "Price": [1.5, 2.0, 3.0],
+                "Text": ["a", "NA", ""],
+            }
+        ).to_excel(excel_path, index=False)
+
+        result = load_excel_to_polars(excel_path, engine=engine)
+
+        assert result.schema["Whole"] == pl.Int64
+        assert result.schema["WithGap"] == pl.Float64
+        assert result.schema["Price"] == pl.Float64
+        assert result["Text"].to_list() == ["a", None, None]
+
+    def test_unnamed_headers_and_trailing_blank_rows(
+        self, tmp_path: Path, engine: str
+    ) -> None:
+        """Blank headers get pandas-style names; trailing blank rows are dropped."""
+        excel_path = tmp_path / "layout.xlsx"
+        pd.DataFrame(
+            {"Title": ["x", None, "y", None], None: ["1", None, "2", None]}
+        ).to_excel(excel_path, index=False)
+
+        result = load_excel_to_polars(excel_path, engine=engine)
+
+        assert result.columns == ["Title", "Unnamed: 1"]
+        assert result["Title"].to_list() == ["x", None, "y"]
+
+    def test_openpyxl_mixed_column_becomes_text(self, tmp_path: Path) -> None:
+        """Columns mixing numbers and text should load as text, not fail."""
+        excel_path = tmp_path / "mixed.xlsx"
+        pd.DataFrame({"Value": ["Total", 12, 3.5]}).to_excel(excel_path, index=False)
+
+        result = load_excel_to_polars(excel_path, engine="openpyxl")
+
+        assert result["Value"].to_list() == ["Total", "12", "3.5"]
+
+    def test_openpyxl_mangles_duplicate_headers(self, tmp_path: Path) -> None:
+        """Duplicate headers should be suffixed like pandas does."""
+        excel_path = tmp_path / "dupes.xlsx"
+        pd.DataFrame([[1, 2, 3]], columns=["A", "A", "A"]).to_excel(
+            excel_path, index=False
+        )
+
+        result = load_excel_to_polars(excel_path, engine="openpyxl")
+
+        assert result.columns == ["A", "A.1", "A.2"]
+
+    def test_openpyxl_ragged_rows(self, tmp_path: Path) -> None:
+        """Rows wider than the header and interior blank rows should be kept."""
+        import openpyxl  # type: ignore[import-untyped]
+
+        excel_path = tmp_path / "ragged.xlsx"
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        assert sheet is not None
+        sheet.append(["NDC"])
+        sheet.append([74433902])
+        sheet.append([])
+        sheet.append([12345678901, 7])
+        sheet.append([])
+        workbook.save(excel_path)
+
+        result = load_excel_to_polars(excel_path, engine="openpyxl")
+
+        assert result.columns == ["NDC", "Unnamed: 1"]
+        assert result["NDC"].to_list() == ["74433902", None, "12345678901"]
+        assert result["Unnamed: 1"].to_list() == [None, None, 7.0]
+
+    def test_rejects_unknown_engine(self, tmp_path: Path) -> None:
+        """Unknown engine names should raise ValueError."""
+        with pytest.raises(ValueError, match="Unknown Excel engine"):
+            load_excel_to_polars(tmp_path / "any.xlsx", engine="xlrd")
+
+
 class TestLoadCsvToPolars:
     """Tests for CSV file loading."""
 
@@ -166,6 +272,72 @@ class TestLoadCsvToPolars:
             load_csv_to_polars(nonexistent_path)
 
 
+class TestCsvSource:
+    """Tests for zero-copy CSV buffer handling."""
+
+    def test_upload_buffer_is_not_copied(self) -> None:
+        """Uploads should be parsed from the bytes they were created from."""
+        data = b"NDC,Price\n00074433902,1.5\n"
+
+        source, encoding = csv_source(BytesIO(data), "latin-1")
+
+        assert source is data
+        assert encoding == "utf8"
+
+    def test_non_ascii_keeps_declared_encoding(self) -> None:
+        """Non-ASCII latin-1 bytes must still be decoded as latin-1."""
+        data = "Name\nCaf\xe9\n".encode("latin-1")
+
+        source, encoding = csv_source(BytesIO(data), "latin-1")
+
+        assert source is data
+        assert encoding == "latin-1"
+
+    def test_text_upload_encoded_once_as_utf8(self) -> None:
+        """Already-decoded text should be parsed as UTF-8."""
+        source, encoding = csv_source(StringIO("Name\nCaf\xe9\n"), "latin-1")
+
+        assert source == "Name\nCaf\xe9\n".encode()
+        assert encoding == "utf8"
+
+    def test_utf8_path_passed_through(self, tmp_path: Path) -> None:
+        """UTF-8 files on disk should be handed to Polars by path."""
+        csv_path = tmp_path / "test.csv"
+        csv_path.write_text("A\n1\n")
+
+        assert csv_source(csv_path, "utf-8") == (csv_path, "utf8")
+
+    def test_header_skips_metadata_rows(self) -> None:
+        """csv_header should return the header below the metadata rows."""
+        data = b"meta 1\nmeta 2\nNDC,HCPCS Code\n00074433902,J0135\n"
+
+        assert csv_header(data, "utf8", skip_rows=2) == ["NDC", "HCPCS Code"]
+
+    def test_drop_empty_columns(self) -> None:
+        """All-null columns should be dropped and others kept in order."""
+        df = pl.DataFrame(
+            {"A": [1, 2], "B": [None, None], "C": ["x", None], "D": [None, None]}
+        )
+
+        assert drop_empty_columns(df).columns == ["A", "C"]
+
+    def test_text_upload_loads(self) -> None:
+        """StringIO uploads should load with non-ASCII text intact."""
+        result = load_csv_to_polars(StringIO("Name,Value\nCaf\xe9,100\n"))
+
+        assert result["Name"].to_list() == ["Caf\xe9"]
+
+    def test_cms_csv_from_upload(self) -> None:
+        """preprocess_cms_csv should accept uploads without a temp file."""
+        data = "meta\nNDC,Drug Name,Empty\n00074433902,Caf\xe9,\n".encode("latin-1")
+
+        result = preprocess_cms_csv(BytesIO(data), skip_rows=1)
+
+        assert result.columns == ["NDC", "Drug Name"]
+        assert result["NDC"].to_list() == ["00074433902"]
+        assert result["Drug Name"].to_list() == ["Caf\xe9"]
+
+
 class TestLoadFileAuto:
     """Tests for auto-detecting file loader."""
 
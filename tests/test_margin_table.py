@@ -0,0 +1,83 @@
+"""Tests for array-backed margin analyses."""
+
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.drug_frame import drugs_to_frame
+from optimizer_340b.compute.margin_table import MarginTable
+from optimizer_340b.compute.margins import rank_opportunities
+from optimizer_340b.models import Drug, MarginAnalysis
+
+
+@pytest.fixture
+def drugs(sample_drug: Drug, sample_drug_retail_only: Drug) -> list[Drug]:
+    """A medical-path drug, a retail-only drug and a generic with NADAC."""
+    generic = Drug(
+        ndc="00093-0058-01",
+        drug_name="METHOTREXATE",
+        manufacturer="TEVA",
+        contract_cost=Decimal("3.17"),
+        awp=Decimal("41.13"),
+        is_brand=False,
+        nadac_price=Decimal("7.891"),
+    )
+    return [sample_drug, sample_drug_retail_only, generic]
+
+
+class TestMarginTable:
+    """Tests for MarginTable row views."""
+
+    @pytest.mark.parametrize("micros", [False, True])
+    def test_views_match_analyses(self, drugs: list[Drug], micros: bool) -> None:
+        """Views should read the same values the materialized analyses hold."""
+        table = MarginTable(rank_opportunities(drugs_to_frame(drugs), micros=micros))
+        analyses = table.to_analyses()
+
+        assert len(table) == len(analyses) == 3
+        for row, analysis in zip(table, analyses, strict=True):
+            assert isinstance(analysis, MarginAnalysis)
+            assert row.to_display_dict() == analysis.to_display_dict()
+            assert row.drug.to_drug() == analysis.drug
+            assert row.drug.ndc_formatted == analysis.drug.ndc_formatted
+            assert row.drug.ndc_normalized == analysis.drug.ndc_normalized
+            assert row.drug.has_medical_path() == analysis.drug.has_medical_path()
+            assert row.margin_delta == analysis.margin_delta
+            assert row.recommended_path is analysis.recommended_path
+
+    def test_indexing_and_slicing(self, drugs: list[Drug]) -> None:
+        """Indexing should follow sequence rules; slices stay tables."""
+        table = MarginTable(rank_opportunities(drugs_to_frame(drugs)))
+
+        assert table[-1].drug.ndc == table[2].drug.ndc
+        assert isinstance(table[1:], MarginTable)
+        assert [row.drug.ndc for row in table[1:]] == [
+            row.drug.ndc for row in list(table)[1:]
+        ]
+        assert len(table[5:]) == 0
+        with pytest.raises(IndexError):
+            table[3]
+        with pytest.raises(ValueError):
+            table[::2]
+
+    def test_missing_columns_use_drug_defaults(self) -> None:
+        """Absent optional columns should read as the Drug defaults."""
+        frame = pl.DataFrame(
+            {
+                "ndc": ["0074-4339-02"],
+                "drug_name": ["HUMIRA"],
+                "manufacturer": ["ABBVIE"],
+                "contract_cost": [None],
+                "awp": [6500.0],
+            },
+            schema_overrides={"contract_cost": pl.Float64},
+        )
+
+        drug = MarginTable(frame)[0].drug
+
+        assert drug.contract_cost == Decimal("0")
+        assert drug.asp is None
+        assert drug.bill_units_per_package == 1
+        assert drug.is_brand is True
+        assert drug.ndc_formatted == "00074-4339-02"
@@ -6,22 +6,33 @@ These tests implement the Gatekeeper Tests from the Project Charter:
 - The "Capture Rate" Stress Test
 """
 
+from dataclasses import replace
 from decimal import Decimal
 
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.drug_frame import drugs_to_frame
 from optimizer_340b.compute.margins import (
     AWP_DISCOUNT_FACTOR,
     COMMERCIAL_ASP_MULTIPLIER,
     DEFAULT_CAPTURE_RATE,
     MEDICARE_ASP_MULTIPLIER,
+    PATHWAY_MARGIN_COLUMNS,
+    analyze_catalog_margins,
     analyze_drug_margin,
+    analyze_drug_margin_5pathway,
     analyze_drug_with_payer,
     calculate_commercial_margin,
+    calculate_crossover_capture_rate,
     calculate_margin_sensitivity,
     calculate_medicare_margin,
     calculate_retail_margin,
     determine_recommendation,
+    margin_analyses_from_frame,
+    opportunity_page,
 )
-from optimizer_340b.models import Drug, RecommendedPath
+from optimizer_340b.models import Drug, MarginAnalysis, RecommendedPath
 
 
 class TestConstants:
@@ -347,6 +358,55 @@ class TestMarginSensitivity:
         assert retail_50 == retail_100 / 2
 
 
+class TestCrossoverCaptureRate:
+    """Tests for the capture rate at which the recommendation flips."""
+
+    @pytest.fixture
+    def crossover_drug(self, sample_drug: Drug) -> Drug:
+        """Drug whose recommendation flips between 0% and 100% capture."""
+        return replace(sample_drug, asp=Decimal("2000.00"))
+
+    def test_crossover_formula(self, sample_drug: Drug) -> None:
+        """Crossover is medical revenue over retail revenue at 100% capture."""
+        # $2800 × 1.15 × 2 / ($6500 × 0.85) = 6440 / 5525
+        assert calculate_crossover_capture_rate(sample_drug) == (
+            Decimal("6440") / Decimal("5525")
+        )
+
+    def test_recommendation_flips_at_crossover(self, crossover_drug: Drug) -> None:
+        """Medical should win just below the crossover, retail just above."""
+        crossover = calculate_crossover_capture_rate(crossover_drug)
+        assert crossover is not None
+        assert Decimal("0") < crossover < Decimal("1")
+
+        step = Decimal("0.001")
+        below = analyze_drug_margin_5pathway(crossover_drug, crossover - step)
+        above = analyze_drug_margin_5pathway(crossover_drug, crossover + step)
+
+        assert below.recommended_path == RecommendedPath.COMMERCIAL_MEDICAL
+        assert above.recommended_path == RecommendedPath.RETAIL
+        assert below.crossover_capture_rate == crossover
+
+    def test_nadac_raises_retail_revenue(self, crossover_drug: Drug) -> None:
+        """A NADAC revenue above AWP × rate should lower the crossover."""
+        with_nadac = replace(crossover_drug, nadac_price=Decimal("6000.00"))
+
+        assert calculate_crossover_capture_rate(with_nadac) == (
+            Decimal("4600") / Decimal("6000")
+        )
+
+    def test_no_medical_path(self, sample_drug_retail_only: Drug) -> None:
+        """Retail-only drugs never flip."""
+        assert calculate_crossover_capture_rate(sample_drug_retail_only) is None
+
+    def test_no_retail_revenue(self, sample_drug: Drug) -> None:
+        """Without retail revenue, medical wins at every capture rate."""
+        assert (
+            calculate_crossover_capture_rate(replace(sample_drug, awp=Decimal("0")))
+            is None
+        )
+
+
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
 
@@ -422,3 +482,357 @@ class TestEdgeCases:
         medicare = calculate_medicare_margin(drug)
         # 500 * 1.06 * 10 - 100 = 5300 - 100 = 5200
         assert medicare == Decimal("5200.00")
+
+
+class TestCatalogMargins:
+    """Tests for the columnar (catalog-wide) 5-pathway margin engine."""
+
+    @pytest.fixture
+    def catalog_drugs(
+        self, sample_drug: Drug, sample_drug_retail_only: Drug
+    ) -> list[Drug]:
+        """Drugs covering brand/generic, NADAC and retail-only cases."""
+        generic_with_nadac = Drug(
+            ndc="00093-0058-01",
+            drug_name="METHOTREXATE",
+            manufacturer="TEVA",
+            contract_cost=Decimal("3.17"),
+            awp=Decimal("41.13"),
+            asp=Decimal("12.345678"),
+            hcpcs_code="J9250",
+            bill_units_per_package=3,
+            is_brand=False,
+            nadac_price=Decimal("7.891"),
+        )
+        return [sample_drug, sample_drug_retail_only, generic_with_nadac]
+
+    @pytest.mark.parametrize(
+        "capture_rate,dispense_fee,markup,commercial_pct",
+        [
+            (Decimal("1.0"), Decimal("0"), Decimal("0"), Decimal("0.15")),
+            (Decimal("0.40"), Decimal("10.50"), Decimal("0.03"), Decimal("0.20")),
+            (Decimal("0"), Decimal("0"), Decimal("0"), Decimal("0.15")),
+        ],
+    )
+    def test_matches_scalar_5pathway_to_the_penny(
+        self,
+        catalog_drugs: list[Drug],
+        capture_rate: Decimal,
+        dispense_fee: Decimal,
+        markup: Decimal,
+        commercial_pct: Decimal,
+    ) -> None:
+        """Batch results must equal analyze_drug_margin_5pathway to the penny."""
+        result = analyze_catalog_margins(
+            drugs_to_frame(catalog_drugs),
+            capture_rate=capture_rate,
+            dispense_fee=dispense_fee,
+            medicaid_markup_pct=markup,
+            commercial_asp_pct=commercial_pct,
+        )
+        batch = margin_analyses_from_frame(result)
+
+        for drug, analysis in zip(catalog_drugs, batch, strict=True):
+            expected = analyze_drug_margin_5pathway(
+                drug, capture_rate, dispense_fee, markup, commercial_pct
+            )
+            for field in (
+                "pharmacy_medicaid_margin",
+                "pharmacy_medicare_commercial_margin",
+                "medical_medicaid_margin",
+                "medical_medicare_margin",
+                "medical_commercial_margin",
+                "retail_gross_margin",
+                "retail_net_margin",
+                "medicare_margin",
+                "commercial_margin",
+                "margin_delta",
+            ):
+                want = getattr(expected, field)
+                got = getattr(analysis, field)
+                if want is None:
+                    assert got is None, field
+                else:
+                    assert got is not None, field
+                    assert abs(got - want) < Decimal("0.005"), field
+            assert analysis.recommended_path == expected.recommended_path
+
+    @pytest.mark.parametrize("micros", [False, True])
+    def test_crossover_column_matches_rescoring(
+        self, catalog_drugs: list[Drug], sample_drug: Drug, micros: bool
+    ) -> None:
+        """Rescoring at any capture rate should agree with the crossover column."""
+        drugs = [*catalog_drugs, replace(sample_drug, asp=Decimal("2000.00"))]
+        frame = drugs_to_frame(drugs)
+        crossover = analyze_catalog_margins(frame, micros=micros)[
+            "crossover_capture_rate"
+        ]
+
+        for drug, value in zip(drugs, crossover, strict=True):
+            expected = calculate_crossover_capture_rate(drug)
+            if expected is None:
+                assert value is None
+            else:
+                assert value == pytest.approx(float(expected))
+
+        for rate in ("0.25", "0.50", "0.75", "0.90", "1.00"):
+            rescored = analyze_catalog_margins(
+                frame, capture_rate=Decimal(rate), micros=micros
+            )
+            for path, value in zip(
+                rescored["recommended_path"], crossover, strict=True
+            ):
+                medical = value is not None and float(rate) < value
+                assert (path != RecommendedPath.RETAIL.value) == medical
+
+    def test_medicare_unit_test_batch(self, sample_drug: Drug) -> None:
+        """Gatekeeper: batch Medicare margin matches manual calculation."""
+        result = analyze_catalog_margins(drugs_to_frame([sample_drug]))
+        # $2800 × 1.06 × 2 - $150 = $5786.00
+        assert result["medical_medicare_margin"][0] == pytest.approx(5786.00)
+
+    @pytest.mark.parametrize(
+        "capture_rate,dispense_fee,markup,commercial_pct",
+        [
+            (Decimal("1.0"), Decimal("0"), Decimal("0"), Decimal("0.15")),
+            (Decimal("0.40"), Decimal("10.50"), Decimal("0.03"), Decimal("0.20")),
+        ],
+    )
+    def test_micros_scalar_and_batch_agree_exactly(
+        self,
+        catalog_drugs: list[Drug],
+        capture_rate: Decimal,
+        dispense_fee: Decimal,
+        markup: Decimal,
+        commercial_pct: Decimal,
+    ) -> None:
+        """Micro-dollar mode should match across APIs and stay within a micro."""
+        result = analyze_catalog_margins(
+            drugs_to_frame(catalog_drugs),
+            capture_rate=capture_rate,
+            dispense_fee=dispense_fee,
+            medicaid_markup_pct=markup,
+            commercial_asp_pct=commercial_pct,
+            micros=True,
+        )
+        assert result["margin_delta"].dtype == pl.Int64
+        batch = margin_analyses_from_frame(result)
+
+        for drug, analysis in zip(catalog_drugs, batch, strict=True):
+            scalar = analyze_drug_margin_5pathway(
+                drug, capture_rate, dispense_fee, markup, commercial_pct, micros=True
+            )
+            exact = analyze_drug_margin_5pathway(
+                drug, capture_rate, dispense_fee, markup, commercial_pct
+            )
+            for field in (
+                "pharmacy_medicaid_margin",
+                "pharmacy_medicare_commercial_margin",
+                "medical_medicaid_margin",
+                "medical_medicare_margin",
+                "medical_commercial_margin",
+                "retail_gross_margin",
+                "retail_net_margin",
+                "margin_delta",
+            ):
+                got = getattr(analysis, field)
+                assert got == getattr(scalar, field), field
+                want = getattr(exact, field)
+                if want is None:
+                    assert got is None, field
+                else:
+                    assert abs(got - want) <= Decimal("0.000001"), field
+            assert analysis.recommended_path == scalar.recommended_path
+
+    def test_micros_parity_with_payment_limit_asps(self, sample_drug: Drug) -> None:
+        """ASPs derived from payment limits should bill to the same micro."""
+        drugs = [
+            replace(
+                sample_drug,
+                ndc=f"{i:011d}",
+                asp=Decimal(str(payment / 1.06)),
+                bill_units_per_package=units,
+            )
+            for i, (payment, units) in enumerate(
+                (p, u)
+                for p in (22.505092, 123.45, 2968.13, 0.731, 17.29)
+                for u in (1, 7, 165, 250, 1000)
+            )
+        ]
+        drugs.append(
+            replace(
+                sample_drug,
+                ndc="99",
+                asp=Decimal("21.2312189"),
+                bill_units_per_package=165,
+            )
+        )
+
+        result = analyze_catalog_margins(drugs_to_frame(drugs), micros=True)
+
+        for drug, analysis in zip(
+            drugs, margin_analyses_from_frame(result), strict=True
+        ):
+            scalar = analyze_drug_margin_5pathway(drug, micros=True)
+            for field in (
+                "medical_medicaid_margin",
+                "medical_medicare_margin",
+                "medical_commercial_margin",
+            ):
+                assert getattr(analysis, field) == getattr(scalar, field), field
+
+    def test_medicare_unit_test_micros(self, sample_drug: Drug) -> None:
+        """Gatekeeper: micro-dollar Medicare margin is exactly $5786.00."""
+        result = analyze_catalog_margins(drugs_to_frame([sample_drug]), micros=True)
+        scalar = analyze_drug_margin_5pathway(sample_drug, micros=True)
+
+        assert result["medical_medicare_margin"][0] == 5_786_000_000
+        assert scalar.medical_medicare_margin == Decimal("5786.00")
+
+    def test_retail_only_has_no_medical_margins(
+        self, sample_drug_retail_only: Drug
+    ) -> None:
+        """Drugs without ASP/HCPCS should have null medical margins."""
+        result = analyze_catalog_margins(drugs_to_frame([sample_drug_retail_only]))
+        assert result["medical_medicare_margin"][0] is None
+        assert result["medical_commercial_margin"][0] is None
+        assert result["recommended_path"][0] == RecommendedPath.RETAIL.value
+
+    def test_materializes_margin_analysis(self, sample_drug: Drug) -> None:
+        """Rows should round-trip to MarginAnalysis with the original drug."""
+        result = analyze_catalog_margins(drugs_to_frame([sample_drug]))
+        (analysis,) = margin_analyses_from_frame(result)
+
+        assert isinstance(analysis, MarginAnalysis)
+        assert analysis.drug == sample_drug
+        assert analysis.retail_capture_rate == Decimal("1.0")
+
+    def test_best_margin_is_recommended_pathway(
+        self, catalog_drugs: list[Drug], sample_drug: Drug
+    ) -> None:
+        """best_margin should be the recommended pathway's margin, not retail."""
+        generic = replace(
+            sample_drug, ndc="00000000001", is_brand=False, asp=Decimal("10.00")
+        )
+        drugs = [*catalog_drugs, generic]
+        result = analyze_catalog_margins(drugs_to_frame(drugs))
+
+        for analysis in margin_analyses_from_frame(result):
+            pathways = {
+                name: getattr(analysis, name)
+                for name, _ in PATHWAY_MARGIN_COLUMNS
+                if getattr(analysis, name) is not None
+            }
+            best = max(pathways, key=lambda name: pathways[name])
+            assert analysis.best_margin == pathways[best]
+            assert analysis.recommended_path == dict(PATHWAY_MARGIN_COLUMNS)[best]
+
+        # The generic bills retail at AWP x 0.20, not the legacy AWP x 0.85
+        (row,) = margin_analyses_from_frame(result.tail(1))
+        assert row.best_margin < row.retail_net_margin
+
+    def test_empty_frame(self) -> None:
+        """Empty drug frame should return an empty analyzed frame."""
+        result = analyze_catalog_margins(drugs_to_frame([]))
+        assert result.height == 0
+        assert "margin_delta" in result.columns
+
+
+class TestOpportunityPage:
+    """Tests for paging and sorting the ranked opportunity frame."""
+
+    @pytest.fixture
+    def ranked(self) -> pl.DataFrame:
+        """A ranked-shaped frame with ties and null margins."""
+        n = 257
+        return pl.DataFrame(
+            {
+                "drug_name": [f"DRUG {i % 40:02d}" for i in range(n)],
+                "ndc": [f"{(i * 7919) % 100_000:011d}" for i in range(n)],
+                "retail_net_margin": [float(i % 13) for i in range(n)],
+                "pharmacy_medicaid_margin": [
+                    None if i % 2 else float(i % 19) for i in range(n)
+                ],
+                "pharmacy_medicare_commercial_margin": [float(i % 7) for i in range(n)],
+                "medical_medicaid_margin": [
+                    None if i % 5 else float(i % 15) for i in range(n)
+                ],
+                "medical_medicare_margin": [
+                    None if i % 5 else float(i % 17) for i in range(n)
+                ],
+                "medical_commercial_margin": [
+                    None if i % 3 else float(i % 11) for i in range(n)
+                ],
+                "medicare_margin": [None if i % 5 else float(i % 17) for i in range(n)],
+                "commercial_margin": [
+                    None if i % 3 else float(i % 11) for i in range(n)
+                ],
+                "margin_delta": [float(i % 9) for i in range(n)],
+                "crossover_capture_rate": [
+                    None if i % 4 == 0 else (i % 23) / 10 for i in range(n)
+                ],
+            }
+        ).sort("margin_delta", descending=True, maintain_order=True)
+
+    def _expected(
+        self, ranked: pl.DataFrame, key: pl.Expr, descending: bool
+    ) -> pl.DataFrame:
+        """Full stable sort of ``ranked`` with nulls last."""
+        return (
+            ranked.with_columns(key.alias("_key"))
+            .with_row_index("_pos")
+            .sort(["_key", "_pos"], descending=[descending, False], nulls_last=True)
+            .drop("_key", "_pos")
+        )
+
+    @pytest.mark.parametrize(
+        "sort_by",
+        [
+            "margin_delta",
+            "drug_name",
+            "ndc",
+            "medicare_margin",
+            "commercial_margin",
+            "crossover_capture_rate",
+        ],
+    )
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_pages_match_full_sort(
+        self, ranked: pl.DataFrame, sort_by: str, descending: bool
+    ) -> None:
+        """Every page should equal the same slice of a full stable sort."""
+        expected = self._expected(ranked, pl.col(sort_by), descending)
+
+        pages = [
+            opportunity_page(ranked, sort_by, descending, page, page_size=50)
+            for page in range(1, 7)
+        ]
+
+        assert [p.height for p in pages] == [50, 50, 50, 50, 50, 7]
+        assert pl.concat(pages).equals(expected)
+
+    def test_best_margin_is_max_of_pathways(self, ranked: pl.DataFrame) -> None:
+        """best_margin should sort on the largest of the five pathway margins."""
+        key = pl.max_horizontal(
+            "pharmacy_medicaid_margin",
+            "pharmacy_medicare_commercial_margin",
+            "medical_medicaid_margin",
+            "medical_medicare_margin",
+            "medical_commercial_margin",
+        )
+
+        page = opportunity_page(ranked, "best_margin", page=2, page_size=20)
+
+        assert page.equals(self._expected(ranked, key, True).slice(20, 20))
+
+    def test_page_past_end_is_empty(self, ranked: pl.DataFrame) -> None:
+        """A page beyond the last row should be empty with the same columns."""
+        page = opportunity_page(ranked, "drug_name", page=99, page_size=50)
+
+        assert page.height == 0
+        assert page.columns == ranked.columns
+
+    def test_unknown_sort_key(self, ranked: pl.DataFrame) -> None:
+        """Unknown sort keys should raise."""
+        with pytest.raises(ValueError, match="sort key"):
+            opportunity_page(ranked, "contract_cost")
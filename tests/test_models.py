@@ -63,6 +63,12 @@ class TestDrug:
         assert drug.penny_pricing_flag is False
         assert drug.nadac_price is None
 
+    def test_drug_is_slotted(self, sample_drug: Drug) -> None:
+        """Drug should not carry a per-instance __dict__."""
+        assert not hasattr(sample_drug, "__dict__")
+        with pytest.raises(AttributeError):
+            sample_drug.ndc_typo = "x"  # type: ignore[attr-defined]
+
     def test_drug_ira_flag(self, sample_drug_ira_flagged: Drug) -> None:
         """IRA-flagged drug should have flag set."""
         assert sample_drug_ira_flagged.ira_flag is True
@@ -149,6 +155,17 @@ class TestMarginAnalysis:
         assert sample_margin_analysis.medicare_margin == Decimal("5786.00")
         assert sample_margin_analysis.commercial_margin == Decimal("6290.00")
 
+    def test_margin_analysis_is_slotted(
+        self, sample_margin_analysis: MarginAnalysis
+    ) -> None:
+        """MarginAnalysis should not carry a per-instance __dict__."""
+        assert not hasattr(sample_margin_analysis, "__dict__")
+
+    def test_margin_analysis_requires_drug(self) -> None:
+        """The drug field should stay required."""
+        with pytest.raises(TypeError):
+            MarginAnalysis()  # type: ignore[call-arg]
+
     def test_recommended_path(self, sample_margin_analysis: MarginAnalysis) -> None:
         """Recommendation should be the highest-margin path."""
         assert (
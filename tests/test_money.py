@@ -0,0 +1,125 @@
+"""Tests for integer micro-dollar money arithmetic."""
+
+from decimal import Decimal
+from fractions import Fraction
+
+import polars as pl
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from optimizer_340b.compute.money import (
+    from_micros,
+    micros_expr,
+    product_micros_expr,
+    round_to_cents,
+    round_to_cents_expr,
+    scale_micros,
+    scale_micros_expr,
+    to_micros,
+)
+
+
+class TestScalarMoney:
+    """Tests for Python int micro-dollar helpers."""
+
+    def test_round_trip(self) -> None:
+        """Decimals with up to six places should convert exactly."""
+        assert to_micros(Decimal("12.345678")) == 12_345_678
+        assert from_micros(12_345_678) == Decimal("12.345678")
+        assert to_micros(2800) == 2_800_000_000
+
+    def test_floats_use_shortest_repr(self) -> None:
+        """Floats should convert like Decimal(str(value))."""
+        assert to_micros(0.1) == 100_000
+        assert to_micros(2641.5094339622642) == 2_641_509_434
+
+    def test_medicare_unit_test(self) -> None:
+        """Gatekeeper: $2800 x 1.06 x 2 - $150 is exactly $5786.00."""
+        revenue = scale_micros(to_micros(Decimal("2800")) * 2, Decimal("1.06"))
+        assert from_micros(revenue - to_micros(Decimal("150"))) == Decimal("5786.00")
+
+    def test_rounds_half_away_from_zero(self) -> None:
+        """Products and cents should round half away from zero."""
+        assert scale_micros(5, Decimal("0.5")) == 3
+        assert scale_micros(-5, Decimal("0.5")) == -3
+        assert round_to_cents(15_000) == 20_000
+        assert round_to_cents(-15_000) == -20_000
+        assert round_to_cents(14_999) == 10_000
+
+
+class TestMoneyExpressions:
+    """Tests for the Polars micro-dollar expressions."""
+
+    def test_micros_expr(self) -> None:
+        """Float dollars should become Int64 micro-dollars, nulls preserved."""
+        df = pl.DataFrame({"price": [12.345678, 0.1, None]})
+
+        result = df.select(micros_expr(pl.col("price")))["price"]
+
+        assert result.dtype == pl.Int64
+        assert result.to_list() == [12_345_678, 100_000, None]
+
+    @given(
+        st.lists(st.integers(-(10**12), 10**12), min_size=1, max_size=50),
+        st.sampled_from(
+            [Decimal("1.06"), Decimal("0.3825"), Fraction(7, 3), Decimal("0.5")]
+        ),
+    )
+    def test_expr_matches_scalar(self, values: list[int], rate: Decimal) -> None:
+        """Column scaling should round exactly like scale_micros."""
+        df = pl.DataFrame({"m": values}, schema={"m": pl.Int64})
+
+        result = df.select(scale_micros_expr(pl.col("m"), rate))["m"].to_list()
+
+        assert result == [scale_micros(v, rate) for v in values]
+
+    @pytest.mark.parametrize("rate", [Decimal("1"), Decimal("0")])
+    def test_identity_and_zero_rates(self, rate: Decimal) -> None:
+        """Whole-number rates should be exact."""
+        df = pl.DataFrame({"m": [123_456_789, -7]})
+
+        result = df.select(scale_micros_expr(pl.col("m"), rate))["m"].to_list()
+
+        assert result == [int(123_456_789 * rate), int(-7 * rate)]
+
+    @given(st.lists(st.integers(-(10**12), 10**12), min_size=1, max_size=50))
+    def test_round_to_cents_expr_matches_scalar(self, values: list[int]) -> None:
+        """Column cent rounding should match round_to_cents."""
+        df = pl.DataFrame({"m": values}, schema={"m": pl.Int64})
+
+        result = df.select(round_to_cents_expr(pl.col("m")))["m"].to_list()
+
+        assert result == [round_to_cents(v) for v in values]
+
+    @given(
+        st.lists(
+            st.tuples(
+                st.integers(1, 10**9).map(lambda cents: cents / 100 / 1.06),
+                st.integers(1, 1000),
+            ),
+            min_size=1,
+            max_size=50,
+        )
+    )
+    def test_product_micros_expr_matches_scalar(
+        self, rows: list[tuple[float, int]]
+    ) -> None:
+        """Price x count should round once, like to_micros of the exact product."""
+        df = pl.DataFrame(
+            rows, schema={"asp": pl.Float64, "units": pl.Int64}, orient="row"
+        )
+
+        result = df.select(product_micros_expr(pl.col("asp"), pl.col("units")))
+
+        assert result.to_series().to_list() == [
+            to_micros(Decimal(str(asp)) * units) for asp, units in rows
+        ]
+
+    def test_product_micros_expr_long_decimals(self) -> None:
+        """Prices with more than six decimals should not round before multiplying."""
+        df = pl.DataFrame({"asp": [21.2312189, 21.2312185, None], "units": [165, 1, 2]})
+
+        result = df.select(product_micros_expr(pl.col("asp"), pl.col("units")))
+
+        assert result.to_series().to_list() == [3_503_151_119, 21_231_219, None]
@@ -0,0 +1,110 @@
+"""Tests for compiled drug name matching."""
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.retail_pricing import (
+    DrugCategory,
+    classify_drug_categories,
+    classify_drug_category,
+)
+from optimizer_340b.risk.ira_flags import check_ira_status, ira_years, reload_ira_drugs
+from optimizer_340b.risk.name_matcher import NameMatcher
+
+NAMES = [
+    "ENBREL SURECLICK 50MG/ML",
+    "enbrel",
+    "  FIASP  ",
+    "NOVO",
+    "FIASP FLEXTOUCH 100U/ML",
+    "HUMIRA PEN",
+    "METHOTREXATE 2.5MG TAB",
+    "FOLIC ACID 1MG",
+    "SOME NEW DRUG",
+    "  ",
+    "",
+]
+
+
+class TestNameMatcher:
+    """Tests for NameMatcher."""
+
+    @pytest.fixture
+    def matcher(self) -> NameMatcher:
+        """Matcher with nested and overlapping patterns."""
+        return NameMatcher(["FIASP FLEXTOUCH", "fiasp", "NOVOLOG", "LOG", "A.B"])
+
+    def test_first_match_in_list_order(self, matcher: NameMatcher) -> None:
+        """The lowest-index pattern should win in either direction."""
+        assert matcher.first_match("FIASP FLEXTOUCH PEN") == 0
+        assert matcher.first_match("XNOVOLOGX") == 2
+        assert matcher.first_match("LO") == 2
+        assert matcher.first_match("LO", reverse=False) is None
+        assert matcher.first_match("AXB") is None
+        assert matcher.first_match("A.B") == 4
+
+    def test_series_matches_scalar(self, matcher: NameMatcher) -> None:
+        """Vectorized matching should equal per-name matching."""
+        names = ["FIASP FLEXTOUCH PEN", "XNOVOLOGX", "LO", "AXB", "", "ZZZ"]
+
+        result = matcher.first_match_series(pl.Series(names)).to_list()
+
+        assert result == [matcher.first_match(name) for name in names]
+        assert matcher.contains_any_series(pl.Series(names)).to_list() == [
+            matcher.contains_any(name) for name in names
+        ]
+
+    def test_empty_matcher(self) -> None:
+        """A matcher without patterns should never match."""
+        matcher = NameMatcher([])
+
+        assert matcher.first_match("ANY") is None
+        assert matcher.first_match_series(pl.Series(["ANY"])).to_list() == [None]
+        assert matcher.contains_any_series(pl.Series(["ANY"])).to_list() == [False]
+
+
+class TestVectorizedClassification:
+    """Parity of Series classifiers with the per-name functions."""
+
+    def test_ira_years_match_check_ira_status(self) -> None:
+        """ira_years should agree with check_ira_status for every name."""
+        result = ira_years(pl.Series(NAMES)).to_list()
+
+        assert result == [check_ira_status(name)["ira_year"] for name in NAMES]
+        assert result[0] == 2026
+
+    @pytest.mark.parametrize(
+        "category_lookup",
+        [
+            None,
+            {"HUMIRA": DrugCategory.GENERIC, "ACID": DrugCategory.BRAND},
+        ],
+    )
+    def test_categories_match_classify_drug_category(
+        self, category_lookup: dict[str, DrugCategory] | None
+    ) -> None:
+        """classify_drug_categories should agree with the scalar classifier."""
+        result = classify_drug_categories(pl.Series(NAMES), category_lookup)
+
+        assert result.to_list() == [
+            classify_drug_category(name, category_lookup).value for name in NAMES
+        ]
+
+    def test_reload_rebuilds_matcher(self) -> None:
+        """Reloading the IRA list should change partial matches."""
+        try:
+            reload_ira_drugs(
+                df=pl.DataFrame(
+                    {
+                        "drug_name": ["NEWDRUG"],
+                        "ira_year": [2027],
+                        "description": ["Test"],
+                    }
+                )
+            )
+            names = pl.Series(["NEWDRUG 10MG", "ENBREL"])
+
+            assert ira_years(names).to_list() == [2027, None]
+            assert check_ira_status("NEWDRUG 10MG")["ira_year"] == 2027
+        finally:
+            reload_ira_drugs()
@@ -0,0 +1,209 @@
+"""Tests for the streaming batch NDC lookup."""
+
+from decimal import Decimal
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.ndc_lookup import (
+    NdcLookup,
+    build_catalog_lookup,
+    read_ndc_list,
+    stream_ndc_lookup,
+)
+
+HEADER = "Drug Description,NDC11,Type,Product Description,HCPCS\n"
+
+
+@pytest.fixture
+def catalog() -> pl.DataFrame:
+    """Catalog with a duplicated NDC and a drug known by its generic name."""
+    return pl.DataFrame(
+        {
+            "NDC": ["0074-4339-02", "0074-4339-02", "0003-0894-21", "11111-1111-11"],
+            "Product Description": [
+                "HUMIRA PEN KT 40MG",
+                "HUMIRA PEN KT 40MG",
+                "ELIQUIS TB 5MG",
+                "",
+            ],
+            "Generic Name": ["ADALIMUMAB", "ADALIMUMAB", "APIXABAN", ""],
+            "Contract Cost": [200.0, 150.0, 100.0, None],
+            "AWP": [6500.0, 6500.0, 120.0, 10.0],
+            "Package Size": [2, 2, 60, None],
+        }
+    )
+
+
+@pytest.fixture
+def nadac() -> pl.DataFrame:
+    """Per-unit NADAC for ELIQUIS only."""
+    return pl.DataFrame({"ndc": ["00003089421"], "last_price": [2.5]})
+
+
+class TestReadNdcList:
+    """Tests for read_ndc_list."""
+
+    def test_header_row(self) -> None:
+        """Named columns should be kept as text and missing ones added."""
+        df = read_ndc_list(b"Drug Description,NDC11\nHUMIRA,00074433902\n")
+
+        assert df is not None
+        assert df["NDC11"].to_list() == ["00074433902"]
+        assert df["Type"].to_list() == ["BRAND"]
+        assert df["HCPCS"].to_list() == [""]
+
+    def test_headerless_and_tab_separated(self) -> None:
+        """Header-less files should be named positionally."""
+        csv = read_ndc_list(b"HUMIRA,74433902,SPECIALTY,HUMIRA PEN\n")
+        tsv = read_ndc_list(b"HUMIRA\t74433902\tSPECIALTY\tHUMIRA PEN\n")
+
+        for df in (csv, tsv):
+            assert df is not None
+            assert df.row(0) == (
+                "HUMIRA",
+                "74433902",
+                "SPECIALTY",
+                "HUMIRA PEN",
+                "",
+            )
+
+    def test_single_column_rejected(self) -> None:
+        """A list without an NDC column should not parse."""
+        assert read_ndc_list(b"Drug Description\nHUMIRA\n") is None
+
+
+class TestNdcLookup:
+    """Tests for NdcLookup."""
+
+    def test_catalog_lookup_keeps_lowest_cost(self, catalog: pl.DataFrame) -> None:
+        """Duplicate NDCs should keep the best 340B price."""
+        lookup = build_catalog_lookup(catalog)
+
+        assert lookup["ndc11"].to_list() == [
+            "00074433902",
+            "00003089421",
+            "11111111111",
+        ]
+        assert lookup["contract_cost"].to_list() == [150.0, 100.0, None]
+        assert lookup["package_size"].to_list() == [2.0, 60.0, 1.0]
+
+    def test_match_status_and_margins(
+        self, catalog: pl.DataFrame, nadac: pl.DataFrame
+    ) -> None:
+        """Statuses, margins and the Medicaid floor should follow the page rules."""
+        data = HEADER + (
+            "HUMIRA PEN 40MG,74433902,specialty,,J0135\n"
+            "APIXABAN 5MG,3089421,BRAND,,\n"
+            "OTHER,11111111111,BRAND,,\n"
+            "UNKNOWN,99999999999,BRAND,,\n"
+            "Drug Description,NDC,Type,,\n"
+        )
+        lookup = NdcLookup(
+            catalog,
+            nadac,
+            dispense_fee=Decimal("10"),
+            awp_discount=Decimal("0.15"),
+            capture_rate=Decimal("0.9"),
+        )
+        input_df = read_ndc_list(data.encode())
+        assert input_df is not None
+
+        result = lookup.process(input_df)
+
+        assert result["Match Status"].to_list() == [
+            "MATCH",
+            "MATCH (GENERIC)",
+            "NO CATALOG NAME",
+            "NDC NOT FOUND",
+        ]
+        assert result["Type"].to_list()[0] == "SPECIALTY"
+        assert result["HCPCS"].to_list()[0] == "J0135"
+        # (2.5 x 60 + 10) x 0.9 - 100 = 44; 120 x 0.85 x 0.9 - 100 = -8.2
+        assert result.row(1)[-2:] == (44.0, -8.2)
+        # No NADAC for HUMIRA: Medicaid floors to 0 next to a Medicare margin
+        assert result.row(0)[-2:] == (0.0, 4822.5)
+        assert result.row(3)[-4:] == (None, None, None, None)
+
+    def test_repeated_header_rows_skipped(self, catalog: pl.DataFrame) -> None:
+        """Header lines repeated mid-file should not become result rows."""
+        data = (
+            "Drug Description,NDC11,Type\n"
+            "HUMIRA,74433902,BRAND\n"
+            "Drug Description,NDC11,Type\n"
+            "Drug Description,ndc_code,Type\n"
+            "ELIQUIS,3089421,BRAND\n"
+        )
+        input_df = read_ndc_list(data.encode())
+        assert input_df is not None
+
+        result = NdcLookup(catalog).process(input_df)
+
+        assert result["NDC11"].to_list() == ["00074433902", "00003089421"]
+        assert "NDC NOT FOUND" not in result["Match Status"].to_list()
+
+    def test_margins_round_half_away_from_zero(self, catalog: pl.DataFrame) -> None:
+        """Half-cent margins should round up, not by binary float."""
+        lookup = NdcLookup(
+            catalog.with_columns(
+                pl.lit(11.66).alias("Contract Cost"), pl.lit(749.0).alias("AWP")
+            ),
+            capture_rate=Decimal("0.9"),
+        )
+        input_df = read_ndc_list(b"Drug Description,NDC11\nHUMIRA,74433902\n")
+        assert input_df is not None
+
+        result = lookup.process(input_df)
+
+        # 749 x 0.85 x 0.9 - 11.66 = 561.325
+        assert result["Pharmacy Medicare/Commercial Margin"].to_list() == [561.33]
+
+
+class TestStreamNdcLookup:
+    """Tests for stream_ndc_lookup."""
+
+    @pytest.mark.parametrize("suffix", [".parquet", ".csv"])
+    def test_chunks_match_single_pass(
+        self,
+        tmp_path: Path,
+        catalog: pl.DataFrame,
+        nadac: pl.DataFrame,
+        suffix: str,
+    ) -> None:
+        """Chunked output should equal one pass over the whole input."""
+        rows = ["HUMIRA,74433902,,,", "ELIQUIS,3089421,,,", "X,123,,,"] * 7
+        input_df = read_ndc_list((HEADER + "\n".join(rows)).encode())
+        assert input_df is not None
+        lookup = NdcLookup(catalog, nadac)
+        progress: list[tuple[int, int]] = []
+
+        summary = stream_ndc_lookup(
+            input_df,
+            lookup,
+            tmp_path / f"out{suffix}",
+            chunk_size=5,
+            on_progress=lambda done, total: progress.append((done, total)),
+        )
+
+        expected = lookup.process(input_df)
+        if suffix == ".csv":
+            result = pl.read_csv(tmp_path / "out.csv", schema=expected.schema)
+        else:
+            result = pl.read_parquet(tmp_path / "out.parquet")
+        assert result.equals(expected)
+        assert progress == [(n, 21) for n in (5, 10, 15, 20, 21)]
+        assert (summary.total, summary.matches, summary.mismatches) == (21, 14, 7)
+        assert summary.with_margins == 14
+
+    def test_empty_input(self, tmp_path: Path, catalog: pl.DataFrame) -> None:
+        """An input without rows should still write an empty result."""
+        input_df = read_ndc_list(HEADER.encode())
+        assert input_df is not None
+
+        summary = stream_ndc_lookup(
+            input_df, NdcLookup(catalog), tmp_path / "o.parquet"
+        )
+
+        assert summary.total == 0
+        assert pl.read_parquet(tmp_path / "o.parquet").width == 10
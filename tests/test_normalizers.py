@@ -1,15 +1,21 @@
 """Tests for data normalization (Silver Layer)."""
 
+from pathlib import Path
+
 import polars as pl
 import pytest
+from hypothesis import given
+from hypothesis import strategies as st
 
 from optimizer_340b.ingest.normalizers import (
     apply_column_mapping,
     build_silver_dataset,
+    build_silver_dataset_lazy,
     fuzzy_match_drug_name,
     fuzzy_match_drug_partial,
     join_asp_pricing,
     join_catalog_to_crosswalk,
+    ndc_expr,
     normalize_asp_pricing,
     normalize_catalog,
     normalize_crosswalk,
@@ -67,6 +73,39 @@ class TestNDCNormalization:
         assert result.height == 2
 
 
+class TestNDCExpression:
+    """Tests for the vectorized ndc_expr against the scalar normalize_ndc."""
+
+    # Digits, NDC separators, letters and non-ASCII digits that must be dropped
+    ndc_text = st.text(alphabet=st.sampled_from("0123456789- .abcXYZ\u0663"))
+
+    @given(st.lists(st.one_of(st.none(), ndc_text, st.text())))
+    def test_matches_scalar_normalize_ndc(self, values: list[str | None]) -> None:
+        """ndc_expr should match normalize_ndc for any string, including None."""
+        df = pl.DataFrame({"NDC": values}, schema={"NDC": pl.String})
+
+        result = df.select(ndc_expr("NDC"))["NDC"].to_list()
+
+        assert result == [normalize_ndc(v) for v in values]  # type: ignore[arg-type]
+
+    @given(st.lists(st.one_of(st.none(), st.integers(min_value=0, max_value=10**14))))
+    def test_matches_scalar_for_integer_columns(self, values: list[int | None]) -> None:
+        """Numeric NDC columns should normalize like their string form."""
+        df = pl.DataFrame({"NDC": values}, schema={"NDC": pl.Int64})
+
+        result = df.select(ndc_expr(pl.col("NDC")))["NDC"].to_list()
+
+        assert result == [normalize_ndc(v) for v in values]  # type: ignore[arg-type]
+
+    def test_null_becomes_empty_string(self) -> None:
+        """Nulls should normalize to "" like normalize_ndc(None)."""
+        df = pl.DataFrame({"NDC": [None, "0074-4339-02"]}, schema={"NDC": pl.String})
+
+        result = df.select(ndc_expr("NDC"))["NDC"].to_list()
+
+        assert result == ["", "00074433902"]
+
+
 class TestColumnMapping:
     """Tests for column mapping/renaming."""
 
@@ -397,3 +436,46 @@ class TestBuildSilverDataset:
         assert "NDC" in silver.columns
         assert "Contract Cost" in silver.columns
         assert "AWP" in silver.columns
+
+
+class TestBuildSilverDatasetLazy:
+    """Tests for the lazy Silver Layer build."""
+
+    @pytest.mark.parametrize("streaming", [True, False])
+    def test_matches_eager_build(
+        self,
+        sample_catalog_df: pl.DataFrame,
+        sample_asp_crosswalk_df: pl.DataFrame,
+        sample_asp_pricing_df: pl.DataFrame,
+        streaming: bool,
+    ) -> None:
+        """The lazy build should equal build_silver_dataset."""
+        inputs = (sample_catalog_df, sample_asp_crosswalk_df, sample_asp_pricing_df)
+
+        silver, orphans = build_silver_dataset_lazy(*inputs, streaming=streaming)
+        expected, expected_orphans = build_silver_dataset(*inputs)
+
+        assert silver.equals(expected)
+        assert orphans.equals(expected_orphans)
+
+    def test_scans_with_projection(
+        self,
+        tmp_path: Path,
+        sample_catalog_df: pl.DataFrame,
+        sample_asp_crosswalk_df: pl.DataFrame,
+        sample_asp_pricing_df: pl.DataFrame,
+    ) -> None:
+        """Parquet scans should work and carry only the requested columns."""
+        sample_catalog_df.write_parquet(tmp_path / "catalog.parquet")
+
+        silver, orphans = build_silver_dataset_lazy(
+            pl.scan_parquet(tmp_path / "catalog.parquet"),
+            sample_asp_crosswalk_df.lazy(),
+            sample_asp_pricing_df,
+            catalog_columns=["NDC", "AWP"],
+        )
+
+        assert silver.columns[:3] == ["NDC", "AWP", "ndc_normalized"]
+        assert "Contract Cost" not in silver.columns
+        assert orphans.columns == ["NDC", "AWP", "ndc_normalized", "HCPCS Code"]
+        assert (silver.height, orphans.height) == (2, 1)
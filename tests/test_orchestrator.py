@@ -0,0 +1,89 @@
+"""Tests for concurrent multi-file ingest."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from optimizer_340b.ingest import orchestrator
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.ingest.sources import load_source
+from optimizer_340b.risk.ira_flags import check_ira_status, reload_ira_drugs
+
+
+@pytest.fixture
+def paths(tmp_path: Path) -> dict[str, Path]:
+    """Catalog, IRA list and NADAC files on disk."""
+    pl.DataFrame(
+        {
+            "NDC": ["0074-4339-02", "5555-5555-55"],
+            "Drug Name": ["HUMIRA", "NEWDRUG"],
+            "Contract Cost": [150.00, 200.00],
+            "AWP": [6500.00, 7000.00],
+        }
+    ).write_csv(tmp_path / "catalog.csv")
+    pl.DataFrame(
+        {"drug_name": ["NEWDRUG"], "ira_year": [2027], "description": ["Test"]}
+    ).write_csv(tmp_path / "ira.csv")
+    pl.DataFrame({"ndc": ["00074433902"], "total_discount_340b_pct": [50.0]}).write_csv(
+        tmp_path / "nadac.csv"
+    )
+    return {
+        "catalog": tmp_path / "catalog.csv",
+        "ira_drugs": tmp_path / "ira.csv",
+        "nadac": tmp_path / "nadac.csv",
+    }
+
+
+@pytest.fixture(autouse=True)
+def restore_ira_list() -> Iterator[None]:
+    """Restore the default IRA list after each test."""
+    yield
+    reload_ira_drugs()
+
+
+class TestIngestSources:
+    """Tests for ingest_sources."""
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_loads_files_and_reloads_ira(
+        self, paths: dict[str, Path], max_workers: int
+    ) -> None:
+        """Every file should load, with timings, and the IRA list reloads."""
+        result = ingest_sources(paths, max_workers=max_workers)
+
+        assert set(result.frames) == set(paths)
+        assert set(result.timings) == set(paths)
+        assert result.errors == {}
+        assert result.frames["catalog"].height == 2
+        assert check_ira_status("NEWDRUG")["ira_year"] == 2027
+
+    def test_failures_are_reported(
+        self, paths: dict[str, Path], tmp_path: Path
+    ) -> None:
+        """A missing file or invalid catalog should not stop other loads."""
+        pl.DataFrame({"NDC": ["1"]}).write_csv(tmp_path / "bad_catalog.csv")
+        paths["catalog"] = tmp_path / "bad_catalog.csv"
+        paths["noc_pricing"] = tmp_path / "missing.csv"
+
+        result = ingest_sources(paths, max_workers=2)
+
+        assert set(result.errors) == {"catalog", "noc_pricing"}
+        assert set(result.frames) == {"ira_drugs", "nadac"}
+
+    def test_process_pool(
+        self,
+        paths: dict[str, Path],
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Files routed to the process pool should load the same frames."""
+        monkeypatch.setenv("DATA_DIR", str(tmp_path / "uploads"))
+        monkeypatch.setattr(orchestrator, "_needs_process", lambda path: True)
+
+        result = ingest_sources(paths, max_workers=2)
+
+        assert result.errors == {}
+        for key, path in paths.items():
+            assert result.frames[key].equals(load_source(key, path))
@@ -0,0 +1,175 @@
+"""Tests for the incremental recompute graph."""
+
+from collections import Counter
+from collections.abc import Callable
+from typing import Any
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.ingest.normalizers import build_silver_dataset
+from optimizer_340b.pipeline import DependencyGraph, Stage, build_pipeline
+
+
+def _counting(
+    calls: Counter[str], name: str, func: Callable[..., Any], inputs: tuple[str, ...]
+) -> Stage:
+    """Build a stage that records how often it is computed."""
+
+    def run(*args: Any) -> Any:
+        calls[name] += 1
+        return func(*args)
+
+    return Stage(name, run, inputs)
+
+
+class TestDependencyGraph:
+    """Tests for DependencyGraph versioning."""
+
+    @pytest.fixture
+    def calls(self) -> Counter[str]:
+        """Per-stage computation counter."""
+        return Counter()
+
+    @pytest.fixture
+    def graph(self, calls: Counter[str]) -> DependencyGraph:
+        """Diamond graph: a and b feed left/right, which feed total."""
+        return DependencyGraph(
+            [
+                _counting(calls, "left", lambda a: a + 1, ("a",)),
+                _counting(calls, "right", lambda b: b * 2, ("b",)),
+                _counting(calls, "total", lambda x, y: x + y, ("left", "right")),
+            ]
+        )
+
+    def test_inputs_are_names_no_stage_produces(self, graph: DependencyGraph) -> None:
+        """Graph inputs should be inferred from stage dependencies."""
+        assert graph.inputs == ("a", "b")
+        assert graph.downstream("a") == {"left", "total"}
+
+    def test_only_downstream_stages_recompute(
+        self, graph: DependencyGraph, calls: Counter[str]
+    ) -> None:
+        """Changing one input should skip stages that do not depend on it."""
+        graph.update_inputs({"a": 1, "b": 10})
+        assert graph.get("total") == 22
+
+        assert graph.update_inputs({"a": 5, "b": 10}) == ["a"]
+        assert graph.get("total") == 26
+        assert calls == Counter({"left": 2, "right": 1, "total": 2})
+
+    def test_unchanged_frame_content_keeps_version(self) -> None:
+        """Re-setting an equal DataFrame should not invalidate stages."""
+        graph = DependencyGraph([Stage("height", lambda df: df.height, ("df",))])
+        graph.set_input("df", pl.DataFrame({"x": [1, 2]}))
+        graph.get("height")
+
+        assert graph.set_input("df", pl.DataFrame({"x": [1, 2]})) is False
+        assert graph.version("df") == 1
+        assert graph.version("height") == 1
+        assert graph.set_input("df", pl.DataFrame({"x": [1, 3]})) is True
+
+    def test_missing_required_input_skips_stage(
+        self, graph: DependencyGraph, calls: Counter[str]
+    ) -> None:
+        """Stages with a missing required input should evaluate to None."""
+        graph.update_inputs({"a": 1})
+
+        assert graph.get("left") == 2
+        assert graph.get("total") is None
+        assert calls["right"] == 0
+
+    def test_optional_input_passed_as_none(self) -> None:
+        """Optional inputs should be passed through as None."""
+        graph = DependencyGraph(
+            [Stage("pair", lambda a, b: (a, b), ("a", "b"), frozenset({"b"}))]
+        )
+        graph.set_input("a", 1)
+
+        assert graph.get("pair") == (1, None)
+
+    def test_invalid_graphs(self) -> None:
+        """Cycles, duplicate stages and unknown names should raise."""
+        with pytest.raises(ValueError, match="Cycle"):
+            DependencyGraph([Stage("x", str, ("y",)), Stage("y", str, ("x",))])
+        with pytest.raises(ValueError, match="Duplicate"):
+            DependencyGraph([Stage("x", str, ("a",)), Stage("x", str, ("b",))])
+        with pytest.raises(KeyError):
+            DependencyGraph([Stage("x", str, ("a",))]).get("unknown")
+
+
+class TestBuildPipeline:
+    """Tests for the application recompute graph."""
+
+    @pytest.fixture
+    def uploaded(
+        self,
+        sample_catalog_df: pl.DataFrame,
+        sample_asp_crosswalk_df: pl.DataFrame,
+        sample_asp_pricing_df: pl.DataFrame,
+        sample_nadac_df: pl.DataFrame,
+    ) -> dict[str, pl.DataFrame]:
+        """Uploaded data with catalog, crosswalk, ASP and NADAC."""
+        return {
+            "catalog": sample_catalog_df,
+            "crosswalk": sample_asp_crosswalk_df,
+            "asp_pricing": sample_asp_pricing_df,
+            "nadac": sample_nadac_df,
+        }
+
+    def test_silver_matches_build_silver_dataset(
+        self, uploaded: dict[str, pl.DataFrame]
+    ) -> None:
+        """The silver stage should equal build_silver_dataset."""
+        pipeline = build_pipeline()
+        pipeline.update_inputs(uploaded)
+
+        silver, orphans = pipeline.get("silver")
+        expected, expected_orphans = build_silver_dataset(
+            uploaded["catalog"], uploaded["crosswalk"], uploaded["asp_pricing"]
+        )
+
+        assert silver.equals(expected)
+        assert orphans.equals(expected_orphans)
+
+    def test_drug_index_matches_direct_build(
+        self, uploaded: dict[str, pl.DataFrame]
+    ) -> None:
+        """The pipeline's index should equal one built in a single pass."""
+        pipeline = build_pipeline()
+        pipeline.update_inputs(uploaded)
+
+        index = pipeline.get("drug_index")
+        direct = DrugIndex.from_uploaded_data(uploaded)
+
+        assert direct is not None
+        assert index.frame.equals(direct.frame)
+        assert pipeline.get("catalog_crosswalk_join") is not None
+
+    def test_new_asp_file_reuses_catalog_stages(
+        self, uploaded: dict[str, pl.DataFrame]
+    ) -> None:
+        """A new ASP file should only redo the ASP joins and lookups."""
+        pipeline = build_pipeline()
+        pipeline.update_inputs(uploaded)
+        pipeline.get("drug_index")
+        pipeline.get("silver")
+        before = {
+            name: pipeline.version(name) for name in pipeline.downstream("catalog")
+        }
+
+        new_asp = uploaded["asp_pricing"].with_columns(pl.col("Payment Limit") * 2)
+        assert pipeline.update_inputs({**uploaded, "asp_pricing": new_asp}) == [
+            "asp_pricing"
+        ]
+        pipeline.get("drug_index")
+        pipeline.get("silver")
+
+        recomputed = {
+            name for name, version in before.items() if pipeline.version(name) > version
+        }
+        assert recomputed == {"silver", "drug_priced", "drug_frame", "drug_index"}
+        assert recomputed | {"hcpcs_lookup", "asp_normalized"} == (
+            pipeline.downstream("asp_pricing")
+        )
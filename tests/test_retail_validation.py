@@ -0,0 +1,112 @@
+"""Tests for retail price validation against the wholesaler catalog."""
+
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from optimizer_340b.risk.retail_validation import (
+    build_retail_price_frame,
+    build_retail_validation_lookup,
+    load_wholesaler_catalog,
+    validate_batch_retail,
+    validate_retail_price,
+)
+
+
+@pytest.fixture
+def wholesaler_df() -> pl.DataFrame:
+    """Normalized wholesaler catalog with a duplicate and unusable rows."""
+    return load_wholesaler_catalog(
+        pl.DataFrame(
+            {
+                "Product Catalog NDC": [
+                    "0074-4339-02",
+                    "1234567890",
+                    "1234567890",
+                    "5555555555",
+                    None,
+                ],
+                "Product Catalog Unit Price (Current Retail) Average": [
+                    3.0,
+                    50.0,
+                    10.0,
+                    0.0,
+                    99.0,
+                ],
+            }
+        )
+    )
+
+
+class TestRetailPriceFrame:
+    """Tests for the wholesaler price frame and lookup."""
+
+    def test_filters_and_deduplicates(self, wholesaler_df: pl.DataFrame) -> None:
+        """Zero prices and missing NDCs are dropped; the last duplicate wins."""
+        prices = build_retail_price_frame(wholesaler_df)
+
+        assert prices.rows() == [("00074433902", 3.0), ("01234567890", 10.0)]
+        assert build_retail_validation_lookup(wholesaler_df) == {
+            "00074433902": Decimal("3.0"),
+            "01234567890": Decimal("10.0"),
+        }
+
+
+class TestValidateBatchRetail:
+    """Tests for the joined batch validation."""
+
+    @pytest.fixture
+    def drugs_df(self) -> pl.DataFrame:
+        """Drugs at, just over and without a retail benchmark."""
+        return pl.DataFrame(
+            {
+                "ndc_normalized": [
+                    "00074433902",
+                    "00074433902",
+                    "01234567890",
+                    "01234567890",
+                    "09999999999",
+                ],
+                "retail_revenue": [3.6, 3.61, 10.0, None, 5.0],
+            }
+        )
+
+    def test_matches_scalar_validation(
+        self, wholesaler_df: pl.DataFrame, drugs_df: pl.DataFrame
+    ) -> None:
+        """Batch confidence should match validate_retail_price row by row."""
+        result = validate_batch_retail(
+            drugs_df, build_retail_price_frame(wholesaler_df)
+        )
+
+        lookup = build_retail_validation_lookup(wholesaler_df)
+        expected = [
+            validate_retail_price(ndc, Decimal(str(calc)), lookup).confidence
+            if calc is not None
+            else "Unknown"
+            for ndc, calc in drugs_df.iter_rows()
+        ]
+        assert result["retail_confidence"].to_list() == expected
+        assert expected == ["High", "Low", "High", "Unknown", "Unknown"]
+        assert result["actual_retail"].to_list() == [3.0, 3.0, 10.0, None, None]
+        assert result["retail_variance_pct"][2] == 0.0
+
+    def test_accepts_lookup_dict(
+        self, wholesaler_df: pl.DataFrame, drugs_df: pl.DataFrame
+    ) -> None:
+        """A lookup dict should give the same result as the price frame."""
+        from_frame = validate_batch_retail(
+            drugs_df, build_retail_price_frame(wholesaler_df)
+        )
+        from_dict = validate_batch_retail(
+            drugs_df, build_retail_validation_lookup(wholesaler_df)
+        )
+
+        assert from_dict.equals(from_frame)
+
+    def test_missing_columns_return_input(self, drugs_df: pl.DataFrame) -> None:
+        """Without the NDC or calculated column the frame is unchanged."""
+        result = validate_batch_retail(drugs_df, {}, calculated_col="missing")
+
+        assert result.equals(drugs_df)
@@ -22,10 +22,14 @@ from optimizer_340b.risk.ira_flags import (
 )
 from optimizer_340b.risk.penny_pricing import (
     HIGH_DISCOUNT_THRESHOLD,
+    NADAC_FLAGS_SCHEMA,
     PENNY_THRESHOLD,
+    build_nadac_flags,
+    build_nadac_lookup,
     check_penny_pricing,
     check_penny_pricing_for_drug,
     filter_top_opportunities,
+    get_nadac_enhanced_status,
     get_penny_pricing_summary,
 )
 
@@ -370,6 +374,111 @@ class TestGetPennyPricingSummary:
         assert summary["flagged_ndcs"] == []
 
 
+class TestNadacFlags:
+    """Tests for the frame-level NADAC flags."""
+
+    @pytest.fixture
+    def nadac_df(self) -> pl.DataFrame:
+        """NADAC rows covering flag spellings, thresholds and duplicates."""
+        return pl.DataFrame({
+            "ndc": ["0074-4339-02", "1111111111", "2222222222", "3333333333",
+                    "3333333333", None],
+            "penny_pricing": ["Yes", "no", "y", None, None, "Yes"],
+            "total_discount_340b_pct": [10.0, 50.0, None, 95.0, 94.9, 99.0],
+            "inflation_penalty_pct": [20.0, 20.5, None, 5.0, 25.0, 30.0],
+            "last_price": [1.25, None, 0.004, 3.0, 3.5, 1.0],
+        })
+
+    def test_flags_frame(self, nadac_df: pl.DataFrame) -> None:
+        """Flags should be parsed and thresholded per normalized NDC."""
+        flags = build_nadac_flags(nadac_df)
+
+        assert flags.schema == NADAC_FLAGS_SCHEMA
+        # Null NDC dropped; the duplicate NDC keeps its last row
+        assert flags["ndc_normalized"].to_list() == [
+            "00074433902",
+            "01111111111",
+            "02222222222",
+            "03333333333",
+        ]
+        assert flags["is_penny_priced"].to_list() == [True, False, True, False]
+        assert flags["override_cost"].to_list() == [0.01, None, 0.01, None]
+        assert flags["has_inflation_penalty"].to_list() == [False, True, False, True]
+        assert flags["nadac_price"].to_list() == [1.25, None, 0.004, 3.5]
+
+    def test_blank_ndc_rows_skipped(self) -> None:
+        """Blank NDCs should be dropped, not normalized to 00000000000."""
+        nadac_df = pl.DataFrame({
+            "ndc": ["", "   ", "1111111111"],
+            "penny_pricing": ["Yes", "Yes", "no"],
+        })
+
+        flags = build_nadac_flags(nadac_df)
+
+        assert flags["ndc_normalized"].to_list() == ["01111111111"]
+        assert "00000000000" not in build_nadac_lookup(nadac_df)
+
+    def test_lookup_matches_flags(self, nadac_df: pl.DataFrame) -> None:
+        """build_nadac_lookup should carry the flags as Decimals."""
+        lookup = build_nadac_lookup(nadac_df)
+
+        assert lookup["00074433902"]["is_penny_priced"] is True
+        assert lookup["00074433902"]["override_cost"] == Decimal("0.01")
+        assert lookup["01111111111"]["inflation_penalty_pct"] == Decimal("20.5")
+        assert lookup["02222222222"]["nadac_price"] == Decimal("0.004")
+
+    def test_enhanced_status_amounts(self, nadac_df: pl.DataFrame) -> None:
+        """Status amounts should be Decimals for built and hand-made lookups."""
+        lookup = build_nadac_lookup(nadac_df)
+        status = get_nadac_enhanced_status("0074-4339-02", lookup)
+        assert status.override_cost == Decimal("0.01")
+        assert status.inflation_penalty_pct == Decimal("20.0")
+
+        lookup = {
+            "01111111111": {
+                "is_penny_priced": True,
+                "override_cost": 0.01,
+                "has_inflation_penalty": True,
+                "inflation_penalty_pct": 20.5,
+            }
+        }
+        status = get_nadac_enhanced_status("1111111111", lookup)
+        assert status.override_cost == Decimal("0.01")
+        assert status.inflation_penalty_pct == Decimal("20.5")
+
+        lookup["01111111111"]["override_cost"] = ["0.01"]
+        with pytest.raises(TypeError):
+            get_nadac_enhanced_status("1111111111", lookup)
+
+    def test_missing_columns(self) -> None:
+        """Missing optional columns should yield unflagged rows."""
+        flags = build_nadac_flags(pl.DataFrame({"ndc": ["1234567890"]}))
+
+        assert flags.row(0, named=True) == {
+            "ndc_normalized": "01234567890",
+            "is_penny_priced": False,
+            "override_cost": None,
+            "has_inflation_penalty": False,
+            "inflation_penalty_pct": None,
+            "discount_340b_pct": None,
+            "nadac_price": None,
+        }
+        assert build_nadac_flags(pl.DataFrame({"x": [1]})).is_empty()
+
+    def test_summary_parses_string_flags(self, nadac_df: pl.DataFrame) -> None:
+        """A "no" flag should not count as penny pricing in the summary."""
+        summary = get_penny_pricing_summary(nadac_df)
+
+        assert summary["total_drugs"] == 6
+        assert summary["penny_priced_count"] == 4
+        assert summary["flagged_ndcs"] == [
+            "0074-4339-02",
+            "2222222222",
+            "3333333333",
+            None,
+        ]
+
+
 class TestConstants:
     """Tests for risk module constants."""
 
@@ -0,0 +1,118 @@
+"""Tests for the drug search index."""
+
+import polars as pl
+import pytest
+
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.search_index import (
+    SCORE_EQUAL,
+    SCORE_PREFIX,
+    SearchIndex,
+)
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    """Search index over a small catalog."""
+    return SearchIndex(
+        {
+            "drug_name": [
+                "HUMIRA PEN",
+                "HUMIRA",
+                "ACETAMINOPHEN",
+                "HYDROCODONE/ACETAMINOPHEN",
+                "OZEMPIC",
+                "Unknown",
+            ],
+            "generic_name": [
+                "ADALIMUMAB",
+                "ADALIMUMAB",
+                "ACETAMINOPHEN",
+                None,
+                "SEMAGLUTIDE",
+                None,
+            ],
+            "manufacturer": ["ABBVIE", "ABBVIE", "TEVA", "TEVA", "NOVO NORDISK", ""],
+            "ndc": [
+                "00074433902",
+                "00074433901",
+                "12345678901",
+                "22222222222",
+                "00169413212",
+                "99999999999",
+            ],
+            "hcpcs_code": ["J0135", "J0135", None, None, None, None],
+        }
+    )
+
+
+class TestSearchIndex:
+    """Tests for SearchIndex ranking and matching."""
+
+    def test_ranks_exact_then_prefix_then_substring(self, index: SearchIndex) -> None:
+        """Exact names should rank above prefixes and substrings."""
+        hits = index.search("acetaminophen")
+
+        assert [hit.position for hit in hits] == [2, 3]
+        assert hits[0].score == SCORE_EQUAL
+        assert hits[1].score < hits[0].score
+
+        humira = index.search("humira")
+        assert [hit.position for hit in humira] == [1, 0]
+        assert humira[1].score == SCORE_PREFIX
+
+    def test_matches_other_fields(self, index: SearchIndex) -> None:
+        """Generic name, manufacturer, NDC and HCPCS should be searchable."""
+        assert index.search("ADALIMUMAB")[0].field == "generic_name"
+        assert {hit.position for hit in index.search("NOVO")} == {4}
+        assert [hit.position for hit in index.search("0074-4339-02")] == [0]
+        assert {hit.position for hit in index.search("J0135")} == {0, 1}
+
+    def test_short_queries_use_word_prefixes(self, index: SearchIndex) -> None:
+        """One- and two-character queries should match word prefixes only."""
+        positions = {hit.position for hit in index.search("OZ", fuzzy=False)}
+
+        assert positions == {4}
+        assert index.search("MI", fuzzy=False) == []
+
+    def test_typo_tolerant_matches(self, index: SearchIndex) -> None:
+        """Misspellings should fall back to thefuzz scores on candidates."""
+        hits = index.search("OZEMPC")
+
+        assert [hit.position for hit in hits] == [4]
+        assert hits[0].fuzzy
+        assert index.search("OZEMPC", fuzzy=False) == []
+
+    def test_limit_and_autocomplete_names(self, index: SearchIndex) -> None:
+        """Results should respect limit; names exclude blanks and Unknown."""
+        assert len(index.search("A", limit=2)) == 2
+        assert index.names == [
+            "ACETAMINOPHEN",
+            "HUMIRA",
+            "HUMIRA PEN",
+            "HYDROCODONE/ACETAMINOPHEN",
+            "OZEMPIC",
+        ]
+
+
+class TestDrugIndexSearch:
+    """Tests for the search index built from a DrugIndex."""
+
+    def test_built_once_from_frame(self, sample_catalog_df: pl.DataFrame) -> None:
+        """The index should be cached and positioned on the drug frame."""
+        drug_index = DrugIndex(sample_catalog_df)
+
+        search_index = drug_index.search_index
+        hit = search_index.search("amgen")[0]
+
+        assert drug_index.search_index is search_index
+        assert drug_index.frame["drug_name"][hit.position] == "ENBREL"
+
+    def test_first_position(self, sample_catalog_df: pl.DataFrame) -> None:
+        """first_position should return the earliest containing row."""
+        search_index = DrugIndex(sample_catalog_df).search_index
+
+        assert search_index.first_position("r") == 0
+        assert search_index.first_position("EN") == 1
+        assert search_index.first_position("bre") == 2
+        assert search_index.first_position("xyz") is None
@@ -0,0 +1,213 @@
+"""Tests for Arrow IPC snapshots of the Silver and Gold datasets."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from optimizer_340b import snapshots
+from optimizer_340b.compute.analysis_cache import (
+    AnalysisCache,
+    Scenario,
+    cached_opportunities,
+    set_analysis_cache,
+)
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.margins import rank_opportunities
+from optimizer_340b.snapshots import (
+    LATEST_FILE,
+    SnapshotStore,
+    load_latest_snapshot,
+    map_ipc,
+    read_snapshot,
+    set_snapshot_store,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def index(sample_catalog_df: pl.DataFrame) -> DrugIndex:
+    """Drug index over the sample catalog."""
+    return DrugIndex(sample_catalog_df)
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> SnapshotStore:
+    """An enabled snapshot store in a temp directory."""
+    return SnapshotStore(tmp_path / "snapshots")
+
+
+@pytest.fixture
+def analysis_cache() -> Iterator[AnalysisCache]:
+    """A fresh process-wide analysis cache; forgets the worker snapshot after."""
+    cache = AnalysisCache(max_bytes=64 * 1024 * 1024)
+    set_analysis_cache(cache)
+    yield cache
+    set_analysis_cache(None)
+    set_snapshot_store(None)
+
+
+def _write(
+    store: SnapshotStore, index: DrugIndex, capture_rate: str = "1.0"
+) -> str | None:
+    """Snapshot the index scored under a capture rate."""
+    scenario = Scenario(capture_rate=Decimal(capture_rate))
+    gold = rank_opportunities(index.frame, scenario.capture_rate)
+    silver = (index.catalog, index.catalog.head(0))
+    return write_snapshot(index, gold, scenario, silver, store=store)
+
+
+class TestSnapshotStore:
+    """Tests for SnapshotStore and the module-level helpers."""
+
+    def test_round_trip(self, store: SnapshotStore, index: DrugIndex) -> None:
+        """A read snapshot should hold the written frames and scenario."""
+        version = _write(store, index)
+
+        assert version is not None
+        assert store.latest() == version
+        snapshot = read_snapshot(store=store)
+        assert snapshot is not None
+        assert snapshot.version == version
+        assert snapshot.scenario == Scenario()
+        assert snapshot.gold.equals(rank_opportunities(index.frame))
+        assert snapshot.silver is not None
+        assert snapshot.silver.equals(index.catalog)
+        assert snapshot.orphans is not None
+        assert snapshot.orphans.height == 0
+
+    def test_index_matches_source(self, store: SnapshotStore, index: DrugIndex) -> None:
+        """The rebuilt index should look up the same drugs without rehashing."""
+        _write(store, index)
+        snapshot = read_snapshot(store=store)
+        assert snapshot is not None
+
+        restored = snapshot.index
+        assert restored.frame.equals(index.frame)
+        assert restored.fingerprint == index.fingerprint
+        assert len(restored) == len(index)
+        ndc = index.frame["ndc"][0]
+        assert restored.get(ndc) == index.get(ndc)
+
+    def test_same_content_same_version(
+        self, store: SnapshotStore, index: DrugIndex
+    ) -> None:
+        """Rewriting identical results should reuse the version directory."""
+        first = _write(store, index)
+        second = _write(store, index, capture_rate="0.5")
+        third = _write(store, index)
+
+        assert first == third != second
+        assert store.latest() == first
+        assert set(store.versions()) == {first, second}
+
+    def test_prune_keeps_latest(self, tmp_path: Path, index: DrugIndex) -> None:
+        """Only the most recent versions should be kept."""
+        store = SnapshotStore(tmp_path / "snapshots", keep=2)
+        versions = [_write(store, index, rate) for rate in ("0.3", "0.4", "0.5")]
+
+        assert store.versions() == versions[1:]
+        assert store.latest() == versions[-1]
+
+    def test_disabled_writes_nothing(self, tmp_path: Path, index: DrugIndex) -> None:
+        """A disabled store should not write."""
+        store = SnapshotStore(tmp_path / "snapshots", enabled=False)
+
+        assert _write(store, index) is None
+        assert not store.root.exists()
+
+    def test_missing_or_foreign_snapshots(
+        self, store: SnapshotStore, index: DrugIndex
+    ) -> None:
+        """Missing versions and other formats should read as None."""
+        assert read_snapshot(store=store) is None
+        assert store.read("0123456789abcdef") is None
+
+        version = _write(store, index)
+        assert version is not None
+        manifest = store.path_for(version) / "manifest.json"
+        manifest.write_text(manifest.read_text().replace('"format": 1', '"format": 0'))
+        assert store.read() is None
+
+        (store.root / LATEST_FILE).write_text("")
+        assert store.latest() is None
+
+    def test_seed_analysis_cache(self, store: SnapshotStore, index: DrugIndex) -> None:
+        """Seeding should serve the Gold frame for the index and scenario."""
+        _write(store, index)
+        snapshot = read_snapshot(store=store)
+        assert snapshot is not None
+        cache = AnalysisCache(max_bytes=64 * 1024 * 1024)
+
+        snapshot.seed_analysis_cache(cache)
+
+        cached = cache.get(("opportunities", index.fingerprint, Scenario()))
+        assert cached is snapshot.gold
+
+    def test_concurrent_writers(self, store: SnapshotStore, index: DrugIndex) -> None:
+        """Threads writing snapshots should not share temporary files."""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            versions = list(
+                pool.map(lambda rate: _write(store, index, rate), ["1.0", "0.5"] * 4)
+            )
+
+        assert None not in versions
+        assert store.latest() in versions
+        assert [p.name for p in store.root.iterdir() if p.name.startswith(".")] == []
+        assert read_snapshot(store=store) is not None
+
+    def test_map_ipc_without_pyarrow(
+        self, tmp_path: Path, index: DrugIndex, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Without pyarrow, IPC files should still load (as copies)."""
+        path = tmp_path / "frame.arrow"
+        index.frame.write_ipc(path)
+        monkeypatch.setattr(snapshots, "find_spec", lambda name: None)
+
+        assert map_ipc(path).equals(index.frame)
+
+
+class TestLoadLatestSnapshot:
+    """Tests for the per-worker startup snapshot."""
+
+    def test_disabled_loads_nothing(
+        self, tmp_path: Path, index: DrugIndex, analysis_cache: AnalysisCache
+    ) -> None:
+        """With snapshots disabled, workers should not map LATEST."""
+        _write(SnapshotStore(tmp_path / "snapshots"), index)
+
+        disabled = SnapshotStore(tmp_path / "snapshots", enabled=False)
+        assert load_latest_snapshot(disabled) is None
+        assert load_latest_snapshot(SnapshotStore(tmp_path / "empty")) is None
+
+    def test_loads_once_and_seeds_cache(
+        self, store: SnapshotStore, index: DrugIndex, analysis_cache: AnalysisCache
+    ) -> None:
+        """The dashboard's default scoring should be served from the snapshot."""
+        _write(store, index)
+
+        snapshot = load_latest_snapshot(store)
+
+        assert snapshot is not None
+        assert load_latest_snapshot(store) is snapshot
+        restored = snapshot.index
+        gold = cached_opportunities(restored.frame, restored.fingerprint, Scenario())
+        assert gold is snapshot.gold
+        assert analysis_cache.misses == 0
+
+    def test_reloads_when_latest_moves(
+        self, store: SnapshotStore, index: DrugIndex, analysis_cache: AnalysisCache
+    ) -> None:
+        """A newer snapshot should replace the worker's copy."""
+        _write(store, index)
+        first = load_latest_snapshot(store)
+        version = _write(store, index, capture_rate="0.5")
+
+        second = load_latest_snapshot(store)
+
+        assert first is not None and second is not None
+        assert second is not first
+        assert second.version == version
@@ -0,0 +1,113 @@
+"""Tests for the synthetic benchmark data generator and suite."""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from benchmarks.bench_suite import StageResult, compare, run_stages
+from benchmarks.synthetic import generate_dataset, parse_size
+from optimizer_340b.compute.drug_index import DrugIndex
+from optimizer_340b.compute.ndc_lookup import read_ndc_list
+from optimizer_340b.ingest.normalizers import build_silver_dataset
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.ingest.sources import load_source, resolve_source_paths
+
+NDCS = 500
+
+
+@pytest.fixture(scope="module")
+def paths(tmp_path_factory: pytest.TempPathFactory) -> dict[str, Path]:
+    """A small generated file set."""
+    return generate_dataset(tmp_path_factory.mktemp("synthetic"), NDCS, seed=7)
+
+
+@pytest.fixture(scope="module")
+def results(paths: dict[str, Path]) -> list[StageResult]:
+    """One run of the benchmark stages over the file set."""
+    return run_stages(paths, NDCS)
+
+
+class TestGenerateDataset:
+    """Tests for generate_dataset."""
+
+    def test_files_load_through_sources(self, paths: dict[str, Path]) -> None:
+        """Every file should load with the app's loaders and header skips."""
+        result = ingest_sources(resolve_source_paths(paths["catalog"].parent))
+
+        assert result.errors == {}
+        assert set(result.frames) == {
+            "catalog",
+            "asp_pricing",
+            "crosswalk",
+            "nadac",
+            "noc_pricing",
+            "noc_crosswalk",
+        }
+        assert result.frames["catalog"].select(pl.col("NDC").n_unique()).item() == NDCS
+        assert load_source("biologics", paths["biologics"]).height > 0
+
+    def test_keys_overlap(self, paths: dict[str, Path]) -> None:
+        """Crosswalk, ASP and NADAC keys should overlap the catalog."""
+        frames = ingest_sources(resolve_source_paths(paths["catalog"].parent)).frames
+        silver, orphans = build_silver_dataset(
+            frames["catalog"], frames["crosswalk"], frames["asp_pricing"]
+        )
+        index = DrugIndex.from_uploaded_data(frames)
+        assert index is not None
+
+        assert 0 < silver.height < orphans.height
+        assert index.frame["asp"].is_not_null().sum() > 0
+        assert index.frame["nadac_price"].is_not_null().sum() > index.frame.height / 2
+        assert index.frame["penny_pricing_flag"].any()
+
+    def test_ndc_list(self, paths: dict[str, Path]) -> None:
+        """The lookup list should parse and include unknown NDCs."""
+        ndc_list = read_ndc_list(paths["ndc_list"].read_bytes())
+
+        assert ndc_list is not None
+        assert ndc_list.height > NDCS
+        assert (ndc_list["Drug Description"] == "UNKNOWN DRUG").any()
+
+    def test_same_seed_same_files(self, paths: dict[str, Path], tmp_path: Path) -> None:
+        """Regenerating with the same size and seed should give identical CSVs."""
+        again = generate_dataset(tmp_path, NDCS, seed=7)
+
+        for key in ("crosswalk", "asp_pricing", "nadac", "ndc_list"):
+            assert again[key].read_bytes() == paths[key].read_bytes(), key
+
+    @pytest.mark.parametrize(
+        "text,expected", [("1k", 1_000), ("1M", 1_000_000), ("2_500", 2_500)]
+    )
+    def test_parse_size(self, text: str, expected: int) -> None:
+        """Size names and plain integers should both parse."""
+        assert parse_size(text) == expected
+
+
+class TestBenchSuite:
+    """Tests for the benchmark stages and baseline comparison."""
+
+    def test_run_stages(self, results: list[StageResult]) -> None:
+        """Every stage should run and report positive throughput."""
+        assert [r.stage for r in results] == [
+            "load_excel",
+            "preprocess_cms_csv",
+            "build_silver",
+            "drug_index",
+            "margin_scoring",
+            "search_index",
+            "search",
+            "ndc_lookup",
+        ]
+        assert all(r.rows > 0 and r.rows_per_s > 0 for r in results)
+
+    def test_compare_flags_regressions(self, results: list[StageResult]) -> None:
+        """Stages slower than the tolerance allows should be reported."""
+        baseline = {
+            "results": [
+                {"ndcs": NDCS, "stage": "load_excel", "rows_per_s": 1e12},
+                {"ndcs": NDCS, "stage": "search", "rows_per_s": 1e-3},
+            ]
+        }
+
+        assert compare(results, baseline, tolerance=0.25) == [f"{NDCS}/load_excel"]
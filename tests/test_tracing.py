@@ -0,0 +1,159 @@
+"""Tests for tracing spans and their JSON-lines export."""
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from optimizer_340b.ingest.orchestrator import ingest_sources
+from optimizer_340b.pipeline import build_pipeline
+from optimizer_340b.risk.ira_flags import filter_ira_drugs, reload_ira_drugs
+from optimizer_340b.tracing import (
+    Span,
+    Tracer,
+    read_traces,
+    record_span,
+    set_tracer,
+    span,
+    traced,
+)
+
+
+@pytest.fixture
+def tracer(tmp_path: Path) -> Iterator[Tracer]:
+    """An enabled process-wide tracer exporting to a temp file."""
+    active = Tracer(tmp_path / "traces.jsonl")
+    set_tracer(active)
+    yield active
+    set_tracer(None)
+    reload_ira_drugs()
+
+
+@traced("test.double")
+def _double(df: pl.DataFrame) -> pl.DataFrame:
+    """Stack a frame on itself."""
+    return pl.concat([df, df])
+
+
+def _names(root: Span) -> list[tuple[int, str]]:
+    """Depth and name of every span in a tree."""
+    return [(depth, node.name) for depth, node in root.walk()]
+
+
+class TestSpans:
+    """Tests for span, traced and record_span."""
+
+    def test_disabled_is_noop(self, tmp_path: Path) -> None:
+        """A disabled tracer should record and write nothing."""
+        disabled = Tracer(tmp_path / "traces.jsonl", enabled=False)
+        set_tracer(disabled)
+        try:
+            with span("outer") as outer:
+                outer.set_rows(3)
+                result = _double(pl.DataFrame({"a": [1]}))
+        finally:
+            set_tracer(None)
+
+        assert result.height == 2
+        assert disabled.last_trace is None
+        assert not (tmp_path / "traces.jsonl").exists()
+
+    def test_nesting_and_rows(self, tracer: Tracer) -> None:
+        """Spans should nest and traced functions report frame heights."""
+        with span("outer", source="test") as outer:
+            _double(pl.DataFrame({"a": [1, 2]}))
+            record_span("worker", 0.5, rows=7)
+            outer.set_rows(4)
+
+        root = tracer.last_trace
+        assert root is not None
+        assert _names(root) == [(0, "outer"), (1, "test.double"), (1, "worker")]
+        assert root.rows == 4
+        assert root.attrs == {"source": "test"}
+        assert root.children[0].rows == 4
+        assert root.children[1].seconds == 0.5
+        assert root.seconds >= root.children[0].seconds
+
+    def test_error_is_recorded(self, tracer: Tracer) -> None:
+        """A raising block should propagate and mark the span."""
+        with pytest.raises(ValueError), span("outer"):
+            raise ValueError("boom")
+
+        assert tracer.last_trace is not None
+        assert tracer.last_trace.error == "ValueError"
+
+    def test_jsonl_round_trip(self, tracer: Tracer) -> None:
+        """Each root should export as linked records that read back as trees."""
+        for name in ("first", "second"):
+            with span(name):
+                _double(pl.DataFrame({"a": [1]}))
+
+        assert tracer.path is not None
+        records = [json.loads(line) for line in tracer.path.read_text().splitlines()]
+        assert len(records) == 4
+        assert records[1]["parent_id"] == records[0]["span_id"]
+        assert records[0]["trace_id"] != records[2]["trace_id"]
+
+        traces = read_traces(tracer.path)
+        assert [_names(t) for t in traces] == [
+            [(0, "first"), (1, "test.double")],
+            [(0, "second"), (1, "test.double")],
+        ]
+        assert [t.name for t in read_traces(tracer.path, limit=1)] == ["second"]
+
+    def test_read_missing_file(self, tmp_path: Path) -> None:
+        """Reading a trace file that does not exist should return no traces."""
+        assert read_traces(tmp_path / "missing.jsonl") == []
+
+
+class TestInstrumentation:
+    """Tests for spans emitted by ingest and the recompute graph."""
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_ingest_spans(
+        self, tracer: Tracer, tmp_path: Path, max_workers: int
+    ) -> None:
+        """Serial and thread-pool loads should nest under the ingest span."""
+        pl.DataFrame(
+            {"NDC": ["0074-4339-02"], "Drug Name": ["HUMIRA"], "AWP": [6500.0]}
+        ).write_csv(tmp_path / "catalog.csv")
+        pl.DataFrame(
+            {"ndc": ["00074433902"], "total_discount_340b_pct": [50.0]}
+        ).write_csv(tmp_path / "nadac.csv")
+        paths = {"catalog": tmp_path / "catalog.csv", "nadac": tmp_path / "nadac.csv"}
+
+        ingest_sources(paths, max_workers=max_workers)
+
+        root = tracer.last_trace
+        assert root is not None
+        assert root.name == "ingest.ingest_sources"
+        loads = [c for c in root.children if c.name == "ingest.load_source"]
+        assert sorted(c.attrs["source"] for c in loads) == ["catalog", "nadac"]
+        assert all(c.rows == 1 for c in loads)
+        assert all(c.children[0].name == "ingest.load_csv" for c in loads)
+
+    def test_pipeline_stage_spans(
+        self, tracer: Tracer, sample_catalog_df: pl.DataFrame
+    ) -> None:
+        """Recomputed stages should appear once; cached reads add no spans."""
+        pipeline = build_pipeline()
+        pipeline.update_inputs({"catalog": sample_catalog_df})
+
+        with span("page"):
+            pipeline.get("drug_index")
+            pipeline.get("drug_index")
+
+        assert tracer.last_trace is not None
+        stages = [c.name for c in tracer.last_trace.children]
+        assert stages.count("pipeline.drug_index") == 1
+        assert (2, "compute.build_drug_base") in _names(tracer.last_trace)
+
+    def test_batch_calls_trace_once(self, tracer: Tracer) -> None:
+        """Per-drug helpers inside a batch should not add a span per row."""
+        filter_ira_drugs(["ENBREL", "HUMIRA", "ELIQUIS"] * 100)
+
+        root = tracer.last_trace
+        assert root is not None
+        assert _names(root) == [(0, "risk.filter_ira_drugs")]